@@ -0,0 +1,5 @@
+from app.caches.ttl_lru_cache import TTLLRUCache
+from app.caches.awfapi_user_cache import AWFAPIUserCache
+from app.caches.token_deny_list import TokenDenyList
+from app.caches.person_name_index import PersonNameIndex
+from app.caches.phone_number_type_cache import PhoneNumberTypeCache
@@ -0,0 +1,38 @@
+import threading
+from typing import ClassVar, Optional
+
+from app.caches import TTLLRUCache
+from app.config import AWFAPIUserCacheConfig
+from app.models import AWFAPIUser
+
+
+class AWFAPIUserCache:
+    """
+    Process-wide cache of AWFAPI users keyed by username.
+
+    Read by the JWT authentication service and invalidated by AWFAPI user providers on every write.
+    Size and time-to-live are read from the 'awfapi_user_cache' section of the config file.
+    """
+    instance: ClassVar[Optional[TTLLRUCache[str, AWFAPIUser]]] = None
+    lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @staticmethod
+    def get_instance() -> TTLLRUCache[str, AWFAPIUser]:
+        """ Returns shared AWFAPI user cache, creates it on the first call """
+        if AWFAPIUserCache.instance is not None:
+            return AWFAPIUserCache.instance
+
+        with AWFAPIUserCache.lock:
+            if AWFAPIUserCache.instance is None:
+                aucc = AWFAPIUserCacheConfig.from_json()
+                AWFAPIUserCache.instance = TTLLRUCache(name="awfapi_user",
+                                                       max_size=aucc.max_size if aucc.is_enabled else 0,
+                                                       ttl=aucc.ttl)
+        return AWFAPIUserCache.instance
+
+    @staticmethod
+    def invalidate(*usernames: str) -> None:
+        """ Drops cached users of given usernames """
+        awfapi_user_cache = AWFAPIUserCache.get_instance()
+        for username in usernames:
+            awfapi_user_cache.invalidate(username)
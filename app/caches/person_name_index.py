@@ -0,0 +1,99 @@
+import bisect
+import threading
+from typing import ClassVar, Dict, Iterable, List, Tuple
+
+
+class PersonNameIndex:
+    """
+    Process-wide in-memory index of person names, answering prefix (autocomplete) queries.
+
+    Each person is indexed under its last name, its first name and its full name ('first last'),
+    all whitespace-normalized and casefolded. The keys are kept in a sorted list, so a prefix query is
+    a binary search followed by a scan of at most top-k matching keys. The index is built at startup
+    and kept up to date by the person provider of the process, changes made by other processes
+    are seen after the next build only.
+    """
+    keys: ClassVar[List[Tuple[str, int]]] = list([])
+    names: ClassVar[Dict[int, Tuple[str, str]]] = dict({})
+    is_built: ClassVar[bool] = False
+    lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @staticmethod
+    def build(person_names: Iterable[Tuple[int, str, str]]) -> None:
+        """ Replaces index contents with given (person id, first name, last name) triples """
+        names = dict(map(lambda pn: (pn[0], (pn[1], pn[2])), person_names))
+        keys = sorted(key for person_id, (first_name, last_name) in names.items()
+                      for key in PersonNameIndex.__get_keys(person_id, first_name, last_name))
+        with PersonNameIndex.lock:
+            PersonNameIndex.names = names
+            PersonNameIndex.keys = keys
+            PersonNameIndex.is_built = True
+
+    @staticmethod
+    def put(person_id: int, first_name: str, last_name: str) -> None:
+        """ Indexes names of given person, replaces the former ones, does nothing if the index is not built """
+        with PersonNameIndex.lock:
+            if not PersonNameIndex.is_built:
+                return
+            PersonNameIndex.__remove(person_id)
+            PersonNameIndex.names[person_id] = (first_name, last_name)
+            for key in PersonNameIndex.__get_keys(person_id, first_name, last_name):
+                bisect.insort(PersonNameIndex.keys, key)
+
+    @staticmethod
+    def remove(person_id: int) -> None:
+        """ Drops names of given person from the index """
+        with PersonNameIndex.lock:
+            PersonNameIndex.__remove(person_id)
+
+    @staticmethod
+    def search(prefix: str, top_k: int) -> List[Tuple[int, str, str]]:
+        """
+        Returns (person id, first name, last name) triples of at most top_k persons whose last, first
+        or full name starts with given prefix (case-insensitive), ordered by the matched name
+        """
+        prefix = PersonNameIndex.normalize(prefix)
+        found_person_ids = list([])
+        with PersonNameIndex.lock:
+            keys = PersonNameIndex.keys
+            i = bisect.bisect_left(keys, (prefix,))
+            while i < len(keys) and len(found_person_ids) < top_k and keys[i][0].startswith(prefix):
+                if keys[i][1] not in found_person_ids:
+                    found_person_ids.append(keys[i][1])
+                i += 1
+            return list(map(lambda pid: (pid, *PersonNameIndex.names[pid]), found_person_ids))
+
+    @staticmethod
+    def get_size() -> int:
+        """ Returns number of indexed persons """
+        return len(PersonNameIndex.names)
+
+    @staticmethod
+    def clear() -> None:
+        """ Drops all index entries, the index is not built until the next build """
+        with PersonNameIndex.lock:
+            PersonNameIndex.names = dict({})
+            PersonNameIndex.keys = list([])
+            PersonNameIndex.is_built = False
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """ Returns name with collapsed whitespaces, casefolded """
+        return " ".join(name.split()).casefold()
+
+    @staticmethod
+    def __get_keys(person_id: int, first_name: str, last_name: str) -> List[Tuple[str, int]]:
+        """ Returns distinct index keys of given person names """
+        names = [last_name, first_name, f"{first_name} {last_name}"]
+        return sorted(set(map(lambda n: (PersonNameIndex.normalize(n), person_id), names)))
+
+    @staticmethod
+    def __remove(person_id: int) -> None:
+        """ Drops index keys of given person, the lock must be held """
+        person_names = PersonNameIndex.names.pop(person_id, None)
+        if person_names is None:
+            return
+        for key in PersonNameIndex.__get_keys(person_id, *person_names):
+            i = bisect.bisect_left(PersonNameIndex.keys, key)
+            if i < len(PersonNameIndex.keys) and PersonNameIndex.keys[i] == key:
+                del PersonNameIndex.keys[i]
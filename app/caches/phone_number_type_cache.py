@@ -0,0 +1,56 @@
+import threading
+import time
+from typing import ClassVar, Dict, List, Optional
+
+from app.models import PhoneNumberType
+
+
+class PhoneNumberTypeCache:
+    """
+    Process-wide in-memory copy of the whole phone number type table (reference data of a few rows).
+
+    It is loaded at startup and loaded again on the first read after it was invalidated, which phone number type
+    providers do on every write, or after its time-to-live ('phone_number_type_cache' section of the config file),
+    so changes made by other processes are seen as well. Each invalidation bumps the version, a load started
+    before an invalidation is not stored, so a concurrent write is never hidden by an older table copy.
+    Cached phone number types are shared, they must not be modified.
+    """
+    phone_number_types: ClassVar[Dict[int, PhoneNumberType]] = dict({})
+    loaded_at: ClassVar[Optional[float]] = None
+    version: ClassVar[int] = 0
+    lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @staticmethod
+    def get_version() -> int:
+        """ Returns version of the cache, it must be read before the table is selected to be loaded """
+        return PhoneNumberTypeCache.version
+
+    @staticmethod
+    def load(phone_number_types: List[PhoneNumberType], version: int) -> Dict[int, PhoneNumberType]:
+        """
+        Replaces cache contents with given phone number types selected at given version, returns them by id.
+        Nothing is stored if the cache was invalidated since.
+        """
+        loaded_phone_number_types = dict(map(lambda pnt: (pnt.phone_number_type_id, pnt),
+                                             sorted(phone_number_types, key=lambda pnt: pnt.phone_number_type_id)))
+        with PhoneNumberTypeCache.lock:
+            if version == PhoneNumberTypeCache.version:
+                PhoneNumberTypeCache.phone_number_types = loaded_phone_number_types
+                PhoneNumberTypeCache.loaded_at = time.monotonic()
+        return loaded_phone_number_types
+
+    @staticmethod
+    def get_all(ttl: float) -> Optional[Dict[int, PhoneNumberType]]:
+        """ Returns all phone number types by id ordered by id, None if the cache is not loaded or is older than ttl """
+        with PhoneNumberTypeCache.lock:
+            if PhoneNumberTypeCache.loaded_at is None or time.monotonic() - PhoneNumberTypeCache.loaded_at > ttl:
+                return None
+            return PhoneNumberTypeCache.phone_number_types
+
+    @staticmethod
+    def invalidate() -> None:
+        """ Drops all cached phone number types, they are loaded again on the next read """
+        with PhoneNumberTypeCache.lock:
+            PhoneNumberTypeCache.version += 1
+            PhoneNumberTypeCache.phone_number_types = dict({})
+            PhoneNumberTypeCache.loaded_at = None
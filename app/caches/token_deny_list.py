@@ -0,0 +1,55 @@
+import sys
+import threading
+import time
+from typing import Callable, ClassVar, Dict, Optional, Tuple
+
+from app.config import JWTAuthenticationConfig
+
+
+class TokenDenyList:
+    """
+    Process-wide deny list of stateless claims tokens.
+
+    Keeps one entry per user: the lowest user version stamp still accepted. Tokens of older versions
+    (issued before the user was modified) or of deleted users are rejected. Entries are dropped after
+    the access token lifetime, when all tokens they deny have already expired.
+    """
+    entries: ClassVar[Dict[str, Tuple[int, float]]] = dict({})
+    lock: ClassVar[threading.Lock] = threading.Lock()
+    timer: ClassVar[Callable[[], float]] = time.monotonic
+
+    @staticmethod
+    def revoke(username: str, min_version: Optional[int] = None) -> None:
+        """ Denies tokens of given user older than given version stamp, all of them if no version is given """
+        lifetime = JWTAuthenticationConfig.from_json().access_token_expire_minutes * 60
+        now = TokenDenyList.timer()
+        with TokenDenyList.lock:
+            TokenDenyList.__purge(now)
+            TokenDenyList.entries[username] = (min_version if min_version is not None else sys.maxsize,
+                                               now + lifetime)
+
+    @staticmethod
+    def is_revoked(username: str, version: int) -> bool:
+        """ Checks if token of given user and version stamp is denied """
+        entry = TokenDenyList.entries.get(username)
+        if entry is None or entry[1] <= TokenDenyList.timer():
+            return False
+        return version < entry[0]
+
+    @staticmethod
+    def get_size() -> int:
+        """ Returns number of denied users """
+        return len(TokenDenyList.entries)
+
+    @staticmethod
+    def clear() -> None:
+        """ Drops all deny list entries """
+        with TokenDenyList.lock:
+            TokenDenyList.entries.clear()
+
+    @staticmethod
+    def __purge(now: float) -> None:
+        """ Drops entries whose denied tokens have already expired """
+        expired_usernames = list(map(lambda e: e[0], filter(lambda e: e[1][1] <= now, TokenDenyList.entries.items())))
+        for username in expired_usernames:
+            del TokenDenyList.entries[username]
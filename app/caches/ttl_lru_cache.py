@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+from app.models import CacheStats
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLLRUCache(Generic[K, V]):
+    """
+    Thread-safe in-process cache with time-to-live and least-recently-used eviction.
+
+    Entries older than 'ttl' seconds are treated as missing and dropped on access. When 'max_size' entries
+    are stored, putting a new one evicts the least recently used entry. Cache of 'max_size' 0 stores nothing.
+    """
+    name: str
+    max_size: int
+    ttl: float
+
+    def __init__(self, name: str, max_size: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.timer = timer
+        self.entries: OrderedDict[K, Tuple[float, V]] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: K) -> Optional[V]:
+        """ Returns cached value of given key or None if it is missing or expired """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= self.timer():
+                del self.entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: K, value: V) -> None:
+        """ Caches value under given key, evicts the least recently used entry if the cache is full """
+        if self.max_size <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (self.timer() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """ Drops cached value of given key """
+        with self.lock:
+            if self.entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """ Drops all cached values and resets the counters """
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+            self.invalidations = 0
+
+    def get_stats(self) -> CacheStats:
+        """ Returns cache size and hit/miss counters """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return CacheStats(name=self.name, size=len(self.entries), max_size=self.max_size, ttl=self.ttl,
+                              hits=self.hits, misses=self.misses, evictions=self.evictions,
+                              expirations=self.expirations, invalidations=self.invalidations,
+                              hit_ratio=self.hits / lookups if lookups > 0 else 0.0)
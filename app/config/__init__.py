@@ -1,3 +1,4 @@
+from app.config.config_loader import ConfigLoader
 from app.config.app_run_config import AppRunConfig
 from app.config.cors_middleware_config import CORSMiddlewareConfig
 from app.config.app_metadata_config import AppMetadataConfig
@@ -6,3 +7,11 @@ from app.config.default_query_params_config import DefaultQueryParamsConfig
 from app.config.postgresdb_connection_config import PostgresdbConnectionConfig
 from app.config.mongodb_connection_config import MongodbConnectionConfig
 from app.config.jwt_authentication_config import JWTAuthenticationConfig
+from app.config.awfapi_user_cache_config import AWFAPIUserCacheConfig
+from app.config.password_hashing_config import PasswordHashingConfig
+from app.config.person_search_config import PersonSearchConfig
+from app.config.person_name_index_config import PersonNameIndexConfig
+from app.config.phone_number_type_cache_config import PhoneNumberTypeCacheConfig
+from app.config.export_config import ExportConfig
+from app.config.import_config import ImportConfig
+from app.config.batch_config import BatchConfig
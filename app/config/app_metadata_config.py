@@ -1,6 +1,6 @@
-import json
 from pydantic import BaseModel
-from typing import List, Union
+
+from app.config.config_loader import ConfigLoader
 
 
 class Contact(BaseModel):
@@ -33,8 +33,10 @@ class AppMetadataConfig(BaseModel):
 
     @staticmethod
     def from_json() -> 'AppMetadataConfig':
-        with open("metadata.json", "r") as f:
-            config_dict = json.load(f)
+        return ConfigLoader.get_cached("app_metadata", AppMetadataConfig.__from_file, path="metadata.json")
+
+    @staticmethod
+    def __from_file() -> 'AppMetadataConfig':
+        config_dict = ConfigLoader.get_section(path="metadata.json")
         config_dict['description'] = "\n".join(config_dict['description'])
-        config = AppMetadataConfig(**config_dict)
-        return config
+        return AppMetadataConfig(**config_dict)
@@ -1,6 +1,7 @@
-import json
 from pydantic import BaseModel
 
+from app.config.config_loader import ConfigLoader
+
 
 class AppRunConfig(BaseModel):
     host: str
@@ -13,6 +14,4 @@ class AppRunConfig(BaseModel):
 
     @staticmethod
     def from_json() -> 'AppRunConfig':
-        with open("config.json", "r") as f:
-            config = AppRunConfig(**json.load(f)['app_run'])
-        return config
+        return ConfigLoader.get_cached("app_run", lambda: AppRunConfig(**ConfigLoader.get_section('app_run')))
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+from app.config.config_loader import ConfigLoader
+
+
+class AWFAPIUserCacheConfig(BaseModel):
+    is_enabled: bool = True
+    max_size: int = 1024
+    ttl: float = 60.0
+
+    class Config:
+        frozen = True
+
+    @staticmethod
+    def from_json() -> 'AWFAPIUserCacheConfig':
+        return ConfigLoader.get_cached("awfapi_user_cache",
+                                       lambda: AWFAPIUserCacheConfig(**ConfigLoader.get_section('awfapi_user_cache')))
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+from app.config.config_loader import ConfigLoader
+
+
+class BatchConfig(BaseModel):
+    max_operations: int = 1000
+    max_ids: int = 1000
+
+    class Config:
+        frozen = True
+
+    @staticmethod
+    def from_json() -> 'BatchConfig':
+        return ConfigLoader.get_cached("batch", lambda: BatchConfig(**ConfigLoader.get_section('batch')))
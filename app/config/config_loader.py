@@ -0,0 +1,94 @@
+import copy
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, ClassVar, Dict, Hashable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class ConfigLoader:
+    """
+    Loads JSON configuration files once and caches them together with config objects built from them.
+
+    Files are read and parsed only on the first access. If hot reload is enabled in the 'config_loader' section
+    of the config file, the file modification time is checked at most once per 'hot_reload_interval' seconds
+    and on a change the file is parsed again and all cached config objects are dropped.
+    """
+    default_path: ClassVar[str] = "config.json"
+
+    files: ClassVar[Dict[str, Dict[str, Any]]] = dict({})
+    file_mtimes: ClassVar[Dict[str, int]] = dict({})
+    file_checks: ClassVar[Dict[str, float]] = dict({})
+    objects: ClassVar[Dict[Hashable, Any]] = dict({})
+    hot_reload_interval: ClassVar[Optional[float]] = None
+    lock: ClassVar[threading.RLock] = threading.RLock()
+
+    @staticmethod
+    def load(path: Optional[str] = None) -> Dict[str, Any]:
+        """ Returns parsed content of given JSON file, reads the file only if it is not cached or has changed """
+        path = path or ConfigLoader.default_path
+        if path in ConfigLoader.files and not ConfigLoader.__is_check_due(path):
+            return ConfigLoader.files[path]
+
+        with ConfigLoader.lock:
+            if path not in ConfigLoader.files:
+                ConfigLoader.__read(path)
+            elif ConfigLoader.__is_check_due(path):
+                ConfigLoader.file_checks[path] = time.monotonic()
+                if os.stat(path).st_mtime_ns != ConfigLoader.file_mtimes[path]:
+                    ConfigLoader.__read(path)
+                    ConfigLoader.objects.clear()
+        return ConfigLoader.files[path]
+
+    @staticmethod
+    def get_section(*keys: str, path: Optional[str] = None) -> Any:
+        """ Returns a copy of config file section under given sequence of keys """
+        section = ConfigLoader.load(path)
+        for key in keys:
+            section = section[key]
+        return copy.deepcopy(section)
+
+    @staticmethod
+    def get_cached(key: Hashable, factory: Callable[[], T], path: Optional[str] = None) -> T:
+        """ Returns config object of given key, builds it with factory if it is not cached yet """
+        ConfigLoader.load(path)
+        try:
+            return ConfigLoader.objects[key]
+        except KeyError:
+            with ConfigLoader.lock:
+                if key not in ConfigLoader.objects:
+                    ConfigLoader.objects[key] = factory()
+                return ConfigLoader.objects[key]
+
+    @staticmethod
+    def clear() -> None:
+        """ Drops all cached files and config objects, next access reads the files again """
+        with ConfigLoader.lock:
+            ConfigLoader.files.clear()
+            ConfigLoader.file_mtimes.clear()
+            ConfigLoader.file_checks.clear()
+            ConfigLoader.objects.clear()
+            ConfigLoader.hot_reload_interval = None
+
+    @staticmethod
+    def __read(path: str) -> None:
+        """ Reads and parses given JSON file """
+        with open(path, "r") as f:
+            ConfigLoader.file_mtimes[path] = os.fstat(f.fileno()).st_mtime_ns
+            ConfigLoader.files[path] = json.load(f)
+        ConfigLoader.file_checks[path] = time.monotonic()
+
+        if path == ConfigLoader.default_path:
+            loader_config = ConfigLoader.files[path].get("config_loader", dict({}))
+            is_hot_reload = loader_config.get("is_hot_reload", False)
+            ConfigLoader.hot_reload_interval = loader_config.get("hot_reload_interval", 5.0) if is_hot_reload else None
+
+    @staticmethod
+    def __is_check_due(path: str) -> bool:
+        """ Checks if the hot reload is enabled and the file modification time should be checked again """
+        if ConfigLoader.hot_reload_interval is None:
+            return False
+        return time.monotonic() - ConfigLoader.file_checks[path] >= ConfigLoader.hot_reload_interval
@@ -1,19 +1,20 @@
-import json
 from typing import List
 from pydantic import BaseModel
 
+from app.config.config_loader import ConfigLoader
+
 
 class CORSMiddlewareConfig(BaseModel):
     allow_origins: List[str]
     allow_credentials: bool
     allow_methods: List[str]
     allow_headers: List[str]
+    expose_headers: List[str] = list([])
 
     class Config:
         frozen = True
 
     @staticmethod
     def from_json() -> 'CORSMiddlewareConfig':
-        with open("config.json", "r") as f:
-            config = CORSMiddlewareConfig(**json.load(f)['cors_middleware'])
-        return config
+        return ConfigLoader.get_cached("cors_middleware",
+                                       lambda: CORSMiddlewareConfig(**ConfigLoader.get_section('cors_middleware')))
@@ -1,7 +1,7 @@
-import json
 from pydantic import BaseModel
 from typing import Optional
 
+from app.config.config_loader import ConfigLoader
 from app.models import EOrderType
 
 
@@ -11,12 +11,12 @@ class DefaultQueryParamsConfig(BaseModel):
     order_type: EOrderType
     offset: int
     limit: int
+    fields: Optional[str]
 
     class Config:
         frozen = True
 
     @staticmethod
     def from_json(entity: str) -> 'DefaultQueryParamsConfig':
-        with open("config.json", "r") as f:
-            config = DefaultQueryParamsConfig(**json.load(f)['default_query_params'][entity])
-        return config
+        return ConfigLoader.get_cached(("default_query_params", entity),
+                                       lambda: DefaultQueryParamsConfig(**ConfigLoader.get_section('default_query_params', entity)))
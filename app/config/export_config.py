@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+from app.config.config_loader import ConfigLoader
+
+
+class ExportConfig(BaseModel):
+    batch_size: int = 1000
+
+    class Config:
+        frozen = True
+
+    @staticmethod
+    def from_json() -> 'ExportConfig':
+        return ConfigLoader.get_cached("export", lambda: ExportConfig(**ConfigLoader.get_section('export')))
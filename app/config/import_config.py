@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+from app.config.config_loader import ConfigLoader
+
+
+class ImportConfig(BaseModel):
+    batch_size: int = 5000
+    max_reported_errors: int = 1000
+
+    class Config:
+        frozen = True
+
+    @staticmethod
+    def from_json() -> 'ImportConfig':
+        return ConfigLoader.get_cached("import", lambda: ImportConfig(**ConfigLoader.get_section('import')))
@@ -1,17 +1,18 @@
-import json
 from pydantic import BaseModel
 
+from app.config.config_loader import ConfigLoader
+
 
 class JWTAuthenticationConfig(BaseModel):
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int
+    is_stateless_claims: bool = False
 
     class Config:
         frozen = True
 
     @staticmethod
     def from_json() -> 'JWTAuthenticationConfig':
-        with open("config.json", "r") as f:
-            config = JWTAuthenticationConfig(**json.load(f)['jwt_auth_config'])
-        return config
+        return ConfigLoader.get_cached("jwt_auth_config",
+                                       lambda: JWTAuthenticationConfig(**ConfigLoader.get_section('jwt_auth_config')))
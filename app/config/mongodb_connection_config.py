@@ -1,6 +1,7 @@
-import json
 from pydantic import BaseModel
 
+from app.config.config_loader import ConfigLoader
+
 
 class MongodbConnectionConfig(BaseModel):
     username: str
@@ -9,15 +10,15 @@ class MongodbConnectionConfig(BaseModel):
     port: int
     database: str
     collection: str
+    is_async: bool = False
 
     class Config:
         frozen = True
 
     @staticmethod
     def from_json() -> 'MongodbConnectionConfig':
-        with open("config.json", "r") as f:
-            config = MongodbConnectionConfig(**json.load(f)['mongodb_connection'])
-        return config
+        return ConfigLoader.get_cached("mongodb_connection",
+                                       lambda: MongodbConnectionConfig(**ConfigLoader.get_section('mongodb_connection')))
 
     @staticmethod
     def get_db_connection_string() -> str:
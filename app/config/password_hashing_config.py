@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional
+
+from app.config.config_loader import ConfigLoader
+
+
+class PasswordHashingConfig(BaseModel):
+    executor_type: str = "process"
+    max_workers: Optional[int] = None
+    max_in_flight: int = 16
+    acquire_timeout: float = 5.0
+
+    class Config:
+        frozen = True
+
+    @staticmethod
+    def from_json() -> 'PasswordHashingConfig':
+        return ConfigLoader.get_cached("password_hashing",
+                                       lambda: PasswordHashingConfig(**ConfigLoader.get_section('password_hashing')))
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+from app.config.config_loader import ConfigLoader
+
+
+class PersonNameIndexConfig(BaseModel):
+    is_enabled: bool = True
+    default_top_k: int = 10
+    max_top_k: int = 100
+
+    class Config:
+        frozen = True
+
+    @staticmethod
+    def from_json() -> 'PersonNameIndexConfig':
+        return ConfigLoader.get_cached("person_name_index",
+                                       lambda: PersonNameIndexConfig(**ConfigLoader.get_section('person_name_index')))
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+from app.config.config_loader import ConfigLoader
+
+
+class PersonSearchConfig(BaseModel):
+    default_limit: int = 50
+    max_limit: int = 1000
+    stream_batch_size: int = 1000
+    is_in_memory: bool = False
+
+    class Config:
+        frozen = True
+
+    @staticmethod
+    def from_json() -> 'PersonSearchConfig':
+        return ConfigLoader.get_cached("person_search",
+                                       lambda: PersonSearchConfig(**ConfigLoader.get_section('person_search')))
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+from app.config.config_loader import ConfigLoader
+
+
+class PhoneNumberTypeCacheConfig(BaseModel):
+    is_enabled: bool = True
+    ttl: float = 300.0
+
+    class Config:
+        frozen = True
+
+    @staticmethod
+    def from_json() -> 'PhoneNumberTypeCacheConfig':
+        return ConfigLoader.get_cached("phone_number_type_cache",
+                                       lambda: PhoneNumberTypeCacheConfig(
+                                           **ConfigLoader.get_section('phone_number_type_cache')))
@@ -1,5 +1,7 @@
-import json
 from pydantic import BaseModel
+from typing import Dict, Union
+
+from app.config.config_loader import ConfigLoader
 
 
 class PostgresdbConnectionConfig(BaseModel):
@@ -8,17 +10,31 @@ class PostgresdbConnectionConfig(BaseModel):
     host: str
     port: int
     database: str
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_recycle: int = -1
+    pool_pre_ping: bool = False
+    is_async: bool = False
 
     class Config:
         frozen = True
 
     @staticmethod
     def from_json() -> 'PostgresdbConnectionConfig':
-        with open("config.json", "r") as f:
-            config = PostgresdbConnectionConfig(**json.load(f)['postgresdb_connection'])
-        return config
+        return ConfigLoader.get_cached("postgresdb_connection",
+                                       lambda: PostgresdbConnectionConfig(**ConfigLoader.get_section('postgresdb_connection')))
 
     @staticmethod
     def get_db_connection_string(test_suffix: str = "") -> str:
         pcc = PostgresdbConnectionConfig.from_json()
         return f"postgresql+psycopg2://{pcc.username}:{pcc.password}@{pcc.host}:{pcc.port}/{pcc.database}{test_suffix}"
+
+    @staticmethod
+    def get_async_db_connection_string(test_suffix: str = "") -> str:
+        pcc = PostgresdbConnectionConfig.from_json()
+        return f"postgresql+asyncpg://{pcc.username}:{pcc.password}@{pcc.host}:{pcc.port}/{pcc.database}{test_suffix}"
+
+    @staticmethod
+    def get_db_engine_options() -> Dict[str, Union[int, bool]]:
+        pcc = PostgresdbConnectionConfig.from_json()
+        return pcc.dict(include={"pool_size", "max_overflow", "pool_recycle", "pool_pre_ping"})
@@ -1,6 +1,7 @@
-import json
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
+
+from app.config.config_loader import ConfigLoader
 
 
 class TableKeys(BaseModel):
@@ -22,19 +23,45 @@ class TableDetailsConfig(BaseModel):
 
     @staticmethod
     def from_json(entity: str) -> 'TableDetailsConfig':
-        with open("config.json", "r") as f:
-            config = TableDetailsConfig(**json.load(f)['table_details'][entity])
-        return config
+        return ConfigLoader.get_cached(("table_details", entity),
+                                       lambda: TableDetailsConfig(**ConfigLoader.get_section('table_details', entity)))
 
     def get_primary_key_strings(self) -> List[str]:
-        return list(map(lambda k: f"\"{self.schema_name}\".\"{self.table}\".\"{k}\"", self.keys.primary))
+        return list(ConfigLoader.get_cached(("table_primary_key_strings", self.schema_name, self.table),
+                                            lambda: self.__get_key_strings(self.keys.primary)))
 
     def get_foreign_key_strings(self, joined_entity: str) -> List[str]:
-        fk = self.keys.foreign[joined_entity]
-        return list(map(lambda k: f"\"{self.schema_name}\".\"{self.table}\".\"{k}\"", fk))
+        return list(ConfigLoader.get_cached(("table_foreign_key_strings", self.schema_name, self.table, joined_entity),
+                                            lambda: self.__get_key_strings(self.keys.foreign[joined_entity])))
+
+    def __get_key_strings(self, key_columns: List[str]) -> Tuple[str, ...]:
+        return tuple(map(lambda k: f"\"{self.schema_name}\".\"{self.table}\".\"{k}\"", key_columns))
+
+    @staticmethod
+    def get_foreign_key_join_conditions() -> Dict[Tuple[str, str], str]:
+        """ Returns join conditions of all foreign keys defined in table details, precomputed once per config load """
+        return ConfigLoader.get_cached("table_foreign_key_join_conditions",
+                                       TableDetailsConfig.__compute_foreign_key_join_conditions)
 
     @staticmethod
     def get_foreign_key_join_condition(entity: str, joined_entity: str) -> str:
+        try:
+            return TableDetailsConfig.get_foreign_key_join_conditions()[(entity, joined_entity)]
+        except KeyError:
+            raise ValueError(f"Entity '{entity}' has no foreign key referencing entity '{joined_entity}'.")
+
+    @staticmethod
+    def __compute_foreign_key_join_conditions() -> Dict[Tuple[str, str], str]:
+        join_conditions = dict({})
+        for entity in ConfigLoader.load()['table_details'].keys():
+            foreign_keys = TableDetailsConfig.from_json(entity).keys.foreign or dict({})
+            for joined_entity in foreign_keys.keys():
+                join_conditions[(entity, joined_entity)] = \
+                    TableDetailsConfig.__compute_foreign_key_join_condition(entity, joined_entity)
+        return join_conditions
+
+    @staticmethod
+    def __compute_foreign_key_join_condition(entity: str, joined_entity: str) -> str:
         table_foreign_key = TableDetailsConfig.from_json(entity).get_foreign_key_strings(joined_entity)
         joined_table_primary_key = TableDetailsConfig.from_json(joined_entity).get_primary_key_strings()
 
@@ -0,0 +1,75 @@
+import io
+import enum
+import sqlalchemy
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel import SQLModel
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+
+class CopyLoader:
+    """
+    Loader of table rows through PostgreSQL COPY FROM STDIN.
+
+    One COPY command streams a whole chunk of rows, so there is no per-row statement parsing, planning
+    and round trip as with INSERT. Rows are sent in the COPY text format (parsed by PostgreSQL, like literals),
+    within the current transaction of given connection: psycopg2 'copy_expert' for sync connections,
+    asyncpg 'copy_to_table' for async ones.
+    """
+
+    @staticmethod
+    def get_columns(model: Type[SQLModel], fields: Optional[Sequence[str]] = None) -> List[str]:
+        """ Returns table column names of given model fields, of all model fields if not given """
+        fields = fields if fields is not None else list(model.__fields__.keys())
+        return list(map(lambda f: getattr(model, f).property.columns[0].name, fields))
+
+    @staticmethod
+    def get_records(model: Type[SQLModel], values: Iterable[Dict[str, Any]],
+                    fields: Optional[Sequence[str]] = None) -> List[Tuple[Any, ...]]:
+        """ Returns records of given model field values, ordered as the columns of 'get_columns' """
+        fields = fields if fields is not None else list(model.__fields__.keys())
+        return list(map(lambda v: tuple(map(lambda f: v.get(f), fields)), values))
+
+    @staticmethod
+    def get_copy_data(records: Iterable[Sequence[Any]]) -> str:
+        """
+        Returns given records in the COPY text format: tab separated columns, one line per record,
+        NULL as '\\N', backslashes and control characters escaped.
+        """
+        return "".join(map(lambda r: "\t".join(map(CopyLoader.__get_copy_value, r)) + "\n", records))
+
+    @staticmethod
+    def get_copy_sql(table_name: str, columns: List[str], schema_name: Optional[str] = None) -> str:
+        """ Returns COPY FROM STDIN command of given table columns """
+        preparer = postgresql.dialect().identifier_preparer
+        table = ".".join(map(preparer.quote, filter(lambda n: n is not None, [schema_name, table_name])))
+        return f"COPY {table} ({', '.join(map(preparer.quote, columns))}) FROM STDIN"
+
+    @staticmethod
+    def copy(connection: sqlalchemy.engine.Connection, table_name: str, columns: List[str],
+             records: Sequence[Sequence[Any]], schema_name: Optional[str] = None) -> None:
+        """ Copies given records into given table columns using the psycopg2 connection """
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(CopyLoader.get_copy_sql(table_name, columns, schema_name),
+                               io.StringIO(CopyLoader.get_copy_data(records)))
+        finally:
+            cursor.close()
+
+    @staticmethod
+    async def copy_async(connection: AsyncConnection, table_name: str, columns: List[str],
+                         records: Sequence[Sequence[Any]], schema_name: Optional[str] = None) -> None:
+        """ Copies given records into given table columns using the asyncpg connection """
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_to_table(
+            table_name, source=io.BytesIO(CopyLoader.get_copy_data(records).encode("utf-8")),
+            columns=columns, schema_name=schema_name, format="text")
+
+    @staticmethod
+    def __get_copy_value(value: Any) -> str:
+        """ Returns value in the COPY text format """
+        if value is None:
+            return "\\N"
+        if isinstance(value, enum.Enum):
+            value = value.value
+        return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
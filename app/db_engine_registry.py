@@ -0,0 +1,67 @@
+import threading
+import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import create_engine
+from typing import Dict, ClassVar
+
+from app.config import PostgresdbConnectionConfig
+
+
+class DbEngineRegistry:
+    """
+    Process-wide registry of database engines.
+
+    Each connection string gets exactly one engine (and thus one connection pool), shared by every provider
+    of the process. Pool options are read from the 'postgresdb_connection' section of the config file.
+    Sync (psycopg2) and async (asyncpg) engines are kept separately.
+    """
+    postgresdb_engines: ClassVar[Dict[str, sqlalchemy.engine.Engine]] = dict({})
+    async_postgresdb_engines: ClassVar[Dict[str, AsyncEngine]] = dict({})
+    lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @staticmethod
+    def get_postgresdb_engine(connection_string: str) -> sqlalchemy.engine.Engine:
+        """ Returns shared engine of given connection string, creates it on the first call """
+        db_engine = DbEngineRegistry.postgresdb_engines.get(connection_string)
+        if db_engine is not None:
+            return db_engine
+
+        with DbEngineRegistry.lock:
+            db_engine = DbEngineRegistry.postgresdb_engines.get(connection_string)
+            if db_engine is None:
+                db_engine = create_engine(connection_string, **PostgresdbConnectionConfig.get_db_engine_options())
+                DbEngineRegistry.postgresdb_engines[connection_string] = db_engine
+        return db_engine
+
+    @staticmethod
+    def get_async_postgresdb_engine(connection_string: str) -> AsyncEngine:
+        """ Returns shared async engine of given connection string, creates it on the first call """
+        db_engine = DbEngineRegistry.async_postgresdb_engines.get(connection_string)
+        if db_engine is not None:
+            return db_engine
+
+        with DbEngineRegistry.lock:
+            db_engine = DbEngineRegistry.async_postgresdb_engines.get(connection_string)
+            if db_engine is None:
+                db_engine = create_async_engine(connection_string,
+                                                **PostgresdbConnectionConfig.get_db_engine_options())
+                DbEngineRegistry.async_postgresdb_engines[connection_string] = db_engine
+        return db_engine
+
+    @staticmethod
+    def dispose_all() -> None:
+        """ Closes connection pools of all registered sync engines and clears the registry """
+        with DbEngineRegistry.lock:
+            for db_engine in DbEngineRegistry.postgresdb_engines.values():
+                db_engine.dispose()
+            DbEngineRegistry.postgresdb_engines.clear()
+
+    @staticmethod
+    async def dispose_all_async() -> None:
+        """ Closes connection pools of all registered sync and async engines and clears the registry """
+        with DbEngineRegistry.lock:
+            async_db_engines = list(DbEngineRegistry.async_postgresdb_engines.values())
+            DbEngineRegistry.async_postgresdb_engines.clear()
+        for db_engine in async_db_engines:
+            await db_engine.dispose()
+        DbEngineRegistry.dispose_all()
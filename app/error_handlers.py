@@ -3,10 +3,11 @@ from fastapi import Request, Response, HTTPException, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError, StarletteHTTPException
 from fastapi.exception_handlers import http_exception_handler, request_validation_exception_handler
-from typing import Optional
+from typing import Optional, List, Tuple, Any
 
-from app import utils
-from app.models import EAuthenticationStatus, ResponseMessage, E401Unauthorized, E400BadRequest
+from app import utils, errors
+from app.models import (EAuthenticationStatus, EBatchOperation, BatchItemResult, BatchResult, ResponseMessage,
+                        E401Unauthorized, E400BadRequest)
 
 
 def raise_400(e: Exception):
@@ -116,6 +117,34 @@ def raise_400(e: Exception):
                                                    code=status.HTTP_400_BAD_REQUEST).dict(),
                             headers={"description": "Existing dependent entity."})
 
+    elif e_400_code == E400BadRequest.INVALID_CURSOR:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=ResponseMessage(title="Invalid pagination cursor.",
+                                                   description=e_message,
+                                                   code=status.HTTP_400_BAD_REQUEST).dict(),
+                            headers={"description": "Invalid pagination cursor."})
+
+    elif e_400_code == E400BadRequest.LIMIT_EXCEEDED:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=ResponseMessage(title="Limit exceeded.",
+                                                   description=e_message,
+                                                   code=status.HTTP_400_BAD_REQUEST).dict(),
+                            headers={"description": "Limit exceeded."})
+
+    elif e_400_code == E400BadRequest.INVALID_FIELDS_STRING:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=ResponseMessage(title="Invalid fields string.",
+                                                   description=e_message,
+                                                   code=status.HTTP_400_BAD_REQUEST).dict(),
+                            headers={"description": "Invalid fields string."})
+
+    elif e_400_code == E400BadRequest.INVALID_IMPORT_ROW:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=ResponseMessage(title="Invalid import file.",
+                                                   description=e_message,
+                                                   code=status.HTTP_400_BAD_REQUEST).dict(),
+                            headers={"description": "Invalid import file."})
+
     else:
         raise_500(e)
 
@@ -166,6 +195,56 @@ def raise_500(e: Exception):
                         headers={"description": "Internal error occurred."})
 
 
+def raise_503(e: Exception, retry_after: int = 1):
+    """ Raises 503 when the server is temporarily overloaded and the request should be retried later """
+    raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail=ResponseMessage(title="Service temporarily overloaded.",
+                                               description=str(e),
+                                               code=status.HTTP_503_SERVICE_UNAVAILABLE).dict(),
+                        headers={"description": "Service temporarily overloaded.",
+                                 "Retry-After": str(retry_after)})
+
+
+def get_error_message(e: Exception, entity: str, entity_id: object) -> ResponseMessage:
+    """ Returns response message of the error raised for given exception by an endpoint of single entity """
+    try:
+        if isinstance(e, errors.NotFoundError):
+            raise_404(e, entity, entity_id)
+        elif isinstance(e, errors.PydanticValidationError):
+            raise_422(e)
+        elif isinstance(e, (errors.IntegrityError, errors.ExistingDependentEntityError,
+                            errors.EmptyFieldsError, errors.InvalidSQLValueError)):
+            raise_400(e)
+        else:
+            raise_500(e)
+    except HTTPException as http_exception:
+        return ResponseMessage(**http_exception.detail)
+
+
+def get_batch_result(entity: str, operations: List[Tuple[EBatchOperation, object]], results: List[Any]
+                     ) -> BatchResult:
+    """
+    Returns result of batch operations of given (operation, entity id) pairs and their results,
+    each item gets status code and message of the matching endpoint of single entity
+    """
+    items = list([])
+    for index, ((operation, entity_id), result) in enumerate(zip(operations, results)):
+        if isinstance(result, Exception):
+            message = get_error_message(result, entity, entity_id)
+            items.append(BatchItemResult(index=index, code=message.code, message=message))
+        elif operation == EBatchOperation.DELETE:
+            message = ResponseMessage(title=f"{entity} deleted.",
+                                      description=f"{entity} of given id '{entity_id}' deleted.",
+                                      code=status.HTTP_200_OK)
+            items.append(BatchItemResult(index=index, code=message.code, message=message))
+        else:
+            code = status.HTTP_201_CREATED if operation == EBatchOperation.CREATE else status.HTTP_200_OK
+            items.append(BatchItemResult(index=index, code=code, item=result))
+    failed_count = len(list(filter(lambda i: i.code >= status.HTTP_400_BAD_REQUEST, items)))
+    return BatchResult(entity=entity, succeeded_count=len(items) - failed_count, failed_count=failed_count,
+                       items=items)
+
+
 async def custom_http_error_handler(request: Request, exc: StarletteHTTPException) -> Response:
     """ Handles each HTTP exception """
     if "//" in utils.get_endpoint_url_param_string(request.url.path) and exc.detail == "Not Found":
@@ -207,6 +286,8 @@ async def custom_http_error_handler(request: Request, exc: StarletteHTTPExceptio
         print("The requested object was not found.")
     elif exc.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY:
         print("The validation of an object failed.")
+    elif exc.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+        print("The server is temporarily overloaded.")
     else:
         print(traceback.format_exc())
     return await http_exception_handler(request, exc)
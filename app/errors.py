@@ -66,3 +66,23 @@ class FilterNotFoundError(Exception):
 class ColumnNotFoundError(Exception):
     """ Raised when a column of certain view does not exist """
     pass
+
+
+class InvalidCursorError(Exception):
+    """ Raised when the pagination cursor is malformed or does not match the ordering """
+    pass
+
+
+class ServiceOverloadedError(Exception):
+    """ Raised when too many jobs of a bounded executor are already in flight """
+    pass
+
+
+class IndexNotBuiltError(Exception):
+    """ Raised when an in-memory index is queried before it is built """
+    pass
+
+
+class InvalidImportFileError(Exception):
+    """ Raised when an imported file cannot be read at all, e.g. its CSV header is invalid """
+    pass
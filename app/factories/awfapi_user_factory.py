@@ -1,8 +1,9 @@
 import pymongo
+from motor.motor_asyncio import AsyncIOMotorClient
 from typing import Tuple
 from pydantic import BaseModel
 
-from app.providers import AWFAPIUserProvider
+from app.providers import AWFAPIUserProvider, AsyncAWFAPIUserProvider
 from app.services import AWFAPIUserService
 
 
@@ -17,6 +18,15 @@ class AWFAPIUserFactory(BaseModel):
             db_engine=db_engine
         )
 
+    @staticmethod
+    def get_async_provider(connection_string: str, collection_name: str,
+                           db_engine: AsyncIOMotorClient) -> AsyncAWFAPIUserProvider:
+        return AsyncAWFAPIUserProvider(
+            connection_string=connection_string,
+            collection_name=collection_name,
+            db_engine=db_engine
+        )
+
     @staticmethod
     def get_service(provider: AWFAPIUserProvider) -> AWFAPIUserService:
         return AWFAPIUserService(awfapi_user_provider=provider)
@@ -1,7 +1,8 @@
 from pydantic import BaseModel
+from typing import Optional
 
 from app.config import JWTAuthenticationConfig
-from app.providers import AWFAPIUserProvider
+from app.providers import AWFAPIUserProvider, AsyncAWFAPIUserProvider
 from app.services import AWFAPIUserService, JWTAuthenticationService
 
 
@@ -9,9 +10,11 @@ class JWTAuthenticationFactory(BaseModel):
 
     @staticmethod
     def get_service(awfapi_user_provider: AWFAPIUserProvider,
-                    awfapi_user_service: AWFAPIUserService) -> JWTAuthenticationService:
+                    awfapi_user_service: AWFAPIUserService,
+                    async_awfapi_user_provider: Optional[AsyncAWFAPIUserProvider] = None) -> JWTAuthenticationService:
         return JWTAuthenticationService(
             jwt_auth_config=JWTAuthenticationConfig.from_json(),
             awfapi_user_provider=awfapi_user_provider,
-            awfapi_user_service=awfapi_user_service
+            awfapi_user_service=awfapi_user_service,
+            async_awfapi_user_provider=async_awfapi_user_provider
         )
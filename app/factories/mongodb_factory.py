@@ -1,4 +1,5 @@
 import pymongo
+from motor.motor_asyncio import AsyncIOMotorClient
 from typing import Tuple
 from pydantic import BaseModel
 
@@ -14,3 +15,11 @@ class MongoDBFactory(BaseModel):
         db_engine = pymongo.MongoClient(connection_string)
 
         return connection_string, collection_name, db_engine
+
+    @staticmethod
+    def get_async_db_connection_details(test_suffix: str = "") -> Tuple[str, str, AsyncIOMotorClient]:
+        connection_string = MongodbConnectionConfig.get_db_connection_string()
+        collection_name = MongodbConnectionConfig.get_collection_name(test_suffix)
+        db_engine = AsyncIOMotorClient(connection_string)
+
+        return connection_string, collection_name, db_engine
@@ -1,9 +1,10 @@
 import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncEngine
 from typing import Tuple
 from pydantic import BaseModel
 
-from app.providers import BusinessEntityProvider, PersonProvider
-from app.services import PersonService
+from app.providers import BusinessEntityProvider, PersonProvider, AsyncBusinessEntityProvider, AsyncPersonProvider
+from app.services import PersonService, AsyncPersonService
 
 
 class PersonFactory(BaseModel):
@@ -29,3 +30,25 @@ class PersonFactory(BaseModel):
         provider = PersonFactory.get_provider(connection_string, db_engine)
         service = PersonFactory.get_service(provider)
         return provider, service
+
+    @staticmethod
+    def get_async_provider(connection_string: str, db_engine: AsyncEngine) -> AsyncPersonProvider:
+        return AsyncPersonProvider(
+            connection_string=connection_string,
+            business_entity_provider=AsyncBusinessEntityProvider(
+                connection_string=connection_string,
+                db_engine=db_engine
+            ),
+            db_engine=db_engine
+        )
+
+    @staticmethod
+    def get_async_service(provider: AsyncPersonProvider) -> AsyncPersonService:
+        return AsyncPersonService(person_provider=provider)
+
+    @staticmethod
+    def get_async_provider_and_service(connection_string: str, db_engine: AsyncEngine
+                                       ) -> Tuple[AsyncPersonProvider, AsyncPersonService]:
+        provider = PersonFactory.get_async_provider(connection_string, db_engine)
+        service = PersonFactory.get_async_service(provider)
+        return provider, service
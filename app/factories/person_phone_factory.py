@@ -1,9 +1,10 @@
 import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncEngine
 from typing import Tuple
 from pydantic import BaseModel
 
-from app.providers import PersonPhoneProvider
-from app.services import PersonPhoneService
+from app.providers import PersonPhoneProvider, AsyncPersonPhoneProvider
+from app.services import PersonPhoneService, AsyncPersonPhoneService
 
 
 class PersonPhoneFactory(BaseModel):
@@ -25,3 +26,21 @@ class PersonPhoneFactory(BaseModel):
         provider = PersonPhoneFactory.get_provider(connection_string, db_engine)
         service = PersonPhoneFactory.get_service(provider)
         return provider, service
+
+    @staticmethod
+    def get_async_provider(connection_string: str, db_engine: AsyncEngine) -> AsyncPersonPhoneProvider:
+        return AsyncPersonPhoneProvider(
+            connection_string=connection_string,
+            db_engine=db_engine
+        )
+
+    @staticmethod
+    def get_async_service(provider: AsyncPersonPhoneProvider) -> AsyncPersonPhoneService:
+        return AsyncPersonPhoneService(person_phone_provider=provider)
+
+    @staticmethod
+    def get_async_provider_and_service(connection_string: str, db_engine: AsyncEngine
+                                       ) -> Tuple[AsyncPersonPhoneProvider, AsyncPersonPhoneService]:
+        provider = PersonPhoneFactory.get_async_provider(connection_string, db_engine)
+        service = PersonPhoneFactory.get_async_service(provider)
+        return provider, service
@@ -1,7 +1,8 @@
 import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncEngine
 from pydantic import BaseModel
 
-from app.providers import PhoneNumberTypeProvider
+from app.providers import PhoneNumberTypeProvider, AsyncPhoneNumberTypeProvider
 
 
 class PhoneNumberTypeFactory(BaseModel):
@@ -12,3 +13,10 @@ class PhoneNumberTypeFactory(BaseModel):
             connection_string=connection_string,
             db_engine=db_engine
         )
+
+    @staticmethod
+    def get_async_provider(connection_string: str, db_engine: AsyncEngine) -> AsyncPhoneNumberTypeProvider:
+        return AsyncPhoneNumberTypeProvider(
+            connection_string=connection_string,
+            db_engine=db_engine
+        )
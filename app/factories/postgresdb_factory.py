@@ -1,9 +1,10 @@
 import sqlalchemy
-from sqlmodel import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine
 from typing import Tuple
 from pydantic import BaseModel
 
 from app.config import PostgresdbConnectionConfig
+from app.db_engine_registry import DbEngineRegistry
 
 
 class PostgresDBFactory(BaseModel):
@@ -11,6 +12,13 @@ class PostgresDBFactory(BaseModel):
     @staticmethod
     def get_db_connection_details(test_suffix: str = "") -> Tuple[str, sqlalchemy.engine.Engine]:
         connection_string = PostgresdbConnectionConfig.get_db_connection_string(test_suffix)
-        db_engine = create_engine(connection_string)
+        db_engine = DbEngineRegistry.get_postgresdb_engine(connection_string)
+
+        return connection_string, db_engine
+
+    @staticmethod
+    def get_async_db_connection_details(test_suffix: str = "") -> Tuple[str, AsyncEngine]:
+        connection_string = PostgresdbConnectionConfig.get_async_db_connection_string(test_suffix)
+        db_engine = DbEngineRegistry.get_async_postgresdb_engine(connection_string)
 
         return connection_string, db_engine
@@ -0,0 +1,119 @@
+import base64
+import binascii
+import json
+import pydantic
+import sqlalchemy
+from pydantic import BaseModel
+from pydantic.json import pydantic_encoder
+from sqlalchemy.sql import ColumnElement
+from sqlmodel.sql.expression import SelectOfScalar
+from typing import Any, List, Optional, Sequence
+
+from app import errors
+from app.models import EOrderType, E400BadRequest
+
+
+class KeysetPagination(BaseModel):
+    """
+    Keyset (cursor) pagination over a list of ordered model columns.
+
+    Rows are ordered by the given columns followed by primary key columns, which makes the order total.
+    The cursor is an opaque token encoding the sort key of the last row of a page. The next page is selected
+    by a predicate on the sort key instead of OFFSET, so every page costs the same as the first one.
+    NULL values are compared as PostgreSQL orders them by default: last in ascending, first in descending order.
+    String columns are compared with given collation (ex. 'C', by code points), with the column one if None.
+    """
+    columns: List[Any]
+    order: EOrderType
+    fingerprint: str
+    collation: Optional[str] = None
+
+    @staticmethod
+    def from_columns(ordered_columns: List[Any], primary_key_columns: List[Any],
+                     order: EOrderType, fingerprint: str, collation: Optional[str] = None) -> 'KeysetPagination':
+        """ Returns pagination over given columns, completed with the missing primary key columns """
+        column_keys = list(map(lambda c: (c.class_, c.key), ordered_columns))
+        missing_primary_key_columns = list(filter(lambda c: (c.class_, c.key) not in column_keys,
+                                                  primary_key_columns))
+        return KeysetPagination(columns=ordered_columns + missing_primary_key_columns,
+                                order=order, fingerprint=fingerprint, collation=collation)
+
+    def paginate(self, statement: SelectOfScalar, cursor: Optional[str] = None) -> SelectOfScalar:
+        """ Returns statement ordered by the sort key and, if cursor is given, selecting rows after it """
+        if cursor is not None:
+            statement = statement.where(self.__get_after_clause(self.decode_cursor(cursor)))
+        sort_columns = list(map(lambda c: KeysetPagination.get_collated_column(c, self.collation), self.columns))
+        order_statement = list(map(lambda c: c.asc() if self.order == EOrderType.ASC else c.desc(), sort_columns))
+        return statement.order_by(*order_statement)
+
+    def get_next_cursor(self, rows: Sequence[Any], limit: Optional[int]) -> Optional[str]:
+        """ Returns cursor of the page following given rows, None if there are no more rows """
+        if limit is None or len(rows) == 0 or len(rows) < limit:
+            return None
+        return self.encode_cursor(rows[-1])
+
+    def encode_cursor(self, row: Any) -> str:
+        """ Returns cursor encoding sort key of given row (a model or a tuple of models) """
+        row_models = row if isinstance(row, tuple) else tuple([row])
+        key = list(map(lambda c: getattr(next(filter(lambda m: isinstance(m, c.class_), row_models)), c.key),
+                       self.columns))
+        return self.encode_key(key)
+
+    def encode_key(self, key: List[Any]) -> str:
+        """ Returns cursor encoding given sort key (values of the pagination columns) """
+        cursor_json = json.dumps({"f": self.fingerprint, "k": key}, default=pydantic_encoder)
+        return base64.urlsafe_b64encode(cursor_json.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> List[Any]:
+        """ Returns sort key encoded in given cursor, raises error if the cursor does not fit the pagination """
+        try:
+            cursor_json = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+            cursor_dict = json.loads(cursor_json)
+            if cursor_dict["f"] != self.fingerprint or len(cursor_dict["k"]) != len(self.columns):
+                raise ValueError("Cursor does not match the ordering.")
+            return list(map(lambda ck: None if ck[1] is None else
+                            pydantic.parse_obj_as(ck[0].property.columns[0].type.python_type, ck[1]),
+                            zip(self.columns, cursor_dict["k"])))
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError, pydantic.ValidationError):
+            raise errors.InvalidCursorError(f"{E400BadRequest.INVALID_CURSOR}: "
+                                            f"Cursor '{cursor}' is invalid or was issued for another ordering.")
+
+    @staticmethod
+    def get_collated_column(column: Any, collation: Optional[str] = None) -> Any:
+        """ Returns given column compared with given collation if it is a string column, the column itself otherwise """
+        if collation is None or not isinstance(column.property.columns[0].type, sqlalchemy.String):
+            return column
+        return column.collate(collation)
+
+    def __get_after_clause(self, key: List[Any]) -> ColumnElement:
+        """
+        Returns clause selecting rows placed after given sort key.
+        Non-nullable sort keys are compared as row values, which lets PostgreSQL seek in a matching index.
+        """
+        if not any(map(lambda c: c.property.columns[0].nullable, self.columns)):
+            sort_columns = list(map(lambda c: KeysetPagination.get_collated_column(c, self.collation), self.columns))
+            columns = sort_columns[0] if len(sort_columns) == 1 else sqlalchemy.tuple_(*sort_columns)
+            values = key[0] if len(key) == 1 else sqlalchemy.tuple_(*key)
+            return columns > values if self.order == EOrderType.ASC else columns < values
+
+        clauses = list([])
+        for i, (column, value) in enumerate(zip(self.columns, key)):
+            equal_clauses = list(map(lambda ck: ck[0].is_(None) if ck[1] is None else ck[0] == ck[1],
+                                     zip(self.columns[:i], key[:i])))
+            after_clause = self.__get_column_after_clause(column, value)
+            if after_clause is not None:
+                clauses.append(sqlalchemy.and_(*equal_clauses, after_clause))
+        return sqlalchemy.or_(*clauses)
+
+    def __get_column_after_clause(self, column: Any, value: Any) -> Optional[ColumnElement]:
+        """ Returns clause selecting column values placed after given value, None if there are none """
+        is_nullable = column.property.columns[0].nullable
+        sort_column = KeysetPagination.get_collated_column(column, self.collation)
+        if self.order == EOrderType.ASC:
+            if value is None:
+                return None
+            return sqlalchemy.or_(sort_column > value, column.is_(None)) if is_nullable else sort_column > value
+        else:
+            if value is None:
+                return column.is_not(None)
+            return sort_column < value
@@ -0,0 +1 @@
+from app.migrations.person_search_migration import PersonSearchMigration
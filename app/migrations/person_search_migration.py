@@ -0,0 +1,54 @@
+import sqlalchemy
+from typing import Any, ClassVar, List
+
+from app.models import Person
+
+
+class PersonSearchMigration:
+    """
+    Migration provisioning the person phrase search.
+
+    Creates 'pg_trgm' extension and trigram GIN indexes on the person name columns searched by phrase filters.
+    The indexes serve ILIKE '%phrase%' predicates directly, so phrase searches no longer scan the whole table.
+    Indexes are built concurrently (outside of a transaction), so the table stays writable during the upgrade.
+    """
+    searched_columns: ClassVar[List[Any]] = list([Person.first_name, Person.middle_name, Person.last_name,
+                                                  Person.suffix, Person.title])
+
+    @staticmethod
+    def get_index_name(column: Any) -> str:
+        """ Returns name of trigram index of given person column """
+        return f"IX_{Person.__tablename__}_{column.property.columns[0].name}_trgm"
+
+    @staticmethod
+    def get_upgrade_statements() -> List[str]:
+        """ Returns DDL statements creating the extension and the indexes, skipping already existing ones """
+        schema_name = Person.__table_args__['schema']
+        return ["CREATE EXTENSION IF NOT EXISTS pg_trgm"] + list(map(
+            lambda c: f"CREATE INDEX CONCURRENTLY IF NOT EXISTS \"{PersonSearchMigration.get_index_name(c)}\" "
+                      f"ON \"{schema_name}\".\"{Person.__tablename__}\" "
+                      f"USING gin (\"{c.property.columns[0].name}\" gin_trgm_ops)",
+            PersonSearchMigration.searched_columns))
+
+    @staticmethod
+    def get_downgrade_statements() -> List[str]:
+        """ Returns DDL statements dropping the indexes, the extension is kept as other objects may use it """
+        schema_name = Person.__table_args__['schema']
+        return list(map(
+            lambda c: f"DROP INDEX CONCURRENTLY IF EXISTS \"{schema_name}\".\"{PersonSearchMigration.get_index_name(c)}\"",
+            PersonSearchMigration.searched_columns))
+
+    @staticmethod
+    def upgrade(db_engine: sqlalchemy.engine.Engine) -> None:
+        PersonSearchMigration.__execute(db_engine, PersonSearchMigration.get_upgrade_statements())
+
+    @staticmethod
+    def downgrade(db_engine: sqlalchemy.engine.Engine) -> None:
+        PersonSearchMigration.__execute(db_engine, PersonSearchMigration.get_downgrade_statements())
+
+    @staticmethod
+    def __execute(db_engine: sqlalchemy.engine.Engine, statements: List[str]) -> None:
+        """ Executes given DDL statements in autocommit mode, required by concurrent index operations """
+        with db_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as db_connection:
+            for statement in statements:
+                db_connection.execute(sqlalchemy.text(statement))
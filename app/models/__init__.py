@@ -2,17 +2,23 @@ from app.models.e_authentication_status import EAuthenticationStatus
 from app.models.e_password_verification_status import EPasswordVerificationStatus
 from app.models.e_constraint_violation import EConstraintViolation
 from app.models.e_order_type import EOrderType
+from app.models.e_export_format import EExportFormat
+from app.models.e_batch_operation import EBatchOperation
 from app.models.e_400_bad_request import E400BadRequest
 from app.models.e_401_unauthorized import E401Unauthorized
 from app.models.e_404_not_found import E404NotFound
 from app.models.e_422_unprocessable_entity import E422UnprocessableEntity
+from app.models.e_503_service_unavailable import E503ServiceUnavailable
 
-from app.models.jwt_authentication import Token, TokenData
+from app.models.jwt_authentication import Token, TokenData, AWFAPIPrincipal
 from app.models.awfapi_user import AWFAPIUserInput, AWFAPIUser, \
     AWFAPIViewedUser, AWFAPIRegisteredUser, AWFAPIChangedUserData, AWFAPIChangedUserCredentials
 
-from app.models.message import CountMessage, ResponseMessage, PrimaryKeyErrorDetails, ForeignKeyErrorDetails
-from app.models.response_models import get_response_models
+from app.models.message import CountMessage, ListCountMessage, ResponseMessage, PrimaryKeyErrorDetails, ForeignKeyErrorDetails
+from app.models.response_models import get_response_models, get_import_request_body
+from app.models.cache_stats import CacheStats
+from app.models.import_report import ImportRowError, ImportReport
+from app.models.batch_result import BatchItemResult, BatchResult
 
 from app.models.e_person_type import EPersonType
 from app.models.e_yes_no import EYesNo
@@ -20,7 +26,7 @@ from app.models.e_yes_no import EYesNo
 from app.models.table_metadata import TableMetadata
 
 from app.models.business_entity import BusinessEntity
-from app.models.person import Person, PersonInput
+from app.models.person import Person, PersonInput, PersonOperation, PersonName
 
-from app.models.phone_number_type import PhoneNumberType, PhoneNumberTypeInput
-from app.models.person_phone import PersonPhone, PersonPhoneInput
+from app.models.phone_number_type import PhoneNumberType, PhoneNumberTypeInput, PhoneNumberTypeOperation
+from app.models.person_phone import PersonPhone, PersonPhoneInput, PersonPhoneOperation, PersonWithPhones
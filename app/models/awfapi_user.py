@@ -82,6 +82,10 @@ class AWFAPIUser(AWFAPIUserInput):
 
         return self
 
+    def get_version(self) -> int:
+        """ Returns the user version stamp, milliseconds of modification date (as precise as MongoDB stores it) """
+        return (self.date_modified - dt.datetime(1970, 1, 1)) // dt.timedelta(milliseconds=1)
+
 
 class AWFAPIViewedUser(BaseModel):
     username: str
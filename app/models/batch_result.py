@@ -0,0 +1,66 @@
+from pydantic.generics import GenericModel
+from typing import Generic, List, Optional, TypeVar
+
+from app.models import ResponseMessage
+
+
+T = TypeVar("T")
+
+
+class BatchItemResult(GenericModel, Generic[T]):
+    index: int
+    code: int
+    item: Optional[T] = None
+    message: Optional[ResponseMessage] = None
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "index": 1,
+                "code": 404,
+                "item": None,
+                "message": {
+                    "title": "Entity 'Person' of id '101' not found.",
+                    "description": "E404_003: Person of id '101' does not exist.",
+                    "code": 404
+                }
+            }
+        }
+
+
+class BatchResult(GenericModel, Generic[T]):
+    entity: str
+    succeeded_count: int
+    failed_count: int
+    items: List[BatchItemResult[T]]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "entity": "Person",
+                "succeeded_count": 1,
+                "failed_count": 1,
+                "items": [
+                    {
+                        "index": 0,
+                        "code": 200,
+                        "item": None,
+                        "message": {
+                            "title": "Person deleted.",
+                            "description": "Person of given id '100' deleted.",
+                            "code": 200
+                        }
+                    },
+                    {
+                        "index": 1,
+                        "code": 404,
+                        "item": None,
+                        "message": {
+                            "title": "Entity 'Person' of id '101' not found.",
+                            "description": "E404_003: Person of id '101' does not exist.",
+                            "code": 404
+                        }
+                    }
+                ]
+            }
+        }
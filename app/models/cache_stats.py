@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    name: str
+    size: int
+    max_size: int
+    ttl: float
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    hit_ratio: float
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "name": "awfapi_user",
+                "size": 12,
+                "max_size": 1024,
+                "ttl": 60.0,
+                "hits": 9876,
+                "misses": 24,
+                "evictions": 0,
+                "expirations": 12,
+                "invalidations": 3,
+                "hit_ratio": 0.9976
+            }
+        }
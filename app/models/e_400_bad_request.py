@@ -15,3 +15,7 @@ class E400BadRequest(str, Enum):
     ORDERING_NOT_SUPPORTED_FOR_COLUMN = "E400_010"
     EXISTING_DEPENDENT_ENTITY = "E400_011"
     EMPTY_STRING_IN_PARAMETER = "E400_012"
+    INVALID_CURSOR = "E400_013"
+    LIMIT_EXCEEDED = "E400_014"
+    INVALID_FIELDS_STRING = "E400_015"
+    INVALID_IMPORT_ROW = "E400_016"
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class E503ServiceUnavailable(str, Enum):
+    PASSWORD_HASHING_OVERLOADED = "E503_000"
+    PERSON_NAME_INDEX_NOT_BUILT = "E503_001"
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class EBatchOperation(Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class EExportFormat(Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
@@ -0,0 +1,41 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class ImportRowError(BaseModel):
+    row: int
+    detail: str
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "row": 12,
+                "detail": "E422_002: 1 validation error for PersonInput\nlast_name\n  field required"
+            }
+        }
+
+
+class ImportReport(BaseModel):
+    entity: str
+    imported_count: int = 0
+    failed_count: int = 0
+    errors: List[ImportRowError] = list([])
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "entity": "person",
+                "imported_count": 9998,
+                "failed_count": 2,
+                "errors": [
+                    {
+                        "row": 12,
+                        "detail": "E422_002: 1 validation error for PersonInput\nlast_name\n  field required"
+                    },
+                    {
+                        "row": 731,
+                        "detail": "E400_016: Row 731 is not a valid JSON object."
+                    }
+                ]
+            }
+        }
@@ -9,3 +9,9 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: Optional[str] = None
+
+
+class AWFAPIPrincipal(BaseModel):
+    username: str
+    is_readonly: bool
+    version: int
@@ -1,4 +1,9 @@
 from pydantic import BaseModel
+from pydantic.generics import GenericModel
+from typing import Generic, List, TypeVar
+
+
+T = TypeVar("T")
 
 
 class CountMessage(BaseModel):
@@ -14,6 +19,21 @@ class CountMessage(BaseModel):
         }
 
 
+class ListCountMessage(GenericModel, Generic[T]):
+    entity: str
+    count: int
+    items: List[T]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "entity": "Person",
+                "count": 10,
+                "items": []
+            }
+        }
+
+
 class ResponseMessage(BaseModel):
     title: str
     description: str
@@ -5,7 +5,7 @@ from sqlmodel import SQLModel, Field, Column, Integer, String, DateTime, Foreign
 from typing import Any, Optional
 
 from app.config import TableDetailsConfig
-from app.models import EPersonType, E422UnprocessableEntity, BusinessEntity
+from app.models import EPersonType, EBatchOperation, E422UnprocessableEntity, BusinessEntity
 from app import errors
 
 
@@ -56,6 +56,31 @@ class PersonInput(BaseModel):
         }
 
 
+class PersonOperation(BaseModel):
+    operation: EBatchOperation
+    person_id: Optional[int] = None
+    person_input: Optional[PersonInput] = None
+
+    class Config:
+        schema_extra = {
+            "example": [
+                {
+                    "operation": EBatchOperation.CREATE,
+                    "person_input": {"person_type": EPersonType.GC, "first_name": "John", "last_name": "Doe"}
+                },
+                {
+                    "operation": EBatchOperation.UPDATE,
+                    "person_id": 101,
+                    "person_input": {"person_type": EPersonType.GC, "first_name": "Jane", "last_name": "Doe"}
+                },
+                {
+                    "operation": EBatchOperation.DELETE,
+                    "person_id": 102
+                }
+            ]
+        }
+
+
 class Person(SQLModel, table=True):
     business_entity_id: int = Field(sa_column=Column(tdc.columns[0], Integer, ForeignKey(BusinessEntity.business_entity_id), primary_key=True, nullable=False))
     person_type: EPersonType = Field(sa_column=Column(tdc.columns[1], String, nullable=False))
@@ -117,3 +142,18 @@ class Person(SQLModel, table=True):
             setattr(self, name, value)
 
         return self
+
+
+class PersonName(BaseModel):
+    business_entity_id: int
+    first_name: str
+    last_name: str
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "business_entity_id": 101,
+                "first_name": "John",
+                "last_name": "Doe"
+            }
+        }
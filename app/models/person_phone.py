@@ -1,10 +1,10 @@
 import datetime as dt
 from pydantic import BaseModel, validate_model
 from sqlmodel import SQLModel, Field, Column, Integer, String, DateTime, ForeignKey
-from typing import Any
+from typing import Any, Optional, List, Tuple
 
 from app.config import TableDetailsConfig
-from app.models import E422UnprocessableEntity, BusinessEntity, PhoneNumberType
+from app.models import EBatchOperation, E422UnprocessableEntity, BusinessEntity, Person, PhoneNumberType
 from app import errors
 
 
@@ -41,10 +41,37 @@ class PersonPhoneInput(BaseModel):
         }
 
 
+class PersonPhoneOperation(BaseModel):
+    operation: EBatchOperation
+    person_phone_id: Optional[Tuple[int, str, int]] = None
+    person_phone_input: Optional[PersonPhoneInput] = None
+
+    class Config:
+        schema_extra = {
+            "example": [
+                {
+                    "operation": EBatchOperation.CREATE,
+                    "person_phone_input": {"business_entity_id": 101, "phone_number": "71 345 07 96",
+                                           "phone_number_type_id": 1}
+                },
+                {
+                    "operation": EBatchOperation.UPDATE,
+                    "person_phone_id": [101, "71 345 07 96", 1],
+                    "person_phone_input": {"business_entity_id": 101, "phone_number": "71 345 07 97",
+                                           "phone_number_type_id": 1}
+                },
+                {
+                    "operation": EBatchOperation.DELETE,
+                    "person_phone_id": [102, "1 (11) 500 555-0120", 2]
+                }
+            ]
+        }
+
+
 class PersonPhone(SQLModel, table=True):
     business_entity_id: int = Field(sa_column=Column(tdc.columns[0], Integer, ForeignKey(BusinessEntity.business_entity_id), primary_key=True, nullable=False))
     phone_number: str = Field(sa_column=Column(tdc.columns[1], String, primary_key=True, nullable=False))
-    phone_number_type_id: int = Field(sa_column=Column(tdc.columns[2], Integer, ForeignKey(PhoneNumberType.phone_number_type_id), primary_key=True, nullable=False))
+    phone_number_type_id: int = Field(sa_column=Column(tdc.columns[2], Integer, ForeignKey(PhoneNumberType.phone_number_type_id), primary_key=True, nullable=False, index=True))
     modified_date: dt.datetime = Field(sa_column=Column(tdc.columns[3], DateTime, default=dt.datetime.utcnow, nullable=False))
 
     __tablename__ = tdc.table
@@ -100,3 +127,27 @@ class PersonPhone(SQLModel, table=True):
             setattr(self, name, value)
 
         return self
+
+
+class PersonWithPhones(BaseModel):
+    person: Person
+    person_phones: List[Tuple[PersonPhone, PhoneNumberType]]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "person": {
+                    "business_entity_id": 101,
+                    "person_type": "EM",
+                    "first_name": "John",
+                    "last_name": "Doe"
+                },
+                "person_phones": [
+                    [
+                        {"business_entity_id": 101, "phone_number": "71 345 07 96", "phone_number_type_id": 1,
+                         "modified_date": "2014-01-14T00:00:00"},
+                        {"phone_number_type_id": 1, "name": "Cell", "modified_date": "2014-01-14T00:00:00"}
+                    ]
+                ]
+            }
+        }
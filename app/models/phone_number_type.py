@@ -1,10 +1,10 @@
 import datetime as dt
 from pydantic import BaseModel, validate_model
 from sqlmodel import SQLModel, Field, Column, Integer, String, DateTime
-from typing import Any
+from typing import Any, Optional
 
 from app.config import TableDetailsConfig
-from app.models import E422UnprocessableEntity
+from app.models import EBatchOperation, E422UnprocessableEntity
 from app import errors
 
 
@@ -35,6 +35,31 @@ class PhoneNumberTypeInput(BaseModel):
         }
 
 
+class PhoneNumberTypeOperation(BaseModel):
+    operation: EBatchOperation
+    phone_number_type_id: Optional[int] = None
+    phone_number_type_input: Optional[PhoneNumberTypeInput] = None
+
+    class Config:
+        schema_extra = {
+            "example": [
+                {
+                    "operation": EBatchOperation.CREATE,
+                    "phone_number_type_input": {"name": "Remote work"}
+                },
+                {
+                    "operation": EBatchOperation.UPDATE,
+                    "phone_number_type_id": 4,
+                    "phone_number_type_input": {"name": "Abroad work"}
+                },
+                {
+                    "operation": EBatchOperation.DELETE,
+                    "phone_number_type_id": 5
+                }
+            ]
+        }
+
+
 class PhoneNumberType(SQLModel, table=True):
     phone_number_type_id: int = Field(sa_column=Column(tdc.columns[0], Integer, primary_key=True, nullable=False))
     name: str = Field(sa_column=Column(tdc.columns[1], String, nullable=False))
@@ -11,9 +11,17 @@ def get_response_models(main_model: object, codes: List[int]) -> Dict[int, Dict[
         401: ResponseMessage,
         404: ResponseMessage,
         422: ResponseMessage,
-        500: ResponseMessage
+        500: ResponseMessage,
+        503: ResponseMessage
     })
 
     response_models = dict(list(map(lambda code: (code, {"model": response_mapping[code]}), codes)))
 
     return response_models
+
+
+def get_import_request_body() -> Dict[str, object]:
+    """ Returns OpenAPI description of import request body: raw NDJSON or CSV file streamed as the body """
+    file_schema = dict({"schema": {"type": "string", "format": "binary"}})
+    return dict({"requestBody": {"required": True,
+                                 "content": {"application/x-ndjson": file_schema, "text/csv": file_schema}}})
@@ -1,8 +1,9 @@
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
+from typing import Union
 
 from app import errors
-from app.models import AWFAPIUser, E400BadRequest
+from app.models import AWFAPIUser, AWFAPIPrincipal, E400BadRequest
 from app.services import JWTAuthenticationService
 from app.error_handlers import raise_400, raise_401, raise_500
 
@@ -11,9 +12,14 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 jwt_auth_service = JWTAuthenticationService()
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> AWFAPIUser:
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Union[AWFAPIUser, AWFAPIPrincipal]:
     try:
-        user = jwt_auth_service.get_user_from_token(token)
+        if jwt_auth_service.jwt_auth_config.is_stateless_claims:
+            principal = jwt_auth_service.get_principal_from_token(token)
+            if principal is not None:
+                return principal
+
+        user = await jwt_auth_service.get_user_from_token_async(token)
         return user
 
     except (errors.JWTTokenSignatureExpiredError, errors.InvalidCredentialsError) as e:
@@ -22,7 +28,8 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> AWFAPIUser:
         raise_500(e)
 
 
-async def get_current_nonreadonly_user(current_user: AWFAPIUser = Depends(get_current_user)) -> AWFAPIUser:
+async def get_current_nonreadonly_user(current_user: Union[AWFAPIUser, AWFAPIPrincipal] = Depends(get_current_user)
+                                       ) -> Union[AWFAPIUser, AWFAPIPrincipal]:
     error_message = (f"{E400BadRequest.READONLY_ACCESS_FOR_USER}: [{current_user.username}] "
                      f"Current user '{current_user.username}' has readonly restricted access.")
     if current_user.is_readonly:
@@ -0,0 +1,126 @@
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from passlib.context import CryptContext
+from typing import Any, Callable, ClassVar, Optional, Tuple, TypeVar
+
+from app import errors
+from app.config import PasswordHashingConfig
+from app.models import E503ServiceUnavailable
+
+
+T = TypeVar("T")
+
+
+@functools.lru_cache(maxsize=8)
+def get_pwd_context(pwd_context_string: str) -> CryptContext:
+    """ Returns password context of given serialized settings, built once per process """
+    return CryptContext.from_string(pwd_context_string)
+
+
+def hash_password_job(pwd_context_string: str, password: str) -> str:
+    return get_pwd_context(pwd_context_string).hash(password)
+
+
+def verify_password_job(pwd_context_string: str, plain_password: str, hashed_password: str) -> bool:
+    return get_pwd_context(pwd_context_string).verify(plain_password, hashed_password)
+
+
+class PasswordHashingExecutor:
+    """
+    Process-wide executor of password hashing and verification jobs.
+
+    Jobs run in a process pool (or a thread pool, or inline, as set in the 'password_hashing' section
+    of the config file), so the CPU-bound hashing occupies neither the event loop nor the GIL of the API process.
+    At most 'max_in_flight' jobs are submitted at once by blocking callers and at most 'max_in_flight' by
+    coroutines of each event loop. A job waiting longer than 'acquire_timeout' seconds for a free slot is rejected
+    with ServiceOverloadedError, so login bursts are shed instead of piling up. Coroutines wait for their slot
+    on the event loop, so the waiting occupies no threadpool thread needed by other requests.
+    """
+    executor: ClassVar[Optional[Executor]] = None
+    semaphore: ClassVar[Optional[threading.BoundedSemaphore]] = None
+    async_semaphores: ClassVar[weakref.WeakKeyDictionary] = weakref.WeakKeyDictionary()
+    lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @staticmethod
+    def get_executor() -> Optional[Executor]:
+        """ Returns shared executor, creates it on the first call, returns None if jobs run inline """
+        return PasswordHashingExecutor.__get_executor_and_semaphore()[0]
+
+    @staticmethod
+    def __get_executor_and_semaphore() -> Tuple[Optional[Executor], threading.BoundedSemaphore]:
+        """ Returns shared executor and in-flight semaphore of blocking callers, creates them on the first call """
+        with PasswordHashingExecutor.lock:
+            if PasswordHashingExecutor.semaphore is None:
+                phc = PasswordHashingConfig.from_json()
+                if phc.executor_type == "process":
+                    PasswordHashingExecutor.executor = ProcessPoolExecutor(max_workers=phc.max_workers)
+                elif phc.executor_type == "thread":
+                    PasswordHashingExecutor.executor = ThreadPoolExecutor(max_workers=phc.max_workers,
+                                                                          thread_name_prefix="password_hashing")
+                elif phc.executor_type != "inline":
+                    raise ValueError(f"Password hashing executor type '{phc.executor_type}' is not supported. "
+                                     f"Use one of: 'process', 'thread', 'inline'.")
+                PasswordHashingExecutor.semaphore = threading.BoundedSemaphore(phc.max_in_flight)
+            return PasswordHashingExecutor.executor, PasswordHashingExecutor.semaphore
+
+    @staticmethod
+    def __get_async_semaphore() -> asyncio.Semaphore:
+        """ Returns in-flight semaphore of coroutines of the running event loop, creates it on the first call """
+        loop = asyncio.get_running_loop()
+        with PasswordHashingExecutor.lock:
+            async_semaphore = PasswordHashingExecutor.async_semaphores.get(loop, None)
+            if async_semaphore is None:
+                async_semaphore = asyncio.BoundedSemaphore(PasswordHashingConfig.from_json().max_in_flight)
+                PasswordHashingExecutor.async_semaphores[loop] = async_semaphore
+        return async_semaphore
+
+    @staticmethod
+    def run(method: Callable[..., T], *args: Any) -> T:
+        """ Runs given job and waits for its result, blocks the calling thread """
+        executor, semaphore = PasswordHashingExecutor.__get_executor_and_semaphore()
+        if not semaphore.acquire(timeout=PasswordHashingConfig.from_json().acquire_timeout):
+            PasswordHashingExecutor.__raise_overloaded_error()
+        try:
+            if executor is None:
+                return method(*args)
+            return executor.submit(method, *args).result()
+        finally:
+            semaphore.release()
+
+    @staticmethod
+    async def run_async(method: Callable[..., T], *args: Any) -> T:
+        """ Runs given job and awaits its result, never blocks the event loop nor a threadpool thread """
+        async_semaphore = PasswordHashingExecutor.__get_async_semaphore()
+        try:
+            await asyncio.wait_for(async_semaphore.acquire(), PasswordHashingConfig.from_json().acquire_timeout)
+        except asyncio.TimeoutError:
+            PasswordHashingExecutor.__raise_overloaded_error()
+        try:
+            executor = PasswordHashingExecutor.get_executor()
+            if executor is None:
+                return method(*args)
+            return await asyncio.wrap_future(executor.submit(method, *args))
+        finally:
+            async_semaphore.release()
+
+    @staticmethod
+    def shutdown() -> None:
+        """
+        Shuts the executor down waiting for its submitted jobs, next job creates it again.
+        Jobs still in flight release the semaphores they acquired, not the new ones.
+        """
+        with PasswordHashingExecutor.lock:
+            if PasswordHashingExecutor.executor is not None:
+                PasswordHashingExecutor.executor.shutdown(wait=True)
+            PasswordHashingExecutor.executor = None
+            PasswordHashingExecutor.semaphore = None
+            PasswordHashingExecutor.async_semaphores = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def __raise_overloaded_error() -> None:
+        raise errors.ServiceOverloadedError(f"{E503ServiceUnavailable.PASSWORD_HASHING_OVERLOADED}: "
+                                            f"Too many password hashing jobs in flight. "
+                                            f"Retry in a moment.")
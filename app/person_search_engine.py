@@ -0,0 +1,147 @@
+import bisect
+import numpy as np
+from typing import Any, ClassVar, Dict, List, Optional, Sequence, Tuple
+
+from app import errors
+from app.keyset_pagination import KeysetPagination
+from app.models import EOrderType, E400BadRequest
+from app.providers.person_provider import PersonDbFilter, PersonDbOrder
+
+
+class PersonSearchEngine:
+    """
+    In-memory engine searching persons the way person phrase filters do, without querying the database.
+
+    Ids, types and name columns of a persons snapshot are stored as contiguous NumPy arrays (names casefolded,
+    with separate NULL masks), so a phrase filter is a few vectorized substring scans combined by boolean
+    operations. Ids of found persons are put in 'full_name' (or id) order by permutations computed once, when
+    the engine is built, the persons themselves are loaded by these ids from the database. Names are ordered
+    by code points, so the database path of phrase searches orders them with the 'C' collation (instead of
+    the database one) and both paths return persons in the same order. Page cursors are keyset pagination cursors
+    of that ordering, both paths accept each other's. Phrases are matched literally ('%' and '_' are not wildcards).
+    The engine does not see names changed after it was built.
+    """
+    collation: ClassVar[str] = "C"
+    search_columns: ClassVar[List[str]] = list(["business_entity_id", "person_type",
+                                                "title", "first_name", "middle_name", "last_name", "suffix"])
+    name_columns: ClassVar[List[str]] = list(["first_name", "middle_name", "last_name", "suffix", "title"])
+    first_name_phrase_columns: ClassVar[List[str]] = list(["first_name", "middle_name", "suffix", "title"])
+    full_name_columns: ClassVar[List[str]] = list(["last_name", "first_name", "middle_name", "suffix", "title"])
+
+    person_ids: np.ndarray
+    person_types: np.ndarray
+    values: Dict[str, np.ndarray]
+    columns: Dict[str, np.ndarray]
+    null_masks: Dict[str, np.ndarray]
+    full_name_order: np.ndarray
+    id_order: np.ndarray
+
+    def __init__(self, person_search_names: Sequence[Sequence[Any]]):
+        """ Builds the engine of given rows of person search columns (ordered as in 'search_columns') """
+        rows = list(map(lambda r: dict(zip(PersonSearchEngine.search_columns, r)), person_search_names))
+        self.person_ids = np.array(list(map(lambda r: r["business_entity_id"], rows)), dtype=np.int64)
+        self.person_types = np.array(list(map(lambda r: getattr(r["person_type"], "value", r["person_type"]),
+                                              rows)), dtype=str)
+        self.values = dict(map(lambda c: (c, np.array(list(map(lambda r: r[c] or "", rows)), dtype=str)),
+                               PersonSearchEngine.name_columns))
+        self.columns = dict(map(lambda c: (c, np.array(list(map(lambda r: (r[c] or "").casefold(), rows)), dtype=str)),
+                                PersonSearchEngine.name_columns))
+        self.null_masks = dict(map(lambda c: (c, np.array(list(map(lambda r: r[c] is None, rows)), dtype=bool)),
+                                   PersonSearchEngine.name_columns))
+        self.full_name_order = self.__get_full_name_order()
+        self.id_order = np.argsort(self.person_ids, kind="stable")
+
+    def get_person_ids(self, filters: str, is_ordered: Optional[bool] = True,
+                       is_alternative: Optional[bool] = False, limit: Optional[int] = None) -> List[int]:
+        """ Returns ids of persons matching given filter string, in 'full_name' order if 'is_ordered', else by id """
+        PersonSearchEngine.__check_limit(limit)
+        indices = self.__get_indices(filters, is_ordered, is_alternative)
+        return self.person_ids[indices[:limit]].tolist()
+
+    def get_person_ids_page(self, filters: str, is_ordered: Optional[bool] = True,
+                            is_alternative: Optional[bool] = False, limit: Optional[int] = None,
+                            cursor: Optional[str] = None) -> Tuple[List[int], Optional[str]]:
+        """ Returns ids of page of persons matching given filter string placed after given cursor and next page cursor """
+        PersonSearchEngine.__check_limit(limit)
+        keyset_pagination = PersonDbOrder.get_keyset_pagination("full_name" if is_ordered else None, EOrderType.ASC,
+                                                                PersonSearchEngine.collation)
+        indices = self.__get_indices(filters, is_ordered, is_alternative)
+        start = 0
+        if cursor is not None:
+            cursor_key = PersonSearchEngine.__get_sort_key(keyset_pagination.decode_cursor(cursor))
+            person_keys = list(map(lambda i: PersonSearchEngine.__get_sort_key(
+                self.__get_keyset_key(i, keyset_pagination)), indices))
+            start = bisect.bisect_right(person_keys, cursor_key)
+        indices = indices[start:] if limit is None else indices[start:start + limit]
+        if limit is None or len(indices) == 0 or len(indices) < limit:
+            return self.person_ids[indices].tolist(), None
+        return self.person_ids[indices].tolist(), \
+            keyset_pagination.encode_key(self.__get_keyset_key(indices[-1], keyset_pagination))
+
+    def get_mask(self, person_db_filter: PersonDbFilter, is_alternative: Optional[bool] = False) -> np.ndarray:
+        """ Returns boolean mask of persons matching given filter, with SQL filter semantics """
+        masks = list([])
+        if person_db_filter.person_type is not None:
+            masks.append(self.person_types == person_db_filter.person_type)
+        if person_db_filter.first_name_phrase is not None:
+            first_name_masks = list(map(lambda c: self.__contains(c, person_db_filter.first_name_phrase),
+                                        PersonSearchEngine.first_name_phrase_columns))
+            masks.extend(first_name_masks if is_alternative else [np.logical_or.reduce(first_name_masks)])
+        if person_db_filter.last_name_phrase is not None:
+            masks.append(self.__contains("last_name", person_db_filter.last_name_phrase))
+
+        if len(masks) == 0:
+            return np.full(len(self.person_ids), not is_alternative, dtype=bool)
+        return np.logical_or.reduce(masks) if is_alternative else np.logical_and.reduce(masks)
+
+    def get_size(self) -> int:
+        """ Returns number of persons of the engine """
+        return len(self.person_ids)
+
+    def get_nbytes(self) -> int:
+        """ Returns number of bytes taken by the engine arrays """
+        return int(self.person_ids.nbytes + self.person_types.nbytes +
+                   self.full_name_order.nbytes + self.id_order.nbytes +
+                   sum(map(lambda a: a.nbytes, self.values.values())) +
+                   sum(map(lambda a: a.nbytes, self.columns.values())) +
+                   sum(map(lambda a: a.nbytes, self.null_masks.values())))
+
+    @staticmethod
+    def __get_sort_key(values: Sequence[Any]) -> Tuple[Any, ...]:
+        """ Returns comparable sort key of given keyset values, NULLs placed last and the id compared as is """
+        return tuple(map(lambda v: (v is None, v or ""), values[:-1])) + tuple([values[-1]])
+
+    @staticmethod
+    def __check_limit(limit: Optional[int] = None) -> None:
+        if limit is not None and limit < 0:
+            raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                              f"Value '{limit}' is invalid for LIMIT clause.")
+
+    def __get_indices(self, filters: str, is_ordered: Optional[bool] = True,
+                      is_alternative: Optional[bool] = False) -> np.ndarray:
+        """ Returns ordered indices of persons matching given filter string """
+        person_db_filter = PersonDbFilter.from_filter_string(filters)
+        mask = self.get_mask(person_db_filter, is_alternative)
+        order = self.full_name_order if is_ordered else self.id_order
+        return order[mask[order]]
+
+    def __get_keyset_key(self, index: int, keyset_pagination: KeysetPagination) -> List[Any]:
+        """ Returns values of keyset pagination columns of the person of given index, None for NULL names """
+        return list(map(lambda c: int(self.person_ids[index]) if c.key == "business_entity_id" else
+                        None if self.null_masks[c.key][index] else str(self.values[c.key][index]),
+                        keyset_pagination.columns))
+
+    def __contains(self, column: str, phrase: str) -> np.ndarray:
+        """ Returns boolean mask of non-NULL column values containing given phrase, case-insensitive """
+        return (np.char.find(self.columns[column], phrase.casefold()) >= 0) & ~self.null_masks[column]
+
+    def __get_full_name_order(self) -> np.ndarray:
+        """
+        Returns permutation of persons in 'full_name' order (NULLs last in each column, then by person id).
+        The keys are original (not casefolded) values compared by code points, as the 'C' collation compares them.
+        """
+        keys = list([self.person_ids])
+        for column in reversed(PersonSearchEngine.full_name_columns):
+            keys.append(self.values[column])
+            keys.append(self.null_masks[column])
+        return np.lexsort(keys)
@@ -1,5 +1,6 @@
 from app.providers.i_awfapi_user_provider import IAWFAPIUserProvider
 from app.providers.awfapi_user_provider import AWFAPIUserProvider
+from app.providers.async_awfapi_user_provider import AsyncAWFAPIUserProvider
 from app.providers.table_metadata_provider import TableMetadataProvider
 
 from app.providers.i_business_entity_provider import IBusinessEntityProvider
@@ -11,3 +12,8 @@ from app.providers.i_phone_number_type_provider import IPhoneNumberTypeProvider
 from app.providers.phone_number_type_provider import PhoneNumberTypeProvider
 from app.providers.i_person_phone_provider import IPersonPhoneProvider
 from app.providers.person_phone_provider import PersonPhoneProvider
+
+from app.providers.async_business_entity_provider import AsyncBusinessEntityProvider
+from app.providers.async_person_provider import AsyncPersonProvider
+from app.providers.async_phone_number_type_provider import AsyncPhoneNumberTypeProvider
+from app.providers.async_person_phone_provider import AsyncPersonPhoneProvider
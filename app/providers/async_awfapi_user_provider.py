@@ -0,0 +1,92 @@
+import datetime as dt
+import pymongo.errors
+from motor.motor_asyncio import AsyncIOMotorClient
+from typing import Any, Dict, Optional, List
+
+from app import errors
+from app.caches import AWFAPIUserCache, TokenDenyList
+from app.config import MongodbConnectionConfig
+from app.models import AWFAPIUserInput, AWFAPIUser, E404NotFound
+from app.providers import IAWFAPIUserProvider, AWFAPIUserProvider
+
+
+class AsyncAWFAPIUserProvider(IAWFAPIUserProvider):
+    """ AWFAPI user provider running on Motor client, its methods are coroutines """
+    connection_string: str
+    collection_name: str
+    db_engine: AsyncIOMotorClient
+
+    def __init__(self, connection_string: Optional[str] = None, collection_name: Optional[str] = None,
+                 db_engine: Optional[AsyncIOMotorClient] = None):
+        super(AsyncAWFAPIUserProvider, self).__init__()
+        self.connection_string = connection_string or MongodbConnectionConfig.get_db_connection_string()
+        self.collection_name = collection_name or MongodbConnectionConfig.get_collection_name()
+        self.db_engine = db_engine or AsyncIOMotorClient(self.connection_string)
+
+    async def get_awfapi_users(self, limit: Optional[int] = None, offset: Optional[int] = None) -> List[AWFAPIUser]:
+        awfapi_user_definitions = self.db_engine.awfapi[self.collection_name].find()
+        if offset is not None:
+            awfapi_user_definitions = awfapi_user_definitions.skip(offset)
+        if limit is not None:
+            awfapi_user_definitions = awfapi_user_definitions.limit(limit)
+        return list(map(lambda au: AWFAPIUser(**au), await awfapi_user_definitions.to_list(length=None)))
+
+    async def get_awfapi_user(self, username: str) -> AWFAPIUser:
+        awfapi_user_definition = await self.db_engine.awfapi[self.collection_name].find_one({'username': {"$eq": username}})
+        if awfapi_user_definition is None:
+            raise errors.NotFoundError(f"{E404NotFound.AWFAPI_USER_NOT_FOUND}: "
+                                       f"AWFAPI user of username '{username}' does not exist.")
+        return AWFAPIUser(**awfapi_user_definition)
+
+    async def insert_awfapi_user(self, awfapi_user_input: AWFAPIUserInput) -> str:
+        await self.__guard_unique_username(awfapi_user_input.username)
+        await self.__guard_unique_email(awfapi_user_input.email)
+
+        awfapi_user = AWFAPIUser(date_created=dt.datetime.utcnow(), date_modified=dt.datetime.utcnow(),
+                                 **awfapi_user_input.dict())
+        awfapi_user.validate_assignment(awfapi_user_input)
+        try:
+            await self.db_engine.awfapi[self.collection_name].insert_one(awfapi_user.dict())
+        except pymongo.errors.DuplicateKeyError as e:
+            AWFAPIUserProvider.raise_duplicate_key_error(e, awfapi_user.username, awfapi_user.email)
+        AWFAPIUserCache.invalidate(awfapi_user.username)
+        TokenDenyList.revoke(awfapi_user.username, awfapi_user.get_version())
+        return awfapi_user.username
+
+    async def update_awfapi_user(self, username: str, awfapi_user_input: AWFAPIUserInput) -> str:
+        updated_awfapi_user = await self.get_awfapi_user(username)
+        await self.__guard_unique_username(awfapi_user_input.username, updated_awfapi_user.username)
+        await self.__guard_unique_email(awfapi_user_input.email, updated_awfapi_user.email)
+
+        updated_awfapi_user.update_from_input(awfapi_user_input)
+        updated_awfapi_user.date_modified = dt.datetime.utcnow()
+        try:
+            await self.db_engine.awfapi[self.collection_name].update_one({'username': {"$eq": username}},
+                                                                         {"$set": updated_awfapi_user.dict()})
+        except pymongo.errors.DuplicateKeyError as e:
+            AWFAPIUserProvider.raise_duplicate_key_error(e, updated_awfapi_user.username, updated_awfapi_user.email)
+        AWFAPIUserCache.invalidate(username, updated_awfapi_user.username)
+        TokenDenyList.revoke(username, updated_awfapi_user.get_version())
+        return updated_awfapi_user.username
+
+    async def delete_awfapi_user(self, username: str) -> None:
+        await self.get_awfapi_user(username)
+        await self.db_engine.awfapi[self.collection_name].delete_one({'username': {"$eq": username}})
+        AWFAPIUserCache.invalidate(username)
+        TokenDenyList.revoke(username)
+
+    async def ensure_indexes(self) -> None:
+        """ Creates unique indexes of usernames and emails unless they already exist """
+        await self.db_engine.awfapi[self.collection_name].create_indexes(AWFAPIUserProvider.get_unique_indexes())
+
+    async def __guard_unique_username(self, new_username: str, current_username: Optional[str] = None) -> None:
+        if new_username != current_username and await self.__exists({'username': {"$eq": new_username}}):
+            raise AWFAPIUserProvider.get_username_already_exists_error(new_username)
+
+    async def __guard_unique_email(self, new_email: str, current_email: Optional[str] = None) -> None:
+        if new_email != current_email and await self.__exists({'email': {"$eq": new_email}}):
+            raise AWFAPIUserProvider.get_email_already_exists_error(new_email)
+
+    async def __exists(self, query: Dict[str, Any]) -> bool:
+        """ Checks if any user matches given query, reads only the document id (from the index if it exists) """
+        return await self.db_engine.awfapi[self.collection_name].find_one(query, projection={'_id': 1}) is not None
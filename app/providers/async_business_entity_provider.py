@@ -0,0 +1,58 @@
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Optional, List
+
+from app import errors
+from app.config import PostgresdbConnectionConfig
+from app.db_engine_registry import DbEngineRegistry
+from app.models import BusinessEntity, E404NotFound
+from app.providers import IBusinessEntityProvider
+
+
+class AsyncBusinessEntityProvider(IBusinessEntityProvider):
+    """ Business entity provider running on the async engine, its methods are coroutines """
+    connection_string: str
+    db_engine: AsyncEngine
+
+    def __init__(self, connection_string: Optional[str] = None,
+                 db_engine: Optional[AsyncEngine] = None):
+        self.connection_string = connection_string or PostgresdbConnectionConfig.get_async_db_connection_string()
+        self.db_engine = db_engine or DbEngineRegistry.get_async_postgresdb_engine(self.connection_string)
+
+    async def get_business_entities(self, limit: Optional[int] = None,
+                                    offset: Optional[int] = None) -> List[BusinessEntity]:
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = select(BusinessEntity)
+            if offset is not None:
+                statement = statement.offset(offset)
+            if limit is not None:
+                statement = statement.limit(limit)
+            business_entities = (await db_session.execute(statement)).all()
+        business_entities = list(map(lambda p: p[0], business_entities))
+        return business_entities
+
+    async def get_business_entity(self, business_entity_id: int) -> BusinessEntity:
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = select(BusinessEntity).where(BusinessEntity.business_entity_id == business_entity_id)
+            business_entity = (await db_session.execute(statement)).first()
+        if business_entity is None:
+            raise errors.NotFoundError(f"{E404NotFound.BUSINESS_ENTITY_NOT_FOUND}: "
+                                       f"Business entity of id '{business_entity_id}' does not exist.")
+        return business_entity[0]
+
+    async def insert_business_entity(self) -> int:
+        business_entity = BusinessEntity()
+        async with AsyncSession(self.db_engine, expire_on_commit=False) as db_session:
+            db_session.add(business_entity)
+            await db_session.commit()
+            business_entity_id = business_entity.business_entity_id
+        return business_entity_id
+
+    # no update method for BusinessEntity, no mutable fields
+
+    async def delete_business_entity(self, business_entity_id: int) -> None:
+        deleted_business_entity = await self.get_business_entity(business_entity_id)
+        async with AsyncSession(self.db_engine) as db_session:
+            await db_session.delete(deleted_business_entity)
+            await db_session.commit()
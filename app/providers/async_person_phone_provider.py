@@ -0,0 +1,245 @@
+import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+from typing import Any, Optional, List, Tuple, Dict, Union, AsyncIterator
+
+from app import utils, errors
+from app.config import PostgresdbConnectionConfig, PhoneNumberTypeCacheConfig
+from app.copy_loader import CopyLoader
+from app.db_engine_registry import DbEngineRegistry
+from app.providers import IPersonPhoneProvider, PersonPhoneProvider, AsyncPhoneNumberTypeProvider
+from app.providers.person_phone_provider import PersonPhoneDbOrder
+from app.models import (EOrderType, Person, PhoneNumberType, PersonPhone, PersonPhoneInput, PersonPhoneOperation,
+                        E404NotFound)
+
+
+class AsyncPersonPhoneProvider(IPersonPhoneProvider):
+    """ Person phone provider running on the async engine, its methods are coroutines """
+    connection_string: str
+    db_engine: AsyncEngine
+    phone_number_type_provider: AsyncPhoneNumberTypeProvider
+
+    def __init__(self, connection_string: Optional[str] = None,
+                 db_engine: Optional[AsyncEngine] = None,
+                 phone_number_type_provider: Optional[AsyncPhoneNumberTypeProvider] = None):
+        self.connection_string = connection_string or PostgresdbConnectionConfig.get_async_db_connection_string()
+        self.db_engine = db_engine or DbEngineRegistry.get_async_postgresdb_engine(self.connection_string)
+        self.phone_number_type_provider = phone_number_type_provider or AsyncPhoneNumberTypeProvider(
+            self.connection_string, self.db_engine)
+
+    async def get_person_phones(self, filters: Optional[str] = None,
+                                order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                limit: Optional[int] = None, offset: Optional[int] = None,
+                                fields: Optional[str] = None) -> List[Tuple[PersonPhone, Person, PhoneNumberType]]:
+        is_cache_enabled = PhoneNumberTypeCacheConfig.from_json().is_enabled
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonPhoneProvider.get_person_phones_statement(filters, order_by, order_type, limit, offset,
+                                                                        fields, not is_cache_enabled)
+            person_phones = (await db_session.execute(statement)).all()
+        if is_cache_enabled:
+            return await self.attach_cached_phone_number_types(person_phones)
+        person_phones = list(map(lambda p: (p[0], p[1], p[2]), person_phones))
+        return person_phones
+
+    async def get_person_phones_page(self, filters: Optional[str] = None,
+                                     order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                     limit: Optional[int] = None, cursor: Optional[str] = None,
+                                     fields: Optional[str] = None
+                                     ) -> Tuple[List[Tuple[PersonPhone, Person, PhoneNumberType]], Optional[str]]:
+        keyset_pagination = PersonPhoneDbOrder.get_keyset_pagination(order_by, order_type)
+        is_cache_used = PhoneNumberTypeCacheConfig.from_json().is_enabled and \
+            not PersonPhoneDbOrder.is_phone_number_type_ordered(order_by)
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonPhoneProvider.get_person_phones_page_statement(keyset_pagination, filters, limit, cursor,
+                                                                             fields, not is_cache_used)
+            person_phones = (await db_session.execute(statement)).all()
+        if is_cache_used:
+            person_phones = await self.attach_cached_phone_number_types(person_phones)
+        else:
+            person_phones = list(map(lambda p: (p[0], p[1], p[2]), person_phones))
+        return person_phones, keyset_pagination.get_next_cursor(person_phones, limit)
+
+    async def get_person_phones_with_total(self, filters: Optional[str] = None,
+                                           order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                           limit: Optional[int] = None, offset: Optional[int] = None,
+                                           fields: Optional[str] = None
+                                           ) -> Tuple[List[Tuple[PersonPhone, Person, PhoneNumberType]], int]:
+        is_cache_enabled = PhoneNumberTypeCacheConfig.from_json().is_enabled
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonPhoneProvider.get_person_phones_with_total_statement(filters, order_by, order_type,
+                                                                                   limit, offset, fields,
+                                                                                   not is_cache_enabled)
+            person_phones = (await db_session.execute(statement)).all()
+            if len(person_phones) == 0 and offset:
+                statement = PersonPhoneProvider.count_person_phones_statement(filters)
+                person_phones_total = int((await db_session.exec(statement)).one())
+            else:
+                person_phones_total = person_phones[0][-1] if len(person_phones) > 0 else 0
+        if is_cache_enabled:
+            return await self.attach_cached_phone_number_types(person_phones), person_phones_total
+        person_phones = list(map(lambda p: (p[0], p[1], p[2]), person_phones))
+        return person_phones, person_phones_total
+
+    def stream_person_phones(self, filters: Optional[str] = None,
+                             order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                             batch_size: int = 1000, fields: Optional[str] = None
+                             ) -> AsyncIterator[List[Tuple[PersonPhone, Person, PhoneNumberType]]]:
+        """ Returns async iterator of person phone batches, the statement is built before iterating """
+        is_cache_enabled = PhoneNumberTypeCacheConfig.from_json().is_enabled
+        statement = PersonPhoneProvider.get_person_phones_statement(filters, order_by, order_type, None, None, fields,
+                                                                    not is_cache_enabled)
+        return self.__stream_person_phones(statement, batch_size, is_cache_enabled)
+
+    async def __stream_person_phones(self, statement: SelectOfScalar[Tuple[PersonPhone, Person, PhoneNumberType]],
+                                     batch_size: int, is_cache_enabled: bool = False
+                                     ) -> AsyncIterator[List[Tuple[PersonPhone, Person, PhoneNumberType]]]:
+        """ Yields batches of selected person phones fetched from a server-side cursor """
+        async with AsyncSession(self.db_engine) as db_session:
+            result = await db_session.stream(statement.execution_options(yield_per=batch_size))
+            async for person_phones in result.partitions():
+                if is_cache_enabled:
+                    yield await self.attach_cached_phone_number_types(person_phones)
+                else:
+                    yield list(map(lambda p: (p[0], p[1], p[2]), person_phones))
+
+    async def count_person_phones(self, filters: Optional[str] = None) -> int:
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonPhoneProvider.count_person_phones_statement(filters)
+            persons_count = int((await db_session.exec(statement)).one())
+        return persons_count
+
+    async def exists_person_phones(self, filters: Optional[str] = None) -> bool:
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonPhoneProvider.exists_person_phones_statement(filters)
+            is_existing = bool((await db_session.exec(statement)).one())
+        return is_existing
+
+    async def get_person_phone(self, person_phone_id: Tuple[int, str, int]
+                               ) -> Tuple[PersonPhone, Person, PhoneNumberType]:
+        is_cache_enabled = PhoneNumberTypeCacheConfig.from_json().is_enabled
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonPhoneProvider.get_person_phone_statement(person_phone_id, not is_cache_enabled)
+            person_phone = (await db_session.execute(statement)).first()
+        if person_phone is None:
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_PHONE_NOT_FOUND}: "
+                                       f"Person phone of id '{person_phone_id}' does not exist.")
+        if is_cache_enabled:
+            return (await self.attach_cached_phone_number_types(list([person_phone])))[0]
+        return tuple((person_phone[0], person_phone[1], person_phone[2]))
+
+    async def attach_cached_phone_number_types(self, person_phones: List[Any]
+                                               ) -> List[Tuple[PersonPhone, Person, PhoneNumberType]]:
+        """
+        Returns given rows of person phones with their persons, each with its phone number type taken from the cache.
+        Reloads the cache once if any of the phone number types is missing in it.
+        """
+        phone_number_types = await self.get_cached_phone_number_types_of(list(map(lambda p: p[0], person_phones)))
+        return PersonPhoneProvider.get_person_phones_with_phone_number_types(person_phones, phone_number_types)
+
+    async def get_cached_phone_number_types_of(self, person_phones: List[PersonPhone]) -> Dict[int, PhoneNumberType]:
+        """ Returns cached phone number types by id, reloaded once if any type of given person phones is missing """
+        phone_number_types = await self.phone_number_type_provider.get_cached_phone_number_types()
+        if any(map(lambda pp: pp.phone_number_type_id not in phone_number_types, person_phones)):
+            phone_number_types = await self.phone_number_type_provider.load_phone_number_type_cache()
+        return phone_number_types
+
+    async def get_person_phones_by_ids(self, person_phone_ids: List[Tuple[int, str, int]]
+                                       ) -> List[Optional[Tuple[PersonPhone, Person, PhoneNumberType]]]:
+        utils.check_ids_count(len(person_phone_ids))
+        is_cache_enabled = PhoneNumberTypeCacheConfig.from_json().is_enabled
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonPhoneProvider.get_person_phones_by_ids_statement(person_phone_ids, not is_cache_enabled)
+            person_phones = (await db_session.execute(statement)).all()
+        if is_cache_enabled:
+            person_phones = await self.attach_cached_phone_number_types(person_phones)
+        else:
+            person_phones = list(map(lambda pp: tuple((pp[0], pp[1], pp[2])), person_phones))
+        return utils.get_objects_in_ids_order(list(map(tuple, person_phone_ids)), person_phones,
+                                              PersonPhoneProvider.get_person_phone_id)
+
+    async def get_person_phones_by_person_ids(self, person_ids: List[int]
+                                              ) -> List[Tuple[PersonPhone, PhoneNumberType]]:
+        is_cache_enabled = PhoneNumberTypeCacheConfig.from_json().is_enabled
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonPhoneProvider.get_person_phones_by_person_ids_statement(person_ids, not is_cache_enabled)
+            person_phones = (await db_session.execute(statement)).all()
+        if is_cache_enabled:
+            phone_number_types = await self.get_cached_phone_number_types_of(list(map(lambda pp: pp[0], person_phones)))
+            return list(map(lambda pp: tuple((pp[0], phone_number_types.get(pp[0].phone_number_type_id, None))),
+                            person_phones))
+        return list(map(lambda pp: tuple((pp[0], pp[1])), person_phones))
+
+    async def insert_person_phone(self, person_phone_input: PersonPhoneInput) -> Tuple[int, str, int]:
+        person_phone = PersonPhone(**person_phone_input.dict())
+        try:
+            async with AsyncSession(self.db_engine, expire_on_commit=False) as db_session:
+                db_session.add(person_phone)
+                await db_session.commit()
+                person_phone_id = tuple((person_phone.business_entity_id, person_phone.phone_number,
+                                         person_phone.phone_number_type_id))
+            return person_phone_id
+        except sqlalchemy.exc.IntegrityError as e:
+            PersonPhoneProvider.raise_integrity_error(e)
+
+    async def copy_person_phones(self, person_phone_inputs: List[PersonPhoneInput]) -> List[int]:
+        if len(person_phone_inputs) == 0:
+            return list([])
+        import_table = PersonPhoneProvider.get_person_phone_import_table()
+        async with self.db_engine.begin() as connection:
+            await connection.execute(PersonPhoneProvider.create_person_phone_import_table_statement())
+            await CopyLoader.copy_async(connection, import_table.name, list(import_table.c.keys()),
+                                        PersonPhoneProvider.get_copy_records(person_phone_inputs))
+            statement = PersonPhoneProvider.insert_imported_person_phones_statement()
+            person_phone_ids = (await connection.execute(statement)).all()
+        return PersonPhoneProvider.get_skipped_positions(person_phone_inputs, person_phone_ids)
+
+    async def update_and_get_person_phone(self, person_phone_id: Tuple[int, str, int],
+                                          person_phone_input: PersonPhoneInput
+                                          ) -> Tuple[PersonPhone, Person, PhoneNumberType]:
+        PersonPhone(**person_phone_input.dict()).validate_assignment(person_phone_input)
+        try:
+            async with AsyncSession(self.db_engine) as db_session:
+                statement = PersonPhoneProvider.update_person_phone_statement(person_phone_id, person_phone_input)
+                updated_person_phone = (await db_session.execute(statement)).first()
+                await db_session.commit()
+        except sqlalchemy.exc.IntegrityError as e:
+            PersonPhoneProvider.raise_integrity_error(e)
+        if updated_person_phone is None:
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_PHONE_NOT_FOUND}: "
+                                       f"Person phone of id '{person_phone_id}' does not exist.")
+        return utils.get_models_from_row([PersonPhone, Person, PhoneNumberType], updated_person_phone)
+
+    async def update_person_phone(self, person_phone_id: Tuple[int, str, int],
+                                  person_phone_input: PersonPhoneInput) -> Tuple[int, str, int]:
+        updated_person_phone = (await self.update_and_get_person_phone(person_phone_id, person_phone_input))[0]
+        return tuple((updated_person_phone.business_entity_id, updated_person_phone.phone_number,
+                      updated_person_phone.phone_number_type_id))
+
+    async def delete_person_phone(self, person_phone_id: Tuple[int, str, int]) -> None:
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonPhoneProvider.delete_person_phone_statement(person_phone_id)
+            deleted_person_phone = (await db_session.execute(statement)).first()
+            await db_session.commit()
+        if deleted_person_phone is None:
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_PHONE_NOT_FOUND}: "
+                                       f"Person phone of id '{person_phone_id}' does not exist.")
+
+    async def execute_person_phone_operations(self, person_phone_operations: List[PersonPhoneOperation]
+                                              ) -> List[Union[Tuple[PersonPhone, Person, PhoneNumberType], Exception]]:
+        utils.check_batch_operations_count(len(person_phone_operations))
+        results = list([])
+        async with AsyncSession(self.db_engine) as db_session:
+            for person_phone_operation in person_phone_operations:
+                try:
+                    statement = PersonPhoneProvider.get_person_phone_operation_statement(person_phone_operation)
+                    async with db_session.begin_nested():
+                        row = (await db_session.execute(statement)).first()
+                        result = PersonPhoneProvider.get_person_phone_operation_result(person_phone_operation, row)
+                except sqlalchemy.exc.IntegrityError as e:
+                    result = PersonPhoneProvider.get_integrity_error(e)
+                except Exception as e:
+                    result = e
+                results.append(result)
+            await db_session.commit()
+        return results
@@ -0,0 +1,216 @@
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+from typing import Optional, List, Tuple, Union, AsyncIterator
+
+from app import utils, errors
+from app.caches import PersonNameIndex
+from app.config import PostgresdbConnectionConfig, PersonNameIndexConfig
+from app.copy_loader import CopyLoader
+from app.db_engine_registry import DbEngineRegistry
+from app.providers import IPersonProvider, AsyncBusinessEntityProvider, PersonProvider
+from app.providers.person_provider import PersonDbOrder
+from app.models import EOrderType, BusinessEntity, Person, PersonInput, PersonOperation, E404NotFound
+
+
+class AsyncPersonProvider(IPersonProvider):
+    """ Person provider running on the async engine, its methods are coroutines """
+    connection_string: str
+    business_entity_provider: AsyncBusinessEntityProvider
+    db_engine: AsyncEngine
+
+    def __init__(self, connection_string: Optional[str] = None,
+                 business_entity_provider: Optional[AsyncBusinessEntityProvider] = None,
+                 db_engine: Optional[AsyncEngine] = None):
+        super(AsyncPersonProvider, self).__init__()
+        self.connection_string = connection_string or PostgresdbConnectionConfig.get_async_db_connection_string()
+        self.db_engine = db_engine or DbEngineRegistry.get_async_postgresdb_engine(self.connection_string)
+        self.business_entity_provider = business_entity_provider or AsyncBusinessEntityProvider(self.connection_string,
+                                                                                                self.db_engine)
+
+    async def get_persons(self, filters: Optional[str] = None,
+                          order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                          limit: Optional[int] = None, offset: Optional[int] = None,
+                          is_alternative: Optional[bool] = False, fields: Optional[str] = None,
+                          collation: Optional[str] = None) -> List[Person]:
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonProvider.get_persons_statement(filters, order_by, order_type, limit, offset,
+                                                             is_alternative, fields, collation)
+            persons = (await db_session.execute(statement)).all()
+        persons = list(map(lambda p: p[0], persons))
+        return persons
+
+    async def get_persons_page(self, filters: Optional[str] = None,
+                               order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                               limit: Optional[int] = None, cursor: Optional[str] = None,
+                               is_alternative: Optional[bool] = False, fields: Optional[str] = None,
+                               collation: Optional[str] = None) -> Tuple[List[Person], Optional[str]]:
+        keyset_pagination = PersonDbOrder.get_keyset_pagination(order_by, order_type, collation)
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonProvider.get_persons_page_statement(keyset_pagination, filters, limit, cursor,
+                                                                  is_alternative, fields)
+            persons = (await db_session.execute(statement)).all()
+        persons = list(map(lambda p: p[0], persons))
+        return persons, keyset_pagination.get_next_cursor(persons, limit)
+
+    async def get_persons_with_total(self, filters: Optional[str] = None,
+                                     order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                     limit: Optional[int] = None, offset: Optional[int] = None,
+                                     fields: Optional[str] = None) -> Tuple[List[Person], int]:
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonProvider.get_persons_with_total_statement(filters, order_by, order_type, limit, offset,
+                                                                        fields)
+            persons = (await db_session.execute(statement)).all()
+            if len(persons) == 0 and offset:
+                statement = PersonProvider.count_persons_statement(filters)
+                persons_total = int((await db_session.exec(statement)).one())
+            else:
+                persons_total = persons[0][-1] if len(persons) > 0 else 0
+        persons = list(map(lambda p: p[0], persons))
+        return persons, persons_total
+
+    async def search_persons(self, filters: str, limit: Optional[int] = None,
+                             is_alternative: Optional[bool] = False, fields: Optional[str] = None) -> List[Person]:
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonProvider.search_persons_statement(filters, limit, is_alternative, fields)
+            persons = (await db_session.execute(statement)).all()
+        persons = list(map(lambda p: p[0], persons))
+        return persons
+
+    def stream_persons(self, filters: Optional[str] = None,
+                       order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                       is_alternative: Optional[bool] = False, is_ranked: Optional[bool] = False,
+                       batch_size: int = 1000, fields: Optional[str] = None,
+                       collation: Optional[str] = None) -> AsyncIterator[List[Person]]:
+        """ Returns async iterator of person batches, the statement is built (and validated) before iterating """
+        statement = PersonProvider.search_persons_statement(filters, None, is_alternative, fields) if is_ranked \
+            else PersonProvider.get_persons_statement(filters, order_by, order_type, None, None, is_alternative,
+                                                      fields, collation)
+        return self.__stream_persons(statement, batch_size)
+
+    async def __stream_persons(self, statement: SelectOfScalar[Person], batch_size: int) -> AsyncIterator[List[Person]]:
+        """ Yields batches of selected persons fetched from a server-side cursor """
+        async with AsyncSession(self.db_engine) as db_session:
+            result = await db_session.stream(statement.execution_options(yield_per=batch_size))
+            async for persons in result.partitions():
+                yield list(map(lambda p: p[0], persons))
+
+    async def build_person_name_index(self) -> None:
+        if not PersonNameIndexConfig.from_json().is_enabled:
+            return
+        async with AsyncSession(self.db_engine) as db_session:
+            person_names = (await db_session.execute(PersonProvider.get_person_names_statement())).all()
+        PersonNameIndex.build(person_names)
+
+    async def get_person_search_names(self) -> List[Tuple]:
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonProvider.get_person_search_names_statement()
+            person_search_names = (await db_session.execute(statement)).all()
+        return list(map(tuple, person_search_names))
+
+    async def count_persons(self, filters: Optional[str] = None) -> int:
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonProvider.count_persons_statement(filters)
+            persons_count = int((await db_session.exec(statement)).one())
+        return persons_count
+
+    async def get_person(self, person_id: int, fields: Optional[str] = None) -> Person:
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonProvider.get_person_statement(person_id, fields)
+            person = (await db_session.execute(statement)).first()
+        if person is None:
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_NOT_FOUND}: "
+                                       f"Person of id '{person_id}' does not exist.")
+        return person[0]
+
+    async def get_persons_by_ids(self, person_ids: List[int], fields: Optional[str] = None
+                                 ) -> List[Optional[Person]]:
+        utils.check_ids_count(len(person_ids))
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonProvider.get_persons_by_ids_statement(person_ids, fields)
+            persons = (await db_session.execute(statement)).all()
+        persons = list(map(lambda p: p[0], persons))
+        return utils.get_objects_in_ids_order(person_ids, persons, lambda p: p.business_entity_id)
+
+    async def create_person(self, person_input: PersonInput) -> Person:
+        Person(**person_input.dict()).validate_assignment(person_input)
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonProvider.create_person_statement(person_input)
+            person = (await db_session.execute(statement)).one()
+            await db_session.commit()
+        person = utils.get_models_from_row([Person], person)[0]
+        PersonNameIndex.put(person.business_entity_id, person.first_name, person.last_name)
+        return person
+
+    async def copy_persons(self, person_inputs: List[PersonInput]) -> List[int]:
+        if len(person_inputs) == 0:
+            return list([])
+        async with self.db_engine.begin() as connection:
+            statement = PersonProvider.allocate_business_entity_ids_statement(len(person_inputs))
+            person_ids = list(map(lambda r: r[0], (await connection.execute(statement)).all()))
+            business_entity_records, person_records = PersonProvider.get_copy_records(person_ids, person_inputs)
+            await CopyLoader.copy_async(connection, BusinessEntity.__table__.name,
+                                        CopyLoader.get_columns(BusinessEntity), business_entity_records,
+                                        BusinessEntity.__table__.schema)
+            await CopyLoader.copy_async(connection, Person.__table__.name, CopyLoader.get_columns(Person),
+                                        person_records, Person.__table__.schema)
+        for person_id, person_input in zip(person_ids, person_inputs):
+            PersonNameIndex.put(person_id, person_input.first_name, person_input.last_name)
+        return person_ids
+
+    async def insert_person(self, person_input: PersonInput) -> int:
+        person = await self.create_person(person_input)
+        return person.business_entity_id
+
+    async def update_and_get_person(self, person_id: int, person_input: PersonInput) -> Person:
+        Person(**person_input.dict()).validate_assignment(person_input)
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonProvider.update_person_statement(person_id, person_input)
+            updated_person = (await db_session.execute(statement)).first()
+            await db_session.commit()
+        if updated_person is None:
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_NOT_FOUND}: "
+                                       f"Person of id '{person_id}' does not exist.")
+        updated_person = utils.get_models_from_row([Person], updated_person)[0]
+        PersonNameIndex.put(updated_person.business_entity_id, updated_person.first_name, updated_person.last_name)
+        return updated_person
+
+    async def update_person(self, person_id: int, person_input: PersonInput) -> int:
+        updated_person = await self.update_and_get_person(person_id, person_input)
+        return updated_person.business_entity_id
+
+    async def delete_person(self, person_id: int) -> None:
+        await self.__delete_person(person_id, is_independent=False)
+
+    async def delete_independent_person(self, person_id: int) -> int:
+        return await self.__delete_person(person_id, is_independent=True)
+
+    async def __delete_person(self, person_id: int, is_independent: bool) -> int:
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PersonProvider.delete_person_statement(person_id, is_independent)
+            deleted_count, dependent_count = (await db_session.execute(statement)).one()
+            await db_session.commit()
+        if deleted_count == 0 and dependent_count == 0:
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_NOT_FOUND}: "
+                                       f"Person of id '{person_id}' does not exist.")
+        if deleted_count > 0:
+            PersonNameIndex.remove(person_id)
+        return dependent_count
+
+    async def execute_person_operations(self, person_operations: List[PersonOperation]
+                                        ) -> List[Union[Person, int, Exception]]:
+        utils.check_batch_operations_count(len(person_operations))
+        results = list([])
+        async with AsyncSession(self.db_engine) as db_session:
+            for person_operation in person_operations:
+                try:
+                    statement = PersonProvider.get_person_operation_statement(person_operation)
+                    async with db_session.begin_nested():
+                        row = (await db_session.execute(statement)).first()
+                        result = PersonProvider.get_person_operation_result(person_operation, row)
+                except Exception as e:
+                    result = e
+                results.append(result)
+            await db_session.commit()
+        PersonProvider.update_person_name_index(person_operations, results)
+        return results
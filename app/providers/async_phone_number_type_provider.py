@@ -0,0 +1,220 @@
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+from typing import Optional, List, Dict, Tuple, Union, AsyncIterator
+
+from app import utils, errors
+from app.caches import PhoneNumberTypeCache
+from app.config import PostgresdbConnectionConfig, PhoneNumberTypeCacheConfig
+from app.copy_loader import CopyLoader
+from app.db_engine_registry import DbEngineRegistry
+from app.providers import IPhoneNumberTypeProvider, PhoneNumberTypeProvider
+from app.providers.phone_number_type_provider import PhoneNumberTypeDbOrder
+from app.models import EOrderType, PhoneNumberType, PhoneNumberTypeInput, PhoneNumberTypeOperation, E404NotFound
+
+
+class AsyncPhoneNumberTypeProvider(IPhoneNumberTypeProvider):
+    """ Phone number type provider running on the async engine, its methods are coroutines """
+    connection_string: str
+    db_engine: AsyncEngine
+
+    def __init__(self, connection_string: Optional[str] = None,
+                 db_engine: Optional[AsyncEngine] = None):
+        self.connection_string = connection_string or PostgresdbConnectionConfig.get_async_db_connection_string()
+        self.db_engine = db_engine or DbEngineRegistry.get_async_postgresdb_engine(self.connection_string)
+
+    async def get_phone_number_types(self, filters: Optional[str] = None,
+                                     order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                     limit: Optional[int] = None, offset: Optional[int] = None
+                                     ) -> List[PhoneNumberType]:
+        if PhoneNumberTypeCacheConfig.from_json().is_enabled:
+            phone_number_types = PhoneNumberTypeProvider.select_cached_phone_number_types(
+                await self.get_cached_phone_number_types(), filters, order_by, order_type)
+            return PhoneNumberTypeProvider.slice_cached_phone_number_types(phone_number_types, limit, offset)
+
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PhoneNumberTypeProvider.get_phone_number_types_statement(filters, order_by, order_type,
+                                                                                 limit, offset)
+            phone_number_types = (await db_session.execute(statement)).all()
+        phone_number_types = list(map(lambda pnt: pnt[0], phone_number_types))
+        return phone_number_types
+
+    async def get_phone_number_types_page(self, filters: Optional[str] = None,
+                                          order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                          limit: Optional[int] = None, cursor: Optional[str] = None
+                                          ) -> Tuple[List[PhoneNumberType], Optional[str]]:
+        keyset_pagination = PhoneNumberTypeDbOrder.get_keyset_pagination(order_by, order_type)
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PhoneNumberTypeProvider.get_phone_number_types_page_statement(keyset_pagination, filters,
+                                                                                      limit, cursor)
+            phone_number_types = (await db_session.execute(statement)).all()
+        phone_number_types = list(map(lambda pnt: pnt[0], phone_number_types))
+        return phone_number_types, keyset_pagination.get_next_cursor(phone_number_types, limit)
+
+    async def get_phone_number_types_with_total(self, filters: Optional[str] = None,
+                                                order_by: Optional[str] = None,
+                                                order_type: Optional[EOrderType] = None,
+                                                limit: Optional[int] = None, offset: Optional[int] = None
+                                                ) -> Tuple[List[PhoneNumberType], int]:
+        if PhoneNumberTypeCacheConfig.from_json().is_enabled:
+            phone_number_types = PhoneNumberTypeProvider.select_cached_phone_number_types(
+                await self.get_cached_phone_number_types(), filters, order_by, order_type)
+            return PhoneNumberTypeProvider.slice_cached_phone_number_types(phone_number_types, limit, offset), \
+                len(phone_number_types)
+
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PhoneNumberTypeProvider.get_phone_number_types_with_total_statement(filters, order_by,
+                                                                                            order_type, limit, offset)
+            phone_number_types = (await db_session.execute(statement)).all()
+            if len(phone_number_types) == 0 and offset:
+                statement = PhoneNumberTypeProvider.count_phone_number_types_statement(filters)
+                phone_number_types_total = int((await db_session.exec(statement)).one())
+            else:
+                phone_number_types_total = phone_number_types[0][-1] if len(phone_number_types) > 0 else 0
+        phone_number_types = list(map(lambda pnt: pnt[0], phone_number_types))
+        return phone_number_types, phone_number_types_total
+
+    def stream_phone_number_types(self, filters: Optional[str] = None,
+                                  order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                  batch_size: int = 1000) -> AsyncIterator[List[PhoneNumberType]]:
+        """ Returns async iterator of phone number type batches, the statement is built before iterating """
+        statement = PhoneNumberTypeProvider.get_phone_number_types_statement(filters, order_by, order_type)
+        return self.__stream_phone_number_types(statement, batch_size)
+
+    async def __stream_phone_number_types(self, statement: SelectOfScalar[PhoneNumberType],
+                                          batch_size: int) -> AsyncIterator[List[PhoneNumberType]]:
+        """ Yields batches of selected phone number types fetched from a server-side cursor """
+        async with AsyncSession(self.db_engine) as db_session:
+            result = await db_session.stream(statement.execution_options(yield_per=batch_size))
+            async for phone_number_types in result.partitions():
+                yield list(map(lambda pnt: pnt[0], phone_number_types))
+
+    async def count_phone_number_types(self, filters: Optional[str] = None) -> int:
+        if PhoneNumberTypeCacheConfig.from_json().is_enabled:
+            return len(PhoneNumberTypeProvider.select_cached_phone_number_types(
+                await self.get_cached_phone_number_types(), filters))
+
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PhoneNumberTypeProvider.count_phone_number_types_statement(filters)
+            phone_number_types_count = int((await db_session.exec(statement)).one())
+        return phone_number_types_count
+
+    async def get_phone_number_type(self, phone_number_type_id: int) -> PhoneNumberType:
+        if PhoneNumberTypeCacheConfig.from_json().is_enabled:
+            phone_number_type = (await self.get_cached_phone_number_types()).get(phone_number_type_id, None)
+        else:
+            async with AsyncSession(self.db_engine) as db_session:
+                statement = PhoneNumberTypeProvider.get_phone_number_type_statement(phone_number_type_id)
+                phone_number_type = (await db_session.execute(statement)).first()
+            phone_number_type = phone_number_type[0] if phone_number_type is not None else None
+        if phone_number_type is None:
+            raise errors.NotFoundError(f"{E404NotFound.PHONE_NUMBER_TYPE_NOT_FOUND}: "
+                                       f"Phone number type of id '{phone_number_type_id}' does not exist.")
+        return phone_number_type
+
+    async def get_cached_phone_number_types(self) -> Dict[int, PhoneNumberType]:
+        """ Returns all phone number types by id from the cache, loads the cache if it is not loaded or expired """
+        phone_number_types = PhoneNumberTypeCache.get_all(PhoneNumberTypeCacheConfig.from_json().ttl)
+        if phone_number_types is None:
+            phone_number_types = await self.load_phone_number_type_cache()
+        return phone_number_types
+
+    async def load_phone_number_type_cache(self) -> Dict[int, PhoneNumberType]:
+        """ Loads all phone number types to the cache and returns them by id """
+        version = PhoneNumberTypeCache.get_version()
+        async with AsyncSession(self.db_engine) as db_session:
+            phone_number_types = (await db_session.execute(
+                PhoneNumberTypeProvider.get_phone_number_types_statement())).all()
+        return PhoneNumberTypeCache.load(list(map(lambda pnt: pnt[0], phone_number_types)), version)
+
+    async def get_phone_number_types_by_ids(self, phone_number_type_ids: List[int]
+                                            ) -> List[Optional[PhoneNumberType]]:
+        utils.check_ids_count(len(phone_number_type_ids))
+        if PhoneNumberTypeCacheConfig.from_json().is_enabled:
+            phone_number_types = await self.get_cached_phone_number_types()
+            return list(map(lambda pnti: phone_number_types.get(pnti, None), phone_number_type_ids))
+
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PhoneNumberTypeProvider.get_phone_number_types_by_ids_statement(phone_number_type_ids)
+            phone_number_types = (await db_session.execute(statement)).all()
+        phone_number_types = list(map(lambda pnt: pnt[0], phone_number_types))
+        return utils.get_objects_in_ids_order(phone_number_type_ids, phone_number_types,
+                                              lambda pnt: pnt.phone_number_type_id)
+
+    async def insert_phone_number_type(self, phone_number_type_input: PhoneNumberTypeInput) -> int:
+        phone_number_type = PhoneNumberType(**phone_number_type_input.dict())
+        async with AsyncSession(self.db_engine, expire_on_commit=False) as db_session:
+            db_session.add(phone_number_type)
+            await db_session.commit()
+            phone_number_type_id = phone_number_type.phone_number_type_id
+        PhoneNumberTypeCache.invalidate()
+        return phone_number_type_id
+
+    async def copy_phone_number_types(self, phone_number_type_inputs: List[PhoneNumberTypeInput]) -> int:
+        if len(phone_number_type_inputs) == 0:
+            return 0
+        async with self.db_engine.begin() as connection:
+            await CopyLoader.copy_async(connection, PhoneNumberType.__table__.name,
+                                        CopyLoader.get_columns(PhoneNumberType, PhoneNumberTypeProvider.copy_fields),
+                                        PhoneNumberTypeProvider.get_copy_records(phone_number_type_inputs),
+                                        PhoneNumberType.__table__.schema)
+        PhoneNumberTypeCache.invalidate()
+        return len(phone_number_type_inputs)
+
+    async def update_and_get_phone_number_type(self, phone_number_type_id: int,
+                                               phone_number_type_input: PhoneNumberTypeInput) -> PhoneNumberType:
+        PhoneNumberType(**phone_number_type_input.dict()).validate_assignment(phone_number_type_input)
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PhoneNumberTypeProvider.update_phone_number_type_statement(phone_number_type_id,
+                                                                                   phone_number_type_input)
+            updated_phone_number_type = (await db_session.execute(statement)).first()
+            await db_session.commit()
+        PhoneNumberTypeCache.invalidate()
+        if updated_phone_number_type is None:
+            raise errors.NotFoundError(f"{E404NotFound.PHONE_NUMBER_TYPE_NOT_FOUND}: "
+                                       f"Phone number type of id '{phone_number_type_id}' does not exist.")
+        return utils.get_models_from_row([PhoneNumberType], updated_phone_number_type)[0]
+
+    async def update_phone_number_type(self, phone_number_type_id: int,
+                                       phone_number_type_input: PhoneNumberTypeInput) -> int:
+        updated_phone_number_type = await self.update_and_get_phone_number_type(phone_number_type_id,
+                                                                                phone_number_type_input)
+        return updated_phone_number_type.phone_number_type_id
+
+    async def delete_phone_number_type(self, phone_number_type_id: int) -> None:
+        await self.__delete_phone_number_type(phone_number_type_id, is_independent=False)
+
+    async def delete_independent_phone_number_type(self, phone_number_type_id: int) -> int:
+        return await self.__delete_phone_number_type(phone_number_type_id, is_independent=True)
+
+    async def __delete_phone_number_type(self, phone_number_type_id: int, is_independent: bool) -> int:
+        async with AsyncSession(self.db_engine) as db_session:
+            statement = PhoneNumberTypeProvider.delete_phone_number_type_statement(phone_number_type_id,
+                                                                                   is_independent)
+            deleted_count, dependent_count = (await db_session.execute(statement)).one()
+            await db_session.commit()
+        PhoneNumberTypeCache.invalidate()
+        if deleted_count == 0 and dependent_count == 0:
+            raise errors.NotFoundError(f"{E404NotFound.PHONE_NUMBER_TYPE_NOT_FOUND}: "
+                                       f"Phone number type of id '{phone_number_type_id}' does not exist.")
+        return dependent_count
+
+    async def execute_phone_number_type_operations(self, phone_number_type_operations: List[PhoneNumberTypeOperation]
+                                                   ) -> List[Union[PhoneNumberType, int, Exception]]:
+        utils.check_batch_operations_count(len(phone_number_type_operations))
+        results = list([])
+        async with AsyncSession(self.db_engine) as db_session:
+            for phone_number_type_operation in phone_number_type_operations:
+                try:
+                    statement = PhoneNumberTypeProvider.get_phone_number_type_operation_statement(
+                        phone_number_type_operation)
+                    async with db_session.begin_nested():
+                        row = (await db_session.execute(statement)).first()
+                        result = PhoneNumberTypeProvider.get_phone_number_type_operation_result(
+                            phone_number_type_operation, row)
+                except Exception as e:
+                    result = e
+                results.append(result)
+            await db_session.commit()
+        PhoneNumberTypeCache.invalidate()
+        return results
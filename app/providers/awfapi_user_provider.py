@@ -1,8 +1,10 @@
 import datetime as dt
 import pymongo
-from typing import Optional, List
+import pymongo.errors
+from typing import Any, Dict, Optional, List
 
 from app import errors
+from app.caches import AWFAPIUserCache, TokenDenyList
 from app.config import MongodbConnectionConfig
 from app.models import AWFAPIUserInput, AWFAPIUser, E400BadRequest, E404NotFound
 from app.providers import IAWFAPIUserProvider
@@ -42,7 +44,12 @@ class AWFAPIUserProvider(IAWFAPIUserProvider):
         awfapi_user = AWFAPIUser(date_created=dt.datetime.utcnow(), date_modified=dt.datetime.utcnow(),
                                  **awfapi_user_input.dict())
         awfapi_user.validate_assignment(awfapi_user_input)
-        self.db_engine.awfapi[self.collection_name].insert_one(awfapi_user.dict())
+        try:
+            self.db_engine.awfapi[self.collection_name].insert_one(awfapi_user.dict())
+        except pymongo.errors.DuplicateKeyError as e:
+            AWFAPIUserProvider.raise_duplicate_key_error(e, awfapi_user.username, awfapi_user.email)
+        AWFAPIUserCache.invalidate(awfapi_user.username)
+        TokenDenyList.revoke(awfapi_user.username, awfapi_user.get_version())
         return awfapi_user.username
 
     def update_awfapi_user(self, username: str, awfapi_user_input: AWFAPIUserInput) -> str:
@@ -52,32 +59,62 @@ class AWFAPIUserProvider(IAWFAPIUserProvider):
 
         updated_awfapi_user.update_from_input(awfapi_user_input)
         updated_awfapi_user.date_modified = dt.datetime.utcnow()
-        self.db_engine.awfapi[self.collection_name].update_one({'username': {"$eq": username}},
-                                                               {"$set": updated_awfapi_user.dict()})
+        try:
+            self.db_engine.awfapi[self.collection_name].update_one({'username': {"$eq": username}},
+                                                                   {"$set": updated_awfapi_user.dict()})
+        except pymongo.errors.DuplicateKeyError as e:
+            AWFAPIUserProvider.raise_duplicate_key_error(e, updated_awfapi_user.username, updated_awfapi_user.email)
+        AWFAPIUserCache.invalidate(username, updated_awfapi_user.username)
+        TokenDenyList.revoke(username, updated_awfapi_user.get_version())
         return updated_awfapi_user.username
 
     def delete_awfapi_user(self, username: str) -> None:
         self.get_awfapi_user(username)
         self.db_engine.awfapi[self.collection_name].delete_one({'username': {"$eq": username}})
+        AWFAPIUserCache.invalidate(username)
+        TokenDenyList.revoke(username)
 
-    def __guard_unique_username(self, new_username: str, current_username: Optional[str] = None) -> None:
-        awfapi_users = self.get_awfapi_users()
-        other_usernames = list(map(lambda au: au.username,
-                                   filter(lambda au: au.username != current_username, awfapi_users)))
+    def ensure_indexes(self) -> None:
+        """ Creates unique indexes of usernames and emails unless they already exist """
+        self.db_engine.awfapi[self.collection_name].create_indexes(AWFAPIUserProvider.get_unique_indexes())
 
-        if new_username in other_usernames:
-            raise errors.UsernameAlreadyExistsError(f"{E400BadRequest.UNIQUE_CONSTRAINT_VIOLATION}: "
-                                                    f"[username] [{new_username}] "
-                                                    f"Field 'username' must have unique values. "
-                                                    f"Provided username '{new_username}' already exists.")
+    def __guard_unique_username(self, new_username: str, current_username: Optional[str] = None) -> None:
+        if new_username != current_username and self.__exists({'username': {"$eq": new_username}}):
+            raise AWFAPIUserProvider.get_username_already_exists_error(new_username)
 
     def __guard_unique_email(self, new_email: str, current_email: Optional[str] = None) -> None:
-        awfapi_users = self.get_awfapi_users()
-        other_emails = list(map(lambda au: au.email,
-                                filter(lambda au: au.email != current_email, awfapi_users)))
-
-        if new_email in other_emails:
-            raise errors.EmailAlreadyExistsError(f"{E400BadRequest.UNIQUE_CONSTRAINT_VIOLATION}: "
-                                                 f"[email] [{new_email}] "
-                                                 f"Field 'email' must have unique values. "
-                                                 f"Provided email '{new_email}' already exists.")
+        if new_email != current_email and self.__exists({'email': {"$eq": new_email}}):
+            raise AWFAPIUserProvider.get_email_already_exists_error(new_email)
+
+    def __exists(self, query: Dict[str, Any]) -> bool:
+        """ Checks if any user matches given query, reads only the document id (from the index if it exists) """
+        return self.db_engine.awfapi[self.collection_name].find_one(query, projection={'_id': 1}) is not None
+
+    @staticmethod
+    def get_unique_indexes() -> List[pymongo.IndexModel]:
+        return list(map(lambda f: pymongo.IndexModel([(f, pymongo.ASCENDING)], name=f"{f}_unique", unique=True),
+                        ["username", "email"]))
+
+    @staticmethod
+    def get_username_already_exists_error(username: str) -> errors.UsernameAlreadyExistsError:
+        return errors.UsernameAlreadyExistsError(f"{E400BadRequest.UNIQUE_CONSTRAINT_VIOLATION}: "
+                                                 f"[username] [{username}] "
+                                                 f"Field 'username' must have unique values. "
+                                                 f"Provided username '{username}' already exists.")
+
+    @staticmethod
+    def get_email_already_exists_error(email: str) -> errors.EmailAlreadyExistsError:
+        return errors.EmailAlreadyExistsError(f"{E400BadRequest.UNIQUE_CONSTRAINT_VIOLATION}: "
+                                              f"[email] [{email}] "
+                                              f"Field 'email' must have unique values. "
+                                              f"Provided email '{email}' already exists.")
+
+    @staticmethod
+    def raise_duplicate_key_error(e: pymongo.errors.DuplicateKeyError, username: str, email: str) -> None:
+        """ Raises unique constraint violation error of the field whose unique index rejected the write """
+        key_pattern = (e.details or dict({})).get("keyPattern", dict({}))
+        if "username" in key_pattern:
+            raise AWFAPIUserProvider.get_username_already_exists_error(username)
+        if "email" in key_pattern:
+            raise AWFAPIUserProvider.get_email_already_exists_error(email)
+        raise e
@@ -1,9 +1,10 @@
 import sqlalchemy
-from sqlmodel import create_engine, Session, select
+from sqlmodel import Session, select
 from typing import Optional, List
 
 from app import errors
 from app.config import PostgresdbConnectionConfig
+from app.db_engine_registry import DbEngineRegistry
 from app.models import BusinessEntity, E404NotFound
 from app.providers import IBusinessEntityProvider
 
@@ -15,7 +16,7 @@ class BusinessEntityProvider(IBusinessEntityProvider):
     def __init__(self, connection_string: Optional[str] = None,
                  db_engine: Optional[sqlalchemy.engine.Engine] = None):
         self.connection_string = connection_string or PostgresdbConnectionConfig.get_db_connection_string()
-        self.db_engine = db_engine or create_engine(self.connection_string)
+        self.db_engine = db_engine or DbEngineRegistry.get_postgresdb_engine(self.connection_string)
 
     def get_business_entities(self, limit: Optional[int] = None, offset: Optional[int] = None) -> List[BusinessEntity]:
         with Session(self.db_engine) as db_session:
@@ -1,6 +1,6 @@
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Union, Iterator
 
-from app.models import EOrderType, Person, PhoneNumberType, PersonPhone, PersonPhoneInput
+from app.models import EOrderType, Person, PhoneNumberType, PersonPhone, PersonPhoneInput, PersonPhoneOperation
 
 
 class IPersonPhoneProvider:
@@ -8,23 +8,70 @@ class IPersonPhoneProvider:
 
     def get_person_phones(self, filters: Optional[str] = None,
                           order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
-                          limit: Optional[int] = None, offset: Optional[int] = None
+                          limit: Optional[int] = None, offset: Optional[int] = None, fields: Optional[str] = None
                           ) -> List[Tuple[PersonPhone, Person, PhoneNumberType]]:
-        """ Returns list of appropriate person phones with its person and phone number type """
+        """ Returns list of appropriate person phones with its person (given fields only) and phone number type """
+        raise NotImplementedError
+
+    def get_person_phones_page(self, filters: Optional[str] = None,
+                               order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                               limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[str] = None
+                               ) -> Tuple[List[Tuple[PersonPhone, Person, PhoneNumberType]], Optional[str]]:
+        """ Returns page of appropriate person phones placed after given cursor and cursor of the next page """
+        raise NotImplementedError
+
+    def get_person_phones_with_total(self, filters: Optional[str] = None,
+                                     order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                     limit: Optional[int] = None, offset: Optional[int] = None,
+                                     fields: Optional[str] = None
+                                     ) -> Tuple[List[Tuple[PersonPhone, Person, PhoneNumberType]], int]:
+        """ Returns list of appropriate person phones and count of all person phones matching the filters """
+        raise NotImplementedError
+
+    def stream_person_phones(self, filters: Optional[str] = None,
+                             order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                             batch_size: int = 1000, fields: Optional[str] = None
+                             ) -> Iterator[List[Tuple[PersonPhone, Person, PhoneNumberType]]]:
+        """ Returns iterator of batches of appropriate person phones with their persons and phone number types """
         raise NotImplementedError
 
     def count_person_phones(self, filters: Optional[str] = None) -> int:
         """ Returns count of appropriate person phones """
         raise NotImplementedError
 
+    def exists_person_phones(self, filters: Optional[str] = None) -> bool:
+        """ Returns whether any appropriate person phone exists """
+        raise NotImplementedError
+
     def get_person_phone(self, person_phone_id: Tuple[int, str, int]) -> Tuple[PersonPhone, Person, PhoneNumberType]:
         """ Returns person phone of given person_phone_id """
         raise NotImplementedError
 
+    def get_person_phones_by_ids(self, person_phone_ids: List[Tuple[int, str, int]]
+                                 ) -> List[Optional[Tuple[PersonPhone, Person, PhoneNumberType]]]:
+        """ Returns person phones of given person_phone_ids in their order, None for missing ones """
+        raise NotImplementedError
+
+    def get_person_phones_by_person_ids(self, person_ids: List[int]) -> List[Tuple[PersonPhone, PhoneNumberType]]:
+        """ Returns person phones of persons of given person_ids with their phone number types, ordered by person """
+        raise NotImplementedError
+
     def insert_person_phone(self, person_phone_input: PersonPhoneInput) -> Tuple[int, str, int]:
         """ Inserts person phone and returns new person phone person_phone_id """
         raise NotImplementedError
 
+    def copy_person_phones(self, person_phone_inputs: List[PersonPhoneInput]) -> List[int]:
+        """
+        Inserts person phones of given valid inputs in one transaction (using COPY), skipping the ones
+        with missing person or phone number type and the already existing ones, returns positions of the skipped inputs
+        """
+        raise NotImplementedError
+
+    def update_and_get_person_phone(self, person_phone_id: Tuple[int, str, int], person_phone_input: PersonPhoneInput
+                                    ) -> Tuple[PersonPhone, Person, PhoneNumberType]:
+        """ Updates person phone of given person_phone_id and returns the updated person phone with its person and phone number type """
+        raise NotImplementedError
+
     def update_person_phone(self, person_phone_id: Tuple[int, str, int],
                             person_phone_input: PersonPhoneInput) -> Tuple[int, str, int]:
         """ Updates person phone of given person_phone_id and returns updated person phone person_phone_id """
@@ -33,3 +80,11 @@ class IPersonPhoneProvider:
     def delete_person_phone(self, person_phone_id: Tuple[int, str, int]) -> None:
         """ Deletes person phone of given person_phone_id """
         raise NotImplementedError
+
+    def execute_person_phone_operations(self, person_phone_operations: List[PersonPhoneOperation]
+                                        ) -> List[Union[Tuple[PersonPhone, Person, PhoneNumberType], Exception]]:
+        """
+        Executes given batch operations in one transaction, each in its own savepoint, returns result of each one:
+        created or updated person phone, nothing for deletion or error of the failed operation
+        """
+        raise NotImplementedError
@@ -1,6 +1,6 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple, Union, Iterator
 
-from app.models import EOrderType, PersonInput, Person
+from app.models import EOrderType, PersonInput, PersonOperation, Person
 
 
 class IPersonProvider:
@@ -9,22 +9,78 @@ class IPersonProvider:
     def get_persons(self, filters: Optional[str] = None,
                     order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
                     limit: Optional[int] = None, offset: Optional[int] = None,
-                    is_alternative: Optional[bool] = False) -> List[Person]:
-        """ Returns list of appropriate persons """
+                    is_alternative: Optional[bool] = False, fields: Optional[str] = None,
+                    collation: Optional[str] = None) -> List[Person]:
+        """ Returns list of appropriate persons, loaded with given fields only, names ordered with given collation """
+        raise NotImplementedError
+
+    def get_persons_page(self, filters: Optional[str] = None,
+                         order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                         limit: Optional[int] = None, cursor: Optional[str] = None,
+                         is_alternative: Optional[bool] = False, fields: Optional[str] = None,
+                         collation: Optional[str] = None) -> Tuple[List[Person], Optional[str]]:
+        """ Returns page of appropriate persons placed after given cursor and cursor of the next page """
+        raise NotImplementedError
+
+    def get_persons_with_total(self, filters: Optional[str] = None,
+                               order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                               limit: Optional[int] = None, offset: Optional[int] = None,
+                               fields: Optional[str] = None) -> Tuple[List[Person], int]:
+        """ Returns list of appropriate persons and count of all persons matching the filters """
+        raise NotImplementedError
+
+    def search_persons(self, filters: str, limit: Optional[int] = None,
+                       is_alternative: Optional[bool] = False, fields: Optional[str] = None) -> List[Person]:
+        """ Returns list of persons matching the phrase filters, ordered by rank of similarity to the phrases """
+        raise NotImplementedError
+
+    def stream_persons(self, filters: Optional[str] = None,
+                       order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                       is_alternative: Optional[bool] = False, is_ranked: Optional[bool] = False,
+                       batch_size: int = 1000, fields: Optional[str] = None,
+                       collation: Optional[str] = None) -> Iterator[List[Person]]:
+        """ Returns iterator of batches of appropriate persons, ranked by similarity to phrases if 'is_ranked' """
+        raise NotImplementedError
+
+    def build_person_name_index(self) -> None:
+        """ Builds in-memory person name index (for autocomplete) from names of all persons """
+        raise NotImplementedError
+
+    def get_person_search_names(self) -> List[Tuple]:
+        """ Returns ids, types and name columns of all persons (for the in-memory person search engine) """
         raise NotImplementedError
 
     def count_persons(self, filters: Optional[str] = None) -> int:
         """ Returns count of appropriate persons """
         raise NotImplementedError
 
-    def get_person(self, person_id: int) -> Person:
-        """ Returns person of given person_id """
+    def get_person(self, person_id: int, fields: Optional[str] = None) -> Person:
+        """ Returns person of given person_id, loaded with given fields only """
+        raise NotImplementedError
+
+    def get_persons_by_ids(self, person_ids: List[int], fields: Optional[str] = None) -> List[Optional[Person]]:
+        """ Returns persons of given person_ids in their order (None for missing ones), loaded with given fields only """
+        raise NotImplementedError
+
+    def create_person(self, person_input: PersonInput) -> Person:
+        """ Inserts person with its business entity in one transaction and returns the new person """
+        raise NotImplementedError
+
+    def copy_persons(self, person_inputs: List[PersonInput]) -> List[int]:
+        """
+        Inserts persons of given valid inputs with their business entities in one transaction (using COPY),
+        returns the new person ids in order of the inputs
+        """
         raise NotImplementedError
 
     def insert_person(self, person_input: PersonInput) -> int:
         """ Inserts person and returns new person person_id """
         raise NotImplementedError
 
+    def update_and_get_person(self, person_id: int, person_input: PersonInput) -> Person:
+        """ Updates person of given person_id and returns the updated person """
+        raise NotImplementedError
+
     def update_person(self, person_id: int, person_input: PersonInput) -> int:
         """ Updates person of given person_id and return updated person person_id """
         raise NotImplementedError
@@ -32,3 +88,15 @@ class IPersonProvider:
     def delete_person(self, person_id: int) -> None:
         """ Deletes person of given person_id """
         raise NotImplementedError
+
+    def delete_independent_person(self, person_id: int) -> int:
+        """ Deletes person of given person_id unless person phones depend on it, returns count of dependent person phones """
+        raise NotImplementedError
+
+    def execute_person_operations(self, person_operations: List[PersonOperation]
+                                  ) -> List[Union[Person, int, Exception]]:
+        """
+        Executes given batch operations in one transaction, each in its own savepoint, returns result of each one:
+        created or updated person, count of dependent person phones for deletion or error of the failed operation
+        """
+        raise NotImplementedError
@@ -1,6 +1,6 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple, Union, Iterator
 
-from app.models import EOrderType, PhoneNumberType, PhoneNumberTypeInput
+from app.models import EOrderType, PhoneNumberType, PhoneNumberTypeInput, PhoneNumberTypeOperation
 
 
 class IPhoneNumberTypeProvider:
@@ -12,6 +12,26 @@ class IPhoneNumberTypeProvider:
         """ Returns list of appropriate phone number types """
         raise NotImplementedError
 
+    def get_phone_number_types_page(self, filters: Optional[str] = None,
+                                    order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                    limit: Optional[int] = None, cursor: Optional[str] = None
+                                    ) -> Tuple[List[PhoneNumberType], Optional[str]]:
+        """ Returns page of appropriate phone number types placed after given cursor and cursor of the next page """
+        raise NotImplementedError
+
+    def get_phone_number_types_with_total(self, filters: Optional[str] = None,
+                                          order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                          limit: Optional[int] = None, offset: Optional[int] = None
+                                          ) -> Tuple[List[PhoneNumberType], int]:
+        """ Returns list of appropriate phone number types and count of all phone number types matching the filters """
+        raise NotImplementedError
+
+    def stream_phone_number_types(self, filters: Optional[str] = None,
+                                  order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                  batch_size: int = 1000) -> Iterator[List[PhoneNumberType]]:
+        """ Returns iterator of batches of appropriate phone number types """
+        raise NotImplementedError
+
     def count_phone_number_types(self, filters: Optional[str] = None) -> int:
         """ Returns count of appropriate phone number types """
         raise NotImplementedError
@@ -20,10 +40,27 @@ class IPhoneNumberTypeProvider:
         """ Returns phone number type of given phone_number_type_id """
         raise NotImplementedError
 
+    def load_phone_number_type_cache(self) -> Dict[int, PhoneNumberType]:
+        """ Loads all phone number types to in-memory cache and returns them by phone_number_type_id """
+        raise NotImplementedError
+
+    def get_phone_number_types_by_ids(self, phone_number_type_ids: List[int]) -> List[Optional[PhoneNumberType]]:
+        """ Returns phone number types of given ids in their order, None for missing ones """
+        raise NotImplementedError
+
     def insert_phone_number_type(self, phone_number_type_input: PhoneNumberTypeInput) -> int:
         """ Inserts phone number type and returns new phone number type phone_number_type_id """
         raise NotImplementedError
 
+    def copy_phone_number_types(self, phone_number_type_inputs: List[PhoneNumberTypeInput]) -> int:
+        """ Inserts phone number types of given valid inputs in one transaction (using COPY), returns their count """
+        raise NotImplementedError
+
+    def update_and_get_phone_number_type(self, phone_number_type_id: int,
+                                         phone_number_type_input: PhoneNumberTypeInput) -> PhoneNumberType:
+        """ Updates phone number type of given phone_number_type_id and returns the updated phone number type """
+        raise NotImplementedError
+
     def update_phone_number_type(self, phone_number_type_id: int, phone_number_type_input: PhoneNumberTypeInput) -> int:
         """ Updates phone number type phone of given phone_number_type_id and returns updated phone number type phone phone_number_type_id """
         raise NotImplementedError
@@ -31,3 +68,18 @@ class IPhoneNumberTypeProvider:
     def delete_phone_number_type(self, phone_number_type_id: int) -> None:
         """ Deletes phone number type phone of given phone_number_type_id """
         raise NotImplementedError
+
+    def delete_independent_phone_number_type(self, phone_number_type_id: int) -> int:
+        """
+        Deletes phone number type of given phone_number_type_id unless person phones depend on it,
+        returns count of dependent person phones
+        """
+        raise NotImplementedError
+
+    def execute_phone_number_type_operations(self, phone_number_type_operations: List[PhoneNumberTypeOperation]
+                                             ) -> List[Union[PhoneNumberType, int, Exception]]:
+        """
+        Executes given batch operations in one transaction, each in its own savepoint, returns result of each one:
+        created or updated phone number type, count of dependent person phones for deletion or error of the failed one
+        """
+        raise NotImplementedError
@@ -1,81 +1,173 @@
 import datetime as dt
 import sqlalchemy
+from sqlalchemy.dialects import postgresql
 from pydantic import BaseModel
-from sqlmodel import create_engine, Session, select, text
+from sqlmodel import Session, select, text
 from sqlmodel.sql.expression import SelectOfScalar
-from typing import Optional, List, Tuple, Dict, Union, ClassVar
+from typing import Any, Optional, List, Tuple, Dict, Union, ClassVar, Iterator
 
 from app import utils, errors
-from app.config import PostgresdbConnectionConfig, TableDetailsConfig
-from app.providers import IPersonPhoneProvider
-from app.models import (EConstraintViolation, EOrderType, Person, PhoneNumberType, PersonPhone, PersonPhoneInput,
-                        E400BadRequest, E404NotFound)
+from app.config import PostgresdbConnectionConfig, TableDetailsConfig, PhoneNumberTypeCacheConfig
+from app.copy_loader import CopyLoader
+from app.db_engine_registry import DbEngineRegistry
+from app.keyset_pagination import KeysetPagination
+from app.providers import IPersonPhoneProvider, PhoneNumberTypeProvider
+from app.providers.person_provider import PersonDbFields
+from app.models import (EConstraintViolation, EOrderType, EBatchOperation, Person, PhoneNumberType, PersonPhone,
+                        PersonPhoneInput, PersonPhoneOperation, E400BadRequest, E404NotFound)
 
 
 class PersonPhoneProvider(IPersonPhoneProvider):
     connection_string: str
     db_engine: sqlalchemy.engine.Engine
+    phone_number_type_provider: PhoneNumberTypeProvider
 
     def __init__(self, connection_string: Optional[str] = None,
-                 db_engine: Optional[sqlalchemy.engine.Engine] = None):
+                 db_engine: Optional[sqlalchemy.engine.Engine] = None,
+                 phone_number_type_provider: Optional[PhoneNumberTypeProvider] = None):
         self.connection_string = connection_string or PostgresdbConnectionConfig.get_db_connection_string()
-        self.db_engine = db_engine or create_engine(self.connection_string)
+        self.db_engine = db_engine or DbEngineRegistry.get_postgresdb_engine(self.connection_string)
+        self.phone_number_type_provider = phone_number_type_provider or PhoneNumberTypeProvider(self.connection_string,
+                                                                                                self.db_engine)
 
     def get_person_phones(self, filters: Optional[str] = None,
                           order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
-                          limit: Optional[int] = None, offset: Optional[int] = None
+                          limit: Optional[int] = None, offset: Optional[int] = None, fields: Optional[str] = None
                           ) -> List[Tuple[PersonPhone, Person, PhoneNumberType]]:
+        is_cache_enabled = PhoneNumberTypeCacheConfig.from_json().is_enabled
         with Session(self.db_engine) as db_session:
-            statement = select(PersonPhone, Person, PhoneNumberType).select_from(PersonPhone)
-            if filters is not None:
-                person_phone_db_filter = PersonPhoneDbFilter.from_filter_string(filters)
-                statement = person_phone_db_filter.filter_person_phones(statement)
-            if order_by is not None:
-                person_phone_db_order = PersonPhoneDbOrder(by=order_by, order=order_type)
-                statement = person_phone_db_order.order_person_phones(statement)
-            if offset is not None:
-                if offset < 0:
-                    raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
-                                                      f"Value '{offset}' is invalid for SKIP clause.")
-                statement = statement.offset(offset)
-            if limit is not None:
-                if limit < 0:
-                    raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
-                                                      f"Value '{limit}' is invalid for LIMIT clause.")
-                statement = statement.limit(limit)
-
-            statement = statement\
-                .join(Person, onclause=text(TableDetailsConfig.get_foreign_key_join_condition("person_phone", "person")))\
-                .join(PhoneNumberType, onclause=text(TableDetailsConfig.get_foreign_key_join_condition("person_phone", "phone_number_type")))
+            statement = PersonPhoneProvider.get_person_phones_statement(filters, order_by, order_type, limit, offset,
+                                                                        fields, not is_cache_enabled)
             person_phones = db_session.execute(statement).all()
+        if is_cache_enabled:
+            return self.attach_cached_phone_number_types(person_phones)
         person_phones = list(map(lambda p: (p[0], p[1], p[2]), person_phones))
         return person_phones
 
+    def get_person_phones_page(self, filters: Optional[str] = None,
+                               order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                               limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[str] = None
+                               ) -> Tuple[List[Tuple[PersonPhone, Person, PhoneNumberType]], Optional[str]]:
+        keyset_pagination = PersonPhoneDbOrder.get_keyset_pagination(order_by, order_type)
+        is_cache_used = PhoneNumberTypeCacheConfig.from_json().is_enabled and \
+            not PersonPhoneDbOrder.is_phone_number_type_ordered(order_by)
+        with Session(self.db_engine) as db_session:
+            statement = PersonPhoneProvider.get_person_phones_page_statement(keyset_pagination, filters, limit, cursor,
+                                                                             fields, not is_cache_used)
+            person_phones = db_session.execute(statement).all()
+        if is_cache_used:
+            person_phones = self.attach_cached_phone_number_types(person_phones)
+        else:
+            person_phones = list(map(lambda p: (p[0], p[1], p[2]), person_phones))
+        return person_phones, keyset_pagination.get_next_cursor(person_phones, limit)
+
+    def get_person_phones_with_total(self, filters: Optional[str] = None,
+                                     order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                     limit: Optional[int] = None, offset: Optional[int] = None,
+                                     fields: Optional[str] = None
+                                     ) -> Tuple[List[Tuple[PersonPhone, Person, PhoneNumberType]], int]:
+        is_cache_enabled = PhoneNumberTypeCacheConfig.from_json().is_enabled
+        with Session(self.db_engine) as db_session:
+            statement = PersonPhoneProvider.get_person_phones_with_total_statement(filters, order_by, order_type,
+                                                                                   limit, offset, fields,
+                                                                                   not is_cache_enabled)
+            person_phones = db_session.execute(statement).all()
+            if len(person_phones) == 0 and offset:
+                statement = PersonPhoneProvider.count_person_phones_statement(filters)
+                person_phones_total = int(db_session.exec(statement).one())
+            else:
+                person_phones_total = person_phones[0][-1] if len(person_phones) > 0 else 0
+        if is_cache_enabled:
+            return self.attach_cached_phone_number_types(person_phones), person_phones_total
+        person_phones = list(map(lambda p: (p[0], p[1], p[2]), person_phones))
+        return person_phones, person_phones_total
+
+    def stream_person_phones(self, filters: Optional[str] = None,
+                             order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                             batch_size: int = 1000, fields: Optional[str] = None
+                             ) -> Iterator[List[Tuple[PersonPhone, Person, PhoneNumberType]]]:
+        is_cache_enabled = PhoneNumberTypeCacheConfig.from_json().is_enabled
+        statement = PersonPhoneProvider.get_person_phones_statement(filters, order_by, order_type, None, None, fields,
+                                                                    not is_cache_enabled)
+        return self.__stream_person_phones(statement, batch_size, is_cache_enabled)
+
+    def __stream_person_phones(self, statement: SelectOfScalar[Tuple[PersonPhone, Person, PhoneNumberType]],
+                               batch_size: int, is_cache_enabled: bool = False
+                               ) -> Iterator[List[Tuple[PersonPhone, Person, PhoneNumberType]]]:
+        """ Yields batches of selected person phones fetched from a server-side cursor """
+        with Session(self.db_engine) as db_session:
+            result = db_session.execute(statement.execution_options(yield_per=batch_size))
+            for person_phones in result.partitions():
+                if is_cache_enabled:
+                    yield self.attach_cached_phone_number_types(person_phones)
+                else:
+                    yield list(map(lambda p: (p[0], p[1], p[2]), person_phones))
+
     def count_person_phones(self, filters: Optional[str] = None) -> int:
         with Session(self.db_engine) as db_session:
-            statement = select(sqlalchemy.func.count()).select_from(PersonPhone)
-            if filters is not None:
-                person_phone_db_filter = PersonPhoneDbFilter.from_filter_string(filters)
-                statement = person_phone_db_filter.filter_person_phones(statement)
+            statement = PersonPhoneProvider.count_person_phones_statement(filters)
             persons_count = int(db_session.exec(statement).one())
         return persons_count
 
-    def get_person_phone(self, person_phone_id: Tuple[int, str, int]) -> Tuple[PersonPhone, Person, PhoneNumberType]:
-        with (Session(self.db_engine) as db_session):
-            statement = select(PersonPhone, Person, PhoneNumberType).select_from(PersonPhone)\
-                .where(sqlalchemy.and_(PersonPhone.business_entity_id == person_phone_id[0],
-                                       PersonPhone.phone_number == person_phone_id[1],
-                                       PersonPhone.phone_number_type_id == person_phone_id[2]))
+    def exists_person_phones(self, filters: Optional[str] = None) -> bool:
+        with Session(self.db_engine) as db_session:
+            statement = PersonPhoneProvider.exists_person_phones_statement(filters)
+            is_existing = bool(db_session.exec(statement).one())
+        return is_existing
 
-            statement = statement\
-                .join(Person, onclause=text(TableDetailsConfig.get_foreign_key_join_condition("person_phone", "person")))\
-                .join(PhoneNumberType, onclause=text(TableDetailsConfig.get_foreign_key_join_condition("person_phone", "phone_number_type")))
+    def get_person_phone(self, person_phone_id: Tuple[int, str, int]) -> Tuple[PersonPhone, Person, PhoneNumberType]:
+        is_cache_enabled = PhoneNumberTypeCacheConfig.from_json().is_enabled
+        with Session(self.db_engine) as db_session:
+            statement = PersonPhoneProvider.get_person_phone_statement(person_phone_id, not is_cache_enabled)
             person_phone = db_session.execute(statement).first()
         if person_phone is None:
             raise errors.NotFoundError(f"{E404NotFound.PERSON_PHONE_NOT_FOUND}: "
                                        f"Person phone of id '{person_phone_id}' does not exist.")
+        if is_cache_enabled:
+            return self.attach_cached_phone_number_types(list([person_phone]))[0]
         return tuple((person_phone[0], person_phone[1], person_phone[2]))
 
+    def attach_cached_phone_number_types(self, person_phones: List[Any]
+                                         ) -> List[Tuple[PersonPhone, Person, PhoneNumberType]]:
+        """
+        Returns given rows of person phones with their persons, each with its phone number type taken from the cache.
+        Reloads the cache once if any of the phone number types is missing in it.
+        """
+        phone_number_types = self.get_cached_phone_number_types_of(list(map(lambda p: p[0], person_phones)))
+        return PersonPhoneProvider.get_person_phones_with_phone_number_types(person_phones, phone_number_types)
+
+    def get_cached_phone_number_types_of(self, person_phones: List[PersonPhone]) -> Dict[int, PhoneNumberType]:
+        """ Returns cached phone number types by id, reloaded once if any type of given person phones is missing """
+        phone_number_types = self.phone_number_type_provider.get_cached_phone_number_types()
+        if any(map(lambda pp: pp.phone_number_type_id not in phone_number_types, person_phones)):
+            phone_number_types = self.phone_number_type_provider.load_phone_number_type_cache()
+        return phone_number_types
+
+    def get_person_phones_by_ids(self, person_phone_ids: List[Tuple[int, str, int]]
+                                 ) -> List[Optional[Tuple[PersonPhone, Person, PhoneNumberType]]]:
+        utils.check_ids_count(len(person_phone_ids))
+        is_cache_enabled = PhoneNumberTypeCacheConfig.from_json().is_enabled
+        with Session(self.db_engine) as db_session:
+            statement = PersonPhoneProvider.get_person_phones_by_ids_statement(person_phone_ids, not is_cache_enabled)
+            person_phones = db_session.execute(statement).all()
+        if is_cache_enabled:
+            person_phones = self.attach_cached_phone_number_types(person_phones)
+        else:
+            person_phones = list(map(lambda pp: tuple((pp[0], pp[1], pp[2])), person_phones))
+        return utils.get_objects_in_ids_order(list(map(tuple, person_phone_ids)), person_phones,
+                                              PersonPhoneProvider.get_person_phone_id)
+
+    def get_person_phones_by_person_ids(self, person_ids: List[int]) -> List[Tuple[PersonPhone, PhoneNumberType]]:
+        is_cache_enabled = PhoneNumberTypeCacheConfig.from_json().is_enabled
+        with Session(self.db_engine) as db_session:
+            statement = PersonPhoneProvider.get_person_phones_by_person_ids_statement(person_ids, not is_cache_enabled)
+            person_phones = db_session.execute(statement).all()
+        if is_cache_enabled:
+            phone_number_types = self.get_cached_phone_number_types_of(list(map(lambda pp: pp[0], person_phones)))
+            return list(map(lambda pp: tuple((pp[0], phone_number_types.get(pp[0].phone_number_type_id, None))),
+                            person_phones))
+        return list(map(lambda pp: tuple((pp[0], pp[1])), person_phones))
+
     def insert_person_phone(self, person_phone_input: PersonPhoneInput) -> Tuple[int, str, int]:
         person_phone = PersonPhone(**person_phone_input.dict())
         try:
@@ -86,39 +178,398 @@ class PersonPhoneProvider(IPersonPhoneProvider):
                                          person_phone.phone_number_type_id))
             return person_phone_id
         except sqlalchemy.exc.IntegrityError as e:
-            if EConstraintViolation.UNIQUE_VIOLATION in str(e):
-                raise errors.IntegrityError(f"{E400BadRequest.PRIMARY_KEY_CONSTRAINT_VIOLATION}: {str(e)}")
-            elif EConstraintViolation.FOREIGN_KEY_VIOLATION in str(e):
-                raise errors.IntegrityError(f"{E400BadRequest.FOREIGN_KEY_CONSTRAINT_VIOLATION}: {str(e)}")
-            else:
-                raise e
+            PersonPhoneProvider.raise_integrity_error(e)
 
-    def update_person_phone(self, person_phone_id: Tuple[int, str, int],
-                            person_phone_input: PersonPhoneInput) -> Tuple[int, str, int]:
-        updated_person_phone = self.get_person_phone(person_phone_id)[0]
-        updated_person_phone.update_from_input(person_phone_input)
-        updated_person_phone.modified_date = dt.datetime.utcnow()
+    def copy_person_phones(self, person_phone_inputs: List[PersonPhoneInput]) -> List[int]:
+        if len(person_phone_inputs) == 0:
+            return list([])
+        import_table = PersonPhoneProvider.get_person_phone_import_table()
+        with self.db_engine.begin() as connection:
+            connection.execute(PersonPhoneProvider.create_person_phone_import_table_statement())
+            CopyLoader.copy(connection, import_table.name, list(import_table.c.keys()),
+                            PersonPhoneProvider.get_copy_records(person_phone_inputs))
+            statement = PersonPhoneProvider.insert_imported_person_phones_statement()
+            person_phone_ids = connection.execute(statement).all()
+        return PersonPhoneProvider.get_skipped_positions(person_phone_inputs, person_phone_ids)
+
+    def update_and_get_person_phone(self, person_phone_id: Tuple[int, str, int], person_phone_input: PersonPhoneInput
+                                    ) -> Tuple[PersonPhone, Person, PhoneNumberType]:
+        PersonPhone(**person_phone_input.dict()).validate_assignment(person_phone_input)
         try:
             with Session(self.db_engine) as db_session:
-                db_session.add(updated_person_phone)
+                statement = PersonPhoneProvider.update_person_phone_statement(person_phone_id, person_phone_input)
+                updated_person_phone = db_session.execute(statement).first()
                 db_session.commit()
-                db_session.refresh(updated_person_phone)
-                person_phone_id = tuple((updated_person_phone.business_entity_id, updated_person_phone.phone_number,
-                                         updated_person_phone.phone_number_type_id))
-            return person_phone_id
         except sqlalchemy.exc.IntegrityError as e:
-            if EConstraintViolation.UNIQUE_VIOLATION in str(e):
-                raise errors.IntegrityError(f"{E400BadRequest.PRIMARY_KEY_CONSTRAINT_VIOLATION}: {str(e)}")
-            elif EConstraintViolation.FOREIGN_KEY_VIOLATION in str(e):
-                raise errors.IntegrityError(f"{E400BadRequest.FOREIGN_KEY_CONSTRAINT_VIOLATION}: {str(e)}")
-            else:
-                raise e
+            PersonPhoneProvider.raise_integrity_error(e)
+        if updated_person_phone is None:
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_PHONE_NOT_FOUND}: "
+                                       f"Person phone of id '{person_phone_id}' does not exist.")
+        return utils.get_models_from_row([PersonPhone, Person, PhoneNumberType], updated_person_phone)
+
+    def update_person_phone(self, person_phone_id: Tuple[int, str, int],
+                            person_phone_input: PersonPhoneInput) -> Tuple[int, str, int]:
+        updated_person_phone = self.update_and_get_person_phone(person_phone_id, person_phone_input)[0]
+        return tuple((updated_person_phone.business_entity_id, updated_person_phone.phone_number,
+                      updated_person_phone.phone_number_type_id))
 
     def delete_person_phone(self, person_phone_id: Tuple[int, str, int]) -> None:
-        deleted_person_phone = self.get_person_phone(person_phone_id)[0]
         with Session(self.db_engine) as db_session:
-            db_session.delete(deleted_person_phone)
+            statement = PersonPhoneProvider.delete_person_phone_statement(person_phone_id)
+            deleted_person_phone = db_session.execute(statement).first()
+            db_session.commit()
+        if deleted_person_phone is None:
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_PHONE_NOT_FOUND}: "
+                                       f"Person phone of id '{person_phone_id}' does not exist.")
+
+    def execute_person_phone_operations(self, person_phone_operations: List[PersonPhoneOperation]
+                                        ) -> List[Union[Tuple[PersonPhone, Person, PhoneNumberType], Exception]]:
+        utils.check_batch_operations_count(len(person_phone_operations))
+        results = list([])
+        with Session(self.db_engine) as db_session:
+            for person_phone_operation in person_phone_operations:
+                try:
+                    statement = PersonPhoneProvider.get_person_phone_operation_statement(person_phone_operation)
+                    with db_session.begin_nested():
+                        row = db_session.execute(statement).first()
+                        result = PersonPhoneProvider.get_person_phone_operation_result(person_phone_operation, row)
+                except sqlalchemy.exc.IntegrityError as e:
+                    result = PersonPhoneProvider.get_integrity_error(e)
+                except Exception as e:
+                    result = e
+                results.append(result)
             db_session.commit()
+        return results
+
+    @staticmethod
+    def get_person_phones_statement(filters: Optional[str] = None,
+                                    order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                    limit: Optional[int] = None, offset: Optional[int] = None,
+                                    fields: Optional[str] = None, is_phone_number_type_selected: bool = True
+                                    ) -> SelectOfScalar[Tuple[PersonPhone, Person, PhoneNumberType]]:
+        """
+        Returns statement selecting appropriate person phones joined with their persons and phone number types.
+        Persons are loaded with given fields only. Phone number types are not selected if the flag is not set,
+        then they are joined only if needed for ordering.
+        """
+        if is_phone_number_type_selected:
+            statement = select(PersonPhone, Person, PhoneNumberType).select_from(PersonPhone)
+        else:
+            statement = select(PersonPhone, Person).select_from(PersonPhone)
+        statement = PersonDbFields.from_fields_string(fields).project_persons(statement)
+        if filters is not None:
+            person_phone_db_filter = PersonPhoneDbFilter.from_filter_string(filters)
+            statement = person_phone_db_filter.filter_person_phones(statement)
+        if order_by is not None:
+            person_phone_db_order = PersonPhoneDbOrder(by=order_by, order=order_type)
+            statement = person_phone_db_order.order_person_phones(statement)
+        if offset is not None:
+            if offset < 0:
+                raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                                  f"Value '{offset}' is invalid for SKIP clause.")
+            statement = statement.offset(offset)
+        if limit is not None:
+            if limit < 0:
+                raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                                  f"Value '{limit}' is invalid for LIMIT clause.")
+            statement = statement.limit(limit)
+
+        statement = statement\
+            .join(Person, onclause=text(TableDetailsConfig.get_foreign_key_join_condition("person_phone", "person")))
+        if is_phone_number_type_selected or PersonPhoneDbOrder.is_phone_number_type_ordered(order_by):
+            statement = statement\
+                .join(PhoneNumberType, onclause=text(TableDetailsConfig.get_foreign_key_join_condition("person_phone", "phone_number_type")))
+        return statement
+
+    @staticmethod
+    def get_person_phones_with_total_statement(filters: Optional[str] = None,
+                                               order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                               limit: Optional[int] = None, offset: Optional[int] = None,
+                                               fields: Optional[str] = None, is_phone_number_type_selected: bool = True
+                                               ) -> SelectOfScalar[Tuple[PersonPhone, Person, PhoneNumberType, int]]:
+        """ Returns statement selecting appropriate person phones, each with count of all matching ones """
+        statement = PersonPhoneProvider.get_person_phones_statement(filters, order_by, order_type, limit, offset,
+                                                                    fields, is_phone_number_type_selected)
+        return statement.add_columns(sqlalchemy.func.count().over().label("total_count"))
+
+    @staticmethod
+    def get_person_phones_page_statement(keyset_pagination: KeysetPagination, filters: Optional[str] = None,
+                                         limit: Optional[int] = None, cursor: Optional[str] = None,
+                                         fields: Optional[str] = None, is_phone_number_type_selected: bool = True
+                                         ) -> SelectOfScalar[Tuple[PersonPhone, Person, PhoneNumberType]]:
+        """
+        Returns statement selecting page of appropriate person phones placed after given cursor. Phone number types
+        are not selected if the flag is not set, then they are joined only if the pagination orders by them.
+        """
+        if is_phone_number_type_selected:
+            statement = select(PersonPhone, Person, PhoneNumberType).select_from(PersonPhone)
+        else:
+            statement = select(PersonPhone, Person).select_from(PersonPhone)
+        statement = PersonDbFields.from_fields_string(fields).project_persons(statement, keyset_pagination.columns)
+        if filters is not None:
+            person_phone_db_filter = PersonPhoneDbFilter.from_filter_string(filters)
+            statement = person_phone_db_filter.filter_person_phones(statement)
+        statement = keyset_pagination.paginate(statement, cursor)
+        if limit is not None:
+            if limit < 0:
+                raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                                  f"Value '{limit}' is invalid for LIMIT clause.")
+            statement = statement.limit(limit)
+
+        statement = statement\
+            .join(Person, onclause=text(TableDetailsConfig.get_foreign_key_join_condition("person_phone", "person")))
+        if is_phone_number_type_selected or any(map(lambda c: c.class_ is PhoneNumberType, keyset_pagination.columns)):
+            statement = statement\
+                .join(PhoneNumberType, onclause=text(TableDetailsConfig.get_foreign_key_join_condition("person_phone", "phone_number_type")))
+        return statement
+
+    @staticmethod
+    def count_person_phones_statement(filters: Optional[str] = None) -> SelectOfScalar[int]:
+        """ Returns statement counting appropriate person phones """
+        statement = select(sqlalchemy.func.count()).select_from(PersonPhone)
+        if filters is not None:
+            person_phone_db_filter = PersonPhoneDbFilter.from_filter_string(filters)
+            statement = person_phone_db_filter.filter_person_phones(statement)
+        return statement
+
+    @staticmethod
+    def exists_person_phones_statement(filters: Optional[str] = None) -> SelectOfScalar[bool]:
+        """ Returns statement checking if any appropriate person phone exists, it stops at the first matching row """
+        statement = select(PersonPhone.business_entity_id)
+        if filters is not None:
+            person_phone_db_filter = PersonPhoneDbFilter.from_filter_string(filters)
+            statement = person_phone_db_filter.filter_person_phones(statement)
+        return select(statement.exists())
+
+    @staticmethod
+    def update_person_phone_statement(person_phone_id: Tuple[int, str, int],
+                                      person_phone_input: PersonPhoneInput) -> SelectOfScalar[Tuple]:
+        """
+        Returns statement updating person phone of given person_phone_id from given input,
+        selecting the updated person phone columns joined with its person and phone number type columns
+        """
+        person_phone_values = dict(person_phone_input.dict(), modified_date=dt.datetime.utcnow())
+        updated_person_phone = sqlalchemy.update(PersonPhone)\
+            .where(sqlalchemy.and_(PersonPhone.business_entity_id == person_phone_id[0],
+                                   PersonPhone.phone_number == person_phone_id[1],
+                                   PersonPhone.phone_number_type_id == person_phone_id[2]))\
+            .values(dict(map(lambda kv: (getattr(PersonPhone, kv[0]), kv[1]), person_phone_values.items())))\
+            .returning(*utils.get_model_columns(PersonPhone))\
+            .cte("updated_person_phone")
+        return PersonPhoneProvider.join_person_phone_statement(updated_person_phone)
+
+    @staticmethod
+    def create_person_phone_statement(person_phone_input: PersonPhoneInput) -> SelectOfScalar[Tuple]:
+        """
+        Returns statement inserting person phone of given input,
+        selecting the new person phone columns joined with its person and phone number type columns
+        """
+        person_phone_values = dict(person_phone_input.dict(), modified_date=dt.datetime.utcnow())
+        new_person_phone = sqlalchemy.insert(PersonPhone)\
+            .values(dict(map(lambda kv: (getattr(PersonPhone, kv[0]), kv[1]), person_phone_values.items())))\
+            .returning(*utils.get_model_columns(PersonPhone))\
+            .cte("new_person_phone")
+        return PersonPhoneProvider.join_person_phone_statement(new_person_phone)
+
+    @staticmethod
+    def join_person_phone_statement(person_phone_cte: sqlalchemy.sql.expression.CTE) -> SelectOfScalar[Tuple]:
+        """ Returns statement selecting person phone of given CTE joined with its person and phone number type """
+        person_phone_columns = list(person_phone_cte.c)
+        return sqlalchemy.select(*person_phone_columns,
+                                 *utils.get_model_columns(Person), *utils.get_model_columns(PhoneNumberType))\
+            .select_from(person_phone_cte)\
+            .join(Person, onclause=Person.business_entity_id == person_phone_columns[0])\
+            .join(PhoneNumberType, onclause=PhoneNumberType.phone_number_type_id == person_phone_columns[2])
+
+    @staticmethod
+    def get_person_phone_operation_statement(person_phone_operation: PersonPhoneOperation
+                                             ) -> sqlalchemy.sql.Executable:
+        """ Returns statement of given batch operation, raises error if the operation values are missing or invalid """
+        operation, person_phone_id, person_phone_input = person_phone_operation.operation, \
+            person_phone_operation.person_phone_id, person_phone_operation.person_phone_input
+        if operation == EBatchOperation.DELETE:
+            utils.check_batch_operation_values(operation, dict(person_phone_id=person_phone_id))
+            return PersonPhoneProvider.delete_person_phone_statement(person_phone_id)
+
+        if operation == EBatchOperation.CREATE:
+            utils.check_batch_operation_values(operation, dict(person_phone_input=person_phone_input))
+        else:
+            utils.check_batch_operation_values(operation, dict(person_phone_id=person_phone_id,
+                                                               person_phone_input=person_phone_input))
+        PersonPhone(**person_phone_input.dict()).validate_assignment(person_phone_input)
+        if operation == EBatchOperation.CREATE:
+            return PersonPhoneProvider.create_person_phone_statement(person_phone_input)
+        return PersonPhoneProvider.update_person_phone_statement(person_phone_id, person_phone_input)
+
+    @staticmethod
+    def get_person_phone_operation_result(person_phone_operation: PersonPhoneOperation, row: Optional[Any]
+                                          ) -> Optional[Tuple[PersonPhone, Person, PhoneNumberType]]:
+        """
+        Returns person phone created or updated by given batch operation joined with its person and phone number type,
+        nothing for deletion, raises error if the person phone does not exist
+        """
+        if row is None:
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_PHONE_NOT_FOUND}: "
+                                       f"Person phone of id '{person_phone_operation.person_phone_id}' does not exist.")
+        if person_phone_operation.operation == EBatchOperation.DELETE:
+            return None
+        return utils.get_models_from_row([PersonPhone, Person, PhoneNumberType], row)
+
+    @staticmethod
+    def get_person_phone_import_table() -> sqlalchemy.sql.TableClause:
+        """ Returns temporary table person phones are copied into before they are inserted """
+        return sqlalchemy.table("person_phone_import", *map(sqlalchemy.column, CopyLoader.get_columns(PersonPhone)))
+
+    @staticmethod
+    def create_person_phone_import_table_statement() -> sqlalchemy.sql.expression.TextClause:
+        """ Returns statement creating the import table shaped like person phone table, dropped at commit """
+        table_name = postgresql.dialect().identifier_preparer.format_table(PersonPhone.__table__)
+        import_table = PersonPhoneProvider.get_person_phone_import_table()
+        return text(f"CREATE TEMPORARY TABLE {import_table.name} (LIKE {table_name}) ON COMMIT DROP")
+
+    @staticmethod
+    def get_copy_records(person_phone_inputs: List[PersonPhoneInput]) -> List[Tuple]:
+        """ Returns COPY records of person phones of given inputs """
+        modified_date = dt.datetime.utcnow()
+        person_phone_values = list(map(lambda ppi: dict(ppi.dict(), modified_date=modified_date),
+                                       person_phone_inputs))
+        return CopyLoader.get_records(PersonPhone, person_phone_values)
+
+    @staticmethod
+    def insert_imported_person_phones_statement() -> sqlalchemy.sql.Insert:
+        """
+        Returns statement inserting person phones of the import table, skipping the ones with missing person
+        or phone number type and the already existing ones, returning ids of the inserted person phones.
+        Skipping instead of failing lets one bad row leave the rest of the batch loaded.
+        """
+        import_table = PersonPhoneProvider.get_person_phone_import_table()
+        import_columns = list(import_table.c)
+        imported_person_phones = sqlalchemy.select(*import_columns)\
+            .where(sqlalchemy.exists().where(Person.business_entity_id == import_columns[0]))\
+            .where(sqlalchemy.exists().where(PhoneNumberType.phone_number_type_id == import_columns[2]))
+        return postgresql.insert(PersonPhone)\
+            .from_select(utils.get_model_columns(PersonPhone), imported_person_phones)\
+            .on_conflict_do_nothing()\
+            .returning(PersonPhone.business_entity_id, PersonPhone.phone_number, PersonPhone.phone_number_type_id)
+
+    @staticmethod
+    def get_skipped_positions(person_phone_inputs: List[PersonPhoneInput],
+                              person_phone_ids: List[Tuple[int, str, int]]) -> List[int]:
+        """ Returns positions of given inputs without inserted person phone, repeated inputs after the first one """
+        inserted_ids = set(map(tuple, person_phone_ids))
+        skipped_positions = list([])
+        for i, ppi in enumerate(person_phone_inputs):
+            person_phone_id = tuple((ppi.business_entity_id, ppi.phone_number, ppi.phone_number_type_id))
+            if person_phone_id in inserted_ids:
+                inserted_ids.remove(person_phone_id)
+            else:
+                skipped_positions.append(i)
+        return skipped_positions
+
+    @staticmethod
+    def delete_person_phone_statement(person_phone_id: Tuple[int, str, int]) -> sqlalchemy.sql.Delete:
+        """ Returns statement deleting person phone of given person_phone_id, returning its business entity id """
+        return sqlalchemy.delete(PersonPhone)\
+            .where(sqlalchemy.and_(PersonPhone.business_entity_id == person_phone_id[0],
+                                   PersonPhone.phone_number == person_phone_id[1],
+                                   PersonPhone.phone_number_type_id == person_phone_id[2]))\
+            .returning(PersonPhone.business_entity_id)
+
+    @staticmethod
+    def get_person_phone_statement(person_phone_id: Tuple[int, str, int], is_phone_number_type_selected: bool = True
+                                   ) -> SelectOfScalar[Tuple[PersonPhone, Person, PhoneNumberType]]:
+        """ Returns statement selecting person phone of given person_phone_id joined with its person and phone number type """
+        if is_phone_number_type_selected:
+            statement = select(PersonPhone, Person, PhoneNumberType).select_from(PersonPhone)
+        else:
+            statement = select(PersonPhone, Person).select_from(PersonPhone)
+        statement = statement\
+            .where(sqlalchemy.and_(PersonPhone.business_entity_id == person_phone_id[0],
+                                   PersonPhone.phone_number == person_phone_id[1],
+                                   PersonPhone.phone_number_type_id == person_phone_id[2]))
+
+        statement = statement\
+            .join(Person, onclause=text(TableDetailsConfig.get_foreign_key_join_condition("person_phone", "person")))
+        if is_phone_number_type_selected:
+            statement = statement\
+                .join(PhoneNumberType, onclause=text(TableDetailsConfig.get_foreign_key_join_condition("person_phone", "phone_number_type")))
+        return statement
+
+    @staticmethod
+    def get_person_phones_by_ids_statement(person_phone_ids: List[Tuple[int, str, int]],
+                                           is_phone_number_type_selected: bool = True
+                                           ) -> SelectOfScalar[Tuple[PersonPhone, Person, PhoneNumberType]]:
+        """
+        Returns statement selecting person phones of given person_phone_ids joined with their persons
+        and phone number types, the latter only if the flag is set.
+        Each id part is bound as one array parameter, the arrays are unnested into id tuples.
+        """
+        id_arrays = list(map(lambda i, t: sqlalchemy.bindparam(f"person_phone_ids_{i}",
+                                                               list(map(lambda ppi: ppi[i], person_phone_ids)),
+                                                               type_=postgresql.ARRAY(t)),
+                             range(3), [sqlalchemy.Integer, sqlalchemy.String, sqlalchemy.Integer]))
+        ids = sqlalchemy.select(*map(sqlalchemy.func.unnest, id_arrays))
+        if is_phone_number_type_selected:
+            statement = select(PersonPhone, Person, PhoneNumberType).select_from(PersonPhone)
+        else:
+            statement = select(PersonPhone, Person).select_from(PersonPhone)
+        statement = statement\
+            .where(sqlalchemy.tuple_(PersonPhone.business_entity_id, PersonPhone.phone_number,
+                                     PersonPhone.phone_number_type_id).in_(ids))
+
+        statement = statement\
+            .join(Person, onclause=text(TableDetailsConfig.get_foreign_key_join_condition("person_phone", "person")))
+        if is_phone_number_type_selected:
+            statement = statement\
+                .join(PhoneNumberType, onclause=text(TableDetailsConfig.get_foreign_key_join_condition("person_phone", "phone_number_type")))
+        return statement
+
+    @staticmethod
+    def get_person_phones_by_person_ids_statement(person_ids: List[int], is_phone_number_type_selected: bool = True
+                                                  ) -> SelectOfScalar[Tuple[PersonPhone, PhoneNumberType]]:
+        """
+        Returns statement selecting person phones of persons of given person_ids joined with their phone number types
+        (only if the flag is set), ordered by person. Persons are not joined, so their rows are not repeated for each phone.
+        """
+        person_ids_array = sqlalchemy.bindparam("person_ids", list(person_ids),
+                                                type_=postgresql.ARRAY(sqlalchemy.Integer))
+        if is_phone_number_type_selected:
+            statement = select(PersonPhone, PhoneNumberType).select_from(PersonPhone)\
+                .join(PhoneNumberType, onclause=text(TableDetailsConfig.get_foreign_key_join_condition("person_phone", "phone_number_type")))
+        else:
+            statement = select(PersonPhone).select_from(PersonPhone)
+        return statement\
+            .where(PersonPhone.business_entity_id == sqlalchemy.any_(person_ids_array))\
+            .order_by(PersonPhone.business_entity_id, PersonPhone.phone_number, PersonPhone.phone_number_type_id)
+
+    @staticmethod
+    def get_person_phones_with_phone_number_types(person_phones: List[Any],
+                                                  phone_number_types: Dict[int, PhoneNumberType]
+                                                  ) -> List[Tuple[PersonPhone, Person, PhoneNumberType]]:
+        """ Returns given rows of person phones with their persons, each with its phone number type of given ones """
+        return list(map(lambda p: (p[0], p[1], phone_number_types.get(p[0].phone_number_type_id, None)),
+                        person_phones))
+
+    @staticmethod
+    def get_person_phone_id(person_phone: Tuple[PersonPhone, Person, PhoneNumberType]) -> Tuple[int, str, int]:
+        """ Returns id of given person phone joined with its person and phone number type """
+        return tuple((person_phone[0].business_entity_id, person_phone[0].phone_number,
+                      person_phone[0].phone_number_type_id))
+
+    @staticmethod
+    def raise_integrity_error(e: sqlalchemy.exc.IntegrityError) -> None:
+        """ Raises integrity error of appropriate constraint violation code """
+        raise PersonPhoneProvider.get_integrity_error(e)
+
+    @staticmethod
+    def get_integrity_error(e: sqlalchemy.exc.IntegrityError) -> Exception:
+        """ Returns integrity error of appropriate constraint violation code, given error if no code matches """
+        if EConstraintViolation.UNIQUE_VIOLATION in str(e):
+            return errors.IntegrityError(f"{E400BadRequest.PRIMARY_KEY_CONSTRAINT_VIOLATION}: {str(e)}")
+        elif EConstraintViolation.FOREIGN_KEY_VIOLATION in str(e):
+            return errors.IntegrityError(f"{E400BadRequest.FOREIGN_KEY_CONSTRAINT_VIOLATION}: {str(e)}")
+        else:
+            return e
 
 
 class PersonPhoneDbFilter(BaseModel):
@@ -159,13 +610,40 @@ class PersonPhoneDbOrder(BaseModel):
         'modified_date': [Person.modified_date]
     })
 
+    primary_key_columns: ClassVar[List[object]] = list([PersonPhone.business_entity_id, PersonPhone.phone_number,
+                                                         PersonPhone.phone_number_type_id])
+
     def order_person_phones(self, person_phone_statement: SelectOfScalar[Tuple[PersonPhone, Person, PhoneNumberType]]) -> SelectOfScalar[Tuple[PersonPhone, Person, PhoneNumberType]]:
-        if self.by not in self.column_mapping.keys():
-            raise errors.ColumnNotFoundError(f"{E400BadRequest.INVALID_ORDERING_COLUMN_NAME}: "
-                                             f"Column does not exist in person phones view ('{self.by}').")
+        self.__guard_ordering_column()
 
         person_phone_attrs = self.column_mapping[self.by]
         order_statement = list(map(lambda a: a.asc() if self.order == EOrderType.ASC else a.desc(), person_phone_attrs))
         person_phone_statement = person_phone_statement.order_by(*order_statement)
 
         return person_phone_statement
+
+    @staticmethod
+    def is_phone_number_type_ordered(order_by: Optional[str] = None) -> bool:
+        """ Returns whether ordering by given column needs person phones to be joined with phone number types """
+        return order_by in PersonPhoneDbOrder.column_mapping.keys() and \
+            any(map(lambda c: c.class_ is PhoneNumberType, PersonPhoneDbOrder.column_mapping[order_by]))
+
+    @staticmethod
+    def get_keyset_pagination(order_by: Optional[str] = None,
+                              order_type: Optional[EOrderType] = None) -> KeysetPagination:
+        """ Returns keyset pagination of person phones ordered by given column, by id if no column is given """
+        order_type = EOrderType(order_type or EOrderType.ASC)
+        if order_by is None:
+            return KeysetPagination.from_columns(list([]), PersonPhoneDbOrder.primary_key_columns, order_type,
+                                                 f"person_phone:{order_type.value}")
+
+        person_phone_db_order = PersonPhoneDbOrder(by=order_by, order=order_type)
+        person_phone_db_order.__guard_ordering_column()
+        return KeysetPagination.from_columns(PersonPhoneDbOrder.column_mapping[order_by],
+                                             PersonPhoneDbOrder.primary_key_columns, order_type,
+                                             f"person_phone:{order_by}:{order_type.value}")
+
+    def __guard_ordering_column(self) -> None:
+        if self.by not in self.column_mapping.keys():
+            raise errors.ColumnNotFoundError(f"{E400BadRequest.INVALID_ORDERING_COLUMN_NAME}: "
+                                             f"Column does not exist in person phones view ('{self.by}').")
@@ -1,14 +1,23 @@
+import uuid
 import datetime as dt
 import sqlalchemy
+import sqlalchemy.orm
+from sqlalchemy.dialects import postgresql
 from pydantic import BaseModel
-from sqlmodel import create_engine, Session, select
+from sqlmodel import Session, select
+from sqlalchemy.sql import ColumnElement
 from sqlmodel.sql.expression import SelectOfScalar
-from typing import Optional, List, Dict, Union, ClassVar
+from typing import Any, Optional, List, Dict, Tuple, Union, ClassVar, Iterator
 
 from app import utils, errors
-from app.config import PostgresdbConnectionConfig
+from app.caches import PersonNameIndex
+from app.config import PostgresdbConnectionConfig, PersonNameIndexConfig
+from app.copy_loader import CopyLoader
+from app.db_engine_registry import DbEngineRegistry
+from app.keyset_pagination import KeysetPagination
 from app.providers import IPersonProvider, BusinessEntityProvider
-from app.models import EOrderType, Person, PersonInput, E400BadRequest, E404NotFound
+from app.models import (EOrderType, EBatchOperation, BusinessEntity, Person, PersonInput, PersonOperation, PersonPhone,
+                        E400BadRequest, E404NotFound)
 
 
 class PersonProvider(IPersonProvider):
@@ -21,80 +30,486 @@ class PersonProvider(IPersonProvider):
                  db_engine: Optional[sqlalchemy.engine.Engine] = None):
         super(PersonProvider, self).__init__()
         self.connection_string = connection_string or PostgresdbConnectionConfig.get_db_connection_string()
-        self.business_entity_provider = business_entity_provider or BusinessEntityProvider()
-        self.db_engine = db_engine or create_engine(self.connection_string)
+        self.db_engine = db_engine or DbEngineRegistry.get_postgresdb_engine(self.connection_string)
+        self.business_entity_provider = business_entity_provider or BusinessEntityProvider(self.connection_string,
+                                                                                           self.db_engine)
 
     def get_persons(self, filters: Optional[str] = None,
                     order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
                     limit: Optional[int] = None, offset: Optional[int] = None,
-                    is_alternative: Optional[bool] = False) -> List[Person]:
+                    is_alternative: Optional[bool] = False, fields: Optional[str] = None,
+                    collation: Optional[str] = None) -> List[Person]:
         with Session(self.db_engine) as db_session:
-            statement = select(Person)
-            if filters is not None:
-                person_db_filter = PersonDbFilter.from_filter_string(filters)
-                statement = person_db_filter.filter_persons(statement, is_alternative)
-            if order_by is not None:
-                person_db_order = PersonDbOrder(by=order_by, order=order_type)
-                statement = person_db_order.order_persons(statement)
-            if offset is not None:
-                if offset < 0:
-                    raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
-                                                      f"Value '{offset}' is invalid for SKIP clause.")
-                statement = statement.offset(offset)
-            if limit is not None:
-                if limit < 0:
-                    raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
-                                                      f"Value '{limit}' is invalid for LIMIT clause.")
-                statement = statement.limit(limit)
+            statement = PersonProvider.get_persons_statement(filters, order_by, order_type, limit, offset,
+                                                             is_alternative, fields, collation)
             persons = db_session.execute(statement).all()
         persons = list(map(lambda p: p[0], persons))
         return persons
 
+    def get_persons_page(self, filters: Optional[str] = None,
+                         order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                         limit: Optional[int] = None, cursor: Optional[str] = None,
+                         is_alternative: Optional[bool] = False, fields: Optional[str] = None,
+                         collation: Optional[str] = None) -> Tuple[List[Person], Optional[str]]:
+        keyset_pagination = PersonDbOrder.get_keyset_pagination(order_by, order_type, collation)
+        with Session(self.db_engine) as db_session:
+            statement = PersonProvider.get_persons_page_statement(keyset_pagination, filters, limit, cursor,
+                                                                  is_alternative, fields)
+            persons = db_session.execute(statement).all()
+        persons = list(map(lambda p: p[0], persons))
+        return persons, keyset_pagination.get_next_cursor(persons, limit)
+
+    def get_persons_with_total(self, filters: Optional[str] = None,
+                               order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                               limit: Optional[int] = None, offset: Optional[int] = None,
+                               fields: Optional[str] = None) -> Tuple[List[Person], int]:
+        with Session(self.db_engine) as db_session:
+            statement = PersonProvider.get_persons_with_total_statement(filters, order_by, order_type, limit, offset,
+                                                                        fields)
+            persons = db_session.execute(statement).all()
+            if len(persons) == 0 and offset:
+                persons_total = int(db_session.exec(PersonProvider.count_persons_statement(filters)).one())
+            else:
+                persons_total = persons[0][-1] if len(persons) > 0 else 0
+        persons = list(map(lambda p: p[0], persons))
+        return persons, persons_total
+
+    def search_persons(self, filters: str, limit: Optional[int] = None,
+                       is_alternative: Optional[bool] = False, fields: Optional[str] = None) -> List[Person]:
+        with Session(self.db_engine) as db_session:
+            statement = PersonProvider.search_persons_statement(filters, limit, is_alternative, fields)
+            persons = db_session.execute(statement).all()
+        persons = list(map(lambda p: p[0], persons))
+        return persons
+
+    def stream_persons(self, filters: Optional[str] = None,
+                       order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                       is_alternative: Optional[bool] = False, is_ranked: Optional[bool] = False,
+                       batch_size: int = 1000, fields: Optional[str] = None,
+                       collation: Optional[str] = None) -> Iterator[List[Person]]:
+        statement = PersonProvider.search_persons_statement(filters, None, is_alternative, fields) if is_ranked \
+            else PersonProvider.get_persons_statement(filters, order_by, order_type, None, None, is_alternative,
+                                                      fields, collation)
+        return self.__stream_persons(statement, batch_size)
+
+    def __stream_persons(self, statement: SelectOfScalar[Person], batch_size: int) -> Iterator[List[Person]]:
+        """ Yields batches of selected persons fetched from a server-side cursor """
+        with Session(self.db_engine) as db_session:
+            result = db_session.execute(statement.execution_options(yield_per=batch_size))
+            for persons in result.partitions():
+                yield list(map(lambda p: p[0], persons))
+
+    def build_person_name_index(self) -> None:
+        if not PersonNameIndexConfig.from_json().is_enabled:
+            return
+        with Session(self.db_engine) as db_session:
+            statement = PersonProvider.get_person_names_statement()
+            person_names = db_session.execute(statement.execution_options(yield_per=10000)).all()
+        PersonNameIndex.build(person_names)
+
+    def get_person_search_names(self) -> List[Tuple]:
+        with Session(self.db_engine) as db_session:
+            statement = PersonProvider.get_person_search_names_statement()
+            person_search_names = db_session.execute(statement.execution_options(yield_per=10000)).all()
+        return list(map(tuple, person_search_names))
+
     def count_persons(self, filters: Optional[str] = None) -> int:
         with Session(self.db_engine) as db_session:
-            statement = select(sqlalchemy.func.count()).select_from(Person)
-            if filters is not None:
-                person_db_filter = PersonDbFilter.from_filter_string(filters)
-                statement = person_db_filter.filter_persons(statement)
+            statement = PersonProvider.count_persons_statement(filters)
             persons_count = int(db_session.exec(statement).one())
         return persons_count
 
-    def get_person(self, person_id: int) -> Person:
+    def get_person(self, person_id: int, fields: Optional[str] = None) -> Person:
         with Session(self.db_engine) as db_session:
-            statement = select(Person).where(Person.business_entity_id == person_id)
+            statement = PersonProvider.get_person_statement(person_id, fields)
             person = db_session.execute(statement).first()
         if person is None:
             raise errors.NotFoundError(f"{E404NotFound.PERSON_NOT_FOUND}: "
                                        f"Person of id '{person_id}' does not exist.")
         return person[0]
 
-    def insert_person(self, person_input: PersonInput) -> int:
-        business_entity_id = self.business_entity_provider.insert_business_entity()
-        person = Person(business_entity_id=business_entity_id, **person_input.dict())
-        person.validate_assignment(person_input)
+    def get_persons_by_ids(self, person_ids: List[int], fields: Optional[str] = None) -> List[Optional[Person]]:
+        utils.check_ids_count(len(person_ids))
         with Session(self.db_engine) as db_session:
-            db_session.add(person)
+            statement = PersonProvider.get_persons_by_ids_statement(person_ids, fields)
+            persons = db_session.execute(statement).all()
+        persons = list(map(lambda p: p[0], persons))
+        return utils.get_objects_in_ids_order(person_ids, persons, lambda p: p.business_entity_id)
+
+    def create_person(self, person_input: PersonInput) -> Person:
+        Person(**person_input.dict()).validate_assignment(person_input)
+        with Session(self.db_engine) as db_session:
+            statement = PersonProvider.create_person_statement(person_input)
+            person = db_session.execute(statement).one()
             db_session.commit()
-            person_id = person.business_entity_id
-        return person_id
+        person = utils.get_models_from_row([Person], person)[0]
+        PersonNameIndex.put(person.business_entity_id, person.first_name, person.last_name)
+        return person
 
-    def update_person(self, person_id: int, person_input: PersonInput) -> int:
-        updated_person = self.get_person(person_id)
-        updated_person.update_from_input(person_input)
-        updated_person.modified_date = dt.datetime.utcnow()
+    def copy_persons(self, person_inputs: List[PersonInput]) -> List[int]:
+        if len(person_inputs) == 0:
+            return list([])
+        with self.db_engine.begin() as connection:
+            statement = PersonProvider.allocate_business_entity_ids_statement(len(person_inputs))
+            person_ids = list(map(lambda r: r[0], connection.execute(statement).all()))
+            business_entity_records, person_records = PersonProvider.get_copy_records(person_ids, person_inputs)
+            CopyLoader.copy(connection, BusinessEntity.__table__.name, CopyLoader.get_columns(BusinessEntity),
+                            business_entity_records, BusinessEntity.__table__.schema)
+            CopyLoader.copy(connection, Person.__table__.name, CopyLoader.get_columns(Person),
+                            person_records, Person.__table__.schema)
+        for person_id, person_input in zip(person_ids, person_inputs):
+            PersonNameIndex.put(person_id, person_input.first_name, person_input.last_name)
+        return person_ids
+
+    def insert_person(self, person_input: PersonInput) -> int:
+        person = self.create_person(person_input)
+        return person.business_entity_id
+
+    def update_and_get_person(self, person_id: int, person_input: PersonInput) -> Person:
+        Person(**person_input.dict()).validate_assignment(person_input)
         with Session(self.db_engine) as db_session:
-            db_session.add(updated_person)
+            statement = PersonProvider.update_person_statement(person_id, person_input)
+            updated_person = db_session.execute(statement).first()
             db_session.commit()
-            db_session.refresh(updated_person)
+        if updated_person is None:
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_NOT_FOUND}: "
+                                       f"Person of id '{person_id}' does not exist.")
+        updated_person = utils.get_models_from_row([Person], updated_person)[0]
+        PersonNameIndex.put(updated_person.business_entity_id, updated_person.first_name, updated_person.last_name)
+        return updated_person
+
+    def update_person(self, person_id: int, person_input: PersonInput) -> int:
+        updated_person = self.update_and_get_person(person_id, person_input)
         return updated_person.business_entity_id
 
     def delete_person(self, person_id: int) -> None:
-        deleted_person = self.get_person(person_id)
-        business_entity_id = deleted_person.business_entity_id
+        self.__delete_person(person_id, is_independent=False)
+
+    def delete_independent_person(self, person_id: int) -> int:
+        return self.__delete_person(person_id, is_independent=True)
+
+    def __delete_person(self, person_id: int, is_independent: bool) -> int:
         with Session(self.db_engine) as db_session:
-            db_session.delete(deleted_person)
+            statement = PersonProvider.delete_person_statement(person_id, is_independent)
+            deleted_count, dependent_count = db_session.execute(statement).one()
             db_session.commit()
-        self.business_entity_provider.delete_business_entity(business_entity_id)
+        if deleted_count == 0 and dependent_count == 0:
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_NOT_FOUND}: "
+                                       f"Person of id '{person_id}' does not exist.")
+        if deleted_count > 0:
+            PersonNameIndex.remove(person_id)
+        return dependent_count
+
+    def execute_person_operations(self, person_operations: List[PersonOperation]
+                                  ) -> List[Union[Person, int, Exception]]:
+        utils.check_batch_operations_count(len(person_operations))
+        results = list([])
+        with Session(self.db_engine) as db_session:
+            for person_operation in person_operations:
+                try:
+                    statement = PersonProvider.get_person_operation_statement(person_operation)
+                    with db_session.begin_nested():
+                        row = db_session.execute(statement).first()
+                        result = PersonProvider.get_person_operation_result(person_operation, row)
+                except Exception as e:
+                    result = e
+                results.append(result)
+            db_session.commit()
+        PersonProvider.update_person_name_index(person_operations, results)
+        return results
+
+    @staticmethod
+    def get_persons_statement(filters: Optional[str] = None,
+                              order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                              limit: Optional[int] = None, offset: Optional[int] = None,
+                              is_alternative: Optional[bool] = False,
+                              fields: Optional[str] = None, collation: Optional[str] = None) -> SelectOfScalar[Person]:
+        """ Returns statement selecting appropriate persons, loading only given fields, names ordered with given collation """
+        statement = PersonDbFields.from_fields_string(fields).project_persons(select(Person))
+        if filters is not None:
+            person_db_filter = PersonDbFilter.from_filter_string(filters)
+            statement = person_db_filter.filter_persons(statement, is_alternative)
+        if order_by is not None:
+            person_db_order = PersonDbOrder(by=order_by, order=order_type, collation=collation)
+            statement = person_db_order.order_persons(statement)
+        if offset is not None:
+            if offset < 0:
+                raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                                  f"Value '{offset}' is invalid for SKIP clause.")
+            statement = statement.offset(offset)
+        if limit is not None:
+            if limit < 0:
+                raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                                  f"Value '{limit}' is invalid for LIMIT clause.")
+            statement = statement.limit(limit)
+        return statement
+
+    @staticmethod
+    def get_persons_with_total_statement(filters: Optional[str] = None,
+                                         order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                         limit: Optional[int] = None, offset: Optional[int] = None,
+                                         fields: Optional[str] = None) -> SelectOfScalar[Tuple[Person, int]]:
+        """
+        Returns statement selecting appropriate persons, each with count of all persons matching the filters.
+        The count is a window function evaluated before LIMIT and OFFSET, so the page and the total
+        come in one round trip. Pages past the end have no rows to carry the count.
+        """
+        statement = PersonProvider.get_persons_statement(filters, order_by, order_type, limit, offset, False, fields)
+        return statement.add_columns(sqlalchemy.func.count().over().label("total_count"))
+
+    @staticmethod
+    def create_person_statement(person_input: PersonInput) -> sqlalchemy.sql.Insert:
+        """
+        Returns statement inserting business entity and person of given input, returning the new person.
+        The business entity is inserted in a data-modifying CTE, so both rows are created by one statement.
+        """
+        modified_date = dt.datetime.utcnow()
+        business_entity_cte = sqlalchemy.insert(BusinessEntity)\
+            .values({BusinessEntity.rowguid: str(uuid.uuid4()), BusinessEntity.modified_date: modified_date})\
+            .returning(BusinessEntity.business_entity_id)\
+            .cte("new_business_entity")
+
+        person_values = dict(person_input.dict(), rowguid=str(uuid.uuid4()), modified_date=modified_date)
+        person_values = dict(map(lambda kv: (getattr(Person, kv[0]), kv[1]), person_values.items()))
+        person_values[Person.business_entity_id] = sqlalchemy.select(business_entity_cte.c[0]).scalar_subquery()
+
+        return sqlalchemy.insert(Person)\
+            .values(person_values)\
+            .add_cte(business_entity_cte)\
+            .returning(*utils.get_model_columns(Person))
+
+    @staticmethod
+    def allocate_business_entity_ids_statement(count: int) -> sqlalchemy.sql.Select:
+        """
+        Returns statement taking given count of business entity ids from the id sequence at once,
+        so rows of a bulk load get their ids without a round trip per row
+        """
+        table_name = postgresql.dialect().identifier_preparer.format_table(BusinessEntity.__table__)
+        column_name = BusinessEntity.business_entity_id.property.columns[0].name
+        sequence_name = sqlalchemy.func.pg_get_serial_sequence(table_name, column_name)
+        return sqlalchemy.select(sqlalchemy.func.nextval(sequence_name))\
+            .select_from(sqlalchemy.func.generate_series(1, count))
+
+    @staticmethod
+    def get_copy_records(person_ids: List[int], person_inputs: List[PersonInput]
+                         ) -> Tuple[List[Tuple[Any, ...]], List[Tuple[Any, ...]]]:
+        """ Returns COPY records of business entities and persons of given ids and inputs """
+        modified_date = dt.datetime.utcnow()
+        business_entity_values = list(map(lambda pi: dict(business_entity_id=pi, rowguid=str(uuid.uuid4()),
+                                                          modified_date=modified_date), person_ids))
+        person_values = list(map(lambda pi: dict(pi[1].dict(), business_entity_id=pi[0], rowguid=str(uuid.uuid4()),
+                                                 modified_date=modified_date), zip(person_ids, person_inputs)))
+        return CopyLoader.get_records(BusinessEntity, business_entity_values), \
+            CopyLoader.get_records(Person, person_values)
+
+    @staticmethod
+    def get_person_operation_statement(person_operation: PersonOperation) -> sqlalchemy.sql.Executable:
+        """ Returns statement of given batch operation, raises error if the operation values are missing or invalid """
+        operation, person_id, person_input = person_operation.operation, person_operation.person_id, \
+            person_operation.person_input
+        if operation == EBatchOperation.DELETE:
+            utils.check_batch_operation_values(operation, dict(person_id=person_id))
+            return PersonProvider.delete_person_statement(person_id, is_independent=True)
+
+        if operation == EBatchOperation.CREATE:
+            utils.check_batch_operation_values(operation, dict(person_input=person_input))
+        else:
+            utils.check_batch_operation_values(operation, dict(person_id=person_id, person_input=person_input))
+        Person(**person_input.dict()).validate_assignment(person_input)
+        if operation == EBatchOperation.CREATE:
+            return PersonProvider.create_person_statement(person_input)
+        return PersonProvider.update_person_statement(person_id, person_input)
+
+    @staticmethod
+    def get_person_operation_result(person_operation: PersonOperation, row: Optional[Any]) -> Union[Person, int]:
+        """
+        Returns person created or updated by given batch operation, for deletion count of dependent person phones
+        (nothing is deleted unless it is zero), raises error if the person does not exist
+        """
+        if row is None or (person_operation.operation == EBatchOperation.DELETE and row[0] == 0 and row[1] == 0):
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_NOT_FOUND}: "
+                                       f"Person of id '{person_operation.person_id}' does not exist.")
+        if person_operation.operation == EBatchOperation.DELETE:
+            return row[1]
+        return utils.get_models_from_row([Person], row)[0]
+
+    @staticmethod
+    def update_person_name_index(person_operations: List[PersonOperation],
+                                 results: List[Union[Person, int, Exception]]) -> None:
+        """ Puts persons created or updated by given batch operations to the name index, removes deleted ones """
+        for person_operation, result in zip(person_operations, results):
+            if isinstance(result, Person):
+                PersonNameIndex.put(result.business_entity_id, result.first_name, result.last_name)
+            elif person_operation.operation == EBatchOperation.DELETE and result == 0:
+                PersonNameIndex.remove(person_operation.person_id)
+
+    @staticmethod
+    def update_person_statement(person_id: int, person_input: PersonInput) -> sqlalchemy.sql.Update:
+        """ Returns statement updating person of given person_id from given input, returning the updated person """
+        person_values = dict(person_input.dict(), modified_date=dt.datetime.utcnow())
+        return sqlalchemy.update(Person)\
+            .where(Person.business_entity_id == person_id)\
+            .values(dict(map(lambda kv: (getattr(Person, kv[0]), kv[1]), person_values.items())))\
+            .returning(*utils.get_model_columns(Person))
+
+    @staticmethod
+    def delete_person_statement(person_id: int, is_independent: bool = False) -> sqlalchemy.sql.Select:
+        """
+        Returns statement deleting person of given person_id with its business entity, selecting counts
+        of deleted persons and of person phones dependent on the person.
+        Both deletes are data-modifying CTEs of one statement. If is_independent is set, nothing is deleted
+        while dependent person phones exist.
+        """
+        dependent_count = sqlalchemy.select(sqlalchemy.func.count()).select_from(PersonPhone)\
+            .where(PersonPhone.business_entity_id == person_id)\
+            .scalar_subquery()
+
+        deleted_person = sqlalchemy.delete(Person).where(Person.business_entity_id == person_id)
+        if is_independent:
+            deleted_person = deleted_person.where(dependent_count == 0)
+        deleted_person = deleted_person.returning(Person.business_entity_id).cte("deleted_person")
+
+        deleted_business_entity = sqlalchemy.delete(BusinessEntity)\
+            .where(BusinessEntity.business_entity_id.in_(sqlalchemy.select(deleted_person.c[0])))\
+            .returning(BusinessEntity.business_entity_id)\
+            .cte("deleted_business_entity")
+
+        deleted_count = sqlalchemy.select(sqlalchemy.func.count()).select_from(deleted_business_entity)\
+            .scalar_subquery()
+        return sqlalchemy.select(deleted_count.label("deleted_count"), dependent_count.label("dependent_count"))
+
+    @staticmethod
+    def search_persons_statement(filters: str, limit: Optional[int] = None,
+                                 is_alternative: Optional[bool] = False,
+                                 fields: Optional[str] = None) -> SelectOfScalar[Person]:
+        """
+        Returns statement selecting persons matching the phrase filters, best ranked first.
+        Phrase filters are ILIKE substring matches served by trigram GIN indexes of the person search migration.
+        """
+        person_db_filter = PersonDbFilter.from_filter_string(filters)
+        statement = PersonDbFields.from_fields_string(fields).project_persons(select(Person))
+        statement = person_db_filter.filter_persons(statement, is_alternative)
+        statement = statement.order_by(person_db_filter.get_rank().desc(), Person.business_entity_id)
+        if limit is not None:
+            if limit < 0:
+                raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                                  f"Value '{limit}' is invalid for LIMIT clause.")
+            statement = statement.limit(limit)
+        return statement
+
+    @staticmethod
+    def get_persons_page_statement(keyset_pagination: KeysetPagination, filters: Optional[str] = None,
+                                   limit: Optional[int] = None, cursor: Optional[str] = None,
+                                   is_alternative: Optional[bool] = False,
+                                   fields: Optional[str] = None) -> SelectOfScalar[Person]:
+        """
+        Returns statement selecting page of appropriate persons placed after given cursor.
+        Sort key columns are always loaded, as the next cursor is encoded from them.
+        """
+        statement = PersonDbFields.from_fields_string(fields).project_persons(select(Person),
+                                                                              keyset_pagination.columns)
+        if filters is not None:
+            person_db_filter = PersonDbFilter.from_filter_string(filters)
+            statement = person_db_filter.filter_persons(statement, is_alternative)
+        statement = keyset_pagination.paginate(statement, cursor)
+        if limit is not None:
+            if limit < 0:
+                raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                                  f"Value '{limit}' is invalid for LIMIT clause.")
+            statement = statement.limit(limit)
+        return statement
+
+    @staticmethod
+    def get_person_names_statement() -> sqlalchemy.sql.Select:
+        """ Returns statement selecting ids, first and last names of all persons """
+        return sqlalchemy.select(Person.business_entity_id, Person.first_name, Person.last_name)
+
+    @staticmethod
+    def get_person_search_names_statement() -> sqlalchemy.sql.Select:
+        """ Returns statement selecting ids, types and name columns of all persons """
+        return sqlalchemy.select(Person.business_entity_id, Person.person_type,
+                                 Person.title, Person.first_name, Person.middle_name, Person.last_name, Person.suffix)
+
+    @staticmethod
+    def count_persons_statement(filters: Optional[str] = None) -> SelectOfScalar[int]:
+        """ Returns statement counting appropriate persons """
+        statement = select(sqlalchemy.func.count()).select_from(Person)
+        if filters is not None:
+            person_db_filter = PersonDbFilter.from_filter_string(filters)
+            statement = person_db_filter.filter_persons(statement)
+        return statement
+
+    @staticmethod
+    def get_person_statement(person_id: int, fields: Optional[str] = None) -> SelectOfScalar[Person]:
+        """ Returns statement selecting person of given person_id, loading only given fields """
+        statement = PersonDbFields.from_fields_string(fields).project_persons(select(Person))
+        return statement.where(Person.business_entity_id == person_id)
+
+    @staticmethod
+    def get_persons_by_ids_statement(person_ids: List[int], fields: Optional[str] = None) -> SelectOfScalar[Person]:
+        """
+        Returns statement selecting persons of given person_ids, loading only given fields.
+        Ids are bound as one array parameter, so the statement is the same for any count of ids.
+        """
+        statement = PersonDbFields.from_fields_string(fields).project_persons(select(Person))
+        person_ids_array = sqlalchemy.bindparam("person_ids", list(person_ids),
+                                                type_=postgresql.ARRAY(sqlalchemy.Integer))
+        return statement.where(Person.business_entity_id == sqlalchemy.any_(person_ids_array))
+
+
+class PersonDbFields(BaseModel):
+    """
+    Projection of person fields loaded from the database.
+
+    Fields string is a comma separated list of fields to load ('first_name,last_name'), of fields not to load
+    ('-additional_contact_info,-demographics'), or '*' for all fields. Primary key is always loaded.
+    """
+    included: Optional[List[str]] = None
+    excluded: List[str] = list([])
+
+    @staticmethod
+    def from_fields_string(fields_string: Optional[str] = None) -> 'PersonDbFields':
+        if fields_string is None or fields_string.strip() == "*":
+            return PersonDbFields()
+
+        fields = list(map(lambda f: f.strip(), fields_string.split(",")))
+        excluded = list(map(lambda f: f[1:], filter(lambda f: f.startswith("-"), fields)))
+        included = list(filter(lambda f: not f.startswith("-"), fields))
+        if len(included) > 0 and len(excluded) > 0:
+            raise errors.ColumnNotFoundError(f"{E400BadRequest.INVALID_FIELDS_STRING}: "
+                                             f"Fields string '{fields_string}' cannot both include and exclude fields.")
+        wrong_fields = list(filter(lambda f: f not in Person.__fields__.keys(), included + excluded))
+        if len(wrong_fields) > 0:
+            raise errors.ColumnNotFoundError(f"{E400BadRequest.INVALID_FIELDS_STRING}: "
+                                             f"Fields string contains fields: '{wrong_fields}' "
+                                             f"which do not exist in person fields: {list(Person.__fields__.keys())}.")
+
+        return PersonDbFields(included=included if len(included) > 0 else None, excluded=excluded)
+
+    def is_all(self) -> bool:
+        """ Returns whether all person fields are projected """
+        return self.included is None and len(self.excluded) == 0
+
+    def get_fields(self) -> List[str]:
+        """ Returns names of projected person fields, primary key first """
+        fields = self.included if self.included is not None else list(Person.__fields__.keys())
+        fields = ["business_entity_id"] + fields
+        return list(dict.fromkeys(filter(lambda f: f == "business_entity_id" or f not in self.excluded, fields)))
+
+    def project_persons(self, statement: SelectOfScalar, required_columns: Optional[List[Any]] = None
+                        ) -> SelectOfScalar:
+        """ Returns statement loading only projected person fields and given required person columns """
+        if self.is_all():
+            return statement
+        required_fields = list(map(lambda c: c.key, filter(lambda c: c.class_ is Person, required_columns or list([]))))
+        fields = list(dict.fromkeys(self.get_fields() + required_fields))
+        return statement.options(sqlalchemy.orm.Load(Person).load_only(*map(lambda f: getattr(Person, f), fields)))
+
+    def project_person(self, person: Person) -> Person:
+        """ Returns copy of given (fully loaded) person with projected fields only """
+        if self.is_all():
+            return person
+        return person.copy(include=set(self.get_fields()))
 
 
 class PersonDbFilter(BaseModel):
@@ -143,10 +558,27 @@ class PersonDbFilter(BaseModel):
             person_statement = person_statement.where(sqlalchemy.or_(*clauses))
         return person_statement
 
+    def get_rank(self) -> ColumnElement:
+        """
+        Returns rank of person similarity to the phrases: sum of trigram word similarities of the phrases
+        to the best matching columns. Requires 'pg_trgm' extension (see person search migration).
+        """
+        ranks = list([])
+        if self.first_name_phrase is not None:
+            ranks.append(sqlalchemy.func.greatest(*map(
+                lambda c: sqlalchemy.func.word_similarity(self.first_name_phrase, c),
+                [Person.first_name, Person.middle_name, Person.suffix, Person.title])))
+        if self.last_name_phrase is not None:
+            ranks.append(sqlalchemy.func.word_similarity(self.last_name_phrase, Person.last_name))
+        if len(ranks) == 0:
+            return sqlalchemy.literal(0)
+        return sum(ranks[1:], ranks[0])
+
 
 class PersonDbOrder(BaseModel):
     by: str
     order: EOrderType
+    collation: Optional[str] = None
 
     column_mapping: ClassVar[Dict[str, List[object]]] = dict({
         'person_id': [Person.business_entity_id],
@@ -160,7 +592,38 @@ class PersonDbOrder(BaseModel):
         'modified_date': [Person.modified_date]
     })
 
+    primary_key_columns: ClassVar[List[object]] = list([Person.business_entity_id])
+
     def order_persons(self, person_statement: SelectOfScalar[Person]) -> SelectOfScalar[Person]:
+        self.__guard_ordering_column()
+
+        person_attrs = list(map(lambda a: KeysetPagination.get_collated_column(a, self.collation),
+                                self.column_mapping[self.by]))
+        order_statement = list(map(lambda a: a.asc() if self.order == EOrderType.ASC else a.desc(), person_attrs))
+        person_statement = person_statement.order_by(*order_statement)
+
+        return person_statement
+
+    @staticmethod
+    def get_keyset_pagination(order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                              collation: Optional[str] = None) -> KeysetPagination:
+        """
+        Returns keyset pagination of persons ordered by given column, by person id if no column is given.
+        Names ordered with a given collation get cursors of their own, as their order differs from the default one.
+        """
+        order_type = EOrderType(order_type or EOrderType.ASC)
+        if order_by is None:
+            return KeysetPagination.from_columns(list([]), PersonDbOrder.primary_key_columns, order_type,
+                                                 f"person:{order_type.value}")
+
+        person_db_order = PersonDbOrder(by=order_by, order=order_type, collation=collation)
+        person_db_order.__guard_ordering_column()
+        collation_suffix = "" if collation is None else f":{collation}"
+        return KeysetPagination.from_columns(PersonDbOrder.column_mapping[order_by],
+                                             PersonDbOrder.primary_key_columns, order_type,
+                                             f"person:{order_by}:{order_type.value}{collation_suffix}", collation)
+
+    def __guard_ordering_column(self) -> None:
         if self.by in ["additional_contact_info", "demographics"]:
             raise errors.ColumnNotFoundError(f"{E400BadRequest.ORDERING_NOT_SUPPORTED_FOR_COLUMN}: "
                                              f"Cannot order by column '{self.by}'. "
@@ -168,9 +631,3 @@ class PersonDbOrder(BaseModel):
         elif self.by not in self.column_mapping.keys():
             raise errors.ColumnNotFoundError(f"{E400BadRequest.INVALID_ORDERING_COLUMN_NAME}: "
                                              f"Column does not exist in persons view ('{self.by}').")
-
-        person_attrs = self.column_mapping[self.by]
-        order_statement = list(map(lambda a: a.asc() if self.order == EOrderType.ASC else a.desc(), person_attrs))
-        person_statement = person_statement.order_by(*order_statement)
-
-        return person_statement
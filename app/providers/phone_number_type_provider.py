@@ -1,67 +1,144 @@
 import datetime as dt
 import sqlalchemy
+from sqlalchemy.dialects import postgresql
 from pydantic import BaseModel
-from sqlmodel import create_engine, Session, select
+from sqlmodel import Session, select
 from sqlmodel.sql.expression import SelectOfScalar
-from typing import Optional, List, Dict, Union, ClassVar
+from typing import Any, Optional, List, Dict, Tuple, Union, ClassVar, Iterator
 
 from app import utils, errors
-from app.config import PostgresdbConnectionConfig
+from app.caches import PhoneNumberTypeCache
+from app.config import PostgresdbConnectionConfig, PhoneNumberTypeCacheConfig
+from app.copy_loader import CopyLoader
+from app.db_engine_registry import DbEngineRegistry
+from app.keyset_pagination import KeysetPagination
 from app.providers import IPhoneNumberTypeProvider
-from app.models import EOrderType, PhoneNumberType, PhoneNumberTypeInput, E400BadRequest, E404NotFound
+from app.models import (EOrderType, EBatchOperation, PhoneNumberType, PhoneNumberTypeInput, PhoneNumberTypeOperation,
+                        PersonPhone, E400BadRequest, E404NotFound)
 
 
 class PhoneNumberTypeProvider(IPhoneNumberTypeProvider):
+    copy_fields: ClassVar[List[str]] = list(["name", "modified_date"])
     connection_string: str
     db_engine: sqlalchemy.engine.Engine
 
     def __init__(self, connection_string: Optional[str] = None,
                  db_engine: Optional[sqlalchemy.engine.Engine] = None):
         self.connection_string = connection_string or PostgresdbConnectionConfig.get_db_connection_string()
-        self.db_engine = db_engine or create_engine(self.connection_string)
+        self.db_engine = db_engine or DbEngineRegistry.get_postgresdb_engine(self.connection_string)
 
     def get_phone_number_types(self, filters: Optional[str] = None,
                                order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
                                limit: Optional[int] = None, offset: Optional[int] = None) -> List[PhoneNumberType]:
+        if PhoneNumberTypeCacheConfig.from_json().is_enabled:
+            phone_number_types = PhoneNumberTypeProvider.select_cached_phone_number_types(
+                self.get_cached_phone_number_types(), filters, order_by, order_type)
+            return PhoneNumberTypeProvider.slice_cached_phone_number_types(phone_number_types, limit, offset)
+
         with Session(self.db_engine) as db_session:
-            statement = select(PhoneNumberType)
-            if filters is not None:
-                phone_number_type_db_filter = PhoneNumberTypeDbFilter.from_filter_string(filters)
-                statement = phone_number_type_db_filter.filter_phone_number_types(statement)
-            if order_by is not None:
-                phone_number_type_db_order = PhoneNumberTypeDbOrder(by=order_by, order=order_type)
-                statement = phone_number_type_db_order.order_phone_number_types(statement)
-            if offset is not None:
-                if offset < 0:
-                    raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
-                                                      f"Value '{offset}' is invalid for SKIP clause.")
-                statement = statement.offset(offset)
-            if limit is not None:
-                if limit < 0:
-                    raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
-                                                      f"Value '{limit}' is invalid for LIMIT clause.")
-                statement = statement.limit(limit)
+            statement = PhoneNumberTypeProvider.get_phone_number_types_statement(filters, order_by, order_type,
+                                                                                 limit, offset)
             phone_number_types = db_session.execute(statement).all()
         phone_number_types = list(map(lambda pnt: pnt[0], phone_number_types))
         return phone_number_types
 
+    def get_phone_number_types_page(self, filters: Optional[str] = None,
+                                    order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                    limit: Optional[int] = None, cursor: Optional[str] = None
+                                    ) -> Tuple[List[PhoneNumberType], Optional[str]]:
+        keyset_pagination = PhoneNumberTypeDbOrder.get_keyset_pagination(order_by, order_type)
+        with Session(self.db_engine) as db_session:
+            statement = PhoneNumberTypeProvider.get_phone_number_types_page_statement(keyset_pagination, filters,
+                                                                                      limit, cursor)
+            phone_number_types = db_session.execute(statement).all()
+        phone_number_types = list(map(lambda pnt: pnt[0], phone_number_types))
+        return phone_number_types, keyset_pagination.get_next_cursor(phone_number_types, limit)
+
+    def get_phone_number_types_with_total(self, filters: Optional[str] = None,
+                                          order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                          limit: Optional[int] = None, offset: Optional[int] = None
+                                          ) -> Tuple[List[PhoneNumberType], int]:
+        if PhoneNumberTypeCacheConfig.from_json().is_enabled:
+            phone_number_types = PhoneNumberTypeProvider.select_cached_phone_number_types(
+                self.get_cached_phone_number_types(), filters, order_by, order_type)
+            return PhoneNumberTypeProvider.slice_cached_phone_number_types(phone_number_types, limit, offset), \
+                len(phone_number_types)
+
+        with Session(self.db_engine) as db_session:
+            statement = PhoneNumberTypeProvider.get_phone_number_types_with_total_statement(filters, order_by,
+                                                                                            order_type, limit, offset)
+            phone_number_types = db_session.execute(statement).all()
+            if len(phone_number_types) == 0 and offset:
+                statement = PhoneNumberTypeProvider.count_phone_number_types_statement(filters)
+                phone_number_types_total = int(db_session.exec(statement).one())
+            else:
+                phone_number_types_total = phone_number_types[0][-1] if len(phone_number_types) > 0 else 0
+        phone_number_types = list(map(lambda pnt: pnt[0], phone_number_types))
+        return phone_number_types, phone_number_types_total
+
+    def stream_phone_number_types(self, filters: Optional[str] = None,
+                                  order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                  batch_size: int = 1000) -> Iterator[List[PhoneNumberType]]:
+        statement = PhoneNumberTypeProvider.get_phone_number_types_statement(filters, order_by, order_type)
+        return self.__stream_phone_number_types(statement, batch_size)
+
+    def __stream_phone_number_types(self, statement: SelectOfScalar[PhoneNumberType],
+                                    batch_size: int) -> Iterator[List[PhoneNumberType]]:
+        """ Yields batches of selected phone number types fetched from a server-side cursor """
+        with Session(self.db_engine) as db_session:
+            result = db_session.execute(statement.execution_options(yield_per=batch_size))
+            for phone_number_types in result.partitions():
+                yield list(map(lambda pnt: pnt[0], phone_number_types))
+
     def count_phone_number_types(self, filters: Optional[str] = None) -> int:
+        if PhoneNumberTypeCacheConfig.from_json().is_enabled:
+            return len(PhoneNumberTypeProvider.select_cached_phone_number_types(self.get_cached_phone_number_types(),
+                                                                                 filters))
+
         with Session(self.db_engine) as db_session:
-            statement = select(sqlalchemy.func.count()).select_from(PhoneNumberType)
-            if filters is not None:
-                phone_number_type_db_filter = PhoneNumberTypeDbFilter.from_filter_string(filters)
-                statement = phone_number_type_db_filter.filter_phone_number_types(statement)
+            statement = PhoneNumberTypeProvider.count_phone_number_types_statement(filters)
             phone_number_types_count = int(db_session.exec(statement).one())
         return phone_number_types_count
 
     def get_phone_number_type(self, phone_number_type_id: int) -> PhoneNumberType:
-        with Session(self.db_engine) as db_session:
-            statement = select(PhoneNumberType).where(PhoneNumberType.phone_number_type_id == phone_number_type_id)
-            phone_number_type = db_session.execute(statement).first()
+        if PhoneNumberTypeCacheConfig.from_json().is_enabled:
+            phone_number_type = self.get_cached_phone_number_types().get(phone_number_type_id, None)
+        else:
+            with Session(self.db_engine) as db_session:
+                statement = PhoneNumberTypeProvider.get_phone_number_type_statement(phone_number_type_id)
+                phone_number_type = db_session.execute(statement).first()
+            phone_number_type = phone_number_type[0] if phone_number_type is not None else None
         if phone_number_type is None:
             raise errors.NotFoundError(f"{E404NotFound.PHONE_NUMBER_TYPE_NOT_FOUND}: "
                                        f"Phone number type of id '{phone_number_type_id}' does not exist.")
-        return phone_number_type[0]
+        return phone_number_type
+
+    def get_cached_phone_number_types(self) -> Dict[int, PhoneNumberType]:
+        """ Returns all phone number types by id from the cache, loads the cache if it is not loaded or expired """
+        phone_number_types = PhoneNumberTypeCache.get_all(PhoneNumberTypeCacheConfig.from_json().ttl)
+        if phone_number_types is None:
+            phone_number_types = self.load_phone_number_type_cache()
+        return phone_number_types
+
+    def load_phone_number_type_cache(self) -> Dict[int, PhoneNumberType]:
+        """ Loads all phone number types to the cache and returns them by id """
+        version = PhoneNumberTypeCache.get_version()
+        with Session(self.db_engine) as db_session:
+            phone_number_types = db_session.execute(PhoneNumberTypeProvider.get_phone_number_types_statement()).all()
+        return PhoneNumberTypeCache.load(list(map(lambda pnt: pnt[0], phone_number_types)), version)
+
+    def get_phone_number_types_by_ids(self, phone_number_type_ids: List[int]) -> List[Optional[PhoneNumberType]]:
+        utils.check_ids_count(len(phone_number_type_ids))
+        if PhoneNumberTypeCacheConfig.from_json().is_enabled:
+            phone_number_types = self.get_cached_phone_number_types()
+            return list(map(lambda pnti: phone_number_types.get(pnti, None), phone_number_type_ids))
+
+        with Session(self.db_engine) as db_session:
+            statement = PhoneNumberTypeProvider.get_phone_number_types_by_ids_statement(phone_number_type_ids)
+            phone_number_types = db_session.execute(statement).all()
+        phone_number_types = list(map(lambda pnt: pnt[0], phone_number_types))
+        return utils.get_objects_in_ids_order(phone_number_type_ids, phone_number_types,
+                                              lambda pnt: pnt.phone_number_type_id)
 
     def insert_phone_number_type(self, phone_number_type_input: PhoneNumberTypeInput) -> int:
         phone_number_type = PhoneNumberType(**phone_number_type_input.dict())
@@ -69,23 +146,272 @@ class PhoneNumberTypeProvider(IPhoneNumberTypeProvider):
             db_session.add(phone_number_type)
             db_session.commit()
             phone_number_type_id = phone_number_type.phone_number_type_id
+        PhoneNumberTypeCache.invalidate()
         return phone_number_type_id
 
-    def update_phone_number_type(self, phone_number_type_id: int, phone_number_type_input: PhoneNumberTypeInput) -> int:
-        updated_phone_number_type = self.get_phone_number_type(phone_number_type_id)
-        updated_phone_number_type.update_from_input(phone_number_type_input)
-        updated_phone_number_type.modified_date = dt.datetime.utcnow()
+    def copy_phone_number_types(self, phone_number_type_inputs: List[PhoneNumberTypeInput]) -> int:
+        if len(phone_number_type_inputs) == 0:
+            return 0
+        with self.db_engine.begin() as connection:
+            CopyLoader.copy(connection, PhoneNumberType.__table__.name,
+                            CopyLoader.get_columns(PhoneNumberType, PhoneNumberTypeProvider.copy_fields),
+                            PhoneNumberTypeProvider.get_copy_records(phone_number_type_inputs),
+                            PhoneNumberType.__table__.schema)
+        PhoneNumberTypeCache.invalidate()
+        return len(phone_number_type_inputs)
+
+    def update_and_get_phone_number_type(self, phone_number_type_id: int,
+                                         phone_number_type_input: PhoneNumberTypeInput) -> PhoneNumberType:
+        PhoneNumberType(**phone_number_type_input.dict()).validate_assignment(phone_number_type_input)
         with Session(self.db_engine) as db_session:
-            db_session.add(updated_phone_number_type)
+            statement = PhoneNumberTypeProvider.update_phone_number_type_statement(phone_number_type_id,
+                                                                                   phone_number_type_input)
+            updated_phone_number_type = db_session.execute(statement).first()
             db_session.commit()
-            db_session.refresh(updated_phone_number_type)
+        PhoneNumberTypeCache.invalidate()
+        if updated_phone_number_type is None:
+            raise errors.NotFoundError(f"{E404NotFound.PHONE_NUMBER_TYPE_NOT_FOUND}: "
+                                       f"Phone number type of id '{phone_number_type_id}' does not exist.")
+        return utils.get_models_from_row([PhoneNumberType], updated_phone_number_type)[0]
+
+    def update_phone_number_type(self, phone_number_type_id: int, phone_number_type_input: PhoneNumberTypeInput) -> int:
+        updated_phone_number_type = self.update_and_get_phone_number_type(phone_number_type_id, phone_number_type_input)
         return updated_phone_number_type.phone_number_type_id
 
     def delete_phone_number_type(self, phone_number_type_id: int) -> None:
-        deleted_phone_number_type = self.get_phone_number_type(phone_number_type_id)
+        self.__delete_phone_number_type(phone_number_type_id, is_independent=False)
+
+    def delete_independent_phone_number_type(self, phone_number_type_id: int) -> int:
+        return self.__delete_phone_number_type(phone_number_type_id, is_independent=True)
+
+    def __delete_phone_number_type(self, phone_number_type_id: int, is_independent: bool) -> int:
         with Session(self.db_engine) as db_session:
-            db_session.delete(deleted_phone_number_type)
+            statement = PhoneNumberTypeProvider.delete_phone_number_type_statement(phone_number_type_id,
+                                                                                   is_independent)
+            deleted_count, dependent_count = db_session.execute(statement).one()
             db_session.commit()
+        PhoneNumberTypeCache.invalidate()
+        if deleted_count == 0 and dependent_count == 0:
+            raise errors.NotFoundError(f"{E404NotFound.PHONE_NUMBER_TYPE_NOT_FOUND}: "
+                                       f"Phone number type of id '{phone_number_type_id}' does not exist.")
+        return dependent_count
+
+    def execute_phone_number_type_operations(self, phone_number_type_operations: List[PhoneNumberTypeOperation]
+                                             ) -> List[Union[PhoneNumberType, int, Exception]]:
+        utils.check_batch_operations_count(len(phone_number_type_operations))
+        results = list([])
+        with Session(self.db_engine) as db_session:
+            for phone_number_type_operation in phone_number_type_operations:
+                try:
+                    statement = PhoneNumberTypeProvider.get_phone_number_type_operation_statement(
+                        phone_number_type_operation)
+                    with db_session.begin_nested():
+                        row = db_session.execute(statement).first()
+                        result = PhoneNumberTypeProvider.get_phone_number_type_operation_result(
+                            phone_number_type_operation, row)
+                except Exception as e:
+                    result = e
+                results.append(result)
+            db_session.commit()
+        PhoneNumberTypeCache.invalidate()
+        return results
+
+    @staticmethod
+    def get_phone_number_types_statement(filters: Optional[str] = None,
+                                         order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                                         limit: Optional[int] = None, offset: Optional[int] = None
+                                         ) -> SelectOfScalar[PhoneNumberType]:
+        """ Returns statement selecting appropriate phone number types """
+        statement = select(PhoneNumberType)
+        if filters is not None:
+            phone_number_type_db_filter = PhoneNumberTypeDbFilter.from_filter_string(filters)
+            statement = phone_number_type_db_filter.filter_phone_number_types(statement)
+        if order_by is not None:
+            phone_number_type_db_order = PhoneNumberTypeDbOrder(by=order_by, order=order_type)
+            statement = phone_number_type_db_order.order_phone_number_types(statement)
+        if offset is not None:
+            if offset < 0:
+                raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                                  f"Value '{offset}' is invalid for SKIP clause.")
+            statement = statement.offset(offset)
+        if limit is not None:
+            if limit < 0:
+                raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                                  f"Value '{limit}' is invalid for LIMIT clause.")
+            statement = statement.limit(limit)
+        return statement
+
+    @staticmethod
+    def select_cached_phone_number_types(phone_number_types: Dict[int, PhoneNumberType],
+                                         filters: Optional[str] = None,
+                                         order_by: Optional[str] = None, order_type: Optional[EOrderType] = None
+                                         ) -> List[PhoneNumberType]:
+        """ Returns appropriate phone number types of given cached ones, filtered and ordered in memory """
+        selected_phone_number_types = list(phone_number_types.values())
+        if filters is not None:
+            phone_number_type_db_filter = PhoneNumberTypeDbFilter.from_filter_string(filters)
+            selected_phone_number_types = phone_number_type_db_filter.filter_cached_phone_number_types(
+                selected_phone_number_types)
+        if order_by is not None:
+            phone_number_type_db_order = PhoneNumberTypeDbOrder(by=order_by, order=order_type)
+            selected_phone_number_types = phone_number_type_db_order.order_cached_phone_number_types(
+                selected_phone_number_types)
+        return selected_phone_number_types
+
+    @staticmethod
+    def slice_cached_phone_number_types(phone_number_types: List[PhoneNumberType],
+                                        limit: Optional[int] = None, offset: Optional[int] = None
+                                        ) -> List[PhoneNumberType]:
+        """ Returns given phone number types skipping offset of them and taking at most limit of them """
+        if offset is not None:
+            if offset < 0:
+                raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                                  f"Value '{offset}' is invalid for SKIP clause.")
+            phone_number_types = phone_number_types[offset:]
+        if limit is not None:
+            if limit < 0:
+                raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                                  f"Value '{limit}' is invalid for LIMIT clause.")
+            phone_number_types = phone_number_types[:limit]
+        return phone_number_types
+
+    @staticmethod
+    def get_phone_number_types_with_total_statement(filters: Optional[str] = None,
+                                                    order_by: Optional[str] = None,
+                                                    order_type: Optional[EOrderType] = None,
+                                                    limit: Optional[int] = None, offset: Optional[int] = None
+                                                    ) -> SelectOfScalar[Tuple[PhoneNumberType, int]]:
+        """ Returns statement selecting appropriate phone number types, each with count of all matching ones """
+        statement = PhoneNumberTypeProvider.get_phone_number_types_statement(filters, order_by, order_type,
+                                                                             limit, offset)
+        return statement.add_columns(sqlalchemy.func.count().over().label("total_count"))
+
+    @staticmethod
+    def get_copy_records(phone_number_type_inputs: List[PhoneNumberTypeInput]) -> List[Tuple]:
+        """ Returns COPY records of phone number types of given inputs, their ids are given by the id sequence """
+        modified_date = dt.datetime.utcnow()
+        phone_number_type_values = list(map(lambda pnti: dict(pnti.dict(), modified_date=modified_date),
+                                            phone_number_type_inputs))
+        return CopyLoader.get_records(PhoneNumberType, phone_number_type_values, PhoneNumberTypeProvider.copy_fields)
+
+    @staticmethod
+    def create_phone_number_type_statement(phone_number_type_input: PhoneNumberTypeInput) -> sqlalchemy.sql.Insert:
+        """ Returns statement inserting phone number type of given input, returning the new phone number type """
+        phone_number_type_values = dict(phone_number_type_input.dict(), modified_date=dt.datetime.utcnow())
+        return sqlalchemy.insert(PhoneNumberType)\
+            .values(dict(map(lambda kv: (getattr(PhoneNumberType, kv[0]), kv[1]), phone_number_type_values.items())))\
+            .returning(*utils.get_model_columns(PhoneNumberType))
+
+    @staticmethod
+    def get_phone_number_type_operation_statement(phone_number_type_operation: PhoneNumberTypeOperation
+                                                  ) -> sqlalchemy.sql.Executable:
+        """ Returns statement of given batch operation, raises error if the operation values are missing or invalid """
+        operation, phone_number_type_id, phone_number_type_input = phone_number_type_operation.operation, \
+            phone_number_type_operation.phone_number_type_id, phone_number_type_operation.phone_number_type_input
+        if operation == EBatchOperation.DELETE:
+            utils.check_batch_operation_values(operation, dict(phone_number_type_id=phone_number_type_id))
+            return PhoneNumberTypeProvider.delete_phone_number_type_statement(phone_number_type_id,
+                                                                              is_independent=True)
+
+        if operation == EBatchOperation.CREATE:
+            utils.check_batch_operation_values(operation, dict(phone_number_type_input=phone_number_type_input))
+        else:
+            utils.check_batch_operation_values(operation, dict(phone_number_type_id=phone_number_type_id,
+                                                               phone_number_type_input=phone_number_type_input))
+        PhoneNumberType(**phone_number_type_input.dict()).validate_assignment(phone_number_type_input)
+        if operation == EBatchOperation.CREATE:
+            return PhoneNumberTypeProvider.create_phone_number_type_statement(phone_number_type_input)
+        return PhoneNumberTypeProvider.update_phone_number_type_statement(phone_number_type_id,
+                                                                          phone_number_type_input)
+
+    @staticmethod
+    def get_phone_number_type_operation_result(phone_number_type_operation: PhoneNumberTypeOperation,
+                                               row: Optional[Any]) -> Union[PhoneNumberType, int]:
+        """
+        Returns phone number type created or updated by given batch operation, for deletion count of dependent
+        person phones (nothing is deleted unless it is zero), raises error if the phone number type does not exist
+        """
+        if row is None or (phone_number_type_operation.operation == EBatchOperation.DELETE
+                           and row[0] == 0 and row[1] == 0):
+            raise errors.NotFoundError(f"{E404NotFound.PHONE_NUMBER_TYPE_NOT_FOUND}: "
+                                       f"Phone number type of id '{phone_number_type_operation.phone_number_type_id}' "
+                                       f"does not exist.")
+        if phone_number_type_operation.operation == EBatchOperation.DELETE:
+            return row[1]
+        return utils.get_models_from_row([PhoneNumberType], row)[0]
+
+    @staticmethod
+    def update_phone_number_type_statement(phone_number_type_id: int,
+                                           phone_number_type_input: PhoneNumberTypeInput) -> sqlalchemy.sql.Update:
+        """ Returns statement updating phone number type of given id from given input, returning the updated one """
+        phone_number_type_values = dict(phone_number_type_input.dict(), modified_date=dt.datetime.utcnow())
+        return sqlalchemy.update(PhoneNumberType)\
+            .where(PhoneNumberType.phone_number_type_id == phone_number_type_id)\
+            .values(dict(map(lambda kv: (getattr(PhoneNumberType, kv[0]), kv[1]), phone_number_type_values.items())))\
+            .returning(*utils.get_model_columns(PhoneNumberType))
+
+    @staticmethod
+    def delete_phone_number_type_statement(phone_number_type_id: int,
+                                           is_independent: bool = False) -> sqlalchemy.sql.Select:
+        """
+        Returns statement deleting phone number type of given id, selecting counts of deleted phone number types
+        and of person phones dependent on the phone number type.
+        If is_independent is set, nothing is deleted while dependent person phones exist.
+        """
+        dependent_count = sqlalchemy.select(sqlalchemy.func.count()).select_from(PersonPhone)\
+            .where(PersonPhone.phone_number_type_id == phone_number_type_id)\
+            .scalar_subquery()
+
+        deleted_phone_number_type = sqlalchemy.delete(PhoneNumberType)\
+            .where(PhoneNumberType.phone_number_type_id == phone_number_type_id)
+        if is_independent:
+            deleted_phone_number_type = deleted_phone_number_type.where(dependent_count == 0)
+        deleted_phone_number_type = deleted_phone_number_type\
+            .returning(PhoneNumberType.phone_number_type_id)\
+            .cte("deleted_phone_number_type")
+
+        deleted_count = sqlalchemy.select(sqlalchemy.func.count()).select_from(deleted_phone_number_type)\
+            .scalar_subquery()
+        return sqlalchemy.select(deleted_count.label("deleted_count"), dependent_count.label("dependent_count"))
+
+    @staticmethod
+    def get_phone_number_types_page_statement(keyset_pagination: KeysetPagination, filters: Optional[str] = None,
+                                              limit: Optional[int] = None, cursor: Optional[str] = None
+                                              ) -> SelectOfScalar[PhoneNumberType]:
+        """ Returns statement selecting page of appropriate phone number types placed after given cursor """
+        statement = select(PhoneNumberType)
+        if filters is not None:
+            phone_number_type_db_filter = PhoneNumberTypeDbFilter.from_filter_string(filters)
+            statement = phone_number_type_db_filter.filter_phone_number_types(statement)
+        statement = keyset_pagination.paginate(statement, cursor)
+        if limit is not None:
+            if limit < 0:
+                raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                                  f"Value '{limit}' is invalid for LIMIT clause.")
+            statement = statement.limit(limit)
+        return statement
+
+    @staticmethod
+    def count_phone_number_types_statement(filters: Optional[str] = None) -> SelectOfScalar[int]:
+        """ Returns statement counting appropriate phone number types """
+        statement = select(sqlalchemy.func.count()).select_from(PhoneNumberType)
+        if filters is not None:
+            phone_number_type_db_filter = PhoneNumberTypeDbFilter.from_filter_string(filters)
+            statement = phone_number_type_db_filter.filter_phone_number_types(statement)
+        return statement
+
+    @staticmethod
+    def get_phone_number_type_statement(phone_number_type_id: int) -> SelectOfScalar[PhoneNumberType]:
+        """ Returns statement selecting phone number type of given phone_number_type_id """
+        return select(PhoneNumberType).where(PhoneNumberType.phone_number_type_id == phone_number_type_id)
+
+    @staticmethod
+    def get_phone_number_types_by_ids_statement(phone_number_type_ids: List[int]) -> SelectOfScalar[PhoneNumberType]:
+        """ Returns statement selecting phone number types of given ids, bound as one array parameter """
+        phone_number_type_ids_array = sqlalchemy.bindparam("phone_number_type_ids", list(phone_number_type_ids),
+                                                           type_=postgresql.ARRAY(sqlalchemy.Integer))
+        return select(PhoneNumberType)\
+            .where(PhoneNumberType.phone_number_type_id == sqlalchemy.any_(phone_number_type_ids_array))
 
 
 class PhoneNumberTypeDbFilter(BaseModel):
@@ -112,6 +438,12 @@ class PhoneNumberTypeDbFilter(BaseModel):
             )
         return phone_number_type_statement
 
+    def filter_cached_phone_number_types(self, phone_number_types: List[PhoneNumberType]) -> List[PhoneNumberType]:
+        if self.name_phrase is not None:
+            name_phrase = self.name_phrase.casefold()
+            phone_number_types = list(filter(lambda pnt: name_phrase in pnt.name.casefold(), phone_number_types))
+        return phone_number_types
+
 
 class PhoneNumberTypeDbOrder(BaseModel):
     by: str
@@ -123,10 +455,10 @@ class PhoneNumberTypeDbOrder(BaseModel):
         'modified_date': [PhoneNumberType.modified_date]
     })
 
+    primary_key_columns: ClassVar[List[object]] = list([PhoneNumberType.phone_number_type_id])
+
     def order_phone_number_types(self, phone_number_type_statement: SelectOfScalar[PhoneNumberType]) -> SelectOfScalar[PhoneNumberType]:
-        if self.by not in self.column_mapping.keys():
-            raise errors.ColumnNotFoundError(f"{E400BadRequest.INVALID_ORDERING_COLUMN_NAME}: "
-                                             f"Column does not exist in phone number types view ('{self.by}').")
+        self.__guard_ordering_column()
 
         phone_number_type_attrs = self.column_mapping[self.by]
         order_statement = list(
@@ -134,3 +466,29 @@ class PhoneNumberTypeDbOrder(BaseModel):
         phone_number_type_statement = phone_number_type_statement.order_by(*order_statement)
 
         return phone_number_type_statement
+
+    def order_cached_phone_number_types(self, phone_number_types: List[PhoneNumberType]) -> List[PhoneNumberType]:
+        self.__guard_ordering_column()
+
+        return sorted(phone_number_types, key=lambda pnt: (getattr(pnt, self.by), pnt.phone_number_type_id),
+                      reverse=self.order == EOrderType.DESC)
+
+    @staticmethod
+    def get_keyset_pagination(order_by: Optional[str] = None,
+                              order_type: Optional[EOrderType] = None) -> KeysetPagination:
+        """ Returns keyset pagination of phone number types ordered by given column, by id if no column is given """
+        order_type = EOrderType(order_type or EOrderType.ASC)
+        if order_by is None:
+            return KeysetPagination.from_columns(list([]), PhoneNumberTypeDbOrder.primary_key_columns, order_type,
+                                                 f"phone_number_type:{order_type.value}")
+
+        phone_number_type_db_order = PhoneNumberTypeDbOrder(by=order_by, order=order_type)
+        phone_number_type_db_order.__guard_ordering_column()
+        return KeysetPagination.from_columns(PhoneNumberTypeDbOrder.column_mapping[order_by],
+                                             PhoneNumberTypeDbOrder.primary_key_columns, order_type,
+                                             f"phone_number_type:{order_by}:{order_type.value}")
+
+    def __guard_ordering_column(self) -> None:
+        if self.by not in self.column_mapping.keys():
+            raise errors.ColumnNotFoundError(f"{E400BadRequest.INVALID_ORDERING_COLUMN_NAME}: "
+                                             f"Column does not exist in phone number types view ('{self.by}').")
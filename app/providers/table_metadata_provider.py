@@ -1,10 +1,11 @@
 import sqlalchemy
 from typing import Optional, List
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app import errors
 from app.config import PostgresdbConnectionConfig
+from app.db_engine_registry import DbEngineRegistry
 from app.models import TableMetadata, E404NotFound
 
 
@@ -17,7 +18,7 @@ class TableMetadataProvider:
                  db_engine: Optional[sqlalchemy.engine.Engine] = None,
                  excluded_schema_names: Optional[List[str]] = None):
         self.connection_string = connection_string or PostgresdbConnectionConfig.get_db_connection_string()
-        self.db_engine = db_engine or create_engine(self.connection_string)
+        self.db_engine = db_engine or DbEngineRegistry.get_postgresdb_engine(self.connection_string)
         self.excluded_schema_names = excluded_schema_names or ["'public'", "'topology'", "'pg_catalog'",
                                                                "'information_schema'"]
 
@@ -9,7 +9,7 @@ from app.providers import AWFAPIUserProvider
 from app.services import AWFAPIUserService
 
 from app.oauth2_handlers import get_current_user, get_current_nonreadonly_user
-from app.error_handlers import raise_400, raise_404, raise_500
+from app.error_handlers import raise_400, raise_404, raise_500, raise_503
 
 
 router: APIRouter = APIRouter()
@@ -103,7 +103,7 @@ def view_awfapi_user_profile(awfapi_user_username: str,
 
 
 @router.post("/register_awfapi_user", tags=["AWFAPI Users"],
-             responses=get_response_models(ResponseMessage, [201, 400, 500]), status_code=status.HTTP_201_CREATED)
+             responses=get_response_models(ResponseMessage, [201, 400, 500, 503]), status_code=status.HTTP_201_CREATED)
 def register_awfapi_user(
         awfapi_registered_user: AWFAPIRegisteredUser = Body(None, examples=AWFAPIRegisteredUser.Config.schema_extra["examples"])) -> ResponseMessage:
     try:
@@ -113,6 +113,8 @@ def register_awfapi_user(
                                code=status.HTTP_201_CREATED)
     except (errors.UsernameAlreadyExistsError, errors.EmailAlreadyExistsError) as e:
         raise_400(e)
+    except errors.ServiceOverloadedError as e:
+        raise_503(e)
     except Exception as e:
         raise_500(e)
 
@@ -137,7 +139,7 @@ def change_awfapi_user_data(
 
 
 @router.put("/change_awfapi_user_credentials/{awfapi_user_username}", tags=["AWFAPI Users"],
-            responses=get_response_models(ResponseMessage, [200, 400, 401, 404, 500]))
+            responses=get_response_models(ResponseMessage, [200, 400, 401, 404, 500, 503]))
 def change_awfapi_user_credentials(
         awfapi_user_username: str,
         awfapi_changed_user_credentials: AWFAPIChangedUserCredentials = Body(None, examples=AWFAPIChangedUserCredentials.Config.schema_extra["examples"]),
@@ -151,6 +153,8 @@ def change_awfapi_user_credentials(
         raise_400(e)
     except errors.NotFoundError as e:
         raise_404(e, "User", awfapi_user_username)
+    except errors.ServiceOverloadedError as e:
+        raise_503(e)
     except Exception as e:
         raise_500(e)
 
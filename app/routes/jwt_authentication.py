@@ -6,7 +6,7 @@ from app.models import ResponseMessage, Token, AWFAPIUser, get_response_models,
     EAuthenticationStatus, EPasswordVerificationStatus
 from app.services import JWTAuthenticationService
 from app.oauth2_handlers import oauth2_scheme, get_current_user, get_current_nonreadonly_user
-from app.error_handlers import raise_401, raise_500
+from app.error_handlers import raise_401, raise_500, raise_503
 
 
 router: APIRouter = APIRouter()
@@ -15,27 +15,29 @@ jwt_auth_service: JWTAuthenticationService = JWTAuthenticationService()
 
 
 @router.post("/token", response_model=Token, include_in_schema=False,
-             responses=get_response_models(ResponseMessage, [200, 401, 500]))
+             responses=get_response_models(ResponseMessage, [200, 401, 500, 503]))
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()) -> Token:
     try:
-        user = jwt_auth_service.authenticate_user(form_data.username, form_data.password)
-        access_token = jwt_auth_service.create_access_token(data={"sub": user.username})
+        user = await jwt_auth_service.authenticate_user_async(form_data.username, form_data.password)
+        access_token = jwt_auth_service.create_user_access_token(user)
         token_dict = {"access_token": access_token, "token_type": "bearer"}
 
         return Token(**token_dict)
 
     except errors.InvalidCredentialsError as e:
         raise_401(e)
+    except errors.ServiceOverloadedError as e:
+        raise_503(e)
     except Exception as e:
         raise_500(e)
 
 
 @router.get("/verify/{password}", include_in_schema=False,
-            responses=get_response_models(ResponseMessage, [200, 401, 500]))
+            responses=get_response_models(ResponseMessage, [200, 401, 500, 503]))
 async def verify(password: str, token: str = Depends(oauth2_scheme)) -> ResponseMessage:
     try:
-        user = jwt_auth_service.get_user_from_token(token)
-        jwt_auth_service.authenticate_user(user.username, password)
+        user = await jwt_auth_service.get_user_from_token_async(token)
+        await jwt_auth_service.authenticate_user_async(user.username, password)
         return ResponseMessage(title=EPasswordVerificationStatus.VERIFIED,
                                description="Users password is verified.",
                                code=status.HTTP_200_OK)
@@ -48,6 +50,8 @@ async def verify(password: str, token: str = Depends(oauth2_scheme)) -> Response
             raise_401(e)
     except errors.JWTTokenSignatureExpiredError as e:
         raise_401(e)
+    except errors.ServiceOverloadedError as e:
+        raise_503(e)
     except Exception as e:
         raise_500(e)
 
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, status
+from typing import List
 
-from app.models import ResponseMessage
+from app.caches import AWFAPIUserCache
+from app.models import ResponseMessage, CacheStats
 
 
 router: APIRouter = APIRouter()
@@ -10,3 +12,8 @@ router: APIRouter = APIRouter()
 @router.get("/hello", tags=["Hello FastAPI"], responses=dict({status.HTTP_200_OK: {"model": ResponseMessage}}))
 def hello_fast_api() -> ResponseMessage:
     return ResponseMessage(title="Hello FastAPI", description="Successful response.", code=status.HTTP_200_OK)
+
+
+@router.get("/cache_stats", include_in_schema=False)
+def get_cache_stats() -> List[CacheStats]:
+    return [AWFAPIUserCache.get_instance().get_stats()]
@@ -1,40 +1,154 @@
-from fastapi import APIRouter, Body, Depends, status
-from typing import Optional, List
+from fastapi import APIRouter, Body, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Optional, List, Union
 
-from app import errors
-from app.config import DefaultQueryParamsConfig
-from app.models import EOrderType, AWFAPIUser, PersonInput, Person, CountMessage, ResponseMessage, get_response_models
-from app.providers import PersonProvider
-from app.services import PersonService, PersonPhoneService
+from app import utils, errors
+from app.config import DefaultQueryParamsConfig, PostgresdbConnectionConfig, ExportConfig
+from app.models import (EOrderType, EExportFormat, EBatchOperation, AWFAPIUser, PersonInput, Person, PersonName,
+                        PersonOperation, PersonWithPhones, ImportReport, BatchResult, CountMessage, ListCountMessage, ResponseMessage,
+                        get_response_models, get_import_request_body)
+from app.providers import IPersonProvider, PersonProvider, AsyncPersonProvider
+from app.providers.person_provider import PersonDbFields
+from app.services import PersonService, PersonPhoneService, AsyncPersonService, AsyncPersonPhoneService, ImportService
 
 from app.oauth2_handlers import get_current_user, get_current_nonreadonly_user
-from app.error_handlers import raise_400, raise_404, raise_422, raise_500
+from app.error_handlers import raise_400, raise_404, raise_422, raise_500, raise_503, get_batch_result
 
 
 router: APIRouter = APIRouter()
 
 default_params: DefaultQueryParamsConfig = DefaultQueryParamsConfig.from_json(entity="person")
-person_provider: PersonProvider = PersonProvider()
-person_service: PersonService = PersonService()
-person_phone_service: PersonPhoneService = PersonPhoneService()
+is_async: bool = PostgresdbConnectionConfig.from_json().is_async
+person_provider: IPersonProvider = AsyncPersonProvider() if is_async else PersonProvider()
+person_service: Union[PersonService, AsyncPersonService] = \
+    AsyncPersonService(person_provider) if is_async else PersonService(person_provider)
+person_phone_service: Union[PersonPhoneService, AsyncPersonPhoneService] = \
+    AsyncPersonPhoneService() if is_async else PersonPhoneService()
+import_service: ImportService = ImportService(person_provider=person_provider)
 
 
 @router.get("/get_persons", tags=["Persons"],
             responses=get_response_models(List[Person], [200, 400, 401, 500]))
-def get_persons(filters: Optional[str] = default_params.filters,
-                order_by: Optional[str] = default_params.order_by,
-                order_type: Optional[EOrderType] = default_params.order_type,
-                offset: int = default_params.offset,
-                limit: int = default_params.limit,
-                _: AWFAPIUser = Depends(get_current_user)) -> List[Person]:
+async def get_persons(response: Response,
+                      filters: Optional[str] = default_params.filters,
+                      order_by: Optional[str] = default_params.order_by,
+                      order_type: Optional[EOrderType] = default_params.order_type,
+                      offset: int = default_params.offset,
+                      limit: int = default_params.limit,
+                      is_keyset: bool = False, cursor: Optional[str] = None,
+                      is_total_count: bool = False,
+                      fields: Optional[str] = default_params.fields,
+                      _: AWFAPIUser = Depends(get_current_user)) -> List[Person]:
     if filters == "":
         filters = None
     if order_by == "":
         order_by = None
+    if cursor == "":
+        cursor = None
+    if fields == "":
+        fields = None
 
     try:
-        persons = person_provider.get_persons(filters, order_by, order_type, limit, offset)
+        if is_keyset or cursor is not None:
+            persons, next_cursor = await utils.run_nonblocking(person_provider.get_persons_page,
+                                                               filters, order_by, order_type, limit, cursor,
+                                                               False, fields)
+            if next_cursor is not None:
+                response.headers["X-Next-Cursor"] = next_cursor
+            return persons
+
+        if is_total_count:
+            persons, persons_total = await utils.run_nonblocking(person_provider.get_persons_with_total,
+                                                                 filters, order_by, order_type, limit, offset,
+                                                                 fields)
+            response.headers["X-Total-Count"] = str(persons_total)
+            return persons
+
+        persons = await utils.run_nonblocking(person_provider.get_persons,
+                                              filters, order_by, order_type, limit, offset, False, fields)
         return persons
+    except (errors.InvalidFilterStringError, errors.FilterNotFoundError,
+            errors.ColumnNotFoundError, errors.InvalidSQLValueError, errors.InvalidCursorError) as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
+@router.get("/get_persons_with_count", tags=["Persons"],
+            responses=get_response_models(ListCountMessage[Person], [200, 400, 401, 500]))
+async def get_persons_with_count(filters: Optional[str] = default_params.filters,
+                                 order_by: Optional[str] = default_params.order_by,
+                                 order_type: Optional[EOrderType] = default_params.order_type,
+                                 offset: int = default_params.offset,
+                                 limit: int = default_params.limit,
+                                 fields: Optional[str] = default_params.fields,
+                                 _: AWFAPIUser = Depends(get_current_user)) -> ListCountMessage[Person]:
+    if filters == "":
+        filters = None
+    if order_by == "":
+        order_by = None
+    if fields == "":
+        fields = None
+
+    try:
+        persons, persons_total = await utils.run_nonblocking(person_provider.get_persons_with_total,
+                                                             filters, order_by, order_type, limit, offset, fields)
+        return ListCountMessage[Person](entity="Person", count=persons_total, items=persons)
+    except (errors.InvalidFilterStringError, errors.FilterNotFoundError,
+            errors.ColumnNotFoundError, errors.InvalidSQLValueError) as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
+@router.get("/get_persons_with_phones", tags=["Persons"],
+            responses=get_response_models(List[PersonWithPhones], [200, 400, 401, 500]))
+async def get_persons_with_phones(filters: Optional[str] = default_params.filters,
+                                  order_by: Optional[str] = default_params.order_by,
+                                  order_type: Optional[EOrderType] = default_params.order_type,
+                                  offset: int = default_params.offset,
+                                  limit: int = default_params.limit,
+                                  fields: Optional[str] = default_params.fields,
+                                  _: AWFAPIUser = Depends(get_current_user)) -> List[PersonWithPhones]:
+    if filters == "":
+        filters = None
+    if order_by == "":
+        order_by = None
+    if fields == "":
+        fields = None
+
+    try:
+        persons = await utils.run_nonblocking(person_provider.get_persons,
+                                              filters, order_by, order_type, limit, offset, False, fields)
+        persons_with_phones = await utils.run_nonblocking(person_phone_service.get_persons_with_phones, persons)
+        return persons_with_phones
+    except (errors.InvalidFilterStringError, errors.FilterNotFoundError,
+            errors.ColumnNotFoundError, errors.InvalidSQLValueError) as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
+@router.get("/export_persons", tags=["Persons"],
+            responses=get_response_models(List[Person], [200, 400, 401, 500]))
+async def export_persons(filters: Optional[str] = default_params.filters,
+                         order_by: Optional[str] = default_params.order_by,
+                         order_type: Optional[EOrderType] = default_params.order_type,
+                         export_format: EExportFormat = EExportFormat.NDJSON,
+                         fields: Optional[str] = default_params.fields,
+                         _: AWFAPIUser = Depends(get_current_user)) -> StreamingResponse:
+    if filters == "":
+        filters = None
+    if order_by == "":
+        order_by = None
+    if fields == "":
+        fields = None
+
+    try:
+        person_batches = person_provider.stream_persons(filters, order_by, order_type,
+                                                        batch_size=ExportConfig.from_json().batch_size, fields=fields)
+        columns = PersonDbFields.from_fields_string(fields).get_fields()
+        return utils.get_export_response(person_batches, export_format, columns, "persons")
     except (errors.InvalidFilterStringError, errors.FilterNotFoundError,
             errors.ColumnNotFoundError, errors.InvalidSQLValueError) as e:
         raise_400(e)
@@ -44,12 +158,12 @@ def get_persons(filters: Optional[str] = default_params.filters,
 
 @router.get("/count_persons", tags=["Persons"],
             responses=get_response_models(CountMessage, [200, 400, 401, 500]))
-def count_persons(filters: Optional[str] = default_params.filters,
-                  _: AWFAPIUser = Depends(get_current_user)) -> CountMessage:
+async def count_persons(filters: Optional[str] = default_params.filters,
+                        _: AWFAPIUser = Depends(get_current_user)) -> CountMessage:
     if filters == "":
         filters = None
     try:
-        persons_count = person_provider.count_persons(filters)
+        persons_count = await utils.run_nonblocking(person_provider.count_persons, filters)
         return CountMessage(entity="Person", count=persons_count)
     except (errors.InvalidFilterStringError, errors.FilterNotFoundError) as e:
         raise_400(e)
@@ -58,12 +172,52 @@ def count_persons(filters: Optional[str] = default_params.filters,
 
 
 @router.get("/get_person/{person_id}", tags=["Persons"],
-            responses=get_response_models(Person, [200, 401, 404, 500]))
-def get_person(person_id: int,
-               _: AWFAPIUser = Depends(get_current_user)) -> Person:
+            responses=get_response_models(Person, [200, 400, 401, 404, 500]))
+async def get_person(person_id: int,
+                     fields: Optional[str] = default_params.fields,
+                     _: AWFAPIUser = Depends(get_current_user)) -> Person:
+    if fields == "":
+        fields = None
     try:
-        person = person_provider.get_person(person_id)
+        person = await utils.run_nonblocking(person_provider.get_person, person_id, fields)
         return person
+    except errors.ColumnNotFoundError as e:
+        raise_400(e)
+    except errors.NotFoundError as e:
+        raise_404(e, "Person", person_id)
+    except Exception as e:
+        raise_500(e)
+
+
+@router.get("/get_persons_by_ids", tags=["Persons"],
+            responses=get_response_models(List[Optional[Person]], [200, 400, 401, 500]))
+async def get_persons_by_ids(person_ids: List[int] = Query(...),
+                             fields: Optional[str] = default_params.fields,
+                             _: AWFAPIUser = Depends(get_current_user)) -> List[Optional[Person]]:
+    if fields == "":
+        fields = None
+    try:
+        persons = await utils.run_nonblocking(person_provider.get_persons_by_ids, person_ids, fields)
+        return persons
+    except (errors.ColumnNotFoundError, errors.InvalidSQLValueError) as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
+@router.get("/get_person_with_phones/{person_id}", tags=["Persons"],
+            responses=get_response_models(PersonWithPhones, [200, 400, 401, 404, 500]))
+async def get_person_with_phones(person_id: int,
+                                 fields: Optional[str] = default_params.fields,
+                                 _: AWFAPIUser = Depends(get_current_user)) -> PersonWithPhones:
+    if fields == "":
+        fields = None
+    try:
+        person = await utils.run_nonblocking(person_provider.get_person, person_id, fields)
+        persons_with_phones = await utils.run_nonblocking(person_phone_service.get_persons_with_phones, [person])
+        return persons_with_phones[0]
+    except errors.ColumnNotFoundError as e:
+        raise_400(e)
     except errors.NotFoundError as e:
         raise_404(e, "Person", person_id)
     except Exception as e:
@@ -72,12 +226,11 @@ def get_person(person_id: int,
 
 @router.post("/create_person", tags=["Persons"],
              responses=get_response_models(Person, [201, 400, 401, 422, 500]), status_code=status.HTTP_201_CREATED)
-def create_person(
+async def create_person(
         person_input: PersonInput = Body(None, examples=PersonInput.Config.schema_extra["examples"]),
         _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> Person:
     try:
-        new_person_id = person_provider.insert_person(person_input)
-        new_person = person_provider.get_person(new_person_id)
+        new_person = await utils.run_nonblocking(person_provider.create_person, person_input)
         return new_person
     except errors.PydanticValidationError as e:
         raise_422(e)
@@ -85,14 +238,49 @@ def create_person(
         raise_500(e)
 
 
+@router.post("/import_persons", tags=["Persons"],
+             responses=get_response_models(ImportReport, [200, 400, 401, 500]),
+             openapi_extra=get_import_request_body())
+async def import_persons(request: Request,
+                         import_format: EExportFormat = EExportFormat.NDJSON,
+                         _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> ImportReport:
+    try:
+        import_report = await import_service.import_persons(request.stream(), import_format)
+        return import_report
+    except errors.InvalidImportFileError as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
+@router.post("/batch_persons", tags=["Persons"],
+             responses=get_response_models(BatchResult[Person], [200, 400, 401, 500]))
+async def batch_persons(
+        person_operations: List[PersonOperation] = Body(..., example=PersonOperation.Config.schema_extra["example"]),
+        _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> BatchResult[Person]:
+    try:
+        results = await utils.run_nonblocking(person_provider.execute_person_operations, person_operations)
+        for i, (person_operation, result) in enumerate(zip(person_operations, results)):
+            if person_operation.operation == EBatchOperation.DELETE and isinstance(result, int):
+                try:
+                    PersonPhoneService.check_person_person_phones_count(person_operation.person_id, result)
+                except errors.ExistingDependentEntityError as e:
+                    results[i] = e
+        return get_batch_result("Person", list(map(lambda po: tuple((po.operation, po.person_id)),
+                                                   person_operations)), results)
+    except errors.InvalidSQLValueError as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
 @router.put("/update_person/{person_id}", tags=["Persons"],
             responses=get_response_models(Person, [200, 400, 401, 404, 422, 500]))
-def update_person(person_id: int,
-                  person_input: PersonInput = Body(None, examples=PersonInput.Config.schema_extra["examples"]),
-                  _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> Person:
+async def update_person(person_id: int,
+                        person_input: PersonInput = Body(None, examples=PersonInput.Config.schema_extra["examples"]),
+                        _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> Person:
     try:
-        updated_person_id = person_provider.update_person(person_id, person_input)
-        updated_person = person_provider.get_person(updated_person_id)
+        updated_person = await utils.run_nonblocking(person_provider.update_and_get_person, person_id, person_input)
         return updated_person
     except errors.NotFoundError as e:
         raise_404(e, "Person", person_id)
@@ -104,11 +292,12 @@ def update_person(person_id: int,
 
 @router.delete("/delete_person/{person_id}", tags=["Persons"],
                responses=get_response_models(ResponseMessage, [200, 400, 401, 404, 500]))
-def delete_person(person_id: int,
-                  _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> ResponseMessage:
+async def delete_person(person_id: int,
+                        _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> ResponseMessage:
     try:
-        person_phone_service.has_person_person_phones(person_id)
-        person_provider.delete_person(person_id)
+        dependent_person_phones_count = await utils.run_nonblocking(person_provider.delete_independent_person,
+                                                                    person_id)
+        PersonPhoneService.check_person_person_phones_count(person_id, dependent_person_phones_count)
         return ResponseMessage(title="Person deleted.",
                                description=f"Person of given id '{person_id}' deleted.",
                                code=status.HTTP_200_OK)
@@ -122,20 +311,40 @@ def delete_person(person_id: int,
 
 @router.get("/search_by_phrases", tags=["Persons"],
             responses=get_response_models(List[Person], [200, 400, 404, 500]))
-def search_by_phrases(first_name_phrase: Optional[str] = None,
-                      last_name_phrase: Optional[str] = None,
-                      is_ordered: Optional[bool] = True,
-                      is_alternative: Optional[bool] = False,
-                      is_raised_error_if_empty: Optional[bool] = True) -> List[Person]:
+async def search_by_phrases(response: Response,
+                            first_name_phrase: Optional[str] = None,
+                            last_name_phrase: Optional[str] = None,
+                            is_ordered: Optional[bool] = True,
+                            is_alternative: Optional[bool] = False,
+                            is_raised_error_if_empty: Optional[bool] = True,
+                            is_ranked: Optional[bool] = False,
+                            limit: Optional[int] = None, cursor: Optional[str] = None,
+                            is_streamed: bool = False,
+                            fields: Optional[str] = default_params.fields) -> Union[List[Person], StreamingResponse]:
     if first_name_phrase == "":
         first_name_phrase = None
     if last_name_phrase == "":
         last_name_phrase = None
+    if cursor == "":
+        cursor = None
+    if fields == "":
+        fields = None
     try:
-        persons = person_service.get_persons_by_phrases(first_name_phrase, last_name_phrase,
-                                                        is_ordered, is_alternative, is_raised_error_if_empty)
+        if is_streamed:
+            person_batches = person_service.stream_persons_by_phrases(first_name_phrase, last_name_phrase,
+                                                                      is_ordered, is_alternative, is_ranked,
+                                                                      fields)
+            return StreamingResponse(utils.get_ndjson_stream(person_batches), media_type="application/x-ndjson")
+
+        persons, next_cursor = await utils.run_nonblocking(person_service.get_persons_page_by_phrases,
+                                                           first_name_phrase, last_name_phrase,
+                                                           is_ordered, is_alternative, is_raised_error_if_empty,
+                                                           is_ranked, limit, cursor, fields)
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = next_cursor
         return persons
-    except errors.EmptyFieldsError as e:
+    except (errors.EmptyFieldsError, errors.InvalidSQLValueError, errors.InvalidCursorError,
+            errors.ColumnNotFoundError) as e:
         raise_400(e)
     except errors.NotFoundError as e:
         raise_404(e, "Persons", "all",
@@ -144,3 +353,17 @@ def search_by_phrases(first_name_phrase: Optional[str] = None,
                          f"(first_name_phrase: {first_name_phrase} | last_name_phrase: {last_name_phrase}).")
     except Exception as e:
         raise_500(e)
+
+
+@router.get("/autocomplete_names", tags=["Persons"],
+            responses=get_response_models(List[PersonName], [200, 400, 500, 503]))
+async def autocomplete_names(prefix: Optional[str] = None, top_k: Optional[int] = None) -> List[PersonName]:
+    try:
+        person_names = PersonService.get_person_names_by_prefix(prefix, top_k)
+        return person_names
+    except (errors.EmptyFieldsError, errors.InvalidSQLValueError) as e:
+        raise_400(e)
+    except errors.IndexNotBuiltError as e:
+        raise_503(e)
+    except Exception as e:
+        raise_500(e)
@@ -1,37 +1,123 @@
-from fastapi import APIRouter, Body, Depends, status
+from fastapi import APIRouter, Body, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
 from typing import Optional, Tuple, List
 
-from app import errors
-from app.config import DefaultQueryParamsConfig
-from app.models import (EOrderType, AWFAPIUser, PhoneNumberType, Person, PersonPhoneInput, PersonPhone,
-                        CountMessage, ResponseMessage, get_response_models)
-from app.providers import PersonPhoneProvider
+from app import utils, errors
+from app.config import DefaultQueryParamsConfig, PostgresdbConnectionConfig, ExportConfig
+from app.models import (EOrderType, EExportFormat, AWFAPIUser, PhoneNumberType, Person, PersonPhoneInput, PersonPhone,
+                        PersonPhoneOperation, ImportReport, BatchResult, CountMessage, ListCountMessage, ResponseMessage,
+                        get_response_models, get_import_request_body)
+from app.providers import IPersonPhoneProvider, PersonPhoneProvider, AsyncPersonPhoneProvider
+from app.providers.person_provider import PersonDbFields
+from app.services import ImportService
 
 from app.oauth2_handlers import get_current_user, get_current_nonreadonly_user
-from app.error_handlers import raise_400, raise_404, raise_422, raise_500
+from app.error_handlers import raise_400, raise_404, raise_422, raise_500, get_batch_result
 
 
 router: APIRouter = APIRouter()
 
 default_params: DefaultQueryParamsConfig = DefaultQueryParamsConfig.from_json(entity="person_phone")
-person_phone_provider: PersonPhoneProvider = PersonPhoneProvider()
+is_async: bool = PostgresdbConnectionConfig.from_json().is_async
+person_phone_provider: IPersonPhoneProvider = AsyncPersonPhoneProvider() if is_async else PersonPhoneProvider()
+import_service: ImportService = ImportService(person_phone_provider=person_phone_provider)
 
 
 @router.get("/get_person_phones", tags=["Person Phones"],
             responses=get_response_models(List[Tuple[PersonPhone, Person, PhoneNumberType]], [200, 400, 401, 500]))
-def get_person_phones(filters: Optional[str] = default_params.filters,
-                      order_by: Optional[str] = default_params.order_by,
-                      order_type: Optional[EOrderType] = default_params.order_type,
-                      offset: int = default_params.offset, limit: int = default_params.limit,
-                      _: AWFAPIUser = Depends(get_current_user)) -> List[Tuple[PersonPhone, Person, PhoneNumberType]]:
+async def get_person_phones(response: Response,
+                            filters: Optional[str] = default_params.filters,
+                            order_by: Optional[str] = default_params.order_by,
+                            order_type: Optional[EOrderType] = default_params.order_type,
+                            offset: int = default_params.offset, limit: int = default_params.limit,
+                            is_keyset: bool = False, cursor: Optional[str] = None,
+                            is_total_count: bool = False,
+                            fields: Optional[str] = default_params.fields,
+                            _: AWFAPIUser = Depends(get_current_user)) -> List[Tuple[PersonPhone, Person, PhoneNumberType]]:
     if filters == "":
         filters = None
     if order_by == "":
         order_by = None
+    if cursor == "":
+        cursor = None
+    if fields == "":
+        fields = None
 
     try:
-        person_phones = person_phone_provider.get_person_phones(filters, order_by, order_type, limit, offset)
+        if is_keyset or cursor is not None:
+            person_phones, next_cursor = await utils.run_nonblocking(person_phone_provider.get_person_phones_page,
+                                                                     filters, order_by, order_type, limit, cursor,
+                                                                     fields)
+            if next_cursor is not None:
+                response.headers["X-Next-Cursor"] = next_cursor
+            return person_phones
+
+        if is_total_count:
+            person_phones, person_phones_total = await utils.run_nonblocking(
+                person_phone_provider.get_person_phones_with_total, filters, order_by, order_type, limit, offset,
+                fields)
+            response.headers["X-Total-Count"] = str(person_phones_total)
+            return person_phones
+
+        person_phones = await utils.run_nonblocking(person_phone_provider.get_person_phones,
+                                                    filters, order_by, order_type, limit, offset, fields)
         return person_phones
+    except (errors.InvalidFilterStringError, errors.FilterNotFoundError,
+            errors.ColumnNotFoundError, errors.InvalidSQLValueError, errors.InvalidCursorError) as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
+@router.get("/get_person_phones_with_count", tags=["Person Phones"],
+            responses=get_response_models(ListCountMessage[Tuple[PersonPhone, Person, PhoneNumberType]],
+                                          [200, 400, 401, 500]))
+async def get_person_phones_with_count(filters: Optional[str] = default_params.filters,
+                                       order_by: Optional[str] = default_params.order_by,
+                                       order_type: Optional[EOrderType] = default_params.order_type,
+                                       offset: int = default_params.offset, limit: int = default_params.limit,
+                                       _: AWFAPIUser = Depends(get_current_user)
+                                       ) -> ListCountMessage[Tuple[PersonPhone, Person, PhoneNumberType]]:
+    if filters == "":
+        filters = None
+    if order_by == "":
+        order_by = None
+
+    try:
+        person_phones, person_phones_total = await utils.run_nonblocking(
+            person_phone_provider.get_person_phones_with_total, filters, order_by, order_type, limit, offset)
+        return ListCountMessage[Tuple[PersonPhone, Person, PhoneNumberType]](entity="Person phone",
+                                                                             count=person_phones_total,
+                                                                             items=person_phones)
+    except (errors.InvalidFilterStringError, errors.FilterNotFoundError,
+            errors.ColumnNotFoundError, errors.InvalidSQLValueError) as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
+@router.get("/export_person_phones", tags=["Person Phones"],
+            responses=get_response_models(List[Tuple[PersonPhone, Person, PhoneNumberType]], [200, 400, 401, 500]))
+async def export_person_phones(filters: Optional[str] = default_params.filters,
+                               order_by: Optional[str] = default_params.order_by,
+                               order_type: Optional[EOrderType] = default_params.order_type,
+                               export_format: EExportFormat = EExportFormat.NDJSON,
+                               fields: Optional[str] = default_params.fields,
+                               _: AWFAPIUser = Depends(get_current_user)) -> StreamingResponse:
+    if filters == "":
+        filters = None
+    if order_by == "":
+        order_by = None
+    if fields == "":
+        fields = None
+
+    try:
+        person_phone_batches = person_phone_provider.stream_person_phones(filters, order_by, order_type,
+                                                                          ExportConfig.from_json().batch_size, fields)
+        columns = utils.get_csv_columns([(PersonPhone, list(PersonPhone.__fields__.keys())),
+                                         (Person, PersonDbFields.from_fields_string(fields).get_fields()),
+                                         (PhoneNumberType, list(PhoneNumberType.__fields__.keys()))])
+        return utils.get_export_response(person_phone_batches, export_format, columns, "person_phones")
     except (errors.InvalidFilterStringError, errors.FilterNotFoundError,
             errors.ColumnNotFoundError, errors.InvalidSQLValueError) as e:
         raise_400(e)
@@ -41,12 +127,12 @@ def get_person_phones(filters: Optional[str] = default_params.filters,
 
 @router.get("/count_person_phones", tags=["Person Phones"],
             responses=get_response_models(CountMessage, [200, 400, 401, 500]))
-def count_persons(filters: Optional[str] = default_params.filters,
-                  _: AWFAPIUser = Depends(get_current_user)) -> CountMessage:
+async def count_persons(filters: Optional[str] = default_params.filters,
+                        _: AWFAPIUser = Depends(get_current_user)) -> CountMessage:
     if filters == "":
         filters = None
     try:
-        person_phones_count = person_phone_provider.count_person_phones(filters)
+        person_phones_count = await utils.run_nonblocking(person_phone_provider.count_person_phones, filters)
         return CountMessage(entity="Person phone", count=person_phones_count)
     except (errors.InvalidFilterStringError, errors.FilterNotFoundError) as e:
         raise_400(e)
@@ -56,11 +142,11 @@ def count_persons(filters: Optional[str] = default_params.filters,
 
 @router.get("/get_person_phone/{person_id}/{phone_number}/{phone_number_type_id}", tags=["Person Phones"],
             responses=get_response_models(Tuple[PersonPhone, Person, PhoneNumberType], [200, 400, 401, 404, 500]))
-def get_person_phone(person_id: int, phone_number: str, phone_number_type_id: int,
-                     _: AWFAPIUser = Depends(get_current_user)) -> Tuple[PersonPhone, Person, PhoneNumberType]:
+async def get_person_phone(person_id: int, phone_number: str, phone_number_type_id: int,
+                           _: AWFAPIUser = Depends(get_current_user)) -> Tuple[PersonPhone, Person, PhoneNumberType]:
     person_phone_id = tuple((person_id, phone_number, phone_number_type_id))
     try:
-        person_phone = person_phone_provider.get_person_phone(person_phone_id)
+        person_phone = await utils.run_nonblocking(person_phone_provider.get_person_phone, person_phone_id)
         return person_phone
     except errors.NotFoundError as e:
         raise_404(e, "Person phone", person_phone_id)
@@ -68,14 +154,31 @@ def get_person_phone(person_id: int, phone_number: str, phone_number_type_id: in
         raise_500(e)
 
 
+@router.post("/get_person_phones_by_ids", tags=["Person Phones"],
+             responses=get_response_models(List[Optional[Tuple[PersonPhone, Person, PhoneNumberType]]],
+                                           [200, 400, 401, 500]))
+async def get_person_phones_by_ids(
+        person_phone_ids: List[Tuple[int, str, int]] = Body(..., example=[[1, "697-555-0142", 1], [2, "819-555-0175", 3]]),
+        _: AWFAPIUser = Depends(get_current_user)) -> List[Optional[Tuple[PersonPhone, Person, PhoneNumberType]]]:
+    try:
+        person_phones = await utils.run_nonblocking(person_phone_provider.get_person_phones_by_ids, person_phone_ids)
+        return person_phones
+    except errors.InvalidSQLValueError as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
 @router.post("/create_person_phone", tags=["Person Phones"],
              responses=get_response_models(PersonPhone, [201, 400, 401, 422, 500]), status_code=status.HTTP_201_CREATED)
-def create_person_phone(
+async def create_person_phone(
         person_phone_input: PersonPhoneInput = Body(None, examples=PersonPhoneInput.Config.schema_extra["examples"]),
         _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> Tuple[PersonPhone, Person, PhoneNumberType]:
     try:
-        new_person_phone_id = person_phone_provider.insert_person_phone(person_phone_input)
-        new_person_phone = person_phone_provider.get_person_phone(new_person_phone_id)
+        new_person_phone_id = await utils.run_nonblocking(person_phone_provider.insert_person_phone,
+                                                          person_phone_input)
+        new_person_phone = await utils.run_nonblocking(person_phone_provider.get_person_phone,
+                                                       new_person_phone_id)
         return new_person_phone
     except errors.IntegrityError as e:
         raise_400(e)
@@ -85,16 +188,48 @@ def create_person_phone(
         raise_500(e)
 
 
+@router.post("/import_person_phones", tags=["Person Phones"],
+             responses=get_response_models(ImportReport, [200, 400, 401, 500]),
+             openapi_extra=get_import_request_body())
+async def import_person_phones(request: Request,
+                               import_format: EExportFormat = EExportFormat.NDJSON,
+                               _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> ImportReport:
+    try:
+        import_report = await import_service.import_person_phones(request.stream(), import_format)
+        return import_report
+    except errors.InvalidImportFileError as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
+@router.post("/batch_person_phones", tags=["Person Phones"],
+             responses=get_response_models(BatchResult[Tuple[PersonPhone, Person, PhoneNumberType]],
+                                           [200, 400, 401, 500]))
+async def batch_person_phones(
+        person_phone_operations: List[PersonPhoneOperation] = Body(..., example=PersonPhoneOperation.Config.schema_extra["example"]),
+        _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> BatchResult[Tuple[PersonPhone, Person, PhoneNumberType]]:
+    try:
+        results = await utils.run_nonblocking(person_phone_provider.execute_person_phone_operations,
+                                              person_phone_operations)
+        return get_batch_result("Person phone", list(map(lambda ppo: tuple((ppo.operation, ppo.person_phone_id)),
+                                                         person_phone_operations)), results)
+    except errors.InvalidSQLValueError as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
 @router.put("/update_person_phone/{person_id}/{phone_number}/{phone_number_type_id}", tags=["Person Phones"],
             responses=get_response_models(PersonPhone, [200, 400, 401, 404, 422, 500]))
-def update_person_phone(
+async def update_person_phone(
         person_id: int, phone_number: str, phone_number_type_id: int,
         person_phone_input: PersonPhoneInput = Body(None, examples=PersonPhoneInput.Config.schema_extra["examples"]),
         _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> Tuple[PersonPhone, Person, PhoneNumberType]:
     person_phone_id = tuple((person_id, phone_number, phone_number_type_id))
     try:
-        updated_person_phone_id = person_phone_provider.update_person_phone(person_phone_id, person_phone_input)
-        updated_person_phone = person_phone_provider.get_person_phone(updated_person_phone_id)
+        updated_person_phone = await utils.run_nonblocking(person_phone_provider.update_and_get_person_phone,
+                                                           person_phone_id, person_phone_input)
         return updated_person_phone
     except errors.NotFoundError as e:
         raise_404(e, "Person phone", person_phone_id)
@@ -108,11 +243,11 @@ def update_person_phone(
 
 @router.delete("/delete_person_phone/{person_id}/{phone_number}/{phone_number_type_id}", tags=["Person Phones"],
                responses=get_response_models(ResponseMessage, [200, 400, 401, 404, 500]))
-def delete_person_phone(person_id: int, phone_number: str, phone_number_type_id: int,
-                        _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> ResponseMessage:
+async def delete_person_phone(person_id: int, phone_number: str, phone_number_type_id: int,
+                              _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> ResponseMessage:
     person_phone_id = tuple((person_id, phone_number, phone_number_type_id))
     try:
-        person_phone_provider.delete_person_phone(person_phone_id)
+        await utils.run_nonblocking(person_phone_provider.delete_person_phone, person_phone_id)
         return ResponseMessage(title="Person phone deleted.",
                                description=f"Person phone of given id '{person_phone_id}' deleted.",
                                code=status.HTTP_200_OK)
@@ -1,41 +1,116 @@
-from fastapi import APIRouter, Body, Depends, status
-from typing import Optional, List
+from fastapi import APIRouter, Body, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Optional, List, Union
 
-from app import errors
-from app.config import DefaultQueryParamsConfig
-from app.models import (EOrderType, AWFAPIUser, PhoneNumberTypeInput, PhoneNumberType,
-                        CountMessage, ResponseMessage, get_response_models)
-from app.providers import PhoneNumberTypeProvider
-from app.services import PersonPhoneService
+from app import utils, errors
+from app.config import DefaultQueryParamsConfig, PostgresdbConnectionConfig, ExportConfig
+from app.models import (EOrderType, EExportFormat, EBatchOperation, AWFAPIUser, PhoneNumberTypeInput, PhoneNumberType,
+                        PhoneNumberTypeOperation, ImportReport, BatchResult, CountMessage, ListCountMessage,
+                        ResponseMessage, get_response_models, get_import_request_body)
+from app.providers import IPhoneNumberTypeProvider, PhoneNumberTypeProvider, AsyncPhoneNumberTypeProvider
+from app.services import PersonPhoneService, AsyncPersonPhoneService, ImportService
 
 from app.oauth2_handlers import get_current_user, get_current_nonreadonly_user
-from app.error_handlers import raise_400, raise_404, raise_422, raise_500
+from app.error_handlers import raise_400, raise_404, raise_422, raise_500, get_batch_result
 
 
 router: APIRouter = APIRouter()
 
 default_params: DefaultQueryParamsConfig = DefaultQueryParamsConfig.from_json(entity="phone_number_type")
-phone_number_type_provider: PhoneNumberTypeProvider = PhoneNumberTypeProvider()
-person_phone_service: PersonPhoneService = PersonPhoneService()
+is_async: bool = PostgresdbConnectionConfig.from_json().is_async
+phone_number_type_provider: IPhoneNumberTypeProvider = \
+    AsyncPhoneNumberTypeProvider() if is_async else PhoneNumberTypeProvider()
+person_phone_service: Union[PersonPhoneService, AsyncPersonPhoneService] = \
+    AsyncPersonPhoneService() if is_async else PersonPhoneService()
+import_service: ImportService = ImportService(phone_number_type_provider=phone_number_type_provider)
 
 
 @router.get("/get_phone_number_types", tags=["Phone Number Types"],
             responses=get_response_models(List[PhoneNumberType], [200, 400, 401, 500]))
-def get_phone_number_types(filters: Optional[str] = default_params.filters,
-                           order_by: Optional[str] = default_params.order_by,
-                           order_type: Optional[EOrderType] = default_params.order_type,
-                           offset: int = default_params.offset,
-                           limit: int = default_params.limit,
-                           _: AWFAPIUser = Depends(get_current_user)) -> List[PhoneNumberType]:
+async def get_phone_number_types(response: Response,
+                                 filters: Optional[str] = default_params.filters,
+                                 order_by: Optional[str] = default_params.order_by,
+                                 order_type: Optional[EOrderType] = default_params.order_type,
+                                 offset: int = default_params.offset,
+                                 limit: int = default_params.limit,
+                                 is_keyset: bool = False, cursor: Optional[str] = None,
+                                 is_total_count: bool = False,
+                                 _: AWFAPIUser = Depends(get_current_user)) -> List[PhoneNumberType]:
     if filters == "":
         filters = None
     if order_by == "":
         order_by = None
+    if cursor == "":
+        cursor = None
 
     try:
-        phone_number_types = phone_number_type_provider.get_phone_number_types(filters, order_by, order_type,
-                                                                               limit, offset)
+        if is_keyset or cursor is not None:
+            phone_number_types, next_cursor = await utils.run_nonblocking(
+                phone_number_type_provider.get_phone_number_types_page, filters, order_by, order_type, limit, cursor)
+            if next_cursor is not None:
+                response.headers["X-Next-Cursor"] = next_cursor
+            return phone_number_types
+
+        if is_total_count:
+            phone_number_types, phone_number_types_total = await utils.run_nonblocking(
+                phone_number_type_provider.get_phone_number_types_with_total,
+                filters, order_by, order_type, limit, offset)
+            response.headers["X-Total-Count"] = str(phone_number_types_total)
+            return phone_number_types
+
+        phone_number_types = await utils.run_nonblocking(phone_number_type_provider.get_phone_number_types,
+                                                         filters, order_by, order_type, limit, offset)
         return phone_number_types
+    except (errors.InvalidFilterStringError, errors.FilterNotFoundError,
+            errors.ColumnNotFoundError, errors.InvalidSQLValueError, errors.InvalidCursorError) as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
+@router.get("/get_phone_number_types_with_count", tags=["Phone Number Types"],
+            responses=get_response_models(ListCountMessage[PhoneNumberType], [200, 400, 401, 500]))
+async def get_phone_number_types_with_count(filters: Optional[str] = default_params.filters,
+                                            order_by: Optional[str] = default_params.order_by,
+                                            order_type: Optional[EOrderType] = default_params.order_type,
+                                            offset: int = default_params.offset,
+                                            limit: int = default_params.limit,
+                                            _: AWFAPIUser = Depends(get_current_user)
+                                            ) -> ListCountMessage[PhoneNumberType]:
+    if filters == "":
+        filters = None
+    if order_by == "":
+        order_by = None
+
+    try:
+        phone_number_types, phone_number_types_total = await utils.run_nonblocking(
+            phone_number_type_provider.get_phone_number_types_with_total, filters, order_by, order_type, limit, offset)
+        return ListCountMessage[PhoneNumberType](entity="Phone number type", count=phone_number_types_total,
+                                                 items=phone_number_types)
+    except (errors.InvalidFilterStringError, errors.FilterNotFoundError,
+            errors.ColumnNotFoundError, errors.InvalidSQLValueError) as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
+@router.get("/export_phone_number_types", tags=["Phone Number Types"],
+            responses=get_response_models(List[PhoneNumberType], [200, 400, 401, 500]))
+async def export_phone_number_types(filters: Optional[str] = default_params.filters,
+                                    order_by: Optional[str] = default_params.order_by,
+                                    order_type: Optional[EOrderType] = default_params.order_type,
+                                    export_format: EExportFormat = EExportFormat.NDJSON,
+                                    _: AWFAPIUser = Depends(get_current_user)) -> StreamingResponse:
+    if filters == "":
+        filters = None
+    if order_by == "":
+        order_by = None
+
+    try:
+        phone_number_type_batches = phone_number_type_provider.stream_phone_number_types(
+            filters, order_by, order_type, ExportConfig.from_json().batch_size)
+        columns = list(PhoneNumberType.__fields__.keys())
+        return utils.get_export_response(phone_number_type_batches, export_format, columns, "phone_number_types")
     except (errors.InvalidFilterStringError, errors.FilterNotFoundError,
             errors.ColumnNotFoundError, errors.InvalidSQLValueError) as e:
         raise_400(e)
@@ -45,12 +120,13 @@ def get_phone_number_types(filters: Optional[str] = default_params.filters,
 
 @router.get("/count_phone_number_types", tags=["Phone Number Types"],
             responses=get_response_models(CountMessage, [200, 400, 401, 500]))
-def count_phone_number_types(filters: Optional[str] = default_params.filters,
-                             _: AWFAPIUser = Depends(get_current_user)) -> CountMessage:
+async def count_phone_number_types(filters: Optional[str] = default_params.filters,
+                                   _: AWFAPIUser = Depends(get_current_user)) -> CountMessage:
     if filters == "":
         filters = None
     try:
-        phone_number_types_count = phone_number_type_provider.count_phone_number_types(filters)
+        phone_number_types_count = await utils.run_nonblocking(phone_number_type_provider.count_phone_number_types,
+                                                               filters)
         return CountMessage(entity="Phone number type", count=phone_number_types_count)
     except (errors.InvalidFilterStringError, errors.FilterNotFoundError) as e:
         raise_400(e)
@@ -60,10 +136,11 @@ def count_phone_number_types(filters: Optional[str] = default_params.filters,
 
 @router.get("/get_phone_number_type/{phone_number_type_id}", tags=["Phone Number Types"],
             responses=get_response_models(PhoneNumberType, [200, 400, 401, 404, 500]))
-def get_phone_number_type(phone_number_type_id: int,
-                          _: AWFAPIUser = Depends(get_current_user)) -> PhoneNumberType:
+async def get_phone_number_type(phone_number_type_id: int,
+                                _: AWFAPIUser = Depends(get_current_user)) -> PhoneNumberType:
     try:
-        phone_number_type = phone_number_type_provider.get_phone_number_type(phone_number_type_id)
+        phone_number_type = await utils.run_nonblocking(phone_number_type_provider.get_phone_number_type,
+                                                        phone_number_type_id)
         return phone_number_type
     except errors.NotFoundError as e:
         raise_404(e, "Phone number type", phone_number_type_id)
@@ -71,15 +148,31 @@ def get_phone_number_type(phone_number_type_id: int,
         raise_500(e)
 
 
+@router.get("/get_phone_number_types_by_ids", tags=["Phone Number Types"],
+            responses=get_response_models(List[Optional[PhoneNumberType]], [200, 400, 401, 500]))
+async def get_phone_number_types_by_ids(phone_number_type_ids: List[int] = Query(...),
+                                        _: AWFAPIUser = Depends(get_current_user)) -> List[Optional[PhoneNumberType]]:
+    try:
+        phone_number_types = await utils.run_nonblocking(phone_number_type_provider.get_phone_number_types_by_ids,
+                                                         phone_number_type_ids)
+        return phone_number_types
+    except errors.InvalidSQLValueError as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
 @router.post("/create_phone_number_type", tags=["Phone Number Types"],
              responses=get_response_models(PhoneNumberType, [201, 400, 401, 422, 500]),
              status_code=status.HTTP_201_CREATED)
-def create_phone_number_type(
+async def create_phone_number_type(
         phone_number_type_input: PhoneNumberTypeInput = Body(None, examples=PhoneNumberTypeInput.Config.schema_extra["examples"]),
         _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> PhoneNumberType:
     try:
-        new_phone_number_type_id = phone_number_type_provider.insert_phone_number_type(phone_number_type_input)
-        new_phone_number_type = phone_number_type_provider.get_phone_number_type(new_phone_number_type_id)
+        new_phone_number_type_id = await utils.run_nonblocking(phone_number_type_provider.insert_phone_number_type,
+                                                               phone_number_type_input)
+        new_phone_number_type = await utils.run_nonblocking(phone_number_type_provider.get_phone_number_type,
+                                                            new_phone_number_type_id)
         return new_phone_number_type
     except errors.PydanticValidationError as e:
         raise_422(e)
@@ -87,15 +180,54 @@ def create_phone_number_type(
         raise_500(e)
 
 
+@router.post("/import_phone_number_types", tags=["Phone Number Types"],
+             responses=get_response_models(ImportReport, [200, 400, 401, 500]),
+             openapi_extra=get_import_request_body())
+async def import_phone_number_types(request: Request,
+                                    import_format: EExportFormat = EExportFormat.NDJSON,
+                                    _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> ImportReport:
+    try:
+        import_report = await import_service.import_phone_number_types(request.stream(), import_format)
+        return import_report
+    except errors.InvalidImportFileError as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
+@router.post("/batch_phone_number_types", tags=["Phone Number Types"],
+             responses=get_response_models(BatchResult[PhoneNumberType], [200, 400, 401, 500]))
+async def batch_phone_number_types(
+        phone_number_type_operations: List[PhoneNumberTypeOperation] = Body(..., example=PhoneNumberTypeOperation.Config.schema_extra["example"]),
+        _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> BatchResult[PhoneNumberType]:
+    try:
+        results = await utils.run_nonblocking(phone_number_type_provider.execute_phone_number_type_operations,
+                                              phone_number_type_operations)
+        for i, (phone_number_type_operation, result) in enumerate(zip(phone_number_type_operations, results)):
+            if phone_number_type_operation.operation == EBatchOperation.DELETE and isinstance(result, int):
+                try:
+                    PersonPhoneService.check_phone_number_type_person_phones_count(
+                        phone_number_type_operation.phone_number_type_id, result)
+                except errors.ExistingDependentEntityError as e:
+                    results[i] = e
+        return get_batch_result("Phone number type",
+                                list(map(lambda pnto: tuple((pnto.operation, pnto.phone_number_type_id)),
+                                         phone_number_type_operations)), results)
+    except errors.InvalidSQLValueError as e:
+        raise_400(e)
+    except Exception as e:
+        raise_500(e)
+
+
 @router.put("/update_phone_number_type/{phone_number_type_id}", tags=["Phone Number Types"],
             responses=get_response_models(PhoneNumberType, [200, 400, 401, 404, 422, 500]))
-def update_phone_number_type(phone_number_type_id: int,
-                             phone_number_type_input: PhoneNumberTypeInput = Body(None, examples=PhoneNumberTypeInput.Config.schema_extra["examples"]),
-                             _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> PhoneNumberType:
+async def update_phone_number_type(phone_number_type_id: int,
+                                   phone_number_type_input: PhoneNumberTypeInput = Body(None, examples=PhoneNumberTypeInput.Config.schema_extra["examples"]),
+                                   _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> PhoneNumberType:
     try:
-        updated_phone_number_type_id = phone_number_type_provider.update_phone_number_type(phone_number_type_id, phone_number_type_input)
-        updated_phone_number = phone_number_type_provider.get_phone_number_type(updated_phone_number_type_id)
-        return updated_phone_number
+        updated_phone_number_type = await utils.run_nonblocking(
+            phone_number_type_provider.update_and_get_phone_number_type, phone_number_type_id, phone_number_type_input)
+        return updated_phone_number_type
     except errors.NotFoundError as e:
         raise_404(e, "Phone number type", phone_number_type_id)
     except errors.PydanticValidationError as e:
@@ -106,11 +238,13 @@ def update_phone_number_type(phone_number_type_id: int,
 
 @router.delete("/delete_phone_number_type/{phone_number_type_id}", tags=["Phone Number Types"],
                responses=get_response_models(ResponseMessage, [200, 400, 401, 404, 500]))
-def delete_phone_number_type(phone_number_type_id: int,
-                             _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> ResponseMessage:
+async def delete_phone_number_type(phone_number_type_id: int,
+                                   _: AWFAPIUser = Depends(get_current_nonreadonly_user)) -> ResponseMessage:
     try:
-        person_phone_service.has_phone_number_type_person_phones(phone_number_type_id)
-        phone_number_type_provider.delete_phone_number_type(phone_number_type_id)
+        dependent_person_phones_count = await utils.run_nonblocking(
+            phone_number_type_provider.delete_independent_phone_number_type, phone_number_type_id)
+        PersonPhoneService.check_phone_number_type_person_phones_count(phone_number_type_id,
+                                                                       dependent_person_phones_count)
         return ResponseMessage(title="Phone number type deleted.",
                                description=f"Phone number type of given id '{phone_number_type_id}' deleted.",
                                code=status.HTTP_200_OK)
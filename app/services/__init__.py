@@ -2,3 +2,6 @@ from app.services.awfapi_user_service import AWFAPIUserService
 from app.services.jwt_authentication_service import JWTAuthenticationService
 from app.services.person_service import PersonService
 from app.services.person_phone_service import PersonPhoneService
+from app.services.async_person_service import AsyncPersonService
+from app.services.async_person_phone_service import AsyncPersonPhoneService
+from app.services.import_service import ImportService
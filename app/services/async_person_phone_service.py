@@ -0,0 +1,50 @@
+from typing import Optional, List, Tuple
+
+from app.providers import AsyncPersonPhoneProvider
+from app.services import PersonPhoneService
+from app.models import Person, PhoneNumberType, PersonPhone, PersonWithPhones
+
+
+class AsyncPersonPhoneService:
+    """ Person phone service working with async person phone provider, its methods are coroutines """
+    person_phone_provider: AsyncPersonPhoneProvider
+
+    def __init__(self, person_phone_provider: Optional[AsyncPersonPhoneProvider] = None):
+        self.person_phone_provider = person_phone_provider or AsyncPersonPhoneProvider()
+
+    async def get_persons_person_phones(self, person_id: int) -> List[Tuple[PersonPhone, Person, PhoneNumberType]]:
+        """ Returns list of person phones assigned to a person of given person_id """
+        filter_string = PersonPhoneService.get_person_filter_string(person_id)
+
+        return await self.person_phone_provider.get_person_phones(filters=filter_string)
+
+    async def get_phone_number_types_person_phones(self, phone_number_type_id: int
+                                                   ) -> List[Tuple[PersonPhone, Person, PhoneNumberType]]:
+        """ Returns list of person phones assigned to a phone number type of given phone_number_type_id """
+        filter_string = PersonPhoneService.get_phone_number_type_filter_string(phone_number_type_id)
+
+        return await self.person_phone_provider.get_person_phones(filters=filter_string)
+
+    async def get_persons_with_phones(self, persons: List[Person]) -> List[PersonWithPhones]:
+        """ Returns given persons with their person phones, phones of all persons are selected at once """
+        person_ids = list(map(lambda p: p.business_entity_id, persons))
+        person_phones = await self.person_phone_provider.get_person_phones_by_person_ids(person_ids)
+        return PersonPhoneService.group_person_phones(persons, person_phones)
+
+    async def has_person_person_phones(self, person_id: int) -> None:
+        """ Checks if person of given person_id has person phones assigned and raises error if so """
+        filter_string = PersonPhoneService.get_person_filter_string(person_id)
+        if not await self.person_phone_provider.exists_person_phones(filters=filter_string):
+            return
+
+        person_phones_count = await self.person_phone_provider.count_person_phones(filters=filter_string)
+        PersonPhoneService.check_person_person_phones_count(person_id, person_phones_count)
+
+    async def has_phone_number_type_person_phones(self, phone_number_type_id: int) -> None:
+        """ Checks if phone number type of given phone_number_type_id has person phones assigned and raises error if so """
+        filter_string = PersonPhoneService.get_phone_number_type_filter_string(phone_number_type_id)
+        if not await self.person_phone_provider.exists_person_phones(filters=filter_string):
+            return
+
+        person_phones_count = await self.person_phone_provider.count_person_phones(filters=filter_string)
+        PersonPhoneService.check_phone_number_type_person_phones_count(phone_number_type_id, person_phones_count)
@@ -0,0 +1,114 @@
+from typing import Optional, List, Tuple, AsyncIterator
+
+from app import errors
+from app.providers import AsyncPersonProvider
+from app.providers.person_provider import PersonDbFields
+from app.config import PersonSearchConfig, BatchConfig
+from app.person_search_engine import PersonSearchEngine
+from app.services import PersonService
+from app.models import EOrderType, Person, E404NotFound
+
+
+class AsyncPersonService:
+    """ Person service working with async person provider, its methods are coroutines """
+    person_provider: AsyncPersonProvider
+    person_search_engine: Optional[PersonSearchEngine]
+
+    def __init__(self, person_provider: Optional[AsyncPersonProvider] = None,
+                 person_search_engine: Optional[PersonSearchEngine] = None):
+        self.person_provider = person_provider or AsyncPersonProvider()
+        self.person_search_engine = person_search_engine
+
+    async def load_person_search_engine(self) -> None:
+        self.person_search_engine = PersonSearchEngine(await self.person_provider.get_person_search_names())
+
+    async def get_persons_of_ids(self, person_ids: List[int], fields: Optional[str] = None) -> List[Person]:
+        max_ids = BatchConfig.from_json().max_ids
+        persons = list([])
+        for i in range(0, len(person_ids), max_ids):
+            persons.extend(await self.person_provider.get_persons_by_ids(person_ids[i:i + max_ids], fields))
+        return list(filter(lambda p: p is not None, persons))
+
+    async def get_persons_by_phrases(self,
+                                     first_name_phrase: Optional[str] = None,
+                                     last_name_phrase: Optional[str] = None,
+                                     is_ordered: Optional[bool] = True,
+                                     is_alternative: Optional[bool] = False,
+                                     is_raised_error_if_empty: Optional[bool] = True,
+                                     is_ranked: Optional[bool] = False,
+                                     limit: Optional[int] = None) -> List[Person]:
+        """ Returns persons found by phrases, best matching first if ranked (then 'is_ordered' is ignored) """
+
+        filter_string = PersonService.get_phrases_filter_string(first_name_phrase, last_name_phrase)
+
+        if is_ranked:
+            found_persons = await self.person_provider.search_persons(filters=filter_string, limit=limit,
+                                                                      is_alternative=is_alternative)
+        elif self.person_search_engine is not None:
+            found_persons = await self.get_persons_of_ids(
+                self.person_search_engine.get_person_ids(filter_string, is_ordered, is_alternative, limit))
+        else:
+            found_persons = await self.person_provider.get_persons(filters=filter_string,
+                                                                   order_by="full_name" if is_ordered else None,
+                                                                   order_type=EOrderType.ASC,
+                                                                   limit=limit, offset=None,
+                                                                   is_alternative=is_alternative,
+                                                                   collation=PersonSearchEngine.collation)
+
+        if is_raised_error_if_empty and len(found_persons) == 0:
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_NOT_FOUND}: Persons of given phrases not found.")
+
+        return found_persons
+
+    async def get_persons_page_by_phrases(self,
+                                          first_name_phrase: Optional[str] = None,
+                                          last_name_phrase: Optional[str] = None,
+                                          is_ordered: Optional[bool] = True,
+                                          is_alternative: Optional[bool] = False,
+                                          is_raised_error_if_empty: Optional[bool] = True,
+                                          is_ranked: Optional[bool] = False,
+                                          limit: Optional[int] = None,
+                                          cursor: Optional[str] = None,
+                                          fields: Optional[str] = None) -> Tuple[List[Person], Optional[str]]:
+
+        filter_string = PersonService.get_phrases_filter_string(first_name_phrase, last_name_phrase)
+        limit = PersonService.get_search_limit(limit)
+        PersonDbFields.from_fields_string(fields)
+
+        if is_ranked:
+            PersonService.check_ranked_search_cursor(cursor)
+            found_persons = await self.person_provider.search_persons(filters=filter_string, limit=limit,
+                                                                      is_alternative=is_alternative, fields=fields)
+            next_cursor = None
+        elif self.person_search_engine is not None:
+            found_person_ids, next_cursor = self.person_search_engine.get_person_ids_page(filter_string, is_ordered,
+                                                                                          is_alternative, limit,
+                                                                                          cursor)
+            found_persons = await self.get_persons_of_ids(found_person_ids, fields)
+        else:
+            found_persons, next_cursor = await self.person_provider.get_persons_page(
+                filters=filter_string, order_by="full_name" if is_ordered else None, order_type=EOrderType.ASC,
+                limit=limit, cursor=cursor, is_alternative=is_alternative, fields=fields,
+                collation=PersonSearchEngine.collation)
+
+        if is_raised_error_if_empty and cursor is None and len(found_persons) == 0:
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_NOT_FOUND}: Persons of given phrases not found.")
+
+        return found_persons, next_cursor
+
+    def stream_persons_by_phrases(self,
+                                  first_name_phrase: Optional[str] = None,
+                                  last_name_phrase: Optional[str] = None,
+                                  is_ordered: Optional[bool] = True,
+                                  is_alternative: Optional[bool] = False,
+                                  is_ranked: Optional[bool] = False,
+                                  fields: Optional[str] = None) -> AsyncIterator[List[Person]]:
+
+        filter_string = PersonService.get_phrases_filter_string(first_name_phrase, last_name_phrase)
+
+        return self.person_provider.stream_persons(filters=filter_string,
+                                                   order_by="full_name" if is_ordered else None,
+                                                   order_type=EOrderType.ASC,
+                                                   is_alternative=is_alternative, is_ranked=is_ranked,
+                                                   batch_size=PersonSearchConfig.from_json().stream_batch_size,
+                                                   fields=fields, collation=PersonSearchEngine.collation)
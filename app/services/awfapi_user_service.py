@@ -5,23 +5,31 @@ from app.models import AWFAPIUserInput,\
     AWFAPIViewedUser, AWFAPIRegisteredUser, AWFAPIChangedUserData, AWFAPIChangedUserCredentials, \
     E400BadRequest
 from app.providers import IAWFAPIUserProvider, AWFAPIUserProvider
+from app.password_hashing_executor import PasswordHashingExecutor, hash_password_job, verify_password_job
 from app import errors
 
 
 class AWFAPIUserService:
     pwd_context: CryptContext
+    pwd_context_string: str
     awfapi_user_provider: IAWFAPIUserProvider
 
     def __init__(self, pwd_context: Optional[CryptContext] = None,
                  awfapi_user_provider: Optional[IAWFAPIUserProvider] = None):
         self.pwd_context = pwd_context or CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.pwd_context_string = self.pwd_context.to_string()
         self.awfapi_user_provider = awfapi_user_provider or AWFAPIUserProvider()
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return PasswordHashingExecutor.run(verify_password_job, self.pwd_context_string,
+                                           plain_password, hashed_password)
+
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        return await PasswordHashingExecutor.run_async(verify_password_job, self.pwd_context_string,
+                                                       plain_password, hashed_password)
 
     def hash_password(self, password: str) -> str:
-        return self.pwd_context.hash(password)
+        return PasswordHashingExecutor.run(hash_password_job, self.pwd_context_string, password)
 
     def view_awfapi_user(self, awfapi_user_username: str) -> 'AWFAPIViewedUser':
         awfapi_user = self.awfapi_user_provider.get_awfapi_user(awfapi_user_username)
@@ -0,0 +1,150 @@
+import pydantic
+from pydantic import BaseModel
+from sqlmodel import SQLModel
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from app import utils, errors
+from app.config import ImportConfig
+from app.providers import (IPersonProvider, IPhoneNumberTypeProvider, IPersonPhoneProvider,
+                           PersonProvider, PhoneNumberTypeProvider, PersonPhoneProvider)
+from app.models import (EExportFormat, Person, PersonInput, PhoneNumberType, PhoneNumberTypeInput,
+                        PersonPhone, PersonPhoneInput, ImportRowError, ImportReport,
+                        E400BadRequest, E422UnprocessableEntity)
+
+
+class ImportService:
+    """
+    Bulk import of persons, phone number types and person phones from NDJSON or CSV files.
+
+    Rows are read from the stream of file chunks (e.g. of an uploaded file), validated against the entity
+    input model and loaded with COPY in batches of 'batch_size' rows (set in the 'import' section
+    of the config file), one transaction per batch.
+    Invalid rows are reported and left out. A batch failing in the database is split in halves and loaded again,
+    until the failing rows are found and reported, so the rest of the file is loaded anyway.
+    Works with both sync and async providers.
+    """
+    person_provider: IPersonProvider
+    phone_number_type_provider: IPhoneNumberTypeProvider
+    person_phone_provider: IPersonPhoneProvider
+
+    def __init__(self, person_provider: Optional[IPersonProvider] = None,
+                 phone_number_type_provider: Optional[IPhoneNumberTypeProvider] = None,
+                 person_phone_provider: Optional[IPersonPhoneProvider] = None):
+        self.person_provider = person_provider or PersonProvider()
+        self.phone_number_type_provider = phone_number_type_provider or PhoneNumberTypeProvider()
+        self.person_phone_provider = person_phone_provider or PersonPhoneProvider()
+
+    async def import_persons(self, chunks: AsyncIterator[bytes], import_format: EExportFormat) -> ImportReport:
+        """ Imports persons of given file chunks, returns report of imported and failed rows """
+        return await self.__import(chunks, import_format, "person", ImportService.get_person_input,
+                                   self.__copy_persons)
+
+    async def import_phone_number_types(self, chunks: AsyncIterator[bytes],
+                                        import_format: EExportFormat) -> ImportReport:
+        """ Imports phone number types of given file chunks, returns report of imported and failed rows """
+        return await self.__import(chunks, import_format, "phone_number_type",
+                                   ImportService.get_phone_number_type_input, self.__copy_phone_number_types)
+
+    async def import_person_phones(self, chunks: AsyncIterator[bytes], import_format: EExportFormat) -> ImportReport:
+        """
+        Imports person phones of given file chunks, returns report of imported and failed rows.
+        Person phones of missing persons or phone number types and already existing ones are reported as failed.
+        """
+        return await self.__import(chunks, import_format, "person_phone", ImportService.get_person_phone_input,
+                                   self.__copy_person_phones)
+
+    @staticmethod
+    def get_person_input(row: Dict[str, Any]) -> Union[PersonInput, str]:
+        """ Returns person input of given row values, error message if the values are invalid """
+        return ImportService.__get_input(row, PersonInput, Person, E422UnprocessableEntity.INVALID_PERSON_VALUES)
+
+    @staticmethod
+    def get_phone_number_type_input(row: Dict[str, Any]) -> Union[PhoneNumberTypeInput, str]:
+        """ Returns phone number type input of given row values, error message if the values are invalid """
+        return ImportService.__get_input(row, PhoneNumberTypeInput, PhoneNumberType,
+                                         E422UnprocessableEntity.INVALID_PHONE_NUMBER_TYPE_VALUES)
+
+    @staticmethod
+    def get_person_phone_input(row: Dict[str, Any]) -> Union[PersonPhoneInput, str]:
+        """ Returns person phone input of given row values, error message if the values are invalid """
+        return ImportService.__get_input(row, PersonPhoneInput, PersonPhone,
+                                         E422UnprocessableEntity.INVALID_PERSON_PHONE_VALUES)
+
+    async def __import(self, chunks: AsyncIterator[bytes], import_format: EExportFormat, entity: str,
+                       get_input: Callable[[Dict[str, Any]], Union[BaseModel, str]],
+                       copy_inputs: Callable[[List[BaseModel]], Any]) -> ImportReport:
+        """ Imports inputs of given file chunks in batches, returns report of imported and failed rows """
+        ic = ImportConfig.from_json()
+        import_report = ImportReport(entity=entity)
+        batch = list([])
+        async for row_number, row in utils.get_import_rows(utils.get_byte_lines(chunks), import_format):
+            entity_input = row if isinstance(row, str) else get_input(row)
+            if isinstance(entity_input, str):
+                ImportService.__add_error(import_report, row_number, entity_input)
+                continue
+            batch.append(tuple((row_number, entity_input)))
+            if len(batch) >= ic.batch_size:
+                await ImportService.__load(import_report, batch, copy_inputs)
+                batch = list([])
+        if len(batch) > 0:
+            await ImportService.__load(import_report, batch, copy_inputs)
+        return import_report
+
+    async def __copy_persons(self, person_inputs: List[PersonInput]) -> List[Tuple[int, str]]:
+        """ Copies persons of given inputs, returns positions of skipped inputs with reasons """
+        await utils.run_nonblocking(self.person_provider.copy_persons, person_inputs)
+        return list([])
+
+    async def __copy_phone_number_types(self, phone_number_type_inputs: List[PhoneNumberTypeInput]
+                                        ) -> List[Tuple[int, str]]:
+        """ Copies phone number types of given inputs, returns positions of skipped inputs with reasons """
+        await utils.run_nonblocking(self.phone_number_type_provider.copy_phone_number_types, phone_number_type_inputs)
+        return list([])
+
+    async def __copy_person_phones(self, person_phone_inputs: List[PersonPhoneInput]) -> List[Tuple[int, str]]:
+        """ Copies person phones of given inputs, returns positions of skipped inputs with reasons """
+        skipped_positions = await utils.run_nonblocking(self.person_phone_provider.copy_person_phones,
+                                                        person_phone_inputs)
+        return list(map(lambda sp: tuple((sp, f"{E400BadRequest.INVALID_IMPORT_ROW}: Person phone is not imported. "
+                                              f"Its person or phone number type does not exist "
+                                              f"or the person phone already exists.")), skipped_positions))
+
+    @staticmethod
+    async def __load(import_report: ImportReport, batch: List[Tuple[int, BaseModel]],
+                     copy_inputs: Callable[[List[BaseModel]], Any]) -> None:
+        """ Loads given batch of numbered inputs, on database error loads its halves separately """
+        try:
+            skipped_inputs = await copy_inputs(list(map(lambda b: b[1], batch)))
+        except Exception as e:
+            if len(batch) == 1:
+                error_message = str(e).strip().split("\n")[0]
+                ImportService.__add_error(import_report, batch[0][0],
+                                          f"{E400BadRequest.INVALID_SQL_VALUE}: {error_message}")
+                return
+            await ImportService.__load(import_report, batch[:len(batch) // 2], copy_inputs)
+            await ImportService.__load(import_report, batch[len(batch) // 2:], copy_inputs)
+            return
+
+        for position, error_message in skipped_inputs:
+            ImportService.__add_error(import_report, batch[position][0], error_message)
+        import_report.imported_count += len(batch) - len(skipped_inputs)
+
+    @staticmethod
+    def __get_input(row: Dict[str, Any], input_model: Type[BaseModel], model: Type[SQLModel],
+                    error_code: E422UnprocessableEntity) -> Union[BaseModel, str]:
+        """ Returns input of given row values validated as the model, error message if the values are invalid """
+        try:
+            entity_input = input_model(**row)
+            model(**entity_input.dict()).validate_assignment(entity_input)
+        except pydantic.ValidationError as e:
+            return f"{error_code}: {str(e)}"
+        except errors.PydanticValidationError as e:
+            return str(e)
+        return entity_input
+
+    @staticmethod
+    def __add_error(import_report: ImportReport, row_number: int, error_message: str) -> None:
+        """ Adds failed row to given report, lists at most 'max_reported_errors' errors """
+        import_report.failed_count += 1
+        if len(import_report.errors) < ImportConfig.from_json().max_reported_errors:
+            import_report.errors.append(ImportRowError(row=row_number, detail=error_message))
@@ -1,26 +1,37 @@
 from jose import jwt, JWTError, ExpiredSignatureError
+from starlette.concurrency import run_in_threadpool
 from typing import Optional, Dict
 import datetime as dt
 
 from app import errors
-from app.config import JWTAuthenticationConfig
-from app.providers import IAWFAPIUserProvider, AWFAPIUserProvider
+from app.caches import TTLLRUCache, AWFAPIUserCache, TokenDenyList
+from app.config import JWTAuthenticationConfig, MongodbConnectionConfig
+from app.providers import IAWFAPIUserProvider, AWFAPIUserProvider, AsyncAWFAPIUserProvider
 from app.services import AWFAPIUserService
-from app.models import AWFAPIUser, TokenData, E401Unauthorized
+from app.models import AWFAPIUser, AWFAPIPrincipal, TokenData, E401Unauthorized
 
 
 class JWTAuthenticationService:
     jwt_auth_config: JWTAuthenticationConfig
     awfapi_user_provider: IAWFAPIUserProvider
     awfapi_user_service: AWFAPIUserService
+    async_awfapi_user_provider: Optional[AsyncAWFAPIUserProvider]
+    awfapi_user_cache: TTLLRUCache[str, AWFAPIUser]
 
     def __init__(self,
                  jwt_auth_config: Optional[JWTAuthenticationConfig] = None,
                  awfapi_user_provider: Optional[IAWFAPIUserProvider] = None,
-                 awfapi_user_service: Optional[AWFAPIUserService] = None):
+                 awfapi_user_service: Optional[AWFAPIUserService] = None,
+                 async_awfapi_user_provider: Optional[AsyncAWFAPIUserProvider] = None,
+                 awfapi_user_cache: Optional[TTLLRUCache[str, AWFAPIUser]] = None):
         self.jwt_auth_config = jwt_auth_config or JWTAuthenticationConfig.from_json()
         self.awfapi_user_provider = awfapi_user_provider or AWFAPIUserProvider()
         self.awfapi_user_service = awfapi_user_service or AWFAPIUserService()
+        self.async_awfapi_user_provider = async_awfapi_user_provider
+        if self.async_awfapi_user_provider is None and awfapi_user_provider is None \
+                and MongodbConnectionConfig.from_json().is_async:
+            self.async_awfapi_user_provider = AsyncAWFAPIUserProvider()
+        self.awfapi_user_cache = awfapi_user_cache or AWFAPIUserCache.get_instance()
 
     def authenticate_user(self, username: str, password: str) -> Optional[AWFAPIUser]:
         try:
@@ -32,25 +43,94 @@ class JWTAuthenticationService:
         except errors.NotFoundError:
             raise errors.InvalidCredentialsError(f"{E401Unauthorized.INVALID_USERNAME}: Invalid username.")
 
+    async def authenticate_user_async(self, username: str, password: str) -> Optional[AWFAPIUser]:
+        """
+        Authenticates user without blocking the event loop.
+
+        The user is awaited from the async user provider or, if there is none, read by the sync user provider
+        in the threadpool. The password is verified by the password hashing executor.
+        """
+        try:
+            if self.async_awfapi_user_provider is not None:
+                user = await self.async_awfapi_user_provider.get_awfapi_user(username)
+            else:
+                user = await run_in_threadpool(self.awfapi_user_provider.get_awfapi_user, username)
+            if not await self.awfapi_user_service.verify_password_async(password, user.hashed_password):
+                raise errors.InvalidCredentialsError(f"{E401Unauthorized.INVALID_PASSWORD}: Invalid password.")
+
+            return user
+        except errors.NotFoundError:
+            raise errors.InvalidCredentialsError(f"{E401Unauthorized.INVALID_USERNAME}: Invalid username.")
+
     def get_user_from_token(self, encoded_jwt: str) -> AWFAPIUser:
         try:
-            payload = self.get_access_token_payload(encoded_jwt)
-            username = payload.get("sub")
-            if username is None:
-                raise errors.InvalidCredentialsError(f"{E401Unauthorized.INVALID_JWT_TOKEN}: "
-                                                     f"Could not decode username from token.")
-
-            token_data = TokenData(username=username)
-            user = self.awfapi_user_provider.get_awfapi_user(token_data.username)
+            token_data = self.get_token_data(encoded_jwt)
+            user = self.awfapi_user_cache.get(token_data.username)
+            if user is None:
+                user = self.awfapi_user_provider.get_awfapi_user(token_data.username)
+                self.awfapi_user_cache.put(token_data.username, user)
             return user
 
-        except ExpiredSignatureError:
-            raise errors.JWTTokenSignatureExpiredError(f"{E401Unauthorized.JWT_TOKEN_EXPIRED}: "
-                                                       f"JWT token signature expired.")
-        except (JWTError, errors.NotFoundError):
+        except errors.NotFoundError:
+            raise errors.InvalidCredentialsError(f"{E401Unauthorized.INVALID_CREDENTIALS}: "
+                                                 f"Could not validate credentials.")
+
+    async def get_user_from_token_async(self, encoded_jwt: str) -> AWFAPIUser:
+        """
+        Returns user of given token without blocking the event loop.
+
+        Cached users are returned in place. On a cache miss the user is awaited from the async user provider
+        or, if there is none, read by the sync user provider in the threadpool.
+        """
+        try:
+            token_data = self.get_token_data(encoded_jwt)
+            user = self.awfapi_user_cache.get(token_data.username)
+            if user is None:
+                if self.async_awfapi_user_provider is not None:
+                    user = await self.async_awfapi_user_provider.get_awfapi_user(token_data.username)
+                else:
+                    user = await run_in_threadpool(self.awfapi_user_provider.get_awfapi_user, token_data.username)
+                self.awfapi_user_cache.put(token_data.username, user)
+            return user
+
+        except errors.NotFoundError:
             raise errors.InvalidCredentialsError(f"{E401Unauthorized.INVALID_CREDENTIALS}: "
                                                  f"Could not validate credentials.")
 
+    def get_token_data(self, encoded_jwt: str) -> TokenData:
+        payload = self.get_access_token_payload(encoded_jwt)
+        username = payload.get("sub")
+        if username is None:
+            raise errors.InvalidCredentialsError(f"{E401Unauthorized.INVALID_JWT_TOKEN}: "
+                                                 f"Could not decode username from token.")
+        return TokenData(username=username)
+
+    def get_principal_from_token(self, encoded_jwt: str) -> Optional[AWFAPIPrincipal]:
+        """
+        Returns principal built from stateless claims of the verified token, without reading the user.
+        Returns None if the token does not carry the claims (it was issued with stateless claims mode disabled).
+        """
+        payload = self.get_access_token_payload(encoded_jwt)
+        username = payload.get("sub")
+        if username is None:
+            raise errors.InvalidCredentialsError(f"{E401Unauthorized.INVALID_JWT_TOKEN}: "
+                                                 f"Could not decode username from token.")
+        if "is_readonly" not in payload or "ver" not in payload:
+            return None
+
+        principal = AWFAPIPrincipal(username=username, is_readonly=payload["is_readonly"], version=payload["ver"])
+        if TokenDenyList.is_revoked(principal.username, principal.version):
+            raise errors.InvalidCredentialsError(f"{E401Unauthorized.INVALID_CREDENTIALS}: "
+                                                 f"Could not validate credentials.")
+        return principal
+
+    def create_user_access_token(self, user: AWFAPIUser) -> str:
+        """ Returns access token of given user, with stateless claims if the mode is enabled """
+        data = dict({"sub": user.username})
+        if self.jwt_auth_config.is_stateless_claims:
+            data.update({"is_readonly": user.is_readonly, "ver": user.get_version()})
+        return self.create_access_token(data=data)
+
     def create_access_token(self, data: dict) -> str:
         to_encode = data.copy()
         expire = dt.datetime.utcnow() + dt.timedelta(minutes=self.jwt_auth_config.access_token_expire_minutes)
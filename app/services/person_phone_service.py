@@ -2,7 +2,7 @@ from typing import Optional, List, Tuple
 
 from app import errors
 from app.providers import IPersonPhoneProvider, PersonPhoneProvider
-from app.models import E400BadRequest, Person, PhoneNumberType, PersonPhone
+from app.models import E400BadRequest, Person, PhoneNumberType, PersonPhone, PersonWithPhones
 
 
 class PersonPhoneService:
@@ -13,32 +13,75 @@ class PersonPhoneService:
 
     def get_persons_person_phones(self, person_id: int) -> List[Tuple[PersonPhone, Person, PhoneNumberType]]:
         """ Returns list of person phones assigned to a person of given person_id """
-        filter_string = f"person_ids:[{person_id}]"
+        filter_string = PersonPhoneService.get_person_filter_string(person_id)
 
         return self.person_phone_provider.get_person_phones(filters=filter_string)
 
     def get_phone_number_types_person_phones(self, phone_number_type_id: int) -> List[Tuple[PersonPhone, Person, PhoneNumberType]]:
         """ Returns list of person phones assigned to a phone number type of given phone_number_type_id """
-        filter_string = f"phone_number_type_ids:[{phone_number_type_id}]"
+        filter_string = PersonPhoneService.get_phone_number_type_filter_string(phone_number_type_id)
 
         return self.person_phone_provider.get_person_phones(filters=filter_string)
 
+    def get_persons_with_phones(self, persons: List[Person]) -> List[PersonWithPhones]:
+        """ Returns given persons with their person phones, phones of all persons are selected at once """
+        person_ids = list(map(lambda p: p.business_entity_id, persons))
+        person_phones = self.person_phone_provider.get_person_phones_by_person_ids(person_ids)
+        return PersonPhoneService.group_person_phones(persons, person_phones)
+
     def has_person_person_phones(self, person_id: int) -> None:
         """ Checks if person of given person_id has person phones assigned and raises error if so """
-        person_phones = self.get_persons_person_phones(person_id)
+        filter_string = PersonPhoneService.get_person_filter_string(person_id)
+        if not self.person_phone_provider.exists_person_phones(filters=filter_string):
+            return
 
-        if len(person_phones) != 0:
-            raise errors.ExistingDependentEntityError(f"{E400BadRequest.EXISTING_DEPENDENT_ENTITY}: "
-                                                      f"Cannot delete person of id '{person_id}', because there are "
-                                                      f"existing person phone entries which are dependent on that person. "
-                                                      f"Dependent {len(person_phones)} person phone entries must be deleted first.")
+        person_phones_count = self.person_phone_provider.count_person_phones(filters=filter_string)
+        PersonPhoneService.check_person_person_phones_count(person_id, person_phones_count)
 
     def has_phone_number_type_person_phones(self, phone_number_type_id: int) -> None:
         """ Checks if phone number type of given phone_number_type_id has person phones assigned and raises error if so """
-        person_phones = self.get_phone_number_types_person_phones(phone_number_type_id)
+        filter_string = PersonPhoneService.get_phone_number_type_filter_string(phone_number_type_id)
+        if not self.person_phone_provider.exists_person_phones(filters=filter_string):
+            return
+
+        person_phones_count = self.person_phone_provider.count_person_phones(filters=filter_string)
+        PersonPhoneService.check_phone_number_type_person_phones_count(phone_number_type_id, person_phones_count)
+
+    @staticmethod
+    def get_person_filter_string(person_id: int) -> str:
+        """ Returns person phone filter string of given person_id """
+        return f"person_ids:[{person_id}]"
+
+    @staticmethod
+    def get_phone_number_type_filter_string(phone_number_type_id: int) -> str:
+        """ Returns person phone filter string of given phone_number_type_id """
+        return f"phone_number_type_ids:[{phone_number_type_id}]"
+
+    @staticmethod
+    def group_person_phones(persons: List[Person], person_phones: List[Tuple[PersonPhone, PhoneNumberType]]
+                            ) -> List[PersonWithPhones]:
+        """ Returns given persons each with its own person phones of the given ones """
+        person_phones_by_person_id = dict(map(lambda p: (p.business_entity_id, list([])), persons))
+        for person_phone in person_phones:
+            person_phones_by_person_id[person_phone[0].business_entity_id].append(person_phone)
+        return list(map(lambda p: PersonWithPhones(person=p,
+                                                   person_phones=person_phones_by_person_id[p.business_entity_id]),
+                        persons))
+
+    @staticmethod
+    def check_person_person_phones_count(person_id: int, person_phones_count: int) -> None:
+        """ Raises error if person of given person_id has any dependent person phones """
+        if person_phones_count != 0:
+            raise errors.ExistingDependentEntityError(f"{E400BadRequest.EXISTING_DEPENDENT_ENTITY}: "
+                                                      f"Cannot delete person of id '{person_id}', because there are "
+                                                      f"existing person phone entries which are dependent on that person. "
+                                                      f"Dependent {person_phones_count} person phone entries must be deleted first.")
 
-        if len(person_phones) != 0:
+    @staticmethod
+    def check_phone_number_type_person_phones_count(phone_number_type_id: int, person_phones_count: int) -> None:
+        """ Raises error if phone number type of given phone_number_type_id has any dependent person phones """
+        if person_phones_count != 0:
             raise errors.ExistingDependentEntityError(f"{E400BadRequest.EXISTING_DEPENDENT_ENTITY}: "
                                                       f"Cannot delete phone number type of id '{phone_number_type_id}', because there are "
                                                       f"existing person phone entries which are dependent on that phone number type. "
-                                                      f"Dependent {len(person_phones)} person phone entries must be deleted first.")
+                                                      f"Dependent {person_phones_count} person phone entries must be deleted first.")
@@ -1,23 +1,175 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple, Iterator
 
 from app import errors
+from app.caches import PersonNameIndex
+from app.config import PersonSearchConfig, PersonNameIndexConfig, BatchConfig
+from app.person_search_engine import PersonSearchEngine
 from app.providers import IPersonProvider, PersonProvider
-from app.models import EOrderType, Person, E400BadRequest, E404NotFound
+from app.providers.person_provider import PersonDbFields
+from app.models import EOrderType, Person, PersonName, E400BadRequest, E404NotFound, E503ServiceUnavailable
 
 
 class PersonService:
     person_provider: IPersonProvider
+    person_search_engine: Optional[PersonSearchEngine]
 
-    def __init__(self, person_provider: Optional[IPersonProvider] = None):
+    def __init__(self, person_provider: Optional[IPersonProvider] = None,
+                 person_search_engine: Optional[PersonSearchEngine] = None):
         self.person_provider = person_provider or PersonProvider()
+        self.person_search_engine = person_search_engine
+
+    def load_person_search_engine(self) -> None:
+        """
+        Builds in-memory search engine of names of all persons, unranked phrase searches use it to find person ids
+        instead of filtering in the database
+        """
+        self.person_search_engine = PersonSearchEngine(self.person_provider.get_person_search_names())
+
+    def get_persons_of_ids(self, person_ids: List[int], fields: Optional[str] = None) -> List[Person]:
+        """ Returns persons of given ids in their order, loaded with given fields only, missing ones are skipped """
+        max_ids = BatchConfig.from_json().max_ids
+        persons = list([])
+        for i in range(0, len(person_ids), max_ids):
+            persons.extend(self.person_provider.get_persons_by_ids(person_ids[i:i + max_ids], fields))
+        return list(filter(lambda p: p is not None, persons))
 
     def get_persons_by_phrases(self,
                                first_name_phrase: Optional[str] = None,
                                last_name_phrase: Optional[str] = None,
                                is_ordered: Optional[bool] = True,
                                is_alternative: Optional[bool] = False,
-                               is_raised_error_if_empty: Optional[bool] = True) -> List[Person]:
+                               is_raised_error_if_empty: Optional[bool] = True,
+                               is_ranked: Optional[bool] = False,
+                               limit: Optional[int] = None) -> List[Person]:
+        """ Returns persons found by phrases, best matching first if ranked (then 'is_ordered' is ignored) """
+
+        filter_string = PersonService.get_phrases_filter_string(first_name_phrase, last_name_phrase)
+
+        if is_ranked:
+            found_persons = self.person_provider.search_persons(filters=filter_string, limit=limit,
+                                                                is_alternative=is_alternative)
+        elif self.person_search_engine is not None:
+            found_persons = self.get_persons_of_ids(
+                self.person_search_engine.get_person_ids(filter_string, is_ordered, is_alternative, limit))
+        else:
+            found_persons = self.person_provider.get_persons(filters=filter_string,
+                                                             order_by="full_name" if is_ordered else None,
+                                                             order_type=EOrderType.ASC,
+                                                             limit=limit, offset=None,
+                                                             is_alternative=is_alternative,
+                                                             collation=PersonSearchEngine.collation)
+
+        if is_raised_error_if_empty and len(found_persons) == 0:
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_NOT_FOUND}: Persons of given phrases not found.")
+
+        return found_persons
+
+    def get_persons_page_by_phrases(self,
+                                    first_name_phrase: Optional[str] = None,
+                                    last_name_phrase: Optional[str] = None,
+                                    is_ordered: Optional[bool] = True,
+                                    is_alternative: Optional[bool] = False,
+                                    is_raised_error_if_empty: Optional[bool] = True,
+                                    is_ranked: Optional[bool] = False,
+                                    limit: Optional[int] = None,
+                                    cursor: Optional[str] = None,
+                                    fields: Optional[str] = None) -> Tuple[List[Person], Optional[str]]:
+        """
+        Returns page of persons found by phrases and cursor of the next page (None if there are no more persons).
+        Page size is bounded by the person search config. Ranked search returns its best matching page only.
+        """
+
+        filter_string = PersonService.get_phrases_filter_string(first_name_phrase, last_name_phrase)
+        limit = PersonService.get_search_limit(limit)
+        PersonDbFields.from_fields_string(fields)
+
+        if is_ranked:
+            PersonService.check_ranked_search_cursor(cursor)
+            found_persons = self.person_provider.search_persons(filters=filter_string, limit=limit,
+                                                                is_alternative=is_alternative, fields=fields)
+            next_cursor = None
+        elif self.person_search_engine is not None:
+            found_person_ids, next_cursor = self.person_search_engine.get_person_ids_page(filter_string, is_ordered,
+                                                                                          is_alternative, limit,
+                                                                                          cursor)
+            found_persons = self.get_persons_of_ids(found_person_ids, fields)
+        else:
+            found_persons, next_cursor = self.person_provider.get_persons_page(
+                filters=filter_string, order_by="full_name" if is_ordered else None, order_type=EOrderType.ASC,
+                limit=limit, cursor=cursor, is_alternative=is_alternative, fields=fields,
+                collation=PersonSearchEngine.collation)
+
+        if is_raised_error_if_empty and cursor is None and len(found_persons) == 0:
+            raise errors.NotFoundError(f"{E404NotFound.PERSON_NOT_FOUND}: Persons of given phrases not found.")
 
+        return found_persons, next_cursor
+
+    def stream_persons_by_phrases(self,
+                                  first_name_phrase: Optional[str] = None,
+                                  last_name_phrase: Optional[str] = None,
+                                  is_ordered: Optional[bool] = True,
+                                  is_alternative: Optional[bool] = False,
+                                  is_ranked: Optional[bool] = False,
+                                  fields: Optional[str] = None) -> Iterator[List[Person]]:
+        """ Returns iterator of batches of all persons found by phrases, fetched lazily from the database """
+
+        filter_string = PersonService.get_phrases_filter_string(first_name_phrase, last_name_phrase)
+
+        return self.person_provider.stream_persons(filters=filter_string,
+                                                   order_by="full_name" if is_ordered else None,
+                                                   order_type=EOrderType.ASC,
+                                                   is_alternative=is_alternative, is_ranked=is_ranked,
+                                                   batch_size=PersonSearchConfig.from_json().stream_batch_size,
+                                                   fields=fields, collation=PersonSearchEngine.collation)
+
+    @staticmethod
+    def get_person_names_by_prefix(prefix: Optional[str] = None, top_k: Optional[int] = None) -> List[PersonName]:
+        """
+        Returns names of persons whose last, first or full name starts with given prefix (for autocomplete).
+        Names are found in the in-memory person name index, the database is not queried.
+        """
+        if prefix is None or prefix.strip() == "":
+            raise errors.EmptyFieldsError(f"{E400BadRequest.VALUES_NOT_PROVIDED}: "
+                                          f"Name prefix must be provided.")
+        person_name_index_config = PersonNameIndexConfig.from_json()
+        top_k = person_name_index_config.default_top_k if top_k is None else top_k
+        if top_k < 1:
+            raise errors.InvalidSQLValueError(f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                              f"Value '{top_k}' is invalid for number of names.")
+        if top_k > person_name_index_config.max_top_k:
+            raise errors.InvalidSQLValueError(f"{E400BadRequest.LIMIT_EXCEEDED}: "
+                                              f"Number of names '{top_k}' exceeds maximum of "
+                                              f"{person_name_index_config.max_top_k}.")
+        if not PersonNameIndex.is_built:
+            raise errors.IndexNotBuiltError(f"{E503ServiceUnavailable.PERSON_NAME_INDEX_NOT_BUILT}: "
+                                            f"Person name index is not built yet. Retry in a moment.")
+
+        return list(map(lambda pn: PersonName(business_entity_id=pn[0], first_name=pn[1], last_name=pn[2]),
+                        PersonNameIndex.search(prefix, top_k)))
+
+    @staticmethod
+    def get_search_limit(limit: Optional[int] = None) -> int:
+        """ Returns limit of found persons, the default one if not given, raises error if it exceeds the maximum """
+        person_search_config = PersonSearchConfig.from_json()
+        if limit is None:
+            return person_search_config.default_limit
+        if limit > person_search_config.max_limit:
+            raise errors.InvalidSQLValueError(f"{E400BadRequest.LIMIT_EXCEEDED}: "
+                                              f"Limit '{limit}' exceeds maximum of {person_search_config.max_limit}. "
+                                              f"Use cursor pagination or streaming to get more persons.")
+        return limit
+
+    @staticmethod
+    def check_ranked_search_cursor(cursor: Optional[str] = None) -> None:
+        """ Raises error if cursor is given for ranked search, which returns its best matching page only """
+        if cursor is not None:
+            raise errors.InvalidCursorError(f"{E400BadRequest.INVALID_CURSOR}: "
+                                            f"Cursor pagination is not supported for ranked search.")
+
+    @staticmethod
+    def get_phrases_filter_string(first_name_phrase: Optional[str] = None,
+                                  last_name_phrase: Optional[str] = None) -> str:
+        """ Returns person filter string of given first and last name phrases """
         if first_name_phrase is not None and last_name_phrase is not None:
             filter_string = f"first_name_phrase:{first_name_phrase},last_name_phrase:{last_name_phrase}"
         elif first_name_phrase is not None:
@@ -27,14 +179,4 @@ class PersonService:
         else:
             raise errors.EmptyFieldsError(f"{E400BadRequest.VALUES_NOT_PROVIDED}: "
                                           f"Either first or last name phrase must be provided.")
-
-        found_persons = self.person_provider.get_persons(filters=filter_string,
-                                                         order_by="full_name" if is_ordered else None,
-                                                         order_type=EOrderType.ASC,
-                                                         limit=None, offset=None,
-                                                         is_alternative=is_alternative)
-
-        if is_raised_error_if_empty and len(found_persons) == 0:
-            raise errors.NotFoundError(f"{E404NotFound.PERSON_NOT_FOUND}: Persons of given phrases not found.")
-
-        return found_persons
+        return filter_string
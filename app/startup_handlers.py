@@ -0,0 +1,52 @@
+from app import utils
+from app.caches import PersonNameIndex, PhoneNumberTypeCache
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import person as person_routes
+from app.routes import phone_number_type as phone_number_type_routes
+
+
+async def ensure_awfapi_user_indexes() -> None:
+    """
+    Creates unique indexes of AWFAPI users with the provider of AWFAPI user routes.
+
+    The provider is looked up on each startup instead of being bound on import,
+    so routes whose provider is replaced (ex. with the one of a test database) get indexes of their own collection.
+    """
+    await utils.run_nonblocking(awfapi_user_routes.awfapi_user_provider.ensure_indexes)
+
+
+async def build_person_name_index() -> None:
+    """
+    Builds the person name index with the provider of person routes.
+
+    If person names cannot be read (ex. the person table does not exist yet), the index is left unbuilt
+    and name autocomplete answers 503 until the next startup.
+    """
+    try:
+        await utils.run_nonblocking(person_routes.person_provider.build_person_name_index)
+    except Exception:
+        PersonNameIndex.clear()
+
+
+async def load_person_search_engine() -> None:
+    """
+    Builds the in-memory person search engine of the person service of person routes.
+
+    If person names cannot be read, the service is left without the engine and searches persons in the database.
+    """
+    try:
+        await utils.run_nonblocking(person_routes.person_service.load_person_search_engine)
+    except Exception:
+        person_routes.person_service.person_search_engine = None
+
+
+async def load_phone_number_type_cache() -> None:
+    """
+    Loads the phone number type cache with the provider of phone number type routes.
+
+    If phone number types cannot be read, the cache is left empty and is loaded on the first read instead.
+    """
+    try:
+        await utils.run_nonblocking(phone_number_type_routes.phone_number_type_provider.load_phone_number_type_cache)
+    except Exception:
+        PhoneNumberTypeCache.invalidate()
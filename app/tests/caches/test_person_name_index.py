@@ -0,0 +1,76 @@
+import pytest
+from typing import List, Tuple
+
+from app.caches import PersonNameIndex
+
+
+person_names: List[Tuple[int, str, str]] = [
+    (1, "John", "Doe"),
+    (2, "Johnny", "Smith"),
+    (3, "Alice", "Johnson"),
+    (4, "Mark", "Sharon"),
+    (5, "Sharon", "Adams")
+]
+
+
+@pytest.fixture(autouse=True)
+def person_name_index() -> None:
+    PersonNameIndex.build(person_names)
+    yield
+    PersonNameIndex.clear()
+
+
+@pytest.mark.parametrize("prefix, top_k, expected_person_ids", [
+    ("joh", 10, [1, 2, 3]),
+    ("JOH", 2, [1, 2]),
+    ("john d", 10, [1]),
+    ("  sharon ", 10, [4, 5]),
+    ("x", 10, [])
+])
+def test_search_should_return_top_k_persons_of_name_prefix(prefix: str, top_k: int,
+                                                           expected_person_ids: List[int]) -> None:
+    # Arrange
+    # Act
+    found_person_names = PersonNameIndex.search(prefix, top_k)
+
+    # Assert
+    assert list(map(lambda pn: pn[0], found_person_names)) == expected_person_ids
+
+
+def test_put_should_replace_former_names_of_person() -> None:
+    # Arrange
+    PersonNameIndex.put(2, "Bob", "Smith")
+    PersonNameIndex.put(6, "Johanna", "Kowalska")
+
+    # Act
+    found_person_names = PersonNameIndex.search("joh", 10)
+
+    # Assert
+    assert found_person_names == [(6, "Johanna", "Kowalska"), (1, "John", "Doe"), (3, "Alice", "Johnson")]
+    assert PersonNameIndex.search("bob", 10) == [(2, "Bob", "Smith")]
+    assert PersonNameIndex.get_size() == 6
+
+
+def test_remove_should_drop_all_keys_of_person() -> None:
+    # Arrange
+    PersonNameIndex.remove(1)
+    PersonNameIndex.remove(100)
+
+    # Act
+    found_person_names = PersonNameIndex.search("", 10)
+
+    # Assert
+    assert list(map(lambda pn: pn[0], found_person_names)) == [5, 3, 2, 4]
+    assert len(PersonNameIndex.keys) == 4 * 3
+
+
+def test_put_should_do_nothing_if_index_is_not_built() -> None:
+    # Arrange
+    PersonNameIndex.clear()
+
+    # Act
+    PersonNameIndex.put(1, "John", "Doe")
+
+    # Assert
+    assert PersonNameIndex.is_built is False
+    assert PersonNameIndex.get_size() == 0
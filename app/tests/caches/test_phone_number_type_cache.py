@@ -0,0 +1,70 @@
+import time
+import pytest
+from typing import List
+
+from app.caches import PhoneNumberTypeCache
+from app.models import PhoneNumberType
+
+
+phone_number_types: List[PhoneNumberType] = [
+    PhoneNumberType(phone_number_type_id=3, name="Work"),
+    PhoneNumberType(phone_number_type_id=1, name="Cell"),
+    PhoneNumberType(phone_number_type_id=2, name="Home")
+]
+
+
+@pytest.fixture(autouse=True)
+def phone_number_type_cache() -> None:
+    PhoneNumberTypeCache.invalidate()
+    yield
+    PhoneNumberTypeCache.invalidate()
+
+
+def test_get_all_should_return_loaded_phone_number_types_ordered_by_id() -> None:
+    # Arrange
+    PhoneNumberTypeCache.load(phone_number_types, PhoneNumberTypeCache.get_version())
+
+    # Act
+    cached_phone_number_types = PhoneNumberTypeCache.get_all(60.0)
+
+    # Assert
+    assert list(cached_phone_number_types.keys()) == [1, 2, 3]
+    assert cached_phone_number_types[2].name == "Home"
+
+
+def test_get_all_should_return_none_if_not_loaded_or_expired() -> None:
+    # Arrange
+    not_loaded_phone_number_types = PhoneNumberTypeCache.get_all(60.0)
+    PhoneNumberTypeCache.load(phone_number_types, PhoneNumberTypeCache.get_version())
+    time.sleep(0.01)
+
+    # Act
+    expired_phone_number_types = PhoneNumberTypeCache.get_all(0.0)
+
+    # Assert
+    assert not_loaded_phone_number_types is None
+    assert expired_phone_number_types is None
+
+
+def test_invalidate_should_drop_loaded_phone_number_types() -> None:
+    # Arrange
+    PhoneNumberTypeCache.load(phone_number_types, PhoneNumberTypeCache.get_version())
+
+    # Act
+    PhoneNumberTypeCache.invalidate()
+
+    # Assert
+    assert PhoneNumberTypeCache.get_all(60.0) is None
+
+
+def test_load_should_not_store_phone_number_types_selected_before_invalidation() -> None:
+    # Arrange
+    version = PhoneNumberTypeCache.get_version()
+    PhoneNumberTypeCache.invalidate()
+
+    # Act
+    loaded_phone_number_types = PhoneNumberTypeCache.load(phone_number_types, version)
+
+    # Assert
+    assert len(loaded_phone_number_types) == 3
+    assert PhoneNumberTypeCache.get_all(60.0) is None
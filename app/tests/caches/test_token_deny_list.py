@@ -0,0 +1,62 @@
+import pytest
+from typing import Optional
+
+from app.caches import TokenDenyList
+
+
+class FakeTimer:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def fake_timer(monkeypatch) -> FakeTimer:
+    timer = FakeTimer()
+    monkeypatch.setattr(TokenDenyList, "timer", timer)
+    TokenDenyList.clear()
+    yield timer
+    TokenDenyList.clear()
+
+
+@pytest.mark.parametrize("min_version, username, version, expected_is_revoked", [
+    (1000, "testuser", 999, True),
+    (1000, "testuser", 1000, False),
+    (1000, "testuser", 1001, False),
+    (1000, "testuser2", 999, False),
+    (None, "testuser", 10 ** 15, True)
+])
+def test_is_revoked_should_deny_tokens_older_than_min_version(min_version: Optional[int], username: str,
+                                                               version: int, expected_is_revoked: bool) -> None:
+    # Arrange
+    TokenDenyList.revoke("testuser", min_version)
+
+    # Act
+    is_revoked = TokenDenyList.is_revoked(username, version)
+
+    # Assert
+    assert is_revoked == expected_is_revoked
+
+
+@pytest.mark.parametrize("elapsed_minutes, expected_is_revoked, expected_size", [
+    (0, True, 1),
+    (29, True, 1),
+    (30, False, 0),
+    (60, False, 0)
+])
+def test_revoke_should_drop_entries_after_token_lifetime(fake_timer: FakeTimer, elapsed_minutes: int,
+                                                         expected_is_revoked: bool, expected_size: int) -> None:
+    # Arrange
+    TokenDenyList.revoke("testuser")
+    fake_timer.now += elapsed_minutes * 60
+
+    # Act
+    is_revoked = TokenDenyList.is_revoked("testuser", 0)
+    TokenDenyList.revoke("testuser2", 0)
+
+    # Assert
+    assert is_revoked == expected_is_revoked
+    assert TokenDenyList.get_size() == expected_size + 1
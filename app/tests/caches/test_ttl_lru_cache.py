@@ -0,0 +1,104 @@
+import pytest
+from typing import List, Optional
+
+from app.caches import TTLLRUCache
+
+
+class FakeTimer:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.parametrize("keys, expected_values, expected_hits, expected_misses", [
+    (["a", "b"], [1, 2], 2, 0),
+    (["a", "c"], [1, None], 1, 1),
+    (["c", "d"], [None, None], 0, 2)
+])
+def test_get_should_return_cached_values_and_count_hits_and_misses(keys: List[str],
+                                                                   expected_values: List[Optional[int]],
+                                                                   expected_hits: int, expected_misses: int) -> None:
+    # Arrange
+    cache = TTLLRUCache(name="test", max_size=4, ttl=60.0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    # Act
+    values = list(map(lambda k: cache.get(k), keys))
+    cache_stats = cache.get_stats()
+
+    # Assert
+    assert values == expected_values
+    assert cache_stats.hits == expected_hits
+    assert cache_stats.misses == expected_misses
+
+
+@pytest.mark.parametrize("elapsed, expected_value, expected_expirations", [
+    (59.9, 1, 0),
+    (60.0, None, 1),
+    (120.0, None, 1)
+])
+def test_get_should_drop_expired_values(elapsed: float, expected_value: Optional[int],
+                                        expected_expirations: int) -> None:
+    # Arrange
+    timer = FakeTimer()
+    cache = TTLLRUCache(name="test", max_size=4, ttl=60.0, timer=timer)
+    cache.put("a", 1)
+    timer.now += elapsed
+
+    # Act
+    value = cache.get("a")
+    cache_stats = cache.get_stats()
+
+    # Assert
+    assert value == expected_value
+    assert cache_stats.expirations == expected_expirations
+    assert cache_stats.size == 1 - expected_expirations
+
+
+def test_put_should_evict_least_recently_used_value() -> None:
+    # Arrange
+    cache = TTLLRUCache(name="test", max_size=2, ttl=60.0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+
+    # Act
+    cache.put("c", 3)
+    cache_stats = cache.get_stats()
+
+    # Assert
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache_stats.evictions == 1
+    assert cache_stats.size == 2
+
+
+def test_put_should_not_store_values_if_max_size_is_zero() -> None:
+    # Arrange
+    cache = TTLLRUCache(name="test", max_size=0, ttl=60.0)
+
+    # Act
+    cache.put("a", 1)
+
+    # Assert
+    assert cache.get("a") is None
+    assert cache.get_stats().size == 0
+
+
+def test_invalidate_should_drop_cached_value() -> None:
+    # Arrange
+    cache = TTLLRUCache(name="test", max_size=4, ttl=60.0)
+    cache.put("a", 1)
+
+    # Act
+    cache.invalidate("a")
+    cache.invalidate("b")
+
+    # Assert
+    assert cache.get("a") is None
+    assert cache.get_stats().invalidations == 1
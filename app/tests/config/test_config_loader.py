@@ -0,0 +1,99 @@
+import os
+import json
+import pytest
+from pathlib import Path
+
+from app.config import ConfigLoader, TableDetailsConfig, DefaultQueryParamsConfig
+
+
+def write_config(path: Path, config_dict: dict, mtime_ns: int) -> None:
+    with open(path, "w") as f:
+        json.dump(config_dict, f)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_load_should_parse_file_only_once(tmp_path: Path) -> None:
+    # Arrange
+    path = tmp_path / "config.json"
+    write_config(path, dict(section=dict(value=1)), 1_000_000_000)
+
+    try:
+        # Act
+        config = ConfigLoader.load(str(path))
+        write_config(path, dict(section=dict(value=2)), 2_000_000_000)
+        config2 = ConfigLoader.load(str(path))
+
+        # Assert
+        assert config is config2
+        assert config2['section']['value'] == 1
+    finally:
+        ConfigLoader.clear()
+
+
+def test_load_should_reload_changed_file_if_hot_reload_enabled(tmp_path: Path) -> None:
+    # Arrange
+    path = tmp_path / "config.json"
+    write_config(path, dict(section=dict(value=1)), 1_000_000_000)
+
+    try:
+        ConfigLoader.load(str(path))
+        ConfigLoader.get_cached("value", lambda: ConfigLoader.get_section("section", "value", path=str(path)),
+                                path=str(path))
+        ConfigLoader.hot_reload_interval = 0.0
+
+        # Act
+        write_config(path, dict(section=dict(value=2)), 2_000_000_000)
+        value = ConfigLoader.get_cached("value", lambda: ConfigLoader.get_section("section", "value", path=str(path)),
+                                        path=str(path))
+
+        # Assert
+        assert value == 2
+    finally:
+        ConfigLoader.clear()
+
+
+def test_get_section_should_return_copy() -> None:
+    # Arrange
+    section = ConfigLoader.get_section("table_details", "person")
+
+    # Act
+    section['table'] = "Changed"
+
+    # Assert
+    assert ConfigLoader.get_section("table_details", "person")['table'] == "Person"
+
+
+def test_from_json_should_return_cached_object() -> None:
+    # Arrange
+    # Act
+    config = DefaultQueryParamsConfig.from_json("person")
+    config2 = DefaultQueryParamsConfig.from_json("person")
+
+    # Assert
+    assert config is config2
+
+
+@pytest.mark.parametrize("entity, joined_entity, expected_join_condition", [
+    ("person", "business_entity", "\"Person\".\"Person\".\"BusinessEntityID\"="
+                                  "\"Person\".\"BusinessEntity\".\"BusinessEntityID\""),
+    ("person_phone", "person", "\"Person\".\"PersonPhone\".\"BusinessEntityID\"="
+                               "\"Person\".\"Person\".\"BusinessEntityID\""),
+    ("person_phone", "phone_number_type", "\"Person\".\"PersonPhone\".\"PhoneNumberTypeID\"="
+                                          "\"Person\".\"PhoneNumberType\".\"PhoneNumberTypeID\""),
+])
+def test_get_foreign_key_join_condition_should_return_expected_condition(entity: str, joined_entity: str,
+                                                                         expected_join_condition: str) -> None:
+    # Arrange
+    # Act
+    join_condition = TableDetailsConfig.get_foreign_key_join_condition(entity, joined_entity)
+
+    # Assert
+    assert join_condition == expected_join_condition
+
+
+def test_get_foreign_key_join_condition_should_raise_expected_error() -> None:
+    # Arrange
+    with pytest.raises(ValueError):
+        # Act
+        # Assert
+        TableDetailsConfig.get_foreign_key_join_condition("phone_number_type", "person")
@@ -0,0 +1,43 @@
+from typing import Optional, List
+
+from app import errors
+from app.models import AWFAPIUserInput, AWFAPIUser, E404NotFound
+from app.providers import IAWFAPIUserProvider
+
+
+class AWFAPIUserProviderStub(IAWFAPIUserProvider):
+
+    def __init__(self, data: List[AWFAPIUser]):
+        super(AWFAPIUserProviderStub, self).__init__()
+        self.data = data
+
+    def get_awfapi_users(self, limit: Optional[int] = None, offset: Optional[int] = None) -> List[AWFAPIUser]:
+        """ Returns list of all AWFAPI users """
+        return self.data
+
+    def get_awfapi_user(self, username: str) -> AWFAPIUser:
+        """ Returns AWFAPI user of given username """
+        awfapi_users = list(filter(lambda au: au.username == username, self.data))
+        if len(awfapi_users) == 0:
+            raise errors.NotFoundError(f"{E404NotFound.AWFAPI_USER_NOT_FOUND}: "
+                                       f"AWFAPI user of username '{username}' does not exist.")
+        return awfapi_users[0]
+
+    def insert_awfapi_user(self, awfapi_user_input: AWFAPIUserInput) -> str:
+        """ Inserts AWFAPI user and returns new AWFAPI user username """
+        pass
+
+    def update_awfapi_user(self, username: str, awfapi_user_input: AWFAPIUserInput) -> str:
+        """ Updates AWFAPI user of given person_id and return updated AWFAPI user username """
+        pass
+
+    def delete_awfapi_user(self, username: str) -> None:
+        """ Deletes AWFAPI user of given username """
+        pass
+
+
+class AsyncAWFAPIUserProviderStub(AWFAPIUserProviderStub):
+
+    async def get_awfapi_user(self, username: str) -> AWFAPIUser:
+        """ Returns AWFAPI user of given username """
+        return super(AsyncAWFAPIUserProviderStub, self).get_awfapi_user(username)
@@ -12,7 +12,8 @@ class PersonPhoneProviderStub(IPersonPhoneProvider):
 
     def get_person_phones(self, filters: Optional[str] = None,
                     order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
-                    limit: Optional[int] = None, offset: Optional[int] = None) -> List[Tuple[PersonPhone, None, None]]:
+                    limit: Optional[int] = None, offset: Optional[int] = None,
+                    fields: Optional[str] = None) -> List[Tuple[PersonPhone, None, None]]:
         """ Returns list of appropriate person phones """
         return list(map(lambda d: tuple((d, None, None)), self.data))
 
@@ -20,14 +21,34 @@ class PersonPhoneProviderStub(IPersonPhoneProvider):
         """ Returns count of appropriate person phones """
         return len(self.data)
 
+    def exists_person_phones(self, filters: Optional[str] = None) -> bool:
+        """ Returns whether any appropriate person phone exists """
+        return len(self.data) > 0
+
     def get_person_phone(self, person_phone_id: Tuple[int, str, int]) -> Tuple[PersonPhone, Person, PhoneNumberType]:
         """ Returns person phone of given person_phone_id """
         pass
 
+    def get_person_phones_by_person_ids(self, person_ids: List[int]) -> List[Tuple[PersonPhone, PhoneNumberType]]:
+        """ Returns person phones of persons of given person_ids with their phone number types, ordered by person """
+        return list(map(lambda d: tuple((d, PhoneNumberType(phone_number_type_id=d.phone_number_type_id,
+                                                            name=f"Type {d.phone_number_type_id}"))),
+                        sorted(filter(lambda d: d.business_entity_id in person_ids, self.data),
+                               key=lambda d: d.business_entity_id)))
+
     def insert_person(self, person_phone_input: PersonPhoneInput) -> Tuple[int, str, int]:
         """ Inserts person phone and returns new person phone person_phone_id """
         pass
 
+    def copy_person_phones(self, person_phone_inputs: List[PersonPhoneInput]) -> List[int]:
+        """ Inserts person phones of given inputs and returns positions of skipped (already existing) ones """
+        existing_ids = list(map(lambda pp: (pp.business_entity_id, pp.phone_number, pp.phone_number_type_id),
+                                self.data))
+        return list(map(lambda ippi: ippi[0],
+                        filter(lambda ippi: (ippi[1].business_entity_id, ippi[1].phone_number,
+                                             ippi[1].phone_number_type_id) in existing_ids,
+                               enumerate(person_phone_inputs))))
+
     def update_person(self, person_phone_id: Tuple[int, str, int],
                             person_phone_input: PersonPhoneInput) -> Tuple[int, str, int]:
         """ Updates person phone of given person_phone_id and return updated person phone person_phone_id """
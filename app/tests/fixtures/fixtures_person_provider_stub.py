@@ -1,7 +1,8 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple, Iterator
 
 from app.models import EOrderType, PersonInput, Person
 from app.providers import IPersonProvider
+from app.providers.person_provider import PersonDbFields
 
 
 class PersonProviderStub(IPersonProvider):
@@ -13,15 +14,50 @@ class PersonProviderStub(IPersonProvider):
     def get_persons(self, filters: Optional[str] = None,
                     order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
                     limit: Optional[int] = None, offset: Optional[int] = None,
-                    is_alternative: Optional[bool] = False) -> List[Person]:
+                    is_alternative: Optional[bool] = False, fields: Optional[str] = None,
+                    collation: Optional[str] = None) -> List[Person]:
         """ Returns list of appropriate persons """
         return self.data
 
+    def get_persons_page(self, filters: Optional[str] = None,
+                         order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                         limit: Optional[int] = None, cursor: Optional[str] = None,
+                         is_alternative: Optional[bool] = False, fields: Optional[str] = None,
+                         collation: Optional[str] = None) -> Tuple[List[Person], Optional[str]]:
+        """ Returns page of appropriate persons placed after given cursor (index of the first person) """
+        start = int(cursor or 0)
+        end = len(self.data) if limit is None else start + limit
+        return self.data[start:end], str(end) if end < len(self.data) else None
+
+    def search_persons(self, filters: str, limit: Optional[int] = None,
+                       is_alternative: Optional[bool] = False, fields: Optional[str] = None) -> List[Person]:
+        """ Returns list of persons matching the phrase filters, ordered by rank of similarity to the phrases """
+        return self.data[:limit]
+
+    def stream_persons(self, filters: Optional[str] = None,
+                       order_by: Optional[str] = None, order_type: Optional[EOrderType] = None,
+                       is_alternative: Optional[bool] = False, is_ranked: Optional[bool] = False,
+                       batch_size: int = 1000, fields: Optional[str] = None,
+                       collation: Optional[str] = None) -> Iterator[List[Person]]:
+        """ Returns iterator of batches of appropriate persons """
+        return iter(list(map(lambda i: self.data[i:i + batch_size], range(0, len(self.data), batch_size))))
+
+    def get_person_search_names(self) -> List[Tuple]:
+        """ Returns ids, types and name columns of all persons """
+        return list(map(lambda p: tuple((p.business_entity_id, p.person_type,
+                                         p.title, p.first_name, p.middle_name, p.last_name, p.suffix)), self.data))
+
+    def get_persons_by_ids(self, person_ids: List[int], fields: Optional[str] = None) -> List[Optional[Person]]:
+        """ Returns persons of given person_ids in their order (None for missing ones), with given fields only """
+        person_db_fields = PersonDbFields.from_fields_string(fields)
+        persons = dict(map(lambda p: (p.business_entity_id, person_db_fields.project_person(p)), self.data))
+        return list(map(lambda pi: persons.get(pi, None), person_ids))
+
     def count_persons(self, filters: Optional[str] = None) -> int:
         """ Returns count of appropriate persons """
         return len(self.data)
 
-    def get_person(self, person_id: int) -> Person:
+    def get_person(self, person_id: int, fields: Optional[str] = None) -> Person:
         """ Returns person of given person_id """
         pass
 
@@ -29,6 +65,12 @@ class PersonProviderStub(IPersonProvider):
         """ Inserts person and returns new person person_id """
         pass
 
+    def copy_persons(self, person_inputs: List[PersonInput]) -> List[int]:
+        """ Inserts persons of given inputs and returns their ids, fails for invalid demographics XML as the database """
+        if any(map(lambda pi: pi.demographics is not None and not pi.demographics.startswith("<"), person_inputs)):
+            raise ValueError("invalid XML content")
+        return list(range(len(self.data) + 1, len(self.data) + len(person_inputs) + 1))
+
     def update_person(self, person_id: int, person_input: PersonInput) -> int:
         """ Updates person of given person_id and return updated person person_id """
         pass
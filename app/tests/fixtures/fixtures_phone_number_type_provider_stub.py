@@ -28,6 +28,10 @@ class PhoneNumberTypeProviderStub(IPhoneNumberTypeProvider):
         """ Inserts phone number type and returns new phone number type phone_number_type_id """
         pass
 
+    def copy_phone_number_types(self, phone_number_type_inputs: List[PhoneNumberTypeInput]) -> int:
+        """ Inserts phone number types of given inputs and returns their count """
+        return len(phone_number_type_inputs)
+
     def update_phone_number_type(self, phone_number_type_id: int, phone_number_type_input: PhoneNumberTypeInput) -> int:
         """ Updates phone number type of given phone_number_type_id and returns updated phone number type phone_number_type_id """
         pass
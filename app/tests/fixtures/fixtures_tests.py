@@ -4,6 +4,7 @@ from typing import List, Tuple
 from sqlmodel import SQLModel
 from starlette.testclient import TestClient
 
+from app.caches import AWFAPIUserCache, PhoneNumberTypeCache
 from app.models import AWFAPIRegisteredUser, Token
 from app.providers import (AWFAPIUserProvider,
                            BusinessEntityProvider, PersonProvider, PhoneNumberTypeProvider, PersonPhoneProvider)
@@ -19,6 +20,7 @@ def create_tables(engine: sqlalchemy.engine.Engine) -> None:
 
 def drop_tables(engine: sqlalchemy.engine.Engine) -> None:
     SQLModel.metadata.drop_all(bind=engine)
+    PhoneNumberTypeCache.invalidate()
 
 
 def register_test_user(awfapi_user_service: AWFAPIUserService, awfapi_registered_user: AWFAPIRegisteredUser) -> None:
@@ -54,3 +56,4 @@ def insert_test_person_phones(engine: sqlalchemy.engine.Engine, connection_strin
 
 def drop_collection(engine: pymongo.MongoClient, name: str) -> None:
     engine.awfapi[name].drop()
+    AWFAPIUserCache.get_instance().clear()
@@ -0,0 +1,41 @@
+import pytest
+from typing import Any
+
+from app.migrations import PersonSearchMigration
+from app.models import Person
+
+
+@pytest.mark.parametrize("column, expected_index_name", [
+    (Person.first_name, "IX_Person_FirstName_trgm"),
+    (Person.last_name, "IX_Person_LastName_trgm"),
+    (Person.title, "IX_Person_Title_trgm")
+])
+def test_get_index_name_should_return_expected_name(column: Any, expected_index_name: str) -> None:
+    # Arrange
+    # Act
+    index_name = PersonSearchMigration.get_index_name(column)
+
+    # Assert
+    assert index_name == expected_index_name
+
+
+def test_get_upgrade_statements_should_create_extension_and_trigram_indexes_of_searched_columns() -> None:
+    # Arrange
+    # Act
+    statements = PersonSearchMigration.get_upgrade_statements()
+
+    # Assert
+    assert statements[0] == "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+    assert len(statements) == len(PersonSearchMigration.searched_columns) + 1
+    assert statements[3] == "CREATE INDEX CONCURRENTLY IF NOT EXISTS \"IX_Person_LastName_trgm\" " \
+                            "ON \"Person\".\"Person\" USING gin (\"LastName\" gin_trgm_ops)"
+
+
+def test_get_downgrade_statements_should_drop_every_created_index() -> None:
+    # Arrange
+    # Act
+    statements = PersonSearchMigration.get_downgrade_statements()
+
+    # Assert
+    assert len(statements) == len(PersonSearchMigration.searched_columns)
+    assert all(map(lambda s: s.startswith("DROP INDEX CONCURRENTLY IF EXISTS \"Person\"."), statements))
@@ -1,6 +1,7 @@
 import pytest
 import pymongo
-from typing import List
+import pymongo.errors
+from typing import Any, Dict, List, Optional
 
 from app.config import MongodbConnectionConfig
 from app.models import AWFAPIUserInput
@@ -256,3 +257,49 @@ def test_delete_awfapi_user_should_delete_object(awfapi_user: AWFAPIUserInput) -
             raise e
         else:
             drop_collection(db_engine, collection_name)
+
+
+@pytest.mark.parametrize("existing_awfapi_user, new_awfapi_user, expected_error", [
+    (AWFAPIUserInput(username="dzhawaria", full_name="Dzhejkob Awaria", email="dzh.awaria@gmail.com",
+                     is_readonly=False, hashed_password="$2b$12$1MPiN.NRShpEI/WzKmsPLemaT3d6paLBXi3t3KFBHFlyXUrKgixF6"),
+     AWFAPIUserInput(username="dzhawaria", full_name="Dzhejkob Awaria 2", email="dzh.awaria2@gmail.com",
+                     is_readonly=False, hashed_password="$2b$12$1MPiN.NRShpEI/WzKmsPLemaT3d6paLBXi3t3KFBHFlyXUrKgixF6"),
+     pymongo.errors.DuplicateKeyError),
+    (AWFAPIUserInput(username="testuser2", full_name="Test User 2", email="test.user2@test.user",
+                     is_readonly=True, hashed_password="$2b$12$Mvf8/LwNEue1qQrh.UUAruWnIOaIYgYIAQ3vtEqOYQg7/xlJ.XSB6"),
+     AWFAPIUserInput(username="testuser22", full_name="Test User 22", email="test.user2@test.user",
+                     is_readonly=True, hashed_password="$2b$12$Mvf8/LwNEue1qQrh.UUAruWnIOaIYgYIAQ3vtEqOYQg7/xlJ.XSB6"),
+     pymongo.errors.DuplicateKeyError)
+])
+def test_ensure_indexes_should_reject_duplicated_documents(existing_awfapi_user: AWFAPIUserInput,
+                                                           new_awfapi_user: AWFAPIUserInput,
+                                                           expected_error: Exception) -> None:
+    # Arrange
+    awfapi_user_provider.ensure_indexes()
+    awfapi_user_provider.insert_awfapi_user(existing_awfapi_user)
+    # Act
+    # Assert
+    with pytest.raises(expected_error):
+        try:
+            db_engine.awfapi[collection_name].insert_one(new_awfapi_user.dict())
+        except Exception as e:
+            drop_collection(db_engine, collection_name)
+            raise e
+        else:
+            drop_collection(db_engine, collection_name)
+
+
+@pytest.mark.parametrize("details, expected_error", [
+    ({"keyPattern": {"username": 1}, "keyValue": {"username": "testuser"}}, errors.UsernameAlreadyExistsError),
+    ({"keyPattern": {"email": 1}, "keyValue": {"email": "test.user@test.user"}}, errors.EmailAlreadyExistsError),
+    ({"keyPattern": {"_id": 1}, "keyValue": {"_id": 1}}, pymongo.errors.DuplicateKeyError),
+    (None, pymongo.errors.DuplicateKeyError)
+])
+def test_raise_duplicate_key_error_should_raise_expected_error(details: Optional[Dict[str, Any]],
+                                                               expected_error: Exception) -> None:
+    # Arrange
+    duplicate_key_error = pymongo.errors.DuplicateKeyError("E11000 duplicate key error", 11000, details)
+    # Act
+    # Assert
+    with pytest.raises(expected_error):
+        AWFAPIUserProvider.raise_duplicate_key_error(duplicate_key_error, "testuser", "test.user@test.user")
@@ -1,13 +1,15 @@
 import pytest
 import sqlalchemy
 from sqlmodel import create_engine
-from typing import List
+from typing import List, Optional
 
-from app.config import PostgresdbConnectionConfig
-from app.models import PersonPhoneInput
+from app.config import PostgresdbConnectionConfig, PhoneNumberTypeCacheConfig
+from app.models import PersonPhoneInput, PersonPhoneOperation, EOrderType, EBatchOperation
 from app.providers import PersonPhoneProvider
+from app.providers.person_phone_provider import PersonPhoneDbOrder
 from app import errors
 
+from app.tests.fixtures.fixtures_entry_lists import person_phones_db
 from app.tests.fixtures.fixtures_tests import (create_tables, drop_tables,
                                                insert_test_persons, insert_test_phone_number_types,
                                                insert_test_person_phones)
@@ -73,6 +75,75 @@ def test_count_person_phones_should_return_expected_number(person_phones: List[P
     drop_tables(db_engine)
 
 
+@pytest.mark.parametrize("is_cache_enabled", [False, True])
+@pytest.mark.parametrize("filters, limit, offset, expected_phone_numbers, expected_total, is_count_queried", [
+    (None, 2, 0, ["000 000 000", "666 666 666"], 8, False),
+    (None, 2, 7, ["000 000 000"], 8, False),
+    ("person_ids:[1]", 2, 5, [], 3, True),
+    ("phone_number_type_ids:[3]", 10, 0, ["123456789", "338 94 95", "71 334 34 34"], 3, False),
+    ("person_ids:[2]", 10, 0, [], 0, False)
+])
+def test_get_person_phones_with_total_should_return_page_and_count_of_all_filtered_person_phones(
+        monkeypatch, is_cache_enabled: bool, filters: Optional[str], limit: int, offset: int,
+        expected_phone_numbers: List[str], expected_total: int, is_count_queried: bool) -> None:
+    create_tables(db_engine)
+    insert_test_persons(db_engine, connection_string)
+    insert_test_phone_number_types(db_engine, connection_string)
+    insert_test_person_phones(db_engine, connection_string)
+
+    # Arrange
+    phone_number_type_cache_config = PhoneNumberTypeCacheConfig(is_enabled=is_cache_enabled)
+    monkeypatch.setattr(PhoneNumberTypeCacheConfig, "from_json", staticmethod(lambda: phone_number_type_cache_config))
+    count_statement_filters = []
+    count_person_phones_statement = PersonPhoneProvider.count_person_phones_statement
+    monkeypatch.setattr(PersonPhoneProvider, "count_person_phones_statement",
+                        staticmethod(lambda f=None: count_statement_filters.append(f) or
+                                     count_person_phones_statement(f)))
+
+    # Act
+    person_phones_page, person_phones_total = person_phone_provider.get_person_phones_with_total(
+        filters=filters, limit=limit, offset=offset)
+
+    # Assert
+    assert list(map(lambda pp: pp[0].phone_number, person_phones_page)) == expected_phone_numbers
+    assert all(map(lambda pp: pp[2].phone_number_type_id == pp[0].phone_number_type_id, person_phones_page))
+    assert person_phones_total == expected_total
+    assert count_statement_filters == ([filters] if is_count_queried else [])
+    assert person_phones_total == person_phone_provider.count_person_phones(filters=filters)
+
+    drop_tables(db_engine)
+
+
+@pytest.mark.parametrize("person_phones, batch_size, expected_batch_lengths", [
+    ([PersonPhoneInput(business_entity_id=1, phone_number="000 000 000", phone_number_type_id=1),
+      PersonPhoneInput(business_entity_id=1, phone_number="666 666 666", phone_number_type_id=1),
+      PersonPhoneInput(business_entity_id=4, phone_number="123456789", phone_number_type_id=3)], 2, [2, 1]),
+    ([], 10, [])
+])
+def test_stream_person_phones_should_yield_all_person_phones_in_batches(person_phones: List[PersonPhoneInput],
+                                                                       batch_size: int,
+                                                                       expected_batch_lengths: List[int]) -> None:
+    create_tables(db_engine)
+    insert_test_persons(db_engine, connection_string)
+    insert_test_phone_number_types(db_engine, connection_string)
+
+    # Arrange
+    for person_phone in person_phones:
+        person_phone_provider.insert_person_phone(person_phone)
+
+    # Act
+    person_phone_batches = list(person_phone_provider.stream_person_phones(order_by="phone_number",
+                                                                           order_type=EOrderType.ASC,
+                                                                           batch_size=batch_size))
+
+    # Assert
+    assert list(map(len, person_phone_batches)) == expected_batch_lengths
+    assert list(map(lambda pp: pp[0].phone_number, sum(person_phone_batches, []))) == \
+           sorted(map(lambda pp: pp.phone_number, person_phones))
+
+    drop_tables(db_engine)
+
+
 @pytest.mark.parametrize("person_phone", [
     PersonPhoneInput(business_entity_id=1, phone_number="000 000 000", phone_number_type_id=1),
     PersonPhoneInput(business_entity_id=5, phone_number="338 94 95", phone_number_type_id=3)
@@ -97,6 +168,67 @@ def test_get_person_phone_should_return_valid_object(person_phone: PersonPhoneIn
     drop_tables(db_engine)
 
 
+@pytest.mark.parametrize("is_cache_enabled", [False, True])
+def test_get_person_phones_by_ids_should_return_objects_in_order_of_ids(monkeypatch, is_cache_enabled: bool) -> None:
+    create_tables(db_engine)
+    insert_test_persons(db_engine, connection_string)
+    insert_test_phone_number_types(db_engine, connection_string)
+
+    # Arrange
+    phone_number_type_cache_config = PhoneNumberTypeCacheConfig(is_enabled=is_cache_enabled)
+    monkeypatch.setattr(PhoneNumberTypeCacheConfig, "from_json", staticmethod(lambda: phone_number_type_cache_config))
+    first_id = person_phone_provider.insert_person_phone(
+        PersonPhoneInput(business_entity_id=1, phone_number="000 000 000", phone_number_type_id=1))
+    second_id = person_phone_provider.insert_person_phone(
+        PersonPhoneInput(business_entity_id=5, phone_number="338 94 95", phone_number_type_id=3))
+
+    # Act
+    person_phones = person_phone_provider.get_person_phones_by_ids([second_id, tuple((1, "000 000 000", 2)),
+                                                                    first_id])
+
+    # Assert
+    assert person_phones[0][0].phone_number == "338 94 95"
+    assert person_phones[0][1].business_entity_id == 5
+    assert person_phones[0][2].phone_number_type_id == 3
+    assert person_phones[0][2].name == "Home"
+    assert person_phones[1] is None
+    assert person_phones[2][0].phone_number == "000 000 000"
+    assert person_phones[2][2].name == "Cell"
+
+    drop_tables(db_engine)
+
+
+@pytest.mark.parametrize("is_cache_enabled", [False, True])
+@pytest.mark.parametrize("person_ids, expected_person_phones_count", [
+    ([1, 5], 5),
+    ([6, -1], 0),
+    ([], 0)
+])
+def test_get_person_phones_by_person_ids_should_return_person_phones_of_all_persons(
+        monkeypatch, is_cache_enabled: bool, person_ids: List[int], expected_person_phones_count: int) -> None:
+    create_tables(db_engine)
+    insert_test_persons(db_engine, connection_string)
+    insert_test_phone_number_types(db_engine, connection_string)
+    insert_test_person_phones(db_engine, connection_string)
+
+    # Arrange
+    phone_number_type_cache_config = PhoneNumberTypeCacheConfig(is_enabled=is_cache_enabled)
+    monkeypatch.setattr(PhoneNumberTypeCacheConfig, "from_json", staticmethod(lambda: phone_number_type_cache_config))
+
+    # Act
+    person_phones = person_phone_provider.get_person_phones_by_person_ids(person_ids)
+
+    # Assert
+    assert len(person_phones) == expected_person_phones_count
+    assert all(map(lambda pp: pp[0].business_entity_id in person_ids, person_phones))
+    assert all(map(lambda pp: pp[0].phone_number_type_id == pp[1].phone_number_type_id, person_phones))
+    assert all(map(lambda pp: pp[1].name is not None, person_phones))
+    assert list(map(lambda pp: pp[0].business_entity_id, person_phones)) == \
+           sorted(map(lambda pp: pp[0].business_entity_id, person_phones))
+
+    drop_tables(db_engine)
+
+
 @pytest.mark.parametrize("person_phone, expected_error", [
     (PersonPhoneInput(business_entity_id=1, phone_number="000 000 000", phone_number_type_id=1), errors.NotFoundError)
 ])
@@ -159,6 +291,36 @@ def test_insert_person_phone_should_raise_expected_error(person_phone: PersonPho
     drop_tables(db_engine)
 
 
+@pytest.mark.parametrize("person_phones, expected_skipped_positions", [
+    ([PersonPhoneInput(business_entity_id=2, phone_number="111 111 111", phone_number_type_id=1),
+      PersonPhoneInput(business_entity_id=3, phone_number="222 222 222", phone_number_type_id=2)], []),
+    ([PersonPhoneInput(business_entity_id=1, phone_number="000 000 000", phone_number_type_id=1),
+      PersonPhoneInput(business_entity_id=2, phone_number="111 111 111", phone_number_type_id=1),
+      PersonPhoneInput(business_entity_id=11, phone_number="000 000 000", phone_number_type_id=5),
+      PersonPhoneInput(business_entity_id=10, phone_number="000 000 000", phone_number_type_id=6),
+      PersonPhoneInput(business_entity_id=2, phone_number="111 111 111", phone_number_type_id=1)], [0, 2, 3, 4]),
+])
+def test_copy_person_phones_should_insert_objects_and_skip_invalid_ones(person_phones: List[PersonPhoneInput],
+                                                                        expected_skipped_positions: List[int]) -> None:
+    create_tables(db_engine)
+    insert_test_persons(db_engine, connection_string)
+    insert_test_phone_number_types(db_engine, connection_string)
+    insert_test_person_phones(db_engine, connection_string)
+
+    # Arrange
+    person_phones_count = person_phone_provider.count_person_phones()
+
+    # Act
+    skipped_positions = person_phone_provider.copy_person_phones(person_phones)
+
+    # Assert
+    assert skipped_positions == expected_skipped_positions
+    assert person_phone_provider.count_person_phones() == \
+           person_phones_count + len(person_phones) - len(expected_skipped_positions)
+
+    drop_tables(db_engine)
+
+
 @pytest.mark.parametrize("person_phone, updated_person_phone", [
     (PersonPhoneInput(business_entity_id=1, phone_number="000 000 123", phone_number_type_id=1),
      PersonPhoneInput(business_entity_id=1, phone_number="000 123 000", phone_number_type_id=1)),
@@ -235,3 +397,130 @@ def test_delete_person_phone_should_delete_object(person_phone: PersonPhoneInput
         person_phone_provider.get_person_phone(person_phone_id)
 
     drop_tables(db_engine)
+
+
+def test_execute_person_phone_operations_should_return_result_of_each_operation() -> None:
+    create_tables(db_engine)
+    insert_test_persons(db_engine, connection_string)
+    insert_test_phone_number_types(db_engine, connection_string)
+
+    # Arrange
+    person_phone_input = PersonPhoneInput(business_entity_id=1, phone_number="000 000 000", phone_number_type_id=1)
+    person_phone_operations = list([
+        PersonPhoneOperation(operation=EBatchOperation.CREATE, person_phone_input=person_phone_input),
+        PersonPhoneOperation(operation=EBatchOperation.CREATE, person_phone_input=person_phone_input),
+        PersonPhoneOperation(operation=EBatchOperation.CREATE,
+                             person_phone_input=PersonPhoneInput(business_entity_id=-1, phone_number="111 111 111",
+                                                                 phone_number_type_id=1)),
+        PersonPhoneOperation(operation=EBatchOperation.DELETE, person_phone_id=tuple((1, "000 000 000", 1))),
+        PersonPhoneOperation(operation=EBatchOperation.DELETE, person_phone_id=tuple((1, "000 000 000", 1)))
+    ])
+
+    # Act
+    results = person_phone_provider.execute_person_phone_operations(person_phone_operations)
+
+    # Assert
+    assert results[0][0].phone_number == "000 000 000"
+    assert results[0][1].business_entity_id == 1
+    assert isinstance(results[1], errors.IntegrityError)
+    assert isinstance(results[2], errors.IntegrityError)
+    assert results[3] is None
+    assert isinstance(results[4], errors.NotFoundError)
+    with pytest.raises(errors.NotFoundError):
+        person_phone_provider.get_person_phone(tuple((1, "000 000 000", 1)))
+
+    drop_tables(db_engine)
+
+
+@pytest.mark.parametrize("order_by, is_phone_number_type_selected, is_phone_number_type_joined", [
+    (None, True, True),
+    (None, False, False),
+    ("phone_number", False, False),
+    ("phone_number_type_name", False, True),
+    ("person_full_name", False, True)
+])
+def test_get_person_phones_statement_should_join_phone_number_types_only_if_needed(
+        order_by: str, is_phone_number_type_selected: bool, is_phone_number_type_joined: bool) -> None:
+    # Arrange
+    # Act
+    statement = PersonPhoneProvider.get_person_phones_statement(order_by=order_by, order_type=EOrderType.ASC,
+                                                                is_phone_number_type_selected=is_phone_number_type_selected)
+    select_list, from_clause = str(statement).split("FROM")[0], str(statement).split("FROM")[1]
+
+    # Assert
+    assert ("\"PhoneNumberType\".\"Name\"" in select_list) == is_phone_number_type_selected
+    assert ("JOIN \"Person\".\"PhoneNumberType\"" in from_clause) == is_phone_number_type_joined
+
+
+@pytest.mark.parametrize("is_cache_enabled", [False, True])
+@pytest.mark.parametrize("order_by, order_type, expected_indices", [
+    (None, EOrderType.ASC, [0, 1, 2, 3, 4, 5, 6, 7]),
+    ("phone_number_type_name", EOrderType.ASC, [0, 1, 3, 4, 6, 5, 7, 2]),
+    ("phone_number_type_name", EOrderType.DESC, [2, 7, 5, 6, 4, 3, 1, 0])
+])
+def test_get_person_phones_page_should_return_all_person_phones_with_phone_number_types(
+        monkeypatch, is_cache_enabled: bool, order_by: Optional[str], order_type: EOrderType,
+        expected_indices: List[int]) -> None:
+    create_tables(db_engine)
+    insert_test_persons(db_engine, connection_string)
+    insert_test_phone_number_types(db_engine, connection_string)
+    insert_test_person_phones(db_engine, connection_string)
+
+    # Arrange
+    phone_number_type_cache_config = PhoneNumberTypeCacheConfig(is_enabled=is_cache_enabled)
+    monkeypatch.setattr(PhoneNumberTypeCacheConfig, "from_json", staticmethod(lambda: phone_number_type_cache_config))
+    person_phones, cursor = list([]), None
+
+    # Act
+    while True:
+        person_phones_page, cursor = person_phone_provider.get_person_phones_page(order_by=order_by,
+                                                                                  order_type=order_type,
+                                                                                  limit=3, cursor=cursor)
+        person_phones += person_phones_page
+        if cursor is None:
+            break
+
+    # Assert
+    assert list(map(lambda pp: (pp[0].business_entity_id, pp[0].phone_number), person_phones)) == \
+           list(map(lambda i: (person_phones_db[i].business_entity_id, person_phones_db[i].phone_number),
+                    expected_indices))
+    assert all(map(lambda pp: pp[2].phone_number_type_id == pp[0].phone_number_type_id, person_phones))
+
+    drop_tables(db_engine)
+
+
+@pytest.mark.parametrize("order_by, is_phone_number_type_selected, is_phone_number_type_joined", [
+    (None, True, True),
+    (None, False, False),
+    ("phone_number", False, False),
+    ("phone_number_type_name", False, True)
+])
+def test_get_person_phones_page_statement_should_join_phone_number_types_only_if_needed(
+        order_by: Optional[str], is_phone_number_type_selected: bool, is_phone_number_type_joined: bool) -> None:
+    # Arrange
+    keyset_pagination = PersonPhoneDbOrder.get_keyset_pagination(order_by, EOrderType.ASC)
+
+    # Act
+    statement = PersonPhoneProvider.get_person_phones_page_statement(
+        keyset_pagination, limit=10, is_phone_number_type_selected=is_phone_number_type_selected)
+    select_list, from_clause = str(statement).split("FROM")[0], str(statement).split("FROM")[1]
+
+    # Assert
+    assert ("\"PhoneNumberType\".\"Name\"" in select_list) == is_phone_number_type_selected
+    assert ("JOIN \"Person\".\"PhoneNumberType\"" in from_clause) == is_phone_number_type_joined
+
+
+@pytest.mark.parametrize("is_phone_number_type_selected", [True, False])
+def test_get_person_phones_by_ids_statements_should_join_phone_number_types_only_if_selected(
+        is_phone_number_type_selected: bool) -> None:
+    # Arrange
+    # Act
+    statements = [PersonPhoneProvider.get_person_phones_by_ids_statement([(1, "000 000 000", 1)],
+                                                                         is_phone_number_type_selected),
+                  PersonPhoneProvider.get_person_phones_by_person_ids_statement([1], is_phone_number_type_selected)]
+
+    # Assert
+    for statement in statements:
+        select_list, from_clause = str(statement).split("FROM")[0], str(statement).split("FROM", 1)[1]
+        assert ("\"PhoneNumberType\".\"Name\"" in select_list) == is_phone_number_type_selected
+        assert ("JOIN \"Person\".\"PhoneNumberType\"" in from_clause) == is_phone_number_type_selected
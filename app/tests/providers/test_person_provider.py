@@ -1,14 +1,17 @@
 import pytest
 import sqlalchemy
 from sqlmodel import create_engine
-from typing import List
+from typing import List, Optional
 
 from app.config import PostgresdbConnectionConfig
-from app.models import PersonInput, EPersonType
+from app.migrations import PersonSearchMigration
+from app.models import PersonInput, PersonOperation, EPersonType, EOrderType, EBatchOperation, Person
 from app.providers import BusinessEntityProvider, PersonProvider
 from app import errors
 
-from app.tests.fixtures.fixtures_tests import create_tables, drop_tables
+from app.tests.fixtures.fixtures_tests import (create_tables, drop_tables,
+                                               insert_test_persons, insert_test_phone_number_types,
+                                               insert_test_person_phones)
 
 
 connection_string: str = PostgresdbConnectionConfig.get_db_connection_string(test_suffix="_test")
@@ -61,6 +64,136 @@ def test_get_persons_should_return_valid_objects(persons: List[PersonInput]) ->
     drop_tables(db_engine)
 
 
+@pytest.mark.parametrize("order_by, order_type, limit", [
+    (None, EOrderType.ASC, 2),
+    ("full_name", EOrderType.ASC, 2),
+    ("full_name", EOrderType.DESC, 1),
+    ("email_promotion", EOrderType.DESC, 2)
+])
+def test_get_persons_page_should_return_the_same_persons_as_offset_pages(order_by: Optional[str],
+                                                                         order_type: EOrderType,
+                                                                         limit: int) -> None:
+    create_tables(db_engine)
+
+    # Arrange
+    persons = [PersonInput(person_type=EPersonType.GC, title="Mr.", first_name="John", middle_name="J.",
+                           last_name="Doe", suffix="Jr", email_promotion=1),
+               PersonInput(person_type=EPersonType.SP, title="Ms.", first_name="Alice", last_name="Doe",
+                           email_promotion=2),
+               PersonInput(person_type=EPersonType.IN, first_name="John", last_name="Doe"),
+               PersonInput(person_type=EPersonType.IN, first_name="John", last_name="Doe"),
+               PersonInput(person_type=EPersonType.EM, first_name="Mark", last_name="Sharon", email_promotion=1)]
+    for person in persons:
+        person_provider.insert_person(person)
+
+    # Act
+    paged_person_ids = list([])
+    persons_page, cursor = person_provider.get_persons_page(order_by=order_by, order_type=order_type, limit=limit)
+    paged_person_ids.extend(list(map(lambda p: p.business_entity_id, persons_page)))
+    while cursor is not None:
+        persons_page, cursor = person_provider.get_persons_page(order_by=order_by, order_type=order_type,
+                                                                limit=limit, cursor=cursor)
+        paged_person_ids.extend(list(map(lambda p: p.business_entity_id, persons_page)))
+    expected_persons = person_provider.get_persons(order_by=order_by or "person_id", order_type=order_type)
+
+    # Assert
+    assert len(paged_person_ids) == len(persons)
+    assert len(set(paged_person_ids)) == len(persons)
+    if order_by != "email_promotion":
+        assert paged_person_ids == list(map(lambda p: p.business_entity_id, expected_persons))
+
+    drop_tables(db_engine)
+
+
+@pytest.mark.parametrize("filters, limit, offset, expected_persons_length, expected_total", [
+    (None, 2, 0, 2, 4),
+    (None, 2, 3, 1, 4),
+    (None, 2, 10, 0, 4),
+    ("person_type:IN", 10, 0, 2, 2),
+    ("person_type:SP", 10, 0, 0, 0)
+])
+def test_get_persons_with_total_should_return_page_and_count_of_all_filtered_persons(
+        filters: Optional[str], limit: int, offset: int,
+        expected_persons_length: int, expected_total: int) -> None:
+    create_tables(db_engine)
+
+    # Arrange
+    persons = [PersonInput(person_type=EPersonType.GC, first_name="John", last_name="Doe"),
+               PersonInput(person_type=EPersonType.IN, first_name="Alice", last_name="Doe"),
+               PersonInput(person_type=EPersonType.IN, first_name="John", last_name="Doe"),
+               PersonInput(person_type=EPersonType.EM, first_name="Mark", last_name="Sharon")]
+    for person in persons:
+        person_provider.insert_person(person)
+
+    # Act
+    persons_page, persons_total = person_provider.get_persons_with_total(filters=filters, limit=limit, offset=offset)
+
+    # Assert
+    assert len(persons_page) == expected_persons_length
+    assert persons_total == expected_total
+    assert persons_total == person_provider.count_persons(filters=filters)
+
+    drop_tables(db_engine)
+
+
+@pytest.mark.parametrize("filters, limit, is_alternative, expected_person_ids", [
+    ("first_name_phrase:john", None, False, [1, 2]),
+    ("first_name_phrase:john", 1, False, [1]),
+    ("first_name_phrase:john,last_name_phrase:john", None, True, [1, 2, 3]),
+    ("last_name_phrase:doe", None, False, [1, 2]),
+    ("first_name_phrase:xyz", None, False, [])
+])
+def test_search_persons_should_return_persons_ranked_by_similarity_to_phrases(
+        filters: str, limit: Optional[int], is_alternative: bool, expected_person_ids: List[int]) -> None:
+    create_tables(db_engine)
+    PersonSearchMigration.upgrade(db_engine)
+
+    # Arrange
+    persons = [PersonInput(person_type=EPersonType.GC, first_name="John", last_name="Doe"),
+               PersonInput(person_type=EPersonType.IN, first_name="Johnny", last_name="Doerr"),
+               PersonInput(person_type=EPersonType.IN, first_name="Alice", last_name="Johnson"),
+               PersonInput(person_type=EPersonType.EM, first_name="Mark", last_name="Sharon")]
+    for person in persons:
+        person_provider.insert_person(person)
+
+    # Act
+    found_persons = person_provider.search_persons(filters, limit, is_alternative)
+
+    # Assert
+    assert list(map(lambda p: p.business_entity_id, found_persons)) == expected_person_ids
+
+    drop_tables(db_engine)
+
+
+@pytest.mark.parametrize("filters, is_ranked, batch_size, expected_batch_lengths", [
+    ("first_name_phrase:john", False, 1, [1, 1]),
+    ("last_name_phrase:o", False, 3, [3, 1]),
+    ("last_name_phrase:o", True, 10, [4]),
+    ("first_name_phrase:xyz", False, 10, [])
+])
+def test_stream_persons_should_yield_all_persons_in_batches(filters: str, is_ranked: bool, batch_size: int,
+                                                           expected_batch_lengths: List[int]) -> None:
+    create_tables(db_engine)
+    PersonSearchMigration.upgrade(db_engine)
+
+    # Arrange
+    persons = [PersonInput(person_type=EPersonType.GC, first_name="John", last_name="Doe"),
+               PersonInput(person_type=EPersonType.IN, first_name="Johnny", last_name="Doerr"),
+               PersonInput(person_type=EPersonType.IN, first_name="Alice", last_name="Johnson"),
+               PersonInput(person_type=EPersonType.EM, first_name="Mark", last_name="Sharon")]
+    for person in persons:
+        person_provider.insert_person(person)
+
+    # Act
+    person_batches = list(person_provider.stream_persons(filters, "full_name", EOrderType.ASC,
+                                                         is_ranked=is_ranked, batch_size=batch_size))
+
+    # Assert
+    assert list(map(len, person_batches)) == expected_batch_lengths
+
+    drop_tables(db_engine)
+
+
 @pytest.mark.parametrize("persons, expected_count", [
     ([PersonInput(person_type=EPersonType.GC, name_style="0",
                  title="Mr.", first_name="John", middle_name="J.", last_name="Doe", suffix="Jr",
@@ -126,6 +259,55 @@ def test_get_person_should_return_valid_object(person: PersonInput) -> None:
     drop_tables(db_engine)
 
 
+@pytest.mark.parametrize("person_ids, fields, expected_person_ids", [
+    ([3, 1, 2], None, [3, 1, 2]),
+    ([2, -1, 2], "first_name", [2, None, 2]),
+    ([], None, [])
+])
+def test_get_persons_by_ids_should_return_objects_in_order_of_ids(person_ids: List[int], fields: Optional[str],
+                                                                  expected_person_ids: List[Optional[int]]) -> None:
+    create_tables(db_engine)
+    insert_test_persons(db_engine, connection_string)
+
+    # Act
+    persons = person_provider.get_persons_by_ids(person_ids, fields)
+
+    # Assert
+    assert list(map(lambda p: p.business_entity_id if p is not None else None, persons)) == expected_person_ids
+
+    drop_tables(db_engine)
+
+
+@pytest.mark.parametrize("person, fields, expected_fields", [
+    (PersonInput(person_type=EPersonType.GC, name_style="0",
+                 title="Mr.", first_name="John", middle_name="J.", last_name="Doe", suffix="Jr",
+                 email_promotion=1,
+                 additional_contact_info="<contact_details>?</contact_details>",
+                 demographics="<demographic_details>?</demographic_details>"),
+     "first_name,last_name", {"business_entity_id", "first_name", "last_name"}),
+    (PersonInput(person_type=EPersonType.EM, first_name="Dzhejkob", last_name="Awaria",
+                 additional_contact_info="<contact_details>?</contact_details>"),
+     "-additional_contact_info,-demographics", {"business_entity_id", "person_type", "name_style", "title",
+                                                "first_name", "middle_name", "last_name", "suffix",
+                                                "email_promotion", "rowguid", "modified_date"})
+])
+def test_get_person_should_return_object_with_projected_fields_only(person: PersonInput, fields: str,
+                                                                    expected_fields: set) -> None:
+    create_tables(db_engine)
+
+    # Arrange
+    person_id = person_provider.insert_person(person)
+
+    # Act
+    expected_person = person_provider.get_person(person_id, fields)
+
+    # Assert
+    assert set(expected_person.dict().keys()) == expected_fields
+    assert person.first_name == expected_person.first_name
+
+    drop_tables(db_engine)
+
+
 @pytest.mark.parametrize("person, expected_error", [
     (PersonInput(person_type=EPersonType.EM, first_name="Dzhejkob", last_name="Awaria"), errors.NotFoundError)
 ])
@@ -173,6 +355,74 @@ def test_insert_person_should_insert_object(person: PersonInput) -> None:
     drop_tables(db_engine)
 
 
+@pytest.mark.parametrize("persons", [
+    [PersonInput(person_type=EPersonType.GC, title="Mr.", first_name="John", middle_name="J.", last_name="Doe",
+                 demographics="<demographic_details><country>England</country></demographic_details>"),
+     PersonInput(person_type=EPersonType.SP, first_name="Alice\tMary", last_name="O'Doe\\Smith")],
+    []
+])
+def test_copy_persons_should_insert_objects_with_their_business_entities(persons: List[PersonInput]) -> None:
+    create_tables(db_engine)
+
+    # Arrange
+    business_entities_count = len(person_provider.business_entity_provider.get_business_entities())
+
+    # Act
+    person_ids = person_provider.copy_persons(persons)
+
+    # Assert
+    assert len(person_ids) == len(persons)
+    assert len(person_provider.business_entity_provider.get_business_entities()) == \
+           business_entities_count + len(persons)
+    for person_id, person in zip(person_ids, persons):
+        expected_person = person_provider.get_person(person_id)
+        assert person.person_type == expected_person.person_type
+        assert person.title == expected_person.title
+        assert person.first_name == expected_person.first_name
+        assert person.middle_name == expected_person.middle_name
+        assert person.last_name == expected_person.last_name
+        assert person.demographics == expected_person.demographics
+        assert expected_person.rowguid is not None
+
+    drop_tables(db_engine)
+
+
+@pytest.mark.parametrize("person, expected_error", [
+    (PersonInput(person_type=EPersonType.IN, first_name="Mark", last_name="Sharon", email_promotion=2), None),
+    (PersonInput(person_type=EPersonType.EM, first_name="Dzhejkob", last_name="Awaria", email_promotion=5),
+     errors.PydanticValidationError)
+])
+def test_create_person_should_insert_person_with_its_business_entity_or_nothing(
+        person: PersonInput, expected_error: Optional[type]) -> None:
+    create_tables(db_engine)
+
+    # Arrange
+    business_entities_count = len(person_provider.business_entity_provider.get_business_entities())
+
+    if expected_error is not None:
+        with pytest.raises(expected_error):
+            # Act
+            # Assert
+            person_provider.create_person(person)
+        assert len(person_provider.business_entity_provider.get_business_entities()) == business_entities_count
+    else:
+        # Act
+        created_person = person_provider.create_person(person)
+
+        # Assert
+        expected_person = person_provider.get_person(created_person.business_entity_id)
+        assert len(person_provider.business_entity_provider.get_business_entities()) == business_entities_count + 1
+        assert created_person.business_entity_id == expected_person.business_entity_id
+        assert created_person.person_type == expected_person.person_type
+        assert created_person.first_name == expected_person.first_name
+        assert created_person.last_name == expected_person.last_name
+        assert created_person.email_promotion == expected_person.email_promotion
+        assert created_person.rowguid == expected_person.rowguid
+        assert created_person.modified_date == expected_person.modified_date
+
+    drop_tables(db_engine)
+
+
 @pytest.mark.parametrize("person, updated_person", [
     (PersonInput(person_type=EPersonType.GC, name_style="0",
                  title="Mr.", first_name="John", middle_name="J.", last_name="Doe", suffix="Jr",
@@ -217,6 +467,40 @@ def test_update_person_should_update_object(person: PersonInput, updated_person:
     drop_tables(db_engine)
 
 
+@pytest.mark.parametrize("person, is_existing, updated_person, expected_error", [
+    (PersonInput(person_type=EPersonType.EM, first_name="Dzhejkob", last_name="Awaria"), True,
+     PersonInput(person_type=EPersonType.GC, first_name="Dzejkob", last_name="Avaria", email_promotion=2), None),
+    (PersonInput(person_type=EPersonType.EM, first_name="Dzhejkob", last_name="Awaria"), False,
+     PersonInput(person_type=EPersonType.GC, first_name="Dzejkob", last_name="Avaria"), errors.NotFoundError)
+])
+def test_update_and_get_person_should_return_updated_person_or_raise_expected_error(
+        person: PersonInput, is_existing: bool, updated_person: PersonInput, expected_error: Optional[type]) -> None:
+    create_tables(db_engine)
+
+    # Arrange
+    person_id = person_provider.insert_person(person) if is_existing else -1
+
+    if expected_error is not None:
+        with pytest.raises(expected_error):
+            # Act
+            # Assert
+            person_provider.update_and_get_person(person_id, updated_person)
+    else:
+        # Act
+        returned_person = person_provider.update_and_get_person(person_id, updated_person)
+
+        # Assert
+        expected_person = person_provider.get_person(person_id)
+        assert returned_person.business_entity_id == expected_person.business_entity_id
+        assert returned_person.person_type == expected_person.person_type
+        assert returned_person.first_name == expected_person.first_name
+        assert returned_person.last_name == expected_person.last_name
+        assert returned_person.email_promotion == expected_person.email_promotion
+        assert returned_person.modified_date == expected_person.modified_date
+
+    drop_tables(db_engine)
+
+
 @pytest.mark.parametrize("person", [
     PersonInput(person_type=EPersonType.GC, name_style="0",
                 title="Mr.", first_name="John", middle_name="J.", last_name="Doe", suffix="Jr",
@@ -239,3 +523,131 @@ def test_delete_person_should_delete_object(person: PersonInput) -> None:
         person_provider.get_person(person_id)
 
     drop_tables(db_engine)
+
+
+@pytest.mark.parametrize("person_id, expected_dependent_count, expected_error", [
+    (1, 3, None),
+    (6, 0, None),
+    (-1, None, errors.NotFoundError)
+])
+def test_delete_independent_person_should_delete_only_person_without_person_phones(
+        person_id: int, expected_dependent_count: Optional[int], expected_error: Optional[type]) -> None:
+    create_tables(db_engine)
+    insert_test_persons(db_engine, connection_string)
+    insert_test_phone_number_types(db_engine, connection_string)
+    insert_test_person_phones(db_engine, connection_string)
+
+    if expected_error is not None:
+        with pytest.raises(expected_error):
+            # Act
+            # Assert
+            person_provider.delete_independent_person(person_id)
+    else:
+        # Arrange
+        business_entities_count = len(person_provider.business_entity_provider.get_business_entities())
+
+        # Act
+        dependent_count = person_provider.delete_independent_person(person_id)
+
+        # Assert
+        assert dependent_count == expected_dependent_count
+        if expected_dependent_count == 0:
+            with pytest.raises(errors.NotFoundError):
+                person_provider.get_person(person_id)
+            assert len(person_provider.business_entity_provider.get_business_entities()) == business_entities_count - 1
+        else:
+            assert person_provider.get_person(person_id).business_entity_id == person_id
+            assert len(person_provider.business_entity_provider.get_business_entities()) == business_entities_count
+
+    drop_tables(db_engine)
+
+
+def test_execute_person_operations_should_return_result_of_each_operation() -> None:
+    create_tables(db_engine)
+    insert_test_persons(db_engine, connection_string)
+    insert_test_phone_number_types(db_engine, connection_string)
+    insert_test_person_phones(db_engine, connection_string)
+
+    # Arrange
+    person_input = PersonInput(person_type=EPersonType.IN, first_name="Mark", last_name="Sharon", email_promotion=2)
+    person_operations = list([
+        PersonOperation(operation=EBatchOperation.CREATE, person_input=person_input),
+        PersonOperation(operation=EBatchOperation.UPDATE, person_id=6, person_input=person_input),
+        PersonOperation(operation=EBatchOperation.UPDATE, person_id=-1, person_input=person_input),
+        PersonOperation(operation=EBatchOperation.CREATE,
+                        person_input=PersonInput(person_type=EPersonType.EM, first_name="Dzhejkob",
+                                                 last_name="Awaria", email_promotion=5)),
+        PersonOperation(operation=EBatchOperation.DELETE, person_id=1),
+        PersonOperation(operation=EBatchOperation.DELETE, person_id=6),
+        PersonOperation(operation=EBatchOperation.DELETE)
+    ])
+
+    # Act
+    results = person_provider.execute_person_operations(person_operations)
+
+    # Assert
+    assert isinstance(results[0], Person)
+    assert person_provider.get_person(results[0].business_entity_id).first_name == "Mark"
+    assert isinstance(results[1], Person) and results[1].business_entity_id == 6
+    assert isinstance(results[2], errors.NotFoundError)
+    assert isinstance(results[3], errors.PydanticValidationError)
+    assert results[4] == 3
+    assert person_provider.get_person(1).business_entity_id == 1
+    assert results[5] == 0
+    with pytest.raises(errors.NotFoundError):
+        person_provider.get_person(6)
+    assert isinstance(results[6], errors.EmptyFieldsError)
+
+    drop_tables(db_engine)
+
+
+@pytest.mark.parametrize("fields, expected_columns, expected_absent_columns", [
+    (None, ["\"FirstName\"", "\"AdditionalContactInfo\"", "\"Demographics\""], []),
+    ("*", ["\"FirstName\"", "\"AdditionalContactInfo\"", "\"Demographics\""], []),
+    ("-additional_contact_info,-demographics", ["\"BusinessEntityID\"", "\"FirstName\"", "\"ModifiedDate\""],
+     ["\"AdditionalContactInfo\"", "\"Demographics\""]),
+    ("last_name", ["\"BusinessEntityID\"", "\"LastName\""],
+     ["\"FirstName\"", "\"AdditionalContactInfo\"", "\"Demographics\""])
+])
+def test_get_persons_statement_should_select_projected_fields_only(fields: Optional[str],
+                                                                    expected_columns: List[str],
+                                                                    expected_absent_columns: List[str]) -> None:
+    # Arrange
+    # Act
+    statement = PersonProvider.get_persons_statement(fields=fields)
+    select_list = str(statement).split("FROM")[0]
+
+    # Assert
+    assert all(map(lambda c: c in select_list, expected_columns))
+    assert not any(map(lambda c: c in select_list, expected_absent_columns))
+
+
+@pytest.mark.parametrize("fields, expected_error", [
+    ("first_name,-demographics", errors.ColumnNotFoundError),
+    ("first_name,nonexistent_field", errors.ColumnNotFoundError),
+    ("-nonexistent_field", errors.ColumnNotFoundError)
+])
+def test_get_persons_statement_should_raise_expected_error(fields: str, expected_error: Exception) -> None:
+    with pytest.raises(expected_error):
+        # Act
+        # Assert
+        PersonProvider.get_persons_statement(fields=fields)
+
+
+@pytest.mark.parametrize("person_operation, expected_error", [
+    (PersonOperation(operation=EBatchOperation.CREATE), errors.EmptyFieldsError),
+    (PersonOperation(operation=EBatchOperation.UPDATE,
+                     person_input=PersonInput(person_type=EPersonType.IN, first_name="Mark", last_name="Sharon")),
+     errors.EmptyFieldsError),
+    (PersonOperation(operation=EBatchOperation.DELETE), errors.EmptyFieldsError),
+    (PersonOperation(operation=EBatchOperation.CREATE,
+                     person_input=PersonInput(person_type=EPersonType.EM, first_name="Dzhejkob", last_name="Awaria",
+                                              email_promotion=5)),
+     errors.PydanticValidationError)
+])
+def test_get_person_operation_statement_should_raise_expected_error(person_operation: PersonOperation,
+                                                                     expected_error: Exception) -> None:
+    with pytest.raises(expected_error):
+        # Act
+        # Assert
+        PersonProvider.get_person_operation_statement(person_operation)
@@ -1,14 +1,14 @@
 import pytest
 import sqlalchemy
 from sqlmodel import create_engine
-from typing import List
+from typing import List, Optional
 
-from app.config import PostgresdbConnectionConfig
-from app.models import PhoneNumberTypeInput
+from app.config import PostgresdbConnectionConfig, PhoneNumberTypeCacheConfig
+from app.models import PhoneNumberTypeInput, PhoneNumberTypeOperation, PhoneNumberType, EOrderType, EBatchOperation
 from app.providers import PhoneNumberTypeProvider
 from app import errors
 
-from app.tests.fixtures.fixtures_tests import create_tables, drop_tables
+from app.tests.fixtures.fixtures_tests import create_tables, drop_tables, insert_test_phone_number_types
 
 
 connection_string: str = PostgresdbConnectionConfig.get_db_connection_string(test_suffix="_test")
@@ -65,6 +65,65 @@ def test_count_phone_number_types_should_return_expected_number(phone_number_typ
     drop_tables(db_engine)
 
 
+@pytest.mark.parametrize("is_cache_enabled", [False, True])
+@pytest.mark.parametrize("filters, limit, offset, expected_names, expected_total, is_count_queried", [
+    (None, 2, 0, ["Cell", "Mobile"], 5, False),
+    (None, 2, 4, ["Home em"], 5, False),
+    ("name_phrase:hom", 2, 5, [], 3, True),
+    ("name_phrase:hom", 1, 1, ["Home 2"], 3, False),
+    ("name_phrase:xyz", 10, 0, [], 0, False)
+])
+def test_get_phone_number_types_with_total_should_return_page_and_count_of_all_filtered_phone_number_types(
+        monkeypatch, is_cache_enabled: bool, filters: Optional[str], limit: int, offset: int,
+        expected_names: List[str], expected_total: int, is_count_queried: bool) -> None:
+    create_tables(db_engine)
+    insert_test_phone_number_types(db_engine, connection_string)
+
+    # Arrange
+    phone_number_type_cache_config = PhoneNumberTypeCacheConfig(is_enabled=is_cache_enabled)
+    monkeypatch.setattr(PhoneNumberTypeCacheConfig, "from_json", staticmethod(lambda: phone_number_type_cache_config))
+    count_statement_filters = []
+    count_phone_number_types_statement = PhoneNumberTypeProvider.count_phone_number_types_statement
+    monkeypatch.setattr(PhoneNumberTypeProvider, "count_phone_number_types_statement",
+                        staticmethod(lambda f=None: count_statement_filters.append(f) or
+                                     count_phone_number_types_statement(f)))
+
+    # Act
+    phone_number_types_page, phone_number_types_total = phone_number_type_provider.get_phone_number_types_with_total(
+        filters=filters, limit=limit, offset=offset)
+
+    # Assert
+    assert list(map(lambda pnt: pnt.name, phone_number_types_page)) == expected_names
+    assert phone_number_types_total == expected_total
+    assert count_statement_filters == ([filters] if is_count_queried and not is_cache_enabled else [])
+
+    drop_tables(db_engine)
+
+
+@pytest.mark.parametrize("phone_number_types, batch_size, expected_names", [
+    ([PhoneNumberTypeInput(name="Mobile"),
+      PhoneNumberTypeInput(name="Cell"),
+      PhoneNumberTypeInput(name="Home")], 2, [["Cell", "Home"], ["Mobile"]]),
+    ([], 10, [])
+])
+def test_stream_phone_number_types_should_yield_all_phone_number_types_in_batches(
+        phone_number_types: List[PhoneNumberTypeInput], batch_size: int, expected_names: List[List[str]]) -> None:
+    create_tables(db_engine)
+
+    # Arrange
+    for phone_number_type in phone_number_types:
+        phone_number_type_provider.insert_phone_number_type(phone_number_type)
+
+    # Act
+    phone_number_type_batches = list(phone_number_type_provider.stream_phone_number_types(
+        order_by="name", order_type=EOrderType.ASC, batch_size=batch_size))
+
+    # Assert
+    assert list(map(lambda b: list(map(lambda pnt: pnt.name, b)), phone_number_type_batches)) == expected_names
+
+    drop_tables(db_engine)
+
+
 @pytest.mark.parametrize("phone_number_type", [
     PhoneNumberTypeInput(name="Cell"),
     PhoneNumberTypeInput(name="Mobile")
@@ -104,6 +163,23 @@ def test_get_phone_number_type_should_raise_expected_error(phone_number_type: Ph
     drop_tables(db_engine)
 
 
+def test_get_phone_number_types_by_ids_should_return_objects_in_order_of_ids() -> None:
+    create_tables(db_engine)
+
+    # Arrange
+    cell_id = phone_number_type_provider.insert_phone_number_type(PhoneNumberTypeInput(name="Cell"))
+    home_id = phone_number_type_provider.insert_phone_number_type(PhoneNumberTypeInput(name="Home"))
+
+    # Act
+    phone_number_types = phone_number_type_provider.get_phone_number_types_by_ids([home_id, -1, cell_id, home_id])
+
+    # Assert
+    assert list(map(lambda pnt: pnt.name if pnt is not None else None, phone_number_types)) == \
+           ["Home", None, "Cell", "Home"]
+
+    drop_tables(db_engine)
+
+
 @pytest.mark.parametrize("phone_number_type", [
     PhoneNumberTypeInput(name="Cell"),
     PhoneNumberTypeInput(name="Mobile")
@@ -124,6 +200,26 @@ def test_insert_phone_number_type_should_insert_object(phone_number_type: PhoneN
     drop_tables(db_engine)
 
 
+@pytest.mark.parametrize("phone_number_types", [
+    [PhoneNumberTypeInput(name="Cell"), PhoneNumberTypeInput(name="Mobile\tphone"), PhoneNumberTypeInput(name="Home")],
+    []
+])
+def test_copy_phone_number_types_should_insert_objects(phone_number_types: List[PhoneNumberTypeInput]) -> None:
+    create_tables(db_engine)
+
+    # Arrange
+    # Act
+    copied_count = phone_number_type_provider.copy_phone_number_types(phone_number_types)
+
+    # Assert
+    expected_phone_number_types = phone_number_type_provider.get_phone_number_types(order_by="phone_number_type_id")
+    assert copied_count == len(phone_number_types)
+    assert list(map(lambda pnt: pnt.name, expected_phone_number_types)) == \
+           list(map(lambda pnt: pnt.name, phone_number_types))
+
+    drop_tables(db_engine)
+
+
 @pytest.mark.parametrize("phone_number_type, updated_phone_number_type", [
     (PhoneNumberTypeInput(name="Cell"),
      PhoneNumberTypeInput(name="Mobile")
@@ -170,3 +266,85 @@ def test_delete_phone_number_type_should_delete_object(phone_number_type: PhoneN
         phone_number_type_provider.get_phone_number_type(phone_number_type_id)
 
     drop_tables(db_engine)
+
+
+def test_execute_phone_number_type_operations_should_return_result_of_each_operation() -> None:
+    create_tables(db_engine)
+
+    # Arrange
+    phone_number_type_id = phone_number_type_provider.insert_phone_number_type(PhoneNumberTypeInput(name="Cell"))
+    phone_number_type_operations = list([
+        PhoneNumberTypeOperation(operation=EBatchOperation.CREATE,
+                                 phone_number_type_input=PhoneNumberTypeInput(name="Remote work")),
+        PhoneNumberTypeOperation(operation=EBatchOperation.UPDATE, phone_number_type_id=phone_number_type_id,
+                                 phone_number_type_input=PhoneNumberTypeInput(name="Mobile")),
+        PhoneNumberTypeOperation(operation=EBatchOperation.DELETE, phone_number_type_id=-1),
+        PhoneNumberTypeOperation(operation=EBatchOperation.UPDATE, phone_number_type_id=phone_number_type_id)
+    ])
+
+    # Act
+    results = phone_number_type_provider.execute_phone_number_type_operations(phone_number_type_operations)
+
+    # Assert
+    assert isinstance(results[0], PhoneNumberType)
+    assert phone_number_type_provider.get_phone_number_type(results[0].phone_number_type_id).name == "Remote work"
+    assert isinstance(results[1], PhoneNumberType)
+    assert phone_number_type_provider.get_phone_number_type(phone_number_type_id).name == "Mobile"
+    assert isinstance(results[2], errors.NotFoundError)
+    assert isinstance(results[3], errors.EmptyFieldsError)
+
+    drop_tables(db_engine)
+
+
+cached_phone_number_types: List[PhoneNumberType] = list([
+    PhoneNumberType(phone_number_type_id=1, name="Cell"),
+    PhoneNumberType(phone_number_type_id=2, name="Home"),
+    PhoneNumberType(phone_number_type_id=3, name="Work"),
+    PhoneNumberType(phone_number_type_id=4, name="Home office")
+])
+
+
+@pytest.mark.parametrize("filters, order_by, order_type, limit, offset, expected_ids", [
+    (None, None, None, None, None, [1, 2, 3, 4]),
+    ("name_phrase:HOME", None, None, None, None, [2, 4]),
+    (None, "name", EOrderType.ASC, None, None, [1, 2, 4, 3]),
+    (None, "name", EOrderType.DESC, 2, 1, [4, 2]),
+    ("name_phrase:o", "name", EOrderType.ASC, 10, 2, [3]),
+    ("name_phrase:x", None, None, None, None, [])
+])
+def test_select_cached_phone_number_types_should_return_expected_objects(filters: str, order_by: str,
+                                                                         order_type: EOrderType,
+                                                                         limit: int, offset: int,
+                                                                         expected_ids: List[int]) -> None:
+    # Arrange
+    phone_number_types = dict(map(lambda pnt: (pnt.phone_number_type_id, pnt), cached_phone_number_types))
+
+    # Act
+    selected_phone_number_types = PhoneNumberTypeProvider.select_cached_phone_number_types(phone_number_types,
+                                                                                          filters, order_by,
+                                                                                          order_type)
+    selected_phone_number_types = PhoneNumberTypeProvider.slice_cached_phone_number_types(selected_phone_number_types,
+                                                                                         limit, offset)
+
+    # Assert
+    assert list(map(lambda pnt: pnt.phone_number_type_id, selected_phone_number_types)) == expected_ids
+
+
+@pytest.mark.parametrize("filters, order_by, limit, offset, expected_error", [
+    ("id:1", None, None, None, errors.FilterNotFoundError),
+    (None, "nonexistent_column", None, None, errors.ColumnNotFoundError),
+    (None, None, -1, None, errors.InvalidSQLValueError),
+    (None, None, None, -1, errors.InvalidSQLValueError)
+])
+def test_select_cached_phone_number_types_should_raise_expected_error(filters: str, order_by: str,
+                                                                      limit: int, offset: int,
+                                                                      expected_error: type) -> None:
+    # Arrange
+    phone_number_types = dict(map(lambda pnt: (pnt.phone_number_type_id, pnt), cached_phone_number_types))
+
+    # Act
+    # Assert
+    with pytest.raises(expected_error):
+        selected_phone_number_types = PhoneNumberTypeProvider.select_cached_phone_number_types(
+            phone_number_types, filters, order_by, EOrderType.ASC)
+        PhoneNumberTypeProvider.slice_cached_phone_number_types(selected_phone_number_types, limit, offset)
@@ -6,6 +6,7 @@ from pytest import MonkeyPatch
 from app.models import (ResponseMessage, AWFAPIUserInput, AWFAPIUser, AWFAPIRegisteredUser,
                         E400BadRequest, E401Unauthorized)
 from app.factories import MongoDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory
+from app.providers import AWFAPIUserProvider
 
 from app.routes import jwt_authentication as jwt_authentication_routes
 from app.routes import awfapi_user as awfapi_user_routes
@@ -126,6 +127,52 @@ def test_create_awfapi_user_should_return_400_response(client, monkeypatch,
         fixtures_after_test()
 
 
+@pytest.mark.parametrize("awfapi_user, expected_message", [
+    (AWFAPIUserInput(username="testuser", full_name="Test User 2", email="test.user2@test.user",
+                     is_readonly=True, hashed_password="$2b$12$1MPiN.NRShpEI/WzKmsPLemaT3d6paLBXi3t3KFBHFlyXUrKgixF6"),
+     ResponseMessage(title="Unique constraint violation. Value 'testuser' for field 'username' already exists.",
+                     description=f"{E400BadRequest.UNIQUE_CONSTRAINT_VIOLATION}: "
+                                 f"[username] [testuser] Field 'username' must have unique values. "
+                                 f"Provided username 'testuser' already exists.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (AWFAPIUserInput(username="testuser2", full_name="Test User 2", email="test.user@test.user",
+                     is_readonly=True, hashed_password="$2b$12$1MPiN.NRShpEI/WzKmsPLemaT3d6paLBXi3t3KFBHFlyXUrKgixF6"),
+     ResponseMessage(title="Unique constraint violation. Value 'test.user@test.user' for field 'email' already exists.",
+                     description=f"{E400BadRequest.UNIQUE_CONSTRAINT_VIOLATION}: "
+                                 f"[email] [test.user@test.user] Field 'email' must have unique values. "
+                                 f"Provided email 'test.user@test.user' already exists.",
+                     code=status.HTTP_400_BAD_REQUEST))
+])
+def test_create_awfapi_user_should_return_400_response_from_unique_index(client, monkeypatch,
+                                                                         awfapi_user: AWFAPIUserInput,
+                                                                         expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_nonreadonly_user)
+        access_token = obtain_access_token(client, awfapi_nonreadonly_user)
+        monkeypatch.setattr(AWFAPIUserProvider, '_AWFAPIUserProvider__guard_unique_username', lambda *args: None)
+        monkeypatch.setattr(AWFAPIUserProvider, '_AWFAPIUserProvider__guard_unique_email', lambda *args: None)
+
+        # Act
+        response = client.post("/create_awfapi_user", data=awfapi_user.json(), headers={
+            'Authorization': f"Bearer {access_token}"
+        })
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
 @pytest.mark.parametrize("awfapi_user, expected_message", [
     (AWFAPIUserInput(username="testuser2", full_name="Test User 2", email="test.user2@test.user",
                      is_readonly=True, hashed_password="$2b$12$1MPiN.NRShpEI/WzKmsPLemaT3d6paLBXi3t3KFBHFlyXUrKgixF6"),
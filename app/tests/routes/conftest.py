@@ -0,0 +1,26 @@
+import pytest
+from pytest import MonkeyPatch
+
+from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, PersonFactory,
+                           PhoneNumberTypeFactory)
+
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import person as person_routes
+from app.routes import phone_number_type as phone_number_type_routes
+
+
+mongodb_connection_string, mongodb_collection_name, mongodb_engine = MongoDBFactory.get_db_connection_details(test_suffix="_test")
+awfapi_user_provider = AWFAPIUserFactory.get_provider(mongodb_connection_string, mongodb_collection_name, mongodb_engine)
+
+postgresdb_connection_string, postgresdb_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_test")
+person_provider, person_service = PersonFactory.get_provider_and_service(postgresdb_connection_string, postgresdb_engine)
+phone_number_type_provider = PhoneNumberTypeFactory.get_provider(postgresdb_connection_string, postgresdb_engine)
+
+
+@pytest.fixture(autouse=True)
+def startup_providers(monkeypatch: MonkeyPatch) -> None:
+    """ Replaces providers used by app startup handlers with the ones of test databases before the test client starts """
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_provider', awfapi_user_provider)
+    monkeypatch.setattr(person_routes, 'person_provider', person_provider)
+    monkeypatch.setattr(person_routes, 'person_service', person_service)
+    monkeypatch.setattr(phone_number_type_routes, 'phone_number_type_provider', phone_number_type_provider)
@@ -0,0 +1,218 @@
+import pytest
+from typing import List, Optional
+from starlette.testclient import TestClient
+from fastapi import status
+from pytest import MonkeyPatch
+
+from app.caches import PersonNameIndex
+from app.config import PersonNameIndexConfig
+from app.models import (ResponseMessage, AWFAPIRegisteredUser, EPersonType, PersonInput, Person, PersonName,
+                        E400BadRequest, E503ServiceUnavailable)
+from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory,
+                           PersonFactory)
+
+from app.routes import jwt_authentication as jwt_authentication_routes
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import person as person_routes
+from app import oauth2_handlers
+
+from app.tests.fixtures.fixtures_entry_lists import awfapi_nonreadonly_user, persons_db
+from app.tests.fixtures.fixtures_tests import (register_test_user, obtain_access_token, insert_test_persons,
+                                               create_tables, drop_tables, drop_collection)
+
+
+mongodb_connection_string, mongodb_collection_name, mongodb_engine = MongoDBFactory.get_db_connection_details(test_suffix="_test")
+awfapi_user_provider, awfapi_user_service = AWFAPIUserFactory.get_provider_and_service(mongodb_connection_string, mongodb_collection_name, mongodb_engine)
+jwt_authentication_service = JWTAuthenticationFactory.get_service(awfapi_user_provider, awfapi_user_service)
+
+postgresdb_connection_string, postgresdb_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_test")
+person_provider = PersonFactory.get_provider(postgresdb_connection_string, postgresdb_engine)
+
+
+@pytest.fixture()
+def person_ids(monkeypatch) -> List[int]:
+    return fixtures_before_test(monkeypatch)
+
+
+@pytest.fixture()
+def client(person_ids):
+    """ Test persons are inserted before the test client starts, so its startup builds the name index of them """
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def fixtures_before_test(monkeypatch: MonkeyPatch) -> List[int]:
+    create_tables(postgresdb_engine)
+
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_provider', awfapi_user_provider)
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_service', awfapi_user_service)
+    monkeypatch.setattr(jwt_authentication_routes, 'jwt_auth_service', jwt_authentication_service)
+    monkeypatch.setattr(oauth2_handlers, 'jwt_auth_service', jwt_authentication_service)
+
+    monkeypatch.setattr(person_routes, 'person_provider', person_provider)
+
+    return insert_test_persons(postgresdb_engine, postgresdb_connection_string)
+
+
+def fixtures_after_test() -> None:
+    drop_collection(mongodb_engine, mongodb_collection_name)
+    drop_tables(postgresdb_engine)
+
+
+@pytest.mark.parametrize("prefix, top_k, expected_person_indices", [
+    ("adams", None, [2, 3, 4]),
+    ("adams", 2, [2, 3]),
+    ("John", None, [0, 1, 2, 3, 4]),
+    ("john", 3, [0, 1, 2]),
+    ("  WASH ", None, [5, 7]),
+    ("aaron  w", None, [7]),
+    ("smith", 2, [1, 8]),
+    ("zzz", None, [])
+])
+def test_autocomplete_names_should_return_200_response(client, person_ids: List[int],
+                                                       prefix: str, top_k: Optional[int],
+                                                       expected_person_indices: List[int]) -> None:
+    try:
+        # Arrange
+        params = {'prefix': prefix} if top_k is None else {'prefix': prefix, 'top_k': top_k}
+
+        # Act
+        response = client.get("/autocomplete_names", params=params)
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        person_names = list(map(lambda pn: PersonName(**pn), response.json()))
+        assert len(person_names) == len(expected_person_indices)
+        for person_name, epi in zip(person_names, expected_person_indices):
+            assert person_name.business_entity_id == person_ids[epi]
+            assert person_name.first_name == persons_db[epi].first_name
+            assert person_name.last_name == persons_db[epi].last_name
+        assert PersonNameIndex.get_size() == len(persons_db)
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("prefix, top_k, expected_message", [
+    (None, None, ResponseMessage(title="Missing values.",
+                                 description=f"{E400BadRequest.VALUES_NOT_PROVIDED}: Name prefix must be provided.",
+                                 code=status.HTTP_400_BAD_REQUEST)),
+    ("", 3, ResponseMessage(title="Missing values.",
+                            description=f"{E400BadRequest.VALUES_NOT_PROVIDED}: Name prefix must be provided.",
+                            code=status.HTTP_400_BAD_REQUEST)),
+    ("   ", None, ResponseMessage(title="Missing values.",
+                                  description=f"{E400BadRequest.VALUES_NOT_PROVIDED}: Name prefix must be provided.",
+                                  code=status.HTTP_400_BAD_REQUEST)),
+    ("john", 0, ResponseMessage(title="Invalid value for SQL clause.",
+                                description=f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                            f"Value '0' is invalid for number of names.",
+                                code=status.HTTP_400_BAD_REQUEST)),
+    ("john", -1, ResponseMessage(title="Invalid value for SQL clause.",
+                                 description=f"{E400BadRequest.INVALID_SQL_VALUE}: "
+                                             f"Value '-1' is invalid for number of names.",
+                                 code=status.HTTP_400_BAD_REQUEST)),
+    ("john", 6, ResponseMessage(title="Limit exceeded.",
+                                description=f"{E400BadRequest.LIMIT_EXCEEDED}: "
+                                            f"Number of names '6' exceeds maximum of 5.",
+                                code=status.HTTP_400_BAD_REQUEST))
+])
+def test_autocomplete_names_should_return_400_response(client, monkeypatch,
+                                                       prefix: Optional[str], top_k: Optional[int],
+                                                       expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        person_name_index_config = PersonNameIndexConfig(is_enabled=True, default_top_k=3, max_top_k=5)
+        monkeypatch.setattr(PersonNameIndexConfig, "from_json", staticmethod(lambda: person_name_index_config))
+        params = dict(filter(lambda p: p[1] is not None, [('prefix', prefix), ('top_k', top_k)]))
+
+        # Act
+        response = client.get("/autocomplete_names", params=params)
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("prefix, expected_message", [
+    ("john", ResponseMessage(title="Service temporarily overloaded.",
+                             description=f"{E503ServiceUnavailable.PERSON_NAME_INDEX_NOT_BUILT}: "
+                                         f"Person name index is not built yet. Retry in a moment.",
+                             code=status.HTTP_503_SERVICE_UNAVAILABLE))
+])
+def test_autocomplete_names_should_return_503_response(client, prefix: str, expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        PersonNameIndex.clear()
+
+        # Act
+        response = client.get("/autocomplete_names", params={'prefix': prefix})
+
+        # Assert
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers['Retry-After'] == "1"
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("awfapi_registered_user, person, deleted_person_index, expected_person_indices", [
+    (awfapi_nonreadonly_user,
+     PersonInput(person_type=EPersonType.GC, first_name="Zoe", last_name="Smithers"),
+     1, [8, 9])
+])
+def test_autocomplete_names_should_see_created_and_deleted_persons(client, person_ids: List[int],
+                                                                   awfapi_registered_user: AWFAPIRegisteredUser,
+                                                                   person: PersonInput, deleted_person_index: int,
+                                                                   expected_person_indices: List[int]) -> None:
+    try:
+        # Arrange
+        register_test_user(awfapi_user_service, awfapi_registered_user)
+        access_token = obtain_access_token(client, awfapi_registered_user)
+
+        # Act
+        create_response = client.post("/create_person", data=person.json(),
+                                      headers={'Authorization': f"Bearer {access_token}"})
+        created_response = client.get("/autocomplete_names", params={'prefix': "smith"})
+        delete_response = client.delete(f"/delete_person/{person_ids[deleted_person_index]}",
+                                        headers={'Authorization': f"Bearer {access_token}"})
+        deleted_response = client.get("/autocomplete_names", params={'prefix': "smith"})
+
+        # Assert
+        assert create_response.status_code == status.HTTP_201_CREATED
+        new_person = Person(**create_response.json())
+        assert created_response.status_code == status.HTTP_200_OK
+        assert list(map(lambda pn: pn['business_entity_id'], created_response.json())) == \
+               [person_ids[deleted_person_index], *map(lambda epi: person_ids[epi], expected_person_indices),
+                new_person.business_entity_id]
+
+        assert delete_response.status_code == status.HTTP_200_OK
+        assert deleted_response.status_code == status.HTTP_200_OK
+        assert list(map(lambda pn: pn['business_entity_id'], deleted_response.json())) == \
+               [*map(lambda epi: person_ids[epi], expected_person_indices), new_person.business_entity_id]
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
@@ -0,0 +1,172 @@
+import pytest
+from typing import Any, Dict, List, Optional, Tuple
+from starlette.testclient import TestClient
+from fastapi import status
+from pytest import MonkeyPatch
+
+from app.config import BatchConfig
+from app.models import (ResponseMessage, BatchResult, Person,
+                        E400BadRequest, E404NotFound, E422UnprocessableEntity)
+from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory,
+                           PersonFactory)
+
+from app.routes import jwt_authentication as jwt_authentication_routes
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import person as person_routes
+from app import oauth2_handlers
+
+from app.tests.fixtures.fixtures_entry_lists import awfapi_nonreadonly_user, persons_db
+from app.tests.fixtures.fixtures_tests import (register_test_user, obtain_access_token,
+                                               insert_test_persons, insert_test_phone_number_types,
+                                               insert_test_person_phones,
+                                               create_tables, drop_tables, drop_collection)
+
+
+mongodb_connection_string, mongodb_collection_name, mongodb_engine = MongoDBFactory.get_db_connection_details(test_suffix="_test")
+awfapi_user_provider, awfapi_user_service = AWFAPIUserFactory.get_provider_and_service(mongodb_connection_string, mongodb_collection_name, mongodb_engine)
+jwt_authentication_service = JWTAuthenticationFactory.get_service(awfapi_user_provider, awfapi_user_service)
+
+postgresdb_connection_string, postgresdb_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_test")
+person_provider = PersonFactory.get_provider(postgresdb_connection_string, postgresdb_engine)
+
+
+@pytest.fixture()
+def client():
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def fixtures_before_test(monkeypatch: MonkeyPatch) -> None:
+    create_tables(postgresdb_engine)
+
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_provider', awfapi_user_provider)
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_service', awfapi_user_service)
+    monkeypatch.setattr(jwt_authentication_routes, 'jwt_auth_service', jwt_authentication_service)
+    monkeypatch.setattr(oauth2_handlers, 'jwt_auth_service', jwt_authentication_service)
+
+    monkeypatch.setattr(person_routes, 'person_provider', person_provider)
+
+    insert_test_persons(postgresdb_engine, postgresdb_connection_string)
+    insert_test_phone_number_types(postgresdb_engine, postgresdb_connection_string)
+    insert_test_person_phones(postgresdb_engine, postgresdb_connection_string)
+
+
+def fixtures_after_test() -> None:
+    drop_collection(mongodb_engine, mongodb_collection_name)
+    drop_tables(postgresdb_engine)
+
+
+@pytest.mark.parametrize("person_operations, expected_items, expected_persons_count", [
+    ([{'operation': "create", 'person_input': {'person_type': "GC", 'first_name': "Dzhejkob", 'last_name': "Awaria"}},
+      {'operation': "update", 'person_id': 2,
+       'person_input': {'person_type': "EM", 'first_name': "Jane", 'last_name': "Doe"}},
+      {'operation': "update", 'person_id': 99,
+       'person_input': {'person_type': "EM", 'first_name': "Jane", 'last_name': "Doe"}},
+      {'operation': "create",
+       'person_input': {'person_type': "GC", 'first_name': "Dzhejkob", 'last_name': "Awaria", 'email_promotion': 3}},
+      {'operation': "delete", 'person_id': 3},
+      {'operation': "delete", 'person_id': 1},
+      {'operation': "delete", 'person_id': 99},
+      {'operation': "create"}],
+     [(status.HTTP_201_CREATED, None, ("Dzhejkob", "Awaria")),
+      (status.HTTP_200_OK, None, ("Jane", "Doe")),
+      (status.HTTP_404_NOT_FOUND, f"{E404NotFound.PERSON_NOT_FOUND}: Person of id '99' does not exist.", None),
+      (status.HTTP_422_UNPROCESSABLE_ENTITY, f"{E422UnprocessableEntity.INVALID_PERSON_VALUES}: ", None),
+      (status.HTTP_200_OK, "Person of given id '3' deleted.", None),
+      (status.HTTP_400_BAD_REQUEST, f"{E400BadRequest.EXISTING_DEPENDENT_ENTITY}: "
+                                    f"Cannot delete person of id '1', because there are existing person phone "
+                                    f"entries which are dependent on that person. "
+                                    f"Dependent 3 person phone entries must be deleted first.", None),
+      (status.HTTP_404_NOT_FOUND, f"{E404NotFound.PERSON_NOT_FOUND}: Person of id '99' does not exist.", None),
+      (status.HTTP_400_BAD_REQUEST, f"{E400BadRequest.VALUES_NOT_PROVIDED}: "
+                                    f"Operation 'create' requires values: ['person_input'].", None)],
+     len(persons_db)),
+    ([{'operation': "delete", 'person_id': 2},
+      {'operation': "delete", 'person_id': 2}],
+     [(status.HTTP_200_OK, "Person of given id '2' deleted.", None),
+      (status.HTTP_404_NOT_FOUND, f"{E404NotFound.PERSON_NOT_FOUND}: Person of id '2' does not exist.", None)],
+     len(persons_db) - 1)
+])
+def test_batch_persons_should_return_200_response(client, monkeypatch,
+                                                  person_operations: List[Dict[str, Any]],
+                                                  expected_items: List[Tuple[int, Optional[str],
+                                                                             Optional[Tuple[str, str]]]],
+                                                  expected_persons_count: int) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_nonreadonly_user)
+        access_token = obtain_access_token(client, awfapi_nonreadonly_user)
+
+        # Act
+        response = client.post("/batch_persons", json=person_operations,
+                               headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        batch_result = BatchResult[Person](**response.json())
+        assert batch_result.entity == "Person"
+        assert batch_result.failed_count == len(list(filter(lambda ei: ei[0] >= status.HTTP_400_BAD_REQUEST,
+                                                            expected_items)))
+        assert batch_result.succeeded_count == len(expected_items) - batch_result.failed_count
+        assert list(map(lambda i: i.index, batch_result.items)) == list(range(len(expected_items)))
+        for item, (expected_code, expected_description, expected_names) in zip(batch_result.items, expected_items):
+            assert item.code == expected_code
+            if expected_names is not None:
+                assert item.item.business_entity_id is not None
+                assert (item.item.first_name, item.item.last_name) == expected_names
+                assert item.message is None
+            else:
+                assert item.item is None
+                assert item.message.code == expected_code
+                assert item.message.description.startswith(expected_description)
+        assert person_provider.count_persons() == expected_persons_count
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("max_operations, operations_count, expected_message", [
+    (2, 3, ResponseMessage(title="Limit exceeded.",
+                           description=f"{E400BadRequest.LIMIT_EXCEEDED}: "
+                                       f"Batch of 3 operations exceeds the maximum of 2 operations.",
+                           code=status.HTTP_400_BAD_REQUEST)),
+    (0, 1, ResponseMessage(title="Limit exceeded.",
+                           description=f"{E400BadRequest.LIMIT_EXCEEDED}: "
+                                       f"Batch of 1 operations exceeds the maximum of 0 operations.",
+                           code=status.HTTP_400_BAD_REQUEST))
+])
+def test_batch_persons_should_return_400_response(client, monkeypatch,
+                                                  max_operations: int, operations_count: int,
+                                                  expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_nonreadonly_user)
+        access_token = obtain_access_token(client, awfapi_nonreadonly_user)
+        batch_config = BatchConfig(max_operations=max_operations)
+        monkeypatch.setattr(BatchConfig, "from_json", staticmethod(lambda: batch_config))
+        person_operations = list(map(lambda i: {'operation': "delete", 'person_id': i + 2}, range(operations_count)))
+
+        # Act
+        response = client.post("/batch_persons", json=person_operations,
+                               headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+        assert person_provider.count_persons() == len(persons_db)
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
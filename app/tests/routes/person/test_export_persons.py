@@ -0,0 +1,212 @@
+import csv
+import io
+import json
+import pytest
+from typing import Optional, List
+from starlette.testclient import TestClient
+from fastapi import status
+from pytest import MonkeyPatch
+
+from app.models import (ResponseMessage, AWFAPIRegisteredUser, EOrderType, EExportFormat, PersonInput, Person,
+                        E400BadRequest)
+from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory,
+                           PersonFactory)
+
+from app.routes import jwt_authentication as jwt_authentication_routes
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import person as person_routes
+from app import oauth2_handlers
+
+from app.tests.fixtures.fixtures_entry_lists import awfapi_nonreadonly_user, awfapi_readonly_user, persons_db
+from app.tests.fixtures.fixtures_tests import (register_test_user, obtain_access_token, insert_test_persons,
+                                               create_tables, drop_tables, drop_collection)
+
+
+mongodb_connection_string, mongodb_collection_name, mongodb_engine = MongoDBFactory.get_db_connection_details(test_suffix="_test")
+awfapi_user_provider, awfapi_user_service = AWFAPIUserFactory.get_provider_and_service(mongodb_connection_string, mongodb_collection_name, mongodb_engine)
+jwt_authentication_service = JWTAuthenticationFactory.get_service(awfapi_user_provider, awfapi_user_service)
+
+postgresdb_connection_string, postgresdb_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_test")
+person_provider = PersonFactory.get_provider(postgresdb_connection_string, postgresdb_engine)
+
+
+@pytest.fixture()
+def client():
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def fixtures_before_test(monkeypatch: MonkeyPatch) -> None:
+    create_tables(postgresdb_engine)
+
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_provider', awfapi_user_provider)
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_service', awfapi_user_service)
+    monkeypatch.setattr(jwt_authentication_routes, 'jwt_auth_service', jwt_authentication_service)
+    monkeypatch.setattr(oauth2_handlers, 'jwt_auth_service', jwt_authentication_service)
+
+    monkeypatch.setattr(person_routes, 'person_provider', person_provider)
+
+    insert_test_persons(postgresdb_engine, postgresdb_connection_string)
+
+
+def fixtures_after_test() -> None:
+    drop_collection(mongodb_engine, mongodb_collection_name)
+    drop_tables(postgresdb_engine)
+
+
+@pytest.mark.parametrize("awfapi_registered_user, filters, order_by, order_type, expected_persons", [
+    (awfapi_nonreadonly_user, None, None, "asc", persons_db),
+    (awfapi_readonly_user, "person_type:GC", None, "asc", [persons_db[0], persons_db[5]]),
+    (awfapi_readonly_user, "first_name_phrase:john", "full_name", "asc",
+     [persons_db[4], persons_db[3], persons_db[2], persons_db[0], persons_db[1]]),
+    (awfapi_readonly_user, "first_name_phrase:ahn", None, "asc", [])
+])
+def test_export_persons_should_return_200_response_of_ndjson(client, monkeypatch,
+                                                             awfapi_registered_user: AWFAPIRegisteredUser,
+                                                             filters: Optional[str],
+                                                             order_by: Optional[str], order_type: Optional[EOrderType],
+                                                             expected_persons: List[PersonInput]) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_registered_user)
+        access_token = obtain_access_token(client, awfapi_registered_user)
+
+        # Act
+        response = client.get("/export_persons",
+                              params={'filters': filters, 'order_by': order_by, 'order_type': order_type,
+                                      'export_format': EExportFormat.NDJSON.value},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert response.headers["content-disposition"] == "attachment; filename=\"persons.ndjson\""
+        persons = list(map(lambda line: Person(**json.loads(line)),
+                           filter(lambda line: line != "", response.text.split("\n"))))
+        assert len(persons) == len(expected_persons)
+        for p, ep in zip(persons, expected_persons):
+            assert p.business_entity_id is not None
+            assert p.person_type == ep.person_type
+            assert p.first_name == ep.first_name
+            assert p.middle_name == ep.middle_name
+            assert p.last_name == ep.last_name
+            assert p.rowguid is not None
+            assert p.modified_date is not None
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("filters, fields, expected_columns, expected_persons", [
+    ("person_type:GC", None, list(Person.__fields__.keys()), [persons_db[0], persons_db[5]]),
+    ("person_type:GC", "last_name,first_name", ["business_entity_id", "last_name", "first_name"],
+     [persons_db[0], persons_db[5]]),
+    ("person_type:GC", "first_name,business_entity_id,last_name", ["business_entity_id", "first_name", "last_name"],
+     [persons_db[0], persons_db[5]]),
+    ("person_type:GC", "-additional_contact_info,-demographics",
+     list(filter(lambda f: f not in ["additional_contact_info", "demographics"], Person.__fields__.keys())),
+     [persons_db[0], persons_db[5]]),
+    ("first_name_phrase:ahn", "last_name,first_name", ["business_entity_id", "last_name", "first_name"], [])
+])
+def test_export_persons_should_return_200_response_of_csv(client, monkeypatch,
+                                                          filters: Optional[str], fields: Optional[str],
+                                                          expected_columns: List[str],
+                                                          expected_persons: List[PersonInput]) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+
+        # Act
+        response = client.get("/export_persons",
+                              params={'filters': filters, 'fields': fields,
+                                      'export_format': EExportFormat.CSV.value},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.headers["content-disposition"] == "attachment; filename=\"persons.csv\""
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0] == expected_columns
+        rows = list(map(lambda r: dict(zip(expected_columns, r)), rows[1:]))
+        assert len(rows) == len(expected_persons)
+        for row, ep in zip(rows, expected_persons):
+            assert row["business_entity_id"] != ""
+            assert row["first_name"] == ep.first_name
+            assert row["last_name"] == ep.last_name
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("export_format, filters, order_by, fields, expected_message", [
+    (EExportFormat.NDJSON, "pers_type:GC", None, None,
+     ResponseMessage(title="Non-existing fields in filter string.",
+                     description=f"{E400BadRequest.INVALID_FIELDS_IN_FILTER_STRING}: "
+                                 f"Filter string contains fields: '['pers_type']' some of which "
+                                 f"do not exist in person filtering fields: "
+                                 f"['person_type', 'first_name_phrase', 'last_name_phrase'].",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (EExportFormat.CSV, "person_type", None, None,
+     ResponseMessage(title="Invalid filter string.",
+                     description=f"{E400BadRequest.INVALID_FILTER_STRING}: "
+                                 f"Invalid filter string: person_type.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (EExportFormat.CSV, None, "name", None,
+     ResponseMessage(title="Non-existing column for ordering.",
+                     description=f"{E400BadRequest.INVALID_ORDERING_COLUMN_NAME}: "
+                                 f"Column does not exist in persons view ('name').",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (EExportFormat.NDJSON, None, "demographics", None,
+     ResponseMessage(title="Unsupported ordering for this data type.",
+                     description=f"{E400BadRequest.ORDERING_NOT_SUPPORTED_FOR_COLUMN}: "
+                                 f"Cannot order by column 'demographics'. "
+                                 f"PostgreSQL does not support ordering for 'xml' data type.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (EExportFormat.CSV, None, None, "first_name,-last_name",
+     ResponseMessage(title="Invalid fields string.",
+                     description=f"{E400BadRequest.INVALID_FIELDS_STRING}: "
+                                 f"Fields string 'first_name,-last_name' cannot both include and exclude fields.",
+                     code=status.HTTP_400_BAD_REQUEST))
+])
+def test_export_persons_should_return_400_response(client, monkeypatch,
+                                                   export_format: EExportFormat,
+                                                   filters: Optional[str], order_by: Optional[str],
+                                                   fields: Optional[str],
+                                                   expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+
+        # Act
+        response = client.get("/export_persons",
+                              params={'filters': filters, 'order_by': order_by, 'fields': fields,
+                                      'export_format': export_format.value},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.headers["content-type"].startswith("application/json")
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
@@ -0,0 +1,216 @@
+import pytest
+from typing import Optional, List
+from starlette.testclient import TestClient
+from fastapi import status
+from pytest import MonkeyPatch
+
+from app.models import (ResponseMessage, AWFAPIRegisteredUser, Person, PersonPhone, PhoneNumberType,
+                        E400BadRequest, E401Unauthorized, E404NotFound)
+from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory,
+                           PersonFactory, PersonPhoneFactory)
+
+from app.routes import jwt_authentication as jwt_authentication_routes
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import person as person_routes
+from app import oauth2_handlers
+
+from app.tests.fixtures.fixtures_entry_lists import (awfapi_nonreadonly_user, awfapi_readonly_user, persons_db,
+                                                     person_phones_db)
+from app.tests.fixtures.fixtures_tests import (register_test_user, obtain_access_token,
+                                               insert_test_persons, insert_test_phone_number_types,
+                                               insert_test_person_phones,
+                                               create_tables, drop_tables, drop_collection)
+
+
+mongodb_connection_string, mongodb_collection_name, mongodb_engine = MongoDBFactory.get_db_connection_details(test_suffix="_test")
+awfapi_user_provider, awfapi_user_service = AWFAPIUserFactory.get_provider_and_service(mongodb_connection_string, mongodb_collection_name, mongodb_engine)
+jwt_authentication_service = JWTAuthenticationFactory.get_service(awfapi_user_provider, awfapi_user_service)
+
+postgresdb_connection_string, postgresdb_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_test")
+person_provider = PersonFactory.get_provider(postgresdb_connection_string, postgresdb_engine)
+person_phone_provider, person_phone_service = PersonPhoneFactory.get_provider_and_service(postgresdb_connection_string, postgresdb_engine)
+
+
+@pytest.fixture()
+def client():
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def fixtures_before_test(monkeypatch: MonkeyPatch) -> List[int]:
+    create_tables(postgresdb_engine)
+
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_provider', awfapi_user_provider)
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_service', awfapi_user_service)
+    monkeypatch.setattr(jwt_authentication_routes, 'jwt_auth_service', jwt_authentication_service)
+    monkeypatch.setattr(oauth2_handlers, 'jwt_auth_service', jwt_authentication_service)
+
+    monkeypatch.setattr(person_routes, 'person_provider', person_provider)
+    monkeypatch.setattr(person_routes, 'person_phone_service', person_phone_service)
+
+    person_ids = insert_test_persons(postgresdb_engine, postgresdb_connection_string)
+    insert_test_phone_number_types(postgresdb_engine, postgresdb_connection_string)
+    insert_test_person_phones(postgresdb_engine, postgresdb_connection_string)
+    return person_ids
+
+
+def fixtures_after_test() -> None:
+    drop_collection(mongodb_engine, mongodb_collection_name)
+    drop_tables(postgresdb_engine)
+
+
+def get_expected_phone_numbers(person_id: int) -> List[str]:
+    return sorted(map(lambda pp: pp.phone_number,
+                      filter(lambda pp: pp.business_entity_id == person_id, person_phones_db)))
+
+
+@pytest.mark.parametrize("awfapi_registered_user, person_index, fields, expected_phones_count", [
+    (awfapi_nonreadonly_user, 0, None, 3),
+    (awfapi_readonly_user, 4, None, 2),
+    (awfapi_readonly_user, 3, None, 1),
+    (awfapi_readonly_user, 1, None, 0),
+    (awfapi_readonly_user, 0, "first_name,last_name", 3),
+    (awfapi_readonly_user, 4, "-additional_contact_info,-demographics", 2)
+])
+def test_get_person_with_phones_should_return_200_response(client, monkeypatch,
+                                                           awfapi_registered_user: AWFAPIRegisteredUser,
+                                                           person_index: int, fields: Optional[str],
+                                                           expected_phones_count: int) -> None:
+    try:
+        # Arrange
+        person_ids = fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_registered_user)
+        access_token = obtain_access_token(client, awfapi_registered_user)
+        person_id = person_ids[person_index]
+
+        # Act
+        response = client.get(f"/get_person_with_phones/{person_id}", params={'fields': fields},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        response_dict = response.json()
+        assert response_dict['person']['business_entity_id'] == person_id
+        assert response_dict['person']['first_name'] == persons_db[person_index].first_name
+        assert response_dict['person']['last_name'] == persons_db[person_index].last_name
+        if fields == "first_name,last_name":
+            assert response_dict['person'].get('person_type') is None
+        else:
+            assert response_dict['person']['person_type'] == persons_db[person_index].person_type
+        if fields is not None:
+            assert response_dict['person'].get('demographics') is None
+
+        assert len(response_dict['person_phones']) == expected_phones_count
+        person_phones = list(map(lambda pp: (PersonPhone(**pp[0]), PhoneNumberType(**pp[1])),
+                                 response_dict['person_phones']))
+        assert list(map(lambda pp: pp[0].phone_number, person_phones)) == get_expected_phone_numbers(person_id)
+        for pp, pnt in person_phones:
+            assert pp.business_entity_id == person_id
+            assert pnt.phone_number_type_id == pp.phone_number_type_id
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("fields, expected_message", [
+    ("first_name,-last_name",
+     ResponseMessage(title="Invalid fields string.",
+                     description=f"{E400BadRequest.INVALID_FIELDS_STRING}: "
+                                 f"Fields string 'first_name,-last_name' cannot both include and exclude fields.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    ("first_name,name",
+     ResponseMessage(title="Invalid fields string.",
+                     description=f"{E400BadRequest.INVALID_FIELDS_STRING}: "
+                                 f"Fields string contains fields: '['name']' "
+                                 f"which do not exist in person fields: {list(Person.__fields__.keys())}.",
+                     code=status.HTTP_400_BAD_REQUEST))
+])
+def test_get_person_with_phones_should_return_400_response(client, monkeypatch,
+                                                           fields: str, expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        person_ids = fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+
+        # Act
+        response = client.get(f"/get_person_with_phones/{person_ids[0]}", params={'fields': fields},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("person_id, expected_message", [
+    (-1,
+     ResponseMessage(title="Entity 'Person' of id '-1' not found.",
+                     description=f"{E404NotFound.PERSON_NOT_FOUND}: Person of id '-1' does not exist.",
+                     code=status.HTTP_404_NOT_FOUND))
+])
+def test_get_person_with_phones_should_return_404_response(client, monkeypatch,
+                                                           person_id: int, expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+
+        # Act
+        response = client.get(f"/get_person_with_phones/{person_id}",
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("expected_message", [
+    ResponseMessage(title="JWT token not provided or wrong encoded.",
+                    description=f"{E401Unauthorized.INVALID_JWT_TOKEN}: "
+                                f"User did not provide or the JWT token is wrongly encoded.",
+                    code=status.HTTP_401_UNAUTHORIZED)
+])
+def test_get_person_with_phones_should_return_401_response(client, monkeypatch,
+                                                           expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        person_ids = fixtures_before_test(monkeypatch)
+
+        # Act
+        response = client.get(f"/get_person_with_phones/{person_ids[0]}")
+
+        # Assert
+        message = ResponseMessage(**response.json())
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
@@ -0,0 +1,137 @@
+import pytest
+from typing import List, Optional
+from starlette.testclient import TestClient
+from fastapi import status
+from pytest import MonkeyPatch
+
+from app.config import BatchConfig
+from app.models import (ResponseMessage, AWFAPIRegisteredUser, PersonInput, Person,
+                        E400BadRequest)
+from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory,
+                           PersonFactory)
+
+from app.routes import jwt_authentication as jwt_authentication_routes
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import person as person_routes
+from app import oauth2_handlers
+
+from app.tests.fixtures.fixtures_entry_lists import awfapi_nonreadonly_user, awfapi_readonly_user, persons_db
+from app.tests.fixtures.fixtures_tests import (register_test_user, obtain_access_token, insert_test_persons,
+                                               create_tables, drop_tables, drop_collection)
+
+
+mongodb_connection_string, mongodb_collection_name, mongodb_engine = MongoDBFactory.get_db_connection_details(test_suffix="_test")
+awfapi_user_provider, awfapi_user_service = AWFAPIUserFactory.get_provider_and_service(mongodb_connection_string, mongodb_collection_name, mongodb_engine)
+jwt_authentication_service = JWTAuthenticationFactory.get_service(awfapi_user_provider, awfapi_user_service)
+
+postgresdb_connection_string, postgresdb_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_test")
+person_provider = PersonFactory.get_provider(postgresdb_connection_string, postgresdb_engine)
+
+
+@pytest.fixture()
+def client():
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def fixtures_before_test(monkeypatch: MonkeyPatch) -> None:
+    create_tables(postgresdb_engine)
+
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_provider', awfapi_user_provider)
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_service', awfapi_user_service)
+    monkeypatch.setattr(jwt_authentication_routes, 'jwt_auth_service', jwt_authentication_service)
+    monkeypatch.setattr(oauth2_handlers, 'jwt_auth_service', jwt_authentication_service)
+
+    monkeypatch.setattr(person_routes, 'person_provider', person_provider)
+
+    insert_test_persons(postgresdb_engine, postgresdb_connection_string)
+
+
+def fixtures_after_test() -> None:
+    drop_collection(mongodb_engine, mongodb_collection_name)
+    drop_tables(postgresdb_engine)
+
+
+@pytest.mark.parametrize("awfapi_registered_user, person_ids, expected_persons", [
+    (awfapi_nonreadonly_user, [1, 2, 3], [persons_db[0], persons_db[1], persons_db[2]]),
+    (awfapi_readonly_user, [10, 4, 7], [persons_db[9], persons_db[3], persons_db[6]]),
+    (awfapi_readonly_user, [3, 99, 1, 3], [persons_db[2], None, persons_db[0], persons_db[2]]),
+    (awfapi_readonly_user, [11, 12], [None, None])
+])
+def test_get_persons_by_ids_should_return_200_response(client, monkeypatch,
+                                                       awfapi_registered_user: AWFAPIRegisteredUser,
+                                                       person_ids: List[int],
+                                                       expected_persons: List[Optional[PersonInput]]) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_registered_user)
+        access_token = obtain_access_token(client, awfapi_registered_user)
+
+        # Act
+        response = client.get("/get_persons_by_ids", params={'person_ids': person_ids},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        response_list = response.json()
+        assert len(response_list) == len(expected_persons)
+        for person_id, rd, ep in zip(person_ids, response_list, expected_persons):
+            if ep is None:
+                assert rd is None
+                continue
+            p = Person(**rd)
+            assert p.business_entity_id == person_id
+            assert p.person_type == ep.person_type
+            assert p.first_name == ep.first_name
+            assert p.middle_name == ep.middle_name
+            assert p.last_name == ep.last_name
+            assert p.rowguid is not None
+            assert p.modified_date is not None
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("max_ids, person_ids, expected_message", [
+    (2, [1, 2, 3],
+     ResponseMessage(title="Limit exceeded.",
+                     description=f"{E400BadRequest.LIMIT_EXCEEDED}: List of 3 ids exceeds the maximum of 2 ids.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (2, [99, 99, 99, 99],
+     ResponseMessage(title="Limit exceeded.",
+                     description=f"{E400BadRequest.LIMIT_EXCEEDED}: List of 4 ids exceeds the maximum of 2 ids.",
+                     code=status.HTTP_400_BAD_REQUEST))
+])
+def test_get_persons_by_ids_should_return_400_response(client, monkeypatch,
+                                                       max_ids: int, person_ids: List[int],
+                                                       expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+        batch_config = BatchConfig(max_ids=max_ids)
+        monkeypatch.setattr(BatchConfig, "from_json", staticmethod(lambda: batch_config))
+
+        # Act
+        response = client.get("/get_persons_by_ids", params={'person_ids': person_ids},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
@@ -0,0 +1,250 @@
+import pytest
+from typing import Optional, List
+from starlette.testclient import TestClient
+from fastapi import status
+from pytest import MonkeyPatch
+
+from app.models import (ResponseMessage, AWFAPIRegisteredUser, EOrderType, PersonInput, Person, ListCountMessage,
+                        E400BadRequest, E401Unauthorized)
+from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory,
+                           PersonFactory)
+
+from app.routes import jwt_authentication as jwt_authentication_routes
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import person as person_routes
+from app import oauth2_handlers
+
+from app.tests.fixtures.fixtures_entry_lists import awfapi_nonreadonly_user, awfapi_readonly_user, persons_db
+from app.tests.fixtures.fixtures_tests import (register_test_user, obtain_access_token, insert_test_persons,
+                                               create_tables, drop_tables, drop_collection)
+
+
+mongodb_connection_string, mongodb_collection_name, mongodb_engine = MongoDBFactory.get_db_connection_details(test_suffix="_test")
+awfapi_user_provider, awfapi_user_service = AWFAPIUserFactory.get_provider_and_service(mongodb_connection_string, mongodb_collection_name, mongodb_engine)
+jwt_authentication_service = JWTAuthenticationFactory.get_service(awfapi_user_provider, awfapi_user_service)
+
+postgresdb_connection_string, postgresdb_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_test")
+person_provider = PersonFactory.get_provider(postgresdb_connection_string, postgresdb_engine)
+
+
+@pytest.fixture()
+def client():
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def fixtures_before_test(monkeypatch: MonkeyPatch) -> None:
+    create_tables(postgresdb_engine)
+
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_provider', awfapi_user_provider)
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_service', awfapi_user_service)
+    monkeypatch.setattr(jwt_authentication_routes, 'jwt_auth_service', jwt_authentication_service)
+    monkeypatch.setattr(oauth2_handlers, 'jwt_auth_service', jwt_authentication_service)
+
+    monkeypatch.setattr(person_routes, 'person_provider', person_provider)
+
+    insert_test_persons(postgresdb_engine, postgresdb_connection_string)
+
+
+def fixtures_after_test() -> None:
+    drop_collection(mongodb_engine, mongodb_collection_name)
+    drop_tables(postgresdb_engine)
+
+
+@pytest.mark.parametrize("awfapi_registered_user, filters, order_by, order_type, offset, limit, "
+                         "expected_count, expected_persons", [
+    (awfapi_nonreadonly_user, None, None, "asc", 0, 3, 10, [persons_db[0], persons_db[1], persons_db[2]]),
+    (awfapi_readonly_user, None, None, "asc", 9, 3, 10, [persons_db[9]]),
+    (awfapi_readonly_user, "person_type:GC", None, "asc", 0, 10, 2, [persons_db[0], persons_db[5]]),
+    (awfapi_readonly_user, "first_name_phrase:john", "full_name", "asc", 1, 2, 5, [persons_db[3], persons_db[2]]),
+    (awfapi_readonly_user, "first_name_phrase:john", "full_name", "asc", 10, 2, 5, []),
+    (awfapi_readonly_user, "last_name_phrase:xyz", None, "asc", 0, 10, 0, [])
+])
+def test_get_persons_with_count_should_return_200_response(client, monkeypatch,
+                                                           awfapi_registered_user: AWFAPIRegisteredUser,
+                                                           filters: Optional[str],
+                                                           order_by: Optional[str], order_type: Optional[EOrderType],
+                                                           offset: int, limit: int, expected_count: int,
+                                                           expected_persons: List[PersonInput]) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_registered_user)
+        access_token = obtain_access_token(client, awfapi_registered_user)
+        params = {'filters': filters, 'order_by': order_by, 'order_type': order_type, 'offset': offset, 'limit': limit}
+
+        # Act
+        response = client.get("/get_persons_with_count", params=params,
+                              headers={'Authorization': f"Bearer {access_token}"})
+        total_count_response = client.get("/get_persons", params=dict(params, is_total_count=True),
+                                          headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        list_count_message = ListCountMessage[Person](**response.json())
+        assert list_count_message.entity == "Person"
+        assert list_count_message.count == expected_count
+        assert len(list_count_message.items) == len(expected_persons)
+        for p, ep in zip(list_count_message.items, expected_persons):
+            assert p.business_entity_id is not None
+            assert p.person_type == ep.person_type
+            assert p.first_name == ep.first_name
+            assert p.middle_name == ep.middle_name
+            assert p.last_name == ep.last_name
+
+        assert total_count_response.status_code == status.HTTP_200_OK
+        assert total_count_response.headers["X-Total-Count"] == str(expected_count)
+        assert list(map(lambda rd: rd['business_entity_id'], total_count_response.json())) == \
+               list(map(lambda p: p.business_entity_id, list_count_message.items))
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("filters, fields, expected_fields, expected_count, expected_persons", [
+    ("person_type:GC", "first_name,last_name", ["business_entity_id", "first_name", "last_name"], 2,
+     [persons_db[0], persons_db[5]]),
+    ("person_type:GC", "-additional_contact_info,-demographics",
+     list(filter(lambda f: f not in ["additional_contact_info", "demographics"], Person.__fields__.keys())), 2,
+     [persons_db[0], persons_db[5]]),
+    (None, "", list(Person.__fields__.keys()), 10, [persons_db[0], persons_db[1], persons_db[2]])
+])
+def test_get_persons_with_count_should_return_projected_persons(client, monkeypatch,
+                                                                filters: Optional[str], fields: str,
+                                                                expected_fields: List[str], expected_count: int,
+                                                                expected_persons: List[PersonInput]) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+
+        # Act
+        response = client.get("/get_persons_with_count",
+                              params={'filters': filters, 'fields': fields, 'offset': 0, 'limit': 3},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        response_dict = response.json()
+        assert response_dict['count'] == expected_count
+        assert len(response_dict['items']) == len(expected_persons)
+        for rd, ep in zip(response_dict['items'], expected_persons):
+            assert rd['business_entity_id'] is not None
+            assert rd['first_name'] == ep.first_name
+            assert rd['last_name'] == ep.last_name
+            for f in Person.__fields__.keys():
+                if f not in expected_fields:
+                    assert rd.get(f) is None
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("filters, order_by, order_type, offset, limit, fields, expected_message", [
+    (None, None, "asc", -1, 0, None,
+     ResponseMessage(title="Invalid value for SQL clause.",
+                     description=f"{E400BadRequest.INVALID_SQL_VALUE}: Value '-1' is invalid for SKIP clause.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (None, None, "asc", 0, -1, None,
+     ResponseMessage(title="Invalid value for SQL clause.",
+                     description=f"{E400BadRequest.INVALID_SQL_VALUE}: Value '-1' is invalid for LIMIT clause.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    ("pers_type:GC", None, "asc", 0, 0, None,
+     ResponseMessage(title="Non-existing fields in filter string.",
+                     description=f"{E400BadRequest.INVALID_FIELDS_IN_FILTER_STRING}: "
+                                 f"Filter string contains fields: '['pers_type']' some of which "
+                                 f"do not exist in person filtering fields: "
+                                 f"['person_type', 'first_name_phrase', 'last_name_phrase'].",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    ("person_type", None, "asc", 0, 0, None,
+     ResponseMessage(title="Invalid filter string.",
+                     description=f"{E400BadRequest.INVALID_FILTER_STRING}: "
+                                 f"Invalid filter string: person_type.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (None, "name", "asc", 0, 0, None,
+     ResponseMessage(title="Non-existing column for ordering.",
+                     description=f"{E400BadRequest.INVALID_ORDERING_COLUMN_NAME}: "
+                                 f"Column does not exist in persons view ('name').",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (None, None, "asc", 0, 10, "first_name,-last_name",
+     ResponseMessage(title="Invalid fields string.",
+                     description=f"{E400BadRequest.INVALID_FIELDS_STRING}: "
+                                 f"Fields string 'first_name,-last_name' cannot both include and exclude fields.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (None, None, "asc", 0, 10, "first_name,name",
+     ResponseMessage(title="Invalid fields string.",
+                     description=f"{E400BadRequest.INVALID_FIELDS_STRING}: "
+                                 f"Fields string contains fields: '['name']' "
+                                 f"which do not exist in person fields: {list(Person.__fields__.keys())}.",
+                     code=status.HTTP_400_BAD_REQUEST))
+])
+def test_get_persons_with_count_should_return_400_response(client, monkeypatch,
+                                                           filters: Optional[str],
+                                                           order_by: Optional[str], order_type: Optional[EOrderType],
+                                                           offset: int, limit: int, fields: Optional[str],
+                                                           expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+        params = {'filters': filters, 'order_by': order_by, 'order_type': order_type,
+                  'offset': offset, 'limit': limit, 'fields': fields}
+
+        # Act
+        response = client.get("/get_persons_with_count", params=params,
+                              headers={'Authorization': f"Bearer {access_token}"})
+        total_count_response = client.get("/get_persons", params=dict(params, is_total_count=True),
+                                          headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        for r in [response, total_count_response]:
+            assert r.status_code == status.HTTP_400_BAD_REQUEST
+            assert "X-Total-Count" not in r.headers
+            message = ResponseMessage(**r.json()['detail'])
+            assert message.title == expected_message.title
+            assert message.description == expected_message.description
+            assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("expected_message", [
+    ResponseMessage(title="JWT token not provided or wrong encoded.",
+                    description=f"{E401Unauthorized.INVALID_JWT_TOKEN}: "
+                                f"User did not provide or the JWT token is wrongly encoded.",
+                    code=status.HTTP_401_UNAUTHORIZED)
+])
+def test_get_persons_with_count_should_return_401_response(client, monkeypatch,
+                                                           expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+
+        # Act
+        response = client.get("/get_persons_with_count")
+
+        # Assert
+        message = ResponseMessage(**response.json())
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
@@ -0,0 +1,199 @@
+import pytest
+from typing import Optional, List
+from starlette.testclient import TestClient
+from fastapi import status
+from pytest import MonkeyPatch
+
+from app.models import (ResponseMessage, AWFAPIRegisteredUser, Person, PersonPhone, PhoneNumberType,
+                        E400BadRequest, E401Unauthorized)
+from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory,
+                           PersonFactory, PersonPhoneFactory)
+
+from app.routes import jwt_authentication as jwt_authentication_routes
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import person as person_routes
+from app import oauth2_handlers
+
+from app.tests.fixtures.fixtures_entry_lists import (awfapi_nonreadonly_user, awfapi_readonly_user, persons_db,
+                                                     person_phones_db)
+from app.tests.fixtures.fixtures_tests import (register_test_user, obtain_access_token,
+                                               insert_test_persons, insert_test_phone_number_types,
+                                               insert_test_person_phones,
+                                               create_tables, drop_tables, drop_collection)
+
+
+mongodb_connection_string, mongodb_collection_name, mongodb_engine = MongoDBFactory.get_db_connection_details(test_suffix="_test")
+awfapi_user_provider, awfapi_user_service = AWFAPIUserFactory.get_provider_and_service(mongodb_connection_string, mongodb_collection_name, mongodb_engine)
+jwt_authentication_service = JWTAuthenticationFactory.get_service(awfapi_user_provider, awfapi_user_service)
+
+postgresdb_connection_string, postgresdb_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_test")
+person_provider = PersonFactory.get_provider(postgresdb_connection_string, postgresdb_engine)
+person_phone_provider, person_phone_service = PersonPhoneFactory.get_provider_and_service(postgresdb_connection_string, postgresdb_engine)
+
+
+@pytest.fixture()
+def client():
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def fixtures_before_test(monkeypatch: MonkeyPatch) -> List[int]:
+    create_tables(postgresdb_engine)
+
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_provider', awfapi_user_provider)
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_service', awfapi_user_service)
+    monkeypatch.setattr(jwt_authentication_routes, 'jwt_auth_service', jwt_authentication_service)
+    monkeypatch.setattr(oauth2_handlers, 'jwt_auth_service', jwt_authentication_service)
+
+    monkeypatch.setattr(person_routes, 'person_provider', person_provider)
+    monkeypatch.setattr(person_routes, 'person_phone_service', person_phone_service)
+
+    person_ids = insert_test_persons(postgresdb_engine, postgresdb_connection_string)
+    insert_test_phone_number_types(postgresdb_engine, postgresdb_connection_string)
+    insert_test_person_phones(postgresdb_engine, postgresdb_connection_string)
+    return person_ids
+
+
+def fixtures_after_test() -> None:
+    drop_collection(mongodb_engine, mongodb_collection_name)
+    drop_tables(postgresdb_engine)
+
+
+def get_expected_phone_numbers(person_id: int) -> List[str]:
+    return sorted(map(lambda pp: pp.phone_number,
+                      filter(lambda pp: pp.business_entity_id == person_id, person_phones_db)))
+
+
+@pytest.mark.parametrize("awfapi_registered_user, filters, offset, limit, fields, expected_person_indices, "
+                         "expected_phones_counts", [
+    (awfapi_nonreadonly_user, None, 0, 5, None, [0, 1, 2, 3, 4], [3, 0, 0, 1, 2]),
+    (awfapi_readonly_user, None, 5, 5, None, [5, 6, 7, 8, 9], [0, 1, 1, 0, 0]),
+    (awfapi_readonly_user, "person_type:GC", 0, 10, None, [0, 5], [3, 0]),
+    (awfapi_readonly_user, "person_type:GC", 0, 10, "first_name,last_name", [0, 5], [3, 0]),
+    (awfapi_readonly_user, "last_name_phrase:xyz", 0, 10, None, [], [])
+])
+def test_get_persons_with_phones_should_return_200_response(client, monkeypatch,
+                                                            awfapi_registered_user: AWFAPIRegisteredUser,
+                                                            filters: Optional[str], offset: int, limit: int,
+                                                            fields: Optional[str],
+                                                            expected_person_indices: List[int],
+                                                            expected_phones_counts: List[int]) -> None:
+    try:
+        # Arrange
+        person_ids = fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_registered_user)
+        access_token = obtain_access_token(client, awfapi_registered_user)
+
+        # Act
+        response = client.get("/get_persons_with_phones",
+                              params={'filters': filters, 'offset': offset, 'limit': limit, 'fields': fields},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        response_list = response.json()
+        assert len(response_list) == len(expected_person_indices)
+        for rd, epi, epc in zip(response_list, expected_person_indices, expected_phones_counts):
+            assert rd['person']['business_entity_id'] == person_ids[epi]
+            assert rd['person']['first_name'] == persons_db[epi].first_name
+            assert rd['person']['last_name'] == persons_db[epi].last_name
+            if fields is not None:
+                assert rd['person'].get('person_type') is None
+            else:
+                assert rd['person']['person_type'] == persons_db[epi].person_type
+
+            assert len(rd['person_phones']) == epc
+            person_phones = list(map(lambda pp: (PersonPhone(**pp[0]), PhoneNumberType(**pp[1])), rd['person_phones']))
+            assert list(map(lambda pp: pp[0].phone_number, person_phones)) == get_expected_phone_numbers(person_ids[epi])
+            for pp, pnt in person_phones:
+                assert pp.business_entity_id == person_ids[epi]
+                assert pnt.phone_number_type_id == pp.phone_number_type_id
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("filters, offset, limit, fields, expected_message", [
+    (None, -1, 0, None,
+     ResponseMessage(title="Invalid value for SQL clause.",
+                     description=f"{E400BadRequest.INVALID_SQL_VALUE}: Value '-1' is invalid for SKIP clause.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    ("pers_type:GC", 0, 10, None,
+     ResponseMessage(title="Non-existing fields in filter string.",
+                     description=f"{E400BadRequest.INVALID_FIELDS_IN_FILTER_STRING}: "
+                                 f"Filter string contains fields: '['pers_type']' some of which "
+                                 f"do not exist in person filtering fields: "
+                                 f"['person_type', 'first_name_phrase', 'last_name_phrase'].",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (None, 0, 10, "first_name,-last_name",
+     ResponseMessage(title="Invalid fields string.",
+                     description=f"{E400BadRequest.INVALID_FIELDS_STRING}: "
+                                 f"Fields string 'first_name,-last_name' cannot both include and exclude fields.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (None, 0, 10, "first_name,name",
+     ResponseMessage(title="Invalid fields string.",
+                     description=f"{E400BadRequest.INVALID_FIELDS_STRING}: "
+                                 f"Fields string contains fields: '['name']' "
+                                 f"which do not exist in person fields: {list(Person.__fields__.keys())}.",
+                     code=status.HTTP_400_BAD_REQUEST))
+])
+def test_get_persons_with_phones_should_return_400_response(client, monkeypatch,
+                                                            filters: Optional[str], offset: int, limit: int,
+                                                            fields: Optional[str],
+                                                            expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+
+        # Act
+        response = client.get("/get_persons_with_phones",
+                              params={'filters': filters, 'offset': offset, 'limit': limit, 'fields': fields},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("expected_message", [
+    ResponseMessage(title="JWT token not provided or wrong encoded.",
+                    description=f"{E401Unauthorized.INVALID_JWT_TOKEN}: "
+                                f"User did not provide or the JWT token is wrongly encoded.",
+                    code=status.HTTP_401_UNAUTHORIZED)
+])
+def test_get_persons_with_phones_should_return_401_response(client, monkeypatch,
+                                                            expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+
+        # Act
+        response = client.get("/get_persons_with_phones")
+
+        # Assert
+        message = ResponseMessage(**response.json())
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
@@ -1,11 +1,13 @@
+import json
 import pytest
 from typing import Optional, List
 from starlette.testclient import TestClient
 from fastapi import status
 from pytest import MonkeyPatch
 
-from app.models import (ResponseMessage, PersonInput, Person,
+from app.models import (ResponseMessage, EPersonType, PersonInput, Person,
                         E400BadRequest, E404NotFound)
+from app.config import PersonSearchConfig
 from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory,
                            PersonFactory)
 
@@ -94,6 +96,169 @@ def test_search_by_phrases_should_return_200_response(client, monkeypatch,
         fixtures_after_test()
 
 
+@pytest.mark.parametrize("first_name_phrase, last_name_phrase, default_limit, expected_persons", [
+    ("", "smi", 3, [persons_db[1], persons_db[6], persons_db[8]]),
+    ("ron", "", 2, [persons_db[6], persons_db[7]]),
+    ("ria", "", 3, [persons_db[5]])
+])
+def test_search_by_phrases_should_return_200_response_of_default_limit(client, monkeypatch,
+                                                                       first_name_phrase: Optional[str],
+                                                                       last_name_phrase: Optional[str],
+                                                                       default_limit: int,
+                                                                       expected_persons: List[PersonInput]) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        person_search_config = PersonSearchConfig(default_limit=default_limit)
+        monkeypatch.setattr(PersonSearchConfig, "from_json", staticmethod(lambda: person_search_config))
+
+        # Act
+        response = client.get("/search_by_phrases",
+                              params={'first_name_phrase': first_name_phrase,
+                                      'last_name_phrase': last_name_phrase,
+                                      'is_ordered': False})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        persons = list(map(lambda rd: Person(**rd), response.json()))
+        assert list(map(lambda p: (p.first_name, p.last_name), persons)) == \
+               list(map(lambda ep: (ep.first_name, ep.last_name), expected_persons))
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("first_name_phrase, last_name_phrase, is_ordered, limit, expected_persons", [
+    ("", "smi", False, 3, [persons_db[1], persons_db[6], persons_db[8], persons_db[9]]),
+    ("", "smi", False, 1, [persons_db[1], persons_db[6], persons_db[8], persons_db[9]]),
+    ("ron", "", False, 2, [persons_db[6], persons_db[7], persons_db[8]]),
+    ("ron", "", True, 2, None)
+])
+def test_search_by_phrases_should_return_200_response_of_cursor_pages(client, monkeypatch,
+                                                                      first_name_phrase: Optional[str],
+                                                                      last_name_phrase: Optional[str],
+                                                                      is_ordered: bool, limit: int,
+                                                                      expected_persons: Optional[List[PersonInput]]
+                                                                      ) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        params = {'first_name_phrase': first_name_phrase, 'last_name_phrase': last_name_phrase,
+                  'is_ordered': is_ordered}
+        all_persons_response = client.get("/search_by_phrases", params=params)
+
+        # Act
+        persons, cursor, page_sizes = list([]), None, list([])
+        for _ in range(10):
+            response = client.get("/search_by_phrases", params=dict(params, limit=limit, cursor=cursor))
+            assert response.status_code == status.HTTP_200_OK
+            page_persons = list(map(lambda rd: Person(**rd), response.json()))
+            persons.extend(page_persons)
+            page_sizes.append(len(page_persons))
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+        # Assert
+        assert cursor is None
+        assert all(map(lambda ps: ps <= limit, page_sizes))
+        all_persons = list(map(lambda rd: Person(**rd), all_persons_response.json()))
+        assert list(map(lambda p: p.business_entity_id, persons)) == \
+               list(map(lambda p: p.business_entity_id, all_persons))
+        if expected_persons is not None:
+            assert list(map(lambda p: (p.first_name, p.last_name), persons)) == \
+                   list(map(lambda ep: (ep.first_name, ep.last_name), expected_persons))
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("last_names, limit, expected_last_names", [
+    (["adams", "Zed", "Ábel", "de Vries", "Adams"], 2, ["Adams", "Zed", "adams", "de Vries", "Ábel"])
+])
+def test_search_by_phrases_should_return_200_response_of_same_pages_with_person_search_engine(
+        client, monkeypatch, last_names: List[str], limit: int, expected_last_names: List[str]) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        monkeypatch.setattr(person_service, 'person_search_engine', None)
+        for last_name in last_names:
+            person_provider.insert_person(PersonInput(person_type=EPersonType.IN, first_name="Kai", last_name=last_name))
+        params = {'first_name_phrase': "kai", 'is_ordered': True, 'limit': limit}
+
+        def get_last_name_pages(first_cursor: Optional[str] = None) -> List[List[str]]:
+            pages, cursor = list([]), first_cursor
+            for _ in range(10):
+                response = client.get("/search_by_phrases", params=dict(params, cursor=cursor))
+                assert response.status_code == status.HTTP_200_OK
+                pages.append(list(map(lambda rd: Person(**rd).last_name, response.json())))
+                cursor = response.headers.get("X-Next-Cursor")
+                if cursor is None:
+                    break
+            return pages
+
+        # Act
+        database_pages = get_last_name_pages()
+        first_page_cursor = client.get("/search_by_phrases", params=params).headers.get("X-Next-Cursor")
+        person_service.load_person_search_engine()
+        engine_pages = get_last_name_pages()
+        engine_pages_after_database_cursor = get_last_name_pages(first_page_cursor)
+
+        # Assert
+        assert sum(database_pages, []) == expected_last_names
+        assert engine_pages == database_pages
+        assert engine_pages_after_database_cursor == database_pages[1:]
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("first_name_phrase, last_name_phrase, is_ordered, expected_persons", [
+    ("ron", "", False, [persons_db[6], persons_db[7], persons_db[8]]),
+    ("", "smi", False, [persons_db[1], persons_db[6], persons_db[8], persons_db[9]]),
+    ("ahn", "", False, [])
+])
+def test_search_by_phrases_should_return_200_response_of_streamed_persons(client, monkeypatch,
+                                                                          first_name_phrase: Optional[str],
+                                                                          last_name_phrase: Optional[str],
+                                                                          is_ordered: bool,
+                                                                          expected_persons: List[PersonInput]
+                                                                          ) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+
+        # Act
+        response = client.get("/search_by_phrases",
+                              params={'first_name_phrase': first_name_phrase,
+                                      'last_name_phrase': last_name_phrase,
+                                      'is_ordered': is_ordered,
+                                      'is_streamed': True})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        persons = list(map(lambda line: Person(**json.loads(line)),
+                           filter(lambda line: line != "", response.text.split("\n"))))
+        assert list(map(lambda p: (p.first_name, p.last_name), persons)) == \
+               list(map(lambda ep: (ep.first_name, ep.last_name), expected_persons))
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
 @pytest.mark.parametrize("first_name_phrase, last_name_phrase, expected_message", [
     ("", "", ResponseMessage(title="Missing values.",
                              description=f"{E400BadRequest.VALUES_NOT_PROVIDED}: "
@@ -129,6 +294,56 @@ def test_search_by_phrases_should_return_400_response(client, monkeypatch,
         fixtures_after_test()
 
 
+@pytest.mark.parametrize("is_ranked, limit, cursor, expected_message", [
+    (False, 1001, None,
+     ResponseMessage(title="Limit exceeded.",
+                     description=f"{E400BadRequest.LIMIT_EXCEEDED}: Limit '1001' exceeds maximum of 1000. "
+                                 f"Use cursor pagination or streaming to get more persons.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (True, 1001, None,
+     ResponseMessage(title="Limit exceeded.",
+                     description=f"{E400BadRequest.LIMIT_EXCEEDED}: Limit '1001' exceeds maximum of 1000. "
+                                 f"Use cursor pagination or streaming to get more persons.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (True, None, "eyJrIjogWyJTbWl0aCJdfQ==",
+     ResponseMessage(title="Invalid pagination cursor.",
+                     description=f"{E400BadRequest.INVALID_CURSOR}: "
+                                 f"Cursor pagination is not supported for ranked search.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (False, None, "invalid",
+     ResponseMessage(title="Invalid pagination cursor.",
+                     description=f"{E400BadRequest.INVALID_CURSOR}: "
+                                 f"Cursor 'invalid' is invalid or was issued for another ordering.",
+                     code=status.HTTP_400_BAD_REQUEST))
+])
+def test_search_by_phrases_should_return_400_response_of_invalid_page(client, monkeypatch,
+                                                                      is_ranked: bool,
+                                                                      limit: Optional[int],
+                                                                      cursor: Optional[str],
+                                                                      expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+
+        # Act
+        response = client.get("/search_by_phrases",
+                              params={'last_name_phrase': "smi", 'is_ranked': is_ranked,
+                                      'limit': limit, 'cursor': cursor})
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
 @pytest.mark.parametrize("first_name_phrase, last_name_phrase, expected_message", [
     ("ahn", "",
      ResponseMessage(title="Persons not found | "
@@ -0,0 +1,174 @@
+import pytest
+from typing import Any, Dict, List, Optional, Tuple
+from starlette.testclient import TestClient
+from fastapi import status
+from pytest import MonkeyPatch
+
+from app.config import BatchConfig
+from app.models import (ResponseMessage, BatchResult, PersonPhone, Person, PhoneNumberType,
+                        E400BadRequest, E404NotFound)
+from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory,
+                           PersonPhoneFactory)
+
+from app.routes import jwt_authentication as jwt_authentication_routes
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import person_phone as person_phone_routes
+from app import oauth2_handlers
+
+from app.tests.fixtures.fixtures_entry_lists import awfapi_nonreadonly_user, person_phones_db
+from app.tests.fixtures.fixtures_tests import (register_test_user, obtain_access_token,
+                                               insert_test_persons, insert_test_phone_number_types,
+                                               insert_test_person_phones,
+                                               create_tables, drop_tables, drop_collection)
+
+
+mongodb_connection_string, mongodb_collection_name, mongodb_engine = MongoDBFactory.get_db_connection_details(test_suffix="_test")
+awfapi_user_provider, awfapi_user_service = AWFAPIUserFactory.get_provider_and_service(mongodb_connection_string, mongodb_collection_name, mongodb_engine)
+jwt_authentication_service = JWTAuthenticationFactory.get_service(awfapi_user_provider, awfapi_user_service)
+
+postgresdb_connection_string, postgresdb_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_test")
+person_phone_provider = PersonPhoneFactory.get_provider(postgresdb_connection_string, postgresdb_engine)
+
+
+@pytest.fixture()
+def client():
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def fixtures_before_test(monkeypatch: MonkeyPatch) -> None:
+    create_tables(postgresdb_engine)
+
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_provider', awfapi_user_provider)
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_service', awfapi_user_service)
+    monkeypatch.setattr(jwt_authentication_routes, 'jwt_auth_service', jwt_authentication_service)
+    monkeypatch.setattr(oauth2_handlers, 'jwt_auth_service', jwt_authentication_service)
+
+    monkeypatch.setattr(person_phone_routes, 'person_phone_provider', person_phone_provider)
+
+    insert_test_persons(postgresdb_engine, postgresdb_connection_string)
+    insert_test_phone_number_types(postgresdb_engine, postgresdb_connection_string)
+    insert_test_person_phones(postgresdb_engine, postgresdb_connection_string)
+
+
+def fixtures_after_test() -> None:
+    drop_collection(mongodb_engine, mongodb_collection_name)
+    drop_tables(postgresdb_engine)
+
+
+@pytest.mark.parametrize("person_phone_operations, expected_items, expected_person_phones_count", [
+    ([{'operation': "create",
+       'person_phone_input': {'business_entity_id': 2, 'phone_number': "222 222 222", 'phone_number_type_id': 1}},
+      {'operation': "create",
+       'person_phone_input': {'business_entity_id': 1, 'phone_number': "000 000 000", 'phone_number_type_id': 1}},
+      {'operation': "create",
+       'person_phone_input': {'business_entity_id': 11, 'phone_number': "000 000 000", 'phone_number_type_id': 1}},
+      {'operation': "update", 'person_phone_id': [4, "123456789", 3],
+       'person_phone_input': {'business_entity_id': 4, 'phone_number': "987654321", 'phone_number_type_id': 2}},
+      {'operation': "update", 'person_phone_id': [99, "123456789", 3],
+       'person_phone_input': {'business_entity_id': 4, 'phone_number': "987654321", 'phone_number_type_id': 2}},
+      {'operation': "update", 'person_phone_id': [5, "338 94 95", 3],
+       'person_phone_input': {'business_entity_id': 5, 'phone_number': "338 94 95", 'phone_number_type_id': 6}},
+      {'operation': "delete", 'person_phone_id': [8, "000 000 000", 5]},
+      {'operation': "delete", 'person_phone_id': [8, "000 000 000", 5]},
+      {'operation': "delete"}],
+     [(status.HTTP_201_CREATED, None, (2, "222 222 222", 1)),
+      (status.HTTP_400_BAD_REQUEST, f"{E400BadRequest.PRIMARY_KEY_CONSTRAINT_VIOLATION}: ", None),
+      (status.HTTP_400_BAD_REQUEST, f"{E400BadRequest.FOREIGN_KEY_CONSTRAINT_VIOLATION}: ", None),
+      (status.HTTP_200_OK, None, (4, "987654321", 2)),
+      (status.HTTP_404_NOT_FOUND, f"{E404NotFound.PERSON_PHONE_NOT_FOUND}: "
+                                  f"Person phone of id '(99, '123456789', 3)' does not exist.", None),
+      (status.HTTP_400_BAD_REQUEST, f"{E400BadRequest.FOREIGN_KEY_CONSTRAINT_VIOLATION}: ", None),
+      (status.HTTP_200_OK, "Person phone of given id '(8, '000 000 000', 5)' deleted.", None),
+      (status.HTTP_404_NOT_FOUND, f"{E404NotFound.PERSON_PHONE_NOT_FOUND}: "
+                                  f"Person phone of id '(8, '000 000 000', 5)' does not exist.", None),
+      (status.HTTP_400_BAD_REQUEST, f"{E400BadRequest.VALUES_NOT_PROVIDED}: "
+                                    f"Operation 'delete' requires values: ['person_phone_id'].", None)],
+     len(person_phones_db))
+])
+def test_batch_person_phones_should_return_200_response(client, monkeypatch,
+                                                        person_phone_operations: List[Dict[str, Any]],
+                                                        expected_items: List[Tuple[int, Optional[str],
+                                                                                   Optional[Tuple[int, str, int]]]],
+                                                        expected_person_phones_count: int) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_nonreadonly_user)
+        access_token = obtain_access_token(client, awfapi_nonreadonly_user)
+
+        # Act
+        response = client.post("/batch_person_phones", json=person_phone_operations,
+                               headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        batch_result = BatchResult[Tuple[PersonPhone, Person, PhoneNumberType]](**response.json())
+        assert batch_result.entity == "Person phone"
+        assert batch_result.failed_count == len(list(filter(lambda ei: ei[0] >= status.HTTP_400_BAD_REQUEST,
+                                                            expected_items)))
+        assert batch_result.succeeded_count == len(expected_items) - batch_result.failed_count
+        assert list(map(lambda i: i.index, batch_result.items)) == list(range(len(expected_items)))
+        for item, (expected_code, expected_description, expected_id) in zip(batch_result.items, expected_items):
+            assert item.code == expected_code
+            if expected_id is not None:
+                person_phone = item.item[0]
+                assert (person_phone.business_entity_id, person_phone.phone_number,
+                        person_phone.phone_number_type_id) == expected_id
+                assert item.message is None
+            else:
+                assert item.item is None
+                assert item.message.code == expected_code
+                assert item.message.description.startswith(expected_description)
+        assert person_phone_provider.count_person_phones() == expected_person_phones_count
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("max_operations, operations_count, expected_message", [
+    (2, 3, ResponseMessage(title="Limit exceeded.",
+                           description=f"{E400BadRequest.LIMIT_EXCEEDED}: "
+                                       f"Batch of 3 operations exceeds the maximum of 2 operations.",
+                           code=status.HTTP_400_BAD_REQUEST)),
+    (0, 1, ResponseMessage(title="Limit exceeded.",
+                           description=f"{E400BadRequest.LIMIT_EXCEEDED}: "
+                                       f"Batch of 1 operations exceeds the maximum of 0 operations.",
+                           code=status.HTTP_400_BAD_REQUEST))
+])
+def test_batch_person_phones_should_return_400_response(client, monkeypatch,
+                                                        max_operations: int, operations_count: int,
+                                                        expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_nonreadonly_user)
+        access_token = obtain_access_token(client, awfapi_nonreadonly_user)
+        batch_config = BatchConfig(max_operations=max_operations)
+        monkeypatch.setattr(BatchConfig, "from_json", staticmethod(lambda: batch_config))
+        person_phone_operations = list(map(lambda i: {'operation': "delete",
+                                                      'person_phone_id': [1, "000 000 000", 1]},
+                                           range(operations_count)))
+
+        # Act
+        response = client.post("/batch_person_phones", json=person_phone_operations,
+                               headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+        assert person_phone_provider.count_person_phones() == len(person_phones_db)
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
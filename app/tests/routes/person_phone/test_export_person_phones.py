@@ -0,0 +1,212 @@
+import csv
+import io
+import json
+import pytest
+from typing import Optional, List
+from starlette.testclient import TestClient
+from fastapi import status
+from pytest import MonkeyPatch
+
+from app.models import (ResponseMessage, AWFAPIRegisteredUser, EOrderType, EExportFormat,
+                        PersonPhoneInput, PersonPhone, Person, PhoneNumberType,
+                        E400BadRequest)
+from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory,
+                           PersonPhoneFactory)
+
+from app.routes import jwt_authentication as jwt_authentication_routes
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import person_phone as person_phone_routes
+from app import oauth2_handlers
+
+from app.tests.fixtures.fixtures_entry_lists import awfapi_nonreadonly_user, awfapi_readonly_user, person_phones_db
+from app.tests.fixtures.fixtures_tests import (register_test_user, obtain_access_token,
+                                               insert_test_persons, insert_test_phone_number_types,
+                                               insert_test_person_phones,
+                                               create_tables, drop_tables, drop_collection)
+
+
+mongodb_connection_string, mongodb_collection_name, mongodb_engine = MongoDBFactory.get_db_connection_details(test_suffix="_test")
+awfapi_user_provider, awfapi_user_service = AWFAPIUserFactory.get_provider_and_service(mongodb_connection_string, mongodb_collection_name, mongodb_engine)
+jwt_authentication_service = JWTAuthenticationFactory.get_service(awfapi_user_provider, awfapi_user_service)
+
+postgresdb_connection_string, postgresdb_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_test")
+person_phone_provider = PersonPhoneFactory.get_provider(postgresdb_connection_string, postgresdb_engine)
+
+
+@pytest.fixture()
+def client():
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def fixtures_before_test(monkeypatch: MonkeyPatch) -> None:
+    create_tables(postgresdb_engine)
+
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_provider', awfapi_user_provider)
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_service', awfapi_user_service)
+    monkeypatch.setattr(jwt_authentication_routes, 'jwt_auth_service', jwt_authentication_service)
+    monkeypatch.setattr(oauth2_handlers, 'jwt_auth_service', jwt_authentication_service)
+
+    monkeypatch.setattr(person_phone_routes, 'person_phone_provider', person_phone_provider)
+
+    insert_test_persons(postgresdb_engine, postgresdb_connection_string)
+    insert_test_phone_number_types(postgresdb_engine, postgresdb_connection_string)
+    insert_test_person_phones(postgresdb_engine, postgresdb_connection_string)
+
+
+def fixtures_after_test() -> None:
+    drop_collection(mongodb_engine, mongodb_collection_name)
+    drop_tables(postgresdb_engine)
+
+
+@pytest.mark.parametrize("awfapi_registered_user, filters, order_by, order_type, expected_person_phones", [
+    (awfapi_nonreadonly_user, None, None, "asc", person_phones_db),
+    (awfapi_readonly_user, "person_ids:[4|5],phone_number_type_ids:[3]", None, "asc",
+     [person_phones_db[3], person_phones_db[4]]),
+    (awfapi_readonly_user, "person_ids:[1|2|3|4]", "person_full_name", "asc",
+     [person_phones_db[3], person_phones_db[0], person_phones_db[1], person_phones_db[2]]),
+    (awfapi_readonly_user, "person_ids:[2|3]", None, "asc", [])
+])
+def test_export_person_phones_should_return_200_response_of_ndjson(client, monkeypatch,
+                                                                   awfapi_registered_user: AWFAPIRegisteredUser,
+                                                                   filters: Optional[str],
+                                                                   order_by: Optional[str],
+                                                                   order_type: Optional[EOrderType],
+                                                                   expected_person_phones: List[PersonPhoneInput]
+                                                                   ) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_registered_user)
+        access_token = obtain_access_token(client, awfapi_registered_user)
+
+        # Act
+        response = client.get("/export_person_phones",
+                              params={'filters': filters, 'order_by': order_by, 'order_type': order_type,
+                                      'export_format': EExportFormat.NDJSON.value},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert response.headers["content-disposition"] == "attachment; filename=\"person_phones.ndjson\""
+        rows = list(map(json.loads, filter(lambda line: line != "", response.text.split("\n"))))
+        assert len(rows) == len(expected_person_phones)
+        for row, epp in zip(rows, expected_person_phones):
+            person_phone, person = PersonPhone(**row[0]), Person(**row[1])
+            assert person_phone.business_entity_id == epp.business_entity_id
+            assert person_phone.phone_number == epp.phone_number
+            assert person_phone.phone_number_type_id == epp.phone_number_type_id
+            assert person.business_entity_id == epp.business_entity_id
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("filters, fields, expected_person_columns, expected_person_phones", [
+    ("person_ids:[4|5],phone_number_type_ids:[3]", None, list(Person.__fields__.keys()),
+     [person_phones_db[3], person_phones_db[4]]),
+    ("person_ids:[4|5],phone_number_type_ids:[3]", "last_name,first_name",
+     ["business_entity_id", "last_name", "first_name"], [person_phones_db[3], person_phones_db[4]]),
+    ("person_ids:[2|3]", "first_name", ["business_entity_id", "first_name"], [])
+])
+def test_export_person_phones_should_return_200_response_of_csv(client, monkeypatch,
+                                                                filters: Optional[str], fields: Optional[str],
+                                                                expected_person_columns: List[str],
+                                                                expected_person_phones: List[PersonPhoneInput]
+                                                                ) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+        expected_columns = list(map(lambda f: f"PersonPhone.{f}", PersonPhone.__fields__.keys())) + \
+            list(map(lambda f: f"Person.{f}", expected_person_columns)) + \
+            list(map(lambda f: f"PhoneNumberType.{f}", PhoneNumberType.__fields__.keys()))
+
+        # Act
+        response = client.get("/export_person_phones",
+                              params={'filters': filters, 'fields': fields,
+                                      'export_format': EExportFormat.CSV.value},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.headers["content-disposition"] == "attachment; filename=\"person_phones.csv\""
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0] == expected_columns
+        rows = list(map(lambda r: dict(zip(expected_columns, r)), rows[1:]))
+        assert len(rows) == len(expected_person_phones)
+        for row, epp in zip(rows, expected_person_phones):
+            assert row["PersonPhone.business_entity_id"] == str(epp.business_entity_id)
+            assert row["PersonPhone.phone_number"] == epp.phone_number
+            assert row["PersonPhone.phone_number_type_id"] == str(epp.phone_number_type_id)
+            assert row["Person.business_entity_id"] == str(epp.business_entity_id)
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("export_format, filters, order_by, fields, expected_message", [
+    (EExportFormat.NDJSON, "person_id:[20785|20777]", None, None,
+     ResponseMessage(title="Non-existing fields in filter string.",
+                     description=f"{E400BadRequest.INVALID_FIELDS_IN_FILTER_STRING}: "
+                                 f"Filter string contains fields: '['person_id']' some of which "
+                                 f"do not exist in person phone filtering fields: "
+                                 f"['person_ids', 'phone_number_type_ids'].",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (EExportFormat.CSV, "person_ids", None, None,
+     ResponseMessage(title="Invalid filter string.",
+                     description=f"{E400BadRequest.INVALID_FILTER_STRING}: "
+                                 f"Invalid filter string: person_ids.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (EExportFormat.CSV, None, "person_id", None,
+     ResponseMessage(title="Non-existing column for ordering.",
+                     description=f"{E400BadRequest.INVALID_ORDERING_COLUMN_NAME}: "
+                                 f"Column does not exist in person phones view ('person_id').",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (EExportFormat.NDJSON, None, None, "first_name,-last_name",
+     ResponseMessage(title="Invalid fields string.",
+                     description=f"{E400BadRequest.INVALID_FIELDS_STRING}: "
+                                 f"Fields string 'first_name,-last_name' cannot both include and exclude fields.",
+                     code=status.HTTP_400_BAD_REQUEST))
+])
+def test_export_person_phones_should_return_400_response(client, monkeypatch,
+                                                         export_format: EExportFormat,
+                                                         filters: Optional[str], order_by: Optional[str],
+                                                         fields: Optional[str],
+                                                         expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+
+        # Act
+        response = client.get("/export_person_phones",
+                              params={'filters': filters, 'order_by': order_by, 'fields': fields,
+                                      'export_format': export_format.value},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.headers["content-type"].startswith("application/json")
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
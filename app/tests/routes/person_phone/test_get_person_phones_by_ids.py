@@ -0,0 +1,172 @@
+import pytest
+from typing import Any, List, Optional
+from starlette.testclient import TestClient
+from fastapi import status
+from pytest import MonkeyPatch
+
+from app.config import BatchConfig
+from app.models import (ResponseMessage, AWFAPIRegisteredUser, PersonPhoneInput, PersonPhone, Person,
+                        E400BadRequest)
+from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory,
+                           PersonPhoneFactory)
+
+from app.routes import jwt_authentication as jwt_authentication_routes
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import person_phone as person_phone_routes
+from app import oauth2_handlers
+
+from app.tests.fixtures.fixtures_entry_lists import awfapi_nonreadonly_user, awfapi_readonly_user, person_phones_db
+from app.tests.fixtures.fixtures_tests import (register_test_user, obtain_access_token,
+                                               insert_test_persons, insert_test_phone_number_types,
+                                               insert_test_person_phones,
+                                               create_tables, drop_tables, drop_collection)
+
+
+mongodb_connection_string, mongodb_collection_name, mongodb_engine = MongoDBFactory.get_db_connection_details(test_suffix="_test")
+awfapi_user_provider, awfapi_user_service = AWFAPIUserFactory.get_provider_and_service(mongodb_connection_string, mongodb_collection_name, mongodb_engine)
+jwt_authentication_service = JWTAuthenticationFactory.get_service(awfapi_user_provider, awfapi_user_service)
+
+postgresdb_connection_string, postgresdb_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_test")
+person_phone_provider = PersonPhoneFactory.get_provider(postgresdb_connection_string, postgresdb_engine)
+
+
+@pytest.fixture()
+def client():
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def fixtures_before_test(monkeypatch: MonkeyPatch) -> None:
+    create_tables(postgresdb_engine)
+
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_provider', awfapi_user_provider)
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_service', awfapi_user_service)
+    monkeypatch.setattr(jwt_authentication_routes, 'jwt_auth_service', jwt_authentication_service)
+    monkeypatch.setattr(oauth2_handlers, 'jwt_auth_service', jwt_authentication_service)
+
+    monkeypatch.setattr(person_phone_routes, 'person_phone_provider', person_phone_provider)
+
+    insert_test_persons(postgresdb_engine, postgresdb_connection_string)
+    insert_test_phone_number_types(postgresdb_engine, postgresdb_connection_string)
+    insert_test_person_phones(postgresdb_engine, postgresdb_connection_string)
+
+
+def fixtures_after_test() -> None:
+    drop_collection(mongodb_engine, mongodb_collection_name)
+    drop_tables(postgresdb_engine)
+
+
+@pytest.mark.parametrize("awfapi_registered_user, person_phone_ids, expected_person_phones", [
+    (awfapi_nonreadonly_user, [[1, "000 000 000", 1], [4, "123456789", 3]],
+     [person_phones_db[0], person_phones_db[3]]),
+    (awfapi_readonly_user, [[8, "000 000 000", 5], [1, "000 000 000", 1], [5, "338 94 95", 3]],
+     [person_phones_db[7], person_phones_db[0], person_phones_db[4]]),
+    (awfapi_readonly_user, [[1, "000 000 000", 2], [7, "71 334 34 34", 3], [99, "000 000 000", 1],
+                            [7, "71 334 34 34", 3]],
+     [None, person_phones_db[6], None, person_phones_db[6]]),
+    (awfapi_readonly_user, [["5", "8880 23453", "4"]], [person_phones_db[5]]),
+    (awfapi_readonly_user, [], [])
+])
+def test_get_person_phones_by_ids_should_return_200_response(client, monkeypatch,
+                                                             awfapi_registered_user: AWFAPIRegisteredUser,
+                                                             person_phone_ids: List[List[Any]],
+                                                             expected_person_phones: List[Optional[PersonPhoneInput]]
+                                                             ) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_registered_user)
+        access_token = obtain_access_token(client, awfapi_registered_user)
+
+        # Act
+        response = client.post("/get_person_phones_by_ids", json=person_phone_ids,
+                               headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        response_list = response.json()
+        assert len(response_list) == len(expected_person_phones)
+        for rd, epp in zip(response_list, expected_person_phones):
+            if epp is None:
+                assert rd is None
+                continue
+            person_phone = PersonPhone(**rd[0])
+            assert person_phone.business_entity_id == epp.business_entity_id
+            assert person_phone.phone_number == epp.phone_number
+            assert person_phone.phone_number_type_id == epp.phone_number_type_id
+            assert person_phone.modified_date is not None
+            assert Person(**rd[1]).business_entity_id == epp.business_entity_id
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("max_ids, person_phone_ids, expected_message", [
+    (2, [[1, "000 000 000", 1], [4, "123456789", 3], [99, "000 000 000", 1]],
+     ResponseMessage(title="Limit exceeded.",
+                     description=f"{E400BadRequest.LIMIT_EXCEEDED}: List of 3 ids exceeds the maximum of 2 ids.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (0, [[1, "000 000 000", 1]],
+     ResponseMessage(title="Limit exceeded.",
+                     description=f"{E400BadRequest.LIMIT_EXCEEDED}: List of 1 ids exceeds the maximum of 0 ids.",
+                     code=status.HTTP_400_BAD_REQUEST))
+])
+def test_get_person_phones_by_ids_should_return_400_response(client, monkeypatch,
+                                                             max_ids: int, person_phone_ids: List[List[Any]],
+                                                             expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+        batch_config = BatchConfig(max_ids=max_ids)
+        monkeypatch.setattr(BatchConfig, "from_json", staticmethod(lambda: batch_config))
+
+        # Act
+        response = client.post("/get_person_phones_by_ids", json=person_phone_ids,
+                               headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("person_phone_ids", [
+    [[1, "000 000 000"]],
+    [[1, "000 000 000", 1, 1]],
+    [["one", "000 000 000", 1]],
+    {'person_phone_ids': [[1, "000 000 000", 1]]}
+])
+def test_get_person_phones_by_ids_should_return_422_response(client, monkeypatch, person_phone_ids: Any) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+
+        # Act
+        response = client.post("/get_person_phones_by_ids", json=person_phone_ids,
+                               headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
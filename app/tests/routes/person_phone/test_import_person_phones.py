@@ -0,0 +1,149 @@
+import pytest
+from typing import List, Tuple
+from starlette.testclient import TestClient
+from fastapi import status
+from pytest import MonkeyPatch
+
+from app.models import (ResponseMessage, ImportReport, EExportFormat,
+                        E400BadRequest, E422UnprocessableEntity)
+from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory,
+                           PersonPhoneFactory)
+from app.services import ImportService
+
+from app.routes import jwt_authentication as jwt_authentication_routes
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import person_phone as person_phone_routes
+from app import oauth2_handlers
+
+from app.tests.fixtures.fixtures_entry_lists import awfapi_nonreadonly_user
+from app.tests.fixtures.fixtures_tests import (register_test_user, obtain_access_token,
+                                               insert_test_persons, insert_test_phone_number_types,
+                                               insert_test_person_phones,
+                                               create_tables, drop_tables, drop_collection)
+
+
+mongodb_connection_string, mongodb_collection_name, mongodb_engine = MongoDBFactory.get_db_connection_details(test_suffix="_test")
+awfapi_user_provider, awfapi_user_service = AWFAPIUserFactory.get_provider_and_service(mongodb_connection_string, mongodb_collection_name, mongodb_engine)
+jwt_authentication_service = JWTAuthenticationFactory.get_service(awfapi_user_provider, awfapi_user_service)
+
+postgresdb_connection_string, postgresdb_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_test")
+person_phone_provider = PersonPhoneFactory.get_provider(postgresdb_connection_string, postgresdb_engine)
+import_service = ImportService(person_phone_provider=person_phone_provider)
+
+
+@pytest.fixture()
+def client():
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def fixtures_before_test(monkeypatch: MonkeyPatch) -> None:
+    create_tables(postgresdb_engine)
+
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_provider', awfapi_user_provider)
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_service', awfapi_user_service)
+    monkeypatch.setattr(jwt_authentication_routes, 'jwt_auth_service', jwt_authentication_service)
+    monkeypatch.setattr(oauth2_handlers, 'jwt_auth_service', jwt_authentication_service)
+
+    monkeypatch.setattr(person_phone_routes, 'person_phone_provider', person_phone_provider)
+    monkeypatch.setattr(person_phone_routes, 'import_service', import_service)
+
+    insert_test_persons(postgresdb_engine, postgresdb_connection_string)
+    insert_test_phone_number_types(postgresdb_engine, postgresdb_connection_string)
+    insert_test_person_phones(postgresdb_engine, postgresdb_connection_string)
+
+
+def fixtures_after_test() -> None:
+    drop_collection(mongodb_engine, mongodb_collection_name)
+    drop_tables(postgresdb_engine)
+
+
+@pytest.mark.parametrize("import_format, file_content, expected_imported_count, expected_errors", [
+    (EExportFormat.CSV,
+     b"business_entity_id,phone_number,phone_number_type_id\n"
+     b"one,111 111 111,1\n"
+     b"2,222 222 222,1\n"
+     b"99,333 333 333,1\n"
+     b"1,000 000 000,1\n"
+     b"3,444 444 444,99\n",
+     1, [(2, E422UnprocessableEntity.INVALID_PERSON_PHONE_VALUES), (4, E400BadRequest.INVALID_IMPORT_ROW),
+         (5, E400BadRequest.INVALID_IMPORT_ROW), (6, E400BadRequest.INVALID_IMPORT_ROW)]),
+    (EExportFormat.NDJSON,
+     b'{"business_entity_id": 2, "phone_number": "222 222 222", "phone_number_type_id": 1}\n'
+     b'{"business_entity_id": 2, "phone_number": "222 222 222"\n'
+     b'\n'
+     b'{"business_entity_id": 99, "phone_number": "333 333 333", "phone_number_type_id": 1}\n',
+     1, [(2, E400BadRequest.INVALID_IMPORT_ROW), (4, E400BadRequest.INVALID_IMPORT_ROW)])
+])
+def test_import_person_phones_should_return_200_response(client, monkeypatch,
+                                                   import_format: EExportFormat, file_content: bytes,
+                                                   expected_imported_count: int,
+                                                   expected_errors: List[Tuple[int, str]]) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_nonreadonly_user)
+        access_token = obtain_access_token(client, awfapi_nonreadonly_user)
+
+        # Act
+        response = client.post("/import_person_phones", params={'import_format': import_format.value},
+                               data=file_content, headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        import_report = ImportReport(**response.json())
+        assert import_report.entity == "person_phone"
+        assert import_report.imported_count == expected_imported_count
+        assert import_report.failed_count == len(expected_errors)
+        assert list(map(lambda e: e.row, import_report.errors)) == list(map(lambda ee: ee[0], expected_errors))
+        for error, expected_error in zip(import_report.errors, expected_errors):
+            assert error.detail.startswith(f"{expected_error[1]}:")
+        assert person_phone_provider.count_person_phones() == 8 + expected_imported_count
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("file_content, expected_message", [
+    (b"\xffbusiness_entity_id,phone_number,phone_number_type_id\n2,222 222 222,1\n",
+     ResponseMessage(title="Invalid import file.",
+                     description=f"{E400BadRequest.INVALID_IMPORT_ROW}: Row 1 is not valid UTF-8 text. "
+                                 f"It is the header of value names, so the file is not imported.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (b"\n\"business_entity_id,phone_number,phone_number_type_id\n2,222 222 222,1\n",
+     ResponseMessage(title="Invalid import file.",
+                     description=f"{E400BadRequest.INVALID_IMPORT_ROW}: Row 2 has an unterminated quoted value. "
+                                 f"It is the header of value names, so the file is not imported.",
+                     code=status.HTTP_400_BAD_REQUEST))
+])
+def test_import_person_phones_should_return_400_response(client, monkeypatch,
+                                                   file_content: bytes,
+                                                   expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_nonreadonly_user)
+        access_token = obtain_access_token(client, awfapi_nonreadonly_user)
+
+        # Act
+        response = client.post("/import_person_phones", params={'import_format': EExportFormat.CSV.value},
+                               data=file_content, headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+        assert person_phone_provider.count_person_phones() == 8
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
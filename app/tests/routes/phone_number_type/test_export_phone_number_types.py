@@ -0,0 +1,160 @@
+import csv
+import io
+import json
+import pytest
+from typing import Optional, List
+from starlette.testclient import TestClient
+from fastapi import status
+from pytest import MonkeyPatch
+
+from app.models import (ResponseMessage, AWFAPIRegisteredUser, EOrderType, EExportFormat,
+                        PhoneNumberTypeInput, PhoneNumberType,
+                        E400BadRequest)
+from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory,
+                           PhoneNumberTypeFactory)
+
+from app.routes import jwt_authentication as jwt_authentication_routes
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import phone_number_type as phone_number_type_routes
+from app import oauth2_handlers
+
+from app.tests.fixtures.fixtures_entry_lists import awfapi_nonreadonly_user, awfapi_readonly_user, phone_number_types_db
+from app.tests.fixtures.fixtures_tests import (register_test_user, obtain_access_token, insert_test_phone_number_types,
+                                               create_tables, drop_tables, drop_collection)
+
+
+mongodb_connection_string, mongodb_collection_name, mongodb_engine = MongoDBFactory.get_db_connection_details(test_suffix="_test")
+awfapi_user_provider, awfapi_user_service = AWFAPIUserFactory.get_provider_and_service(mongodb_connection_string, mongodb_collection_name, mongodb_engine)
+jwt_authentication_service = JWTAuthenticationFactory.get_service(awfapi_user_provider, awfapi_user_service)
+
+postgresdb_connection_string, postgresdb_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_test")
+phone_number_type_provider = PhoneNumberTypeFactory.get_provider(postgresdb_connection_string, postgresdb_engine)
+
+
+@pytest.fixture()
+def client():
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def fixtures_before_test(monkeypatch: MonkeyPatch) -> None:
+    create_tables(postgresdb_engine)
+
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_provider', awfapi_user_provider)
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_service', awfapi_user_service)
+    monkeypatch.setattr(jwt_authentication_routes, 'jwt_auth_service', jwt_authentication_service)
+    monkeypatch.setattr(oauth2_handlers, 'jwt_auth_service', jwt_authentication_service)
+
+    monkeypatch.setattr(phone_number_type_routes, 'phone_number_type_provider', phone_number_type_provider)
+
+    insert_test_phone_number_types(postgresdb_engine, postgresdb_connection_string)
+
+
+def fixtures_after_test() -> None:
+    drop_collection(mongodb_engine, mongodb_collection_name)
+    drop_tables(postgresdb_engine)
+
+
+@pytest.mark.parametrize("awfapi_registered_user, export_format, filters, order_by, order_type, "
+                         "expected_phone_number_types", [
+    (awfapi_nonreadonly_user, EExportFormat.NDJSON, None, None, "asc", phone_number_types_db),
+    (awfapi_readonly_user, EExportFormat.NDJSON, "name_phrase:hom", "name", "desc",
+     [phone_number_types_db[4], phone_number_types_db[3], phone_number_types_db[2]]),
+    (awfapi_readonly_user, EExportFormat.CSV, None, None, "asc", phone_number_types_db),
+    (awfapi_readonly_user, EExportFormat.CSV, "name_phrase:hom", "name", "desc",
+     [phone_number_types_db[4], phone_number_types_db[3], phone_number_types_db[2]]),
+    (awfapi_readonly_user, EExportFormat.CSV, "name_phrase:fax", None, "asc", [])
+])
+def test_export_phone_number_types_should_return_200_response(client, monkeypatch,
+                                                              awfapi_registered_user: AWFAPIRegisteredUser,
+                                                              export_format: EExportFormat,
+                                                              filters: Optional[str],
+                                                              order_by: Optional[str],
+                                                              order_type: Optional[EOrderType],
+                                                              expected_phone_number_types: List[PhoneNumberTypeInput]
+                                                              ) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_registered_user)
+        access_token = obtain_access_token(client, awfapi_registered_user)
+
+        # Act
+        response = client.get("/export_phone_number_types",
+                              params={'filters': filters, 'order_by': order_by, 'order_type': order_type,
+                                      'export_format': export_format.value},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-disposition"] == \
+               f"attachment; filename=\"phone_number_types.{export_format.value}\""
+        if export_format == EExportFormat.CSV:
+            assert response.headers["content-type"].startswith("text/csv")
+            rows = list(csv.reader(io.StringIO(response.text)))
+            assert rows[0] == ["phone_number_type_id", "name", "modified_date"]
+            names = list(map(lambda r: r[1], rows[1:]))
+        else:
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            phone_number_types = list(map(lambda line: PhoneNumberType(**json.loads(line)),
+                                          filter(lambda line: line != "", response.text.split("\n"))))
+            names = list(map(lambda pnt: pnt.name, phone_number_types))
+        assert names == list(map(lambda epnt: epnt.name, expected_phone_number_types))
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("export_format, filters, order_by, expected_message", [
+    (EExportFormat.NDJSON, "name:hom", None,
+     ResponseMessage(title="Non-existing fields in filter string.",
+                     description=f"{E400BadRequest.INVALID_FIELDS_IN_FILTER_STRING}: "
+                                 f"Filter string contains fields: '['name']' some of which "
+                                 f"do not exist in phone number type filtering fields: "
+                                 f"['name_phrase'].",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (EExportFormat.CSV, "name_phrase", None,
+     ResponseMessage(title="Invalid filter string.",
+                     description=f"{E400BadRequest.INVALID_FILTER_STRING}: "
+                                 f"Invalid filter string: name_phrase.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (EExportFormat.CSV, None, "name_phrase",
+     ResponseMessage(title="Non-existing column for ordering.",
+                     description=f"{E400BadRequest.INVALID_ORDERING_COLUMN_NAME}: "
+                                 f"Column does not exist in phone number types view ('name_phrase').",
+                     code=status.HTTP_400_BAD_REQUEST))
+])
+def test_export_phone_number_types_should_return_400_response(client, monkeypatch,
+                                                              export_format: EExportFormat,
+                                                              filters: Optional[str], order_by: Optional[str],
+                                                              expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+
+        # Act
+        response = client.get("/export_phone_number_types",
+                              params={'filters': filters, 'order_by': order_by,
+                                      'export_format': export_format.value},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.headers["content-type"].startswith("application/json")
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
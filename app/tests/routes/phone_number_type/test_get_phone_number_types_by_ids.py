@@ -0,0 +1,213 @@
+import pytest
+from typing import List, Optional
+from starlette.testclient import TestClient
+from fastapi import status
+from pytest import MonkeyPatch
+
+from app.config import BatchConfig, PhoneNumberTypeCacheConfig
+from app.models import ResponseMessage, AWFAPIRegisteredUser, PhoneNumberTypeInput, PhoneNumberType, E400BadRequest
+from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory,
+                           PhoneNumberTypeFactory)
+from app.providers import PhoneNumberTypeProvider
+
+from app.routes import jwt_authentication as jwt_authentication_routes
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import phone_number_type as phone_number_type_routes
+from app import oauth2_handlers
+
+from app.tests.fixtures.fixtures_entry_lists import awfapi_nonreadonly_user, awfapi_readonly_user, phone_number_types_db
+from app.tests.fixtures.fixtures_tests import (register_test_user, obtain_access_token, insert_test_phone_number_types,
+                                               create_tables, drop_tables, drop_collection)
+
+
+mongodb_connection_string, mongodb_collection_name, mongodb_engine = MongoDBFactory.get_db_connection_details(test_suffix="_test")
+awfapi_user_provider, awfapi_user_service = AWFAPIUserFactory.get_provider_and_service(mongodb_connection_string, mongodb_collection_name, mongodb_engine)
+jwt_authentication_service = JWTAuthenticationFactory.get_service(awfapi_user_provider, awfapi_user_service)
+
+postgresdb_connection_string, postgresdb_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_test")
+phone_number_type_provider = PhoneNumberTypeFactory.get_provider(postgresdb_connection_string, postgresdb_engine)
+
+
+@pytest.fixture()
+def client():
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def fixtures_before_test(monkeypatch: MonkeyPatch) -> List[int]:
+    create_tables(postgresdb_engine)
+
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_provider', awfapi_user_provider)
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_service', awfapi_user_service)
+    monkeypatch.setattr(jwt_authentication_routes, 'jwt_auth_service', jwt_authentication_service)
+    monkeypatch.setattr(oauth2_handlers, 'jwt_auth_service', jwt_authentication_service)
+
+    monkeypatch.setattr(phone_number_type_routes, 'phone_number_type_provider', phone_number_type_provider)
+
+    return insert_test_phone_number_types(postgresdb_engine, postgresdb_connection_string)
+
+
+def fixtures_after_test() -> None:
+    drop_collection(mongodb_engine, mongodb_collection_name)
+    drop_tables(postgresdb_engine)
+
+
+@pytest.mark.parametrize("is_cache_enabled", [False, True])
+@pytest.mark.parametrize("awfapi_registered_user, phone_number_type_indices, expected_phone_number_types", [
+    (awfapi_nonreadonly_user, [0, 2], [phone_number_types_db[0], phone_number_types_db[2]]),
+    (awfapi_readonly_user, [4, 0, 3], [phone_number_types_db[4], phone_number_types_db[0], phone_number_types_db[3]]),
+    (awfapi_readonly_user, [1, None, 1], [phone_number_types_db[1], None, phone_number_types_db[1]]),
+    (awfapi_readonly_user, [None], [None])
+])
+def test_get_phone_number_types_by_ids_should_return_200_response(client, monkeypatch, is_cache_enabled: bool,
+                                                                  awfapi_registered_user: AWFAPIRegisteredUser,
+                                                                  phone_number_type_indices: List[Optional[int]],
+                                                                  expected_phone_number_types: List[Optional[PhoneNumberTypeInput]]
+                                                                  ) -> None:
+    try:
+        # Arrange
+        phone_number_type_ids = fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_registered_user)
+        access_token = obtain_access_token(client, awfapi_registered_user)
+        phone_number_type_cache_config = PhoneNumberTypeCacheConfig(is_enabled=is_cache_enabled)
+        monkeypatch.setattr(PhoneNumberTypeCacheConfig, "from_json", staticmethod(lambda: phone_number_type_cache_config))
+        requested_ids = list(map(lambda i: phone_number_type_ids[i] if i is not None else max(phone_number_type_ids) + 1,
+                                 phone_number_type_indices))
+
+        # Act
+        response = client.get("/get_phone_number_types_by_ids", params={'phone_number_type_ids': requested_ids},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        response_list = response.json()
+        assert len(response_list) == len(expected_phone_number_types)
+        for rd, ri, epnt in zip(response_list, requested_ids, expected_phone_number_types):
+            if epnt is None:
+                assert rd is None
+                continue
+            phone_number_type = PhoneNumberType(**rd)
+            assert phone_number_type.phone_number_type_id == ri
+            assert phone_number_type.name == epnt.name
+            assert phone_number_type.modified_date is not None
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("phone_number_type_indices, expected_phone_number_types", [
+    ([3, None, 0], [phone_number_types_db[3], None, phone_number_types_db[0]])
+])
+def test_get_phone_number_types_by_ids_should_return_cached_phone_number_types(
+        client, monkeypatch, phone_number_type_indices: List[Optional[int]],
+        expected_phone_number_types: List[Optional[PhoneNumberTypeInput]]) -> None:
+    try:
+        # Arrange
+        phone_number_type_ids = fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+        phone_number_type_cache_config = PhoneNumberTypeCacheConfig(is_enabled=True)
+        monkeypatch.setattr(PhoneNumberTypeCacheConfig, "from_json", staticmethod(lambda: phone_number_type_cache_config))
+
+        def raise_on_database_select(*_):
+            raise AssertionError("Phone number types by ids were selected from the database.")
+
+        monkeypatch.setattr(PhoneNumberTypeProvider, "get_phone_number_types_by_ids_statement",
+                            staticmethod(raise_on_database_select))
+        requested_ids = list(map(lambda i: phone_number_type_ids[i] if i is not None else max(phone_number_type_ids) + 1,
+                                 phone_number_type_indices))
+
+        # Act
+        responses = list(map(lambda _: client.get("/get_phone_number_types_by_ids",
+                                                  params={'phone_number_type_ids': requested_ids},
+                                                  headers={'Authorization': f"Bearer {access_token}"}),
+                             range(2)))
+
+        # Assert
+        for response in responses:
+            assert response.status_code == status.HTTP_200_OK
+            response_list = response.json()
+            assert len(response_list) == len(expected_phone_number_types)
+            for rd, ri, epnt in zip(response_list, requested_ids, expected_phone_number_types):
+                if epnt is None:
+                    assert rd is None
+                    continue
+                phone_number_type = PhoneNumberType(**rd)
+                assert phone_number_type.phone_number_type_id == ri
+                assert phone_number_type.name == epnt.name
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("max_ids, phone_number_types_count, expected_message", [
+    (2, 3, ResponseMessage(title="Limit exceeded.",
+                           description=f"{E400BadRequest.LIMIT_EXCEEDED}: List of 3 ids exceeds the maximum of 2 ids.",
+                           code=status.HTTP_400_BAD_REQUEST)),
+    (0, 1, ResponseMessage(title="Limit exceeded.",
+                           description=f"{E400BadRequest.LIMIT_EXCEEDED}: List of 1 ids exceeds the maximum of 0 ids.",
+                           code=status.HTTP_400_BAD_REQUEST))
+])
+def test_get_phone_number_types_by_ids_should_return_400_response(client, monkeypatch,
+                                                                  max_ids: int, phone_number_types_count: int,
+                                                                  expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        phone_number_type_ids = fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+        batch_config = BatchConfig(max_ids=max_ids)
+        monkeypatch.setattr(BatchConfig, "from_json", staticmethod(lambda: batch_config))
+
+        # Act
+        response = client.get("/get_phone_number_types_by_ids",
+                              params={'phone_number_type_ids': phone_number_type_ids[:phone_number_types_count]},
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        message = ResponseMessage(**response.json()['detail'])
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("phone_number_type_ids", [
+    None,
+    ["one"]
+])
+def test_get_phone_number_types_by_ids_should_return_422_response(client, monkeypatch,
+                                                                  phone_number_type_ids: Optional[List[str]]) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+        params = {'phone_number_type_ids': phone_number_type_ids} if phone_number_type_ids is not None else {}
+
+        # Act
+        response = client.get("/get_phone_number_types_by_ids", params=params,
+                              headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
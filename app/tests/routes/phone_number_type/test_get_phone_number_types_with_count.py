@@ -0,0 +1,197 @@
+import pytest
+from typing import Optional, List
+from starlette.testclient import TestClient
+from fastapi import status
+from pytest import MonkeyPatch
+
+from app.config import PhoneNumberTypeCacheConfig
+from app.models import (ResponseMessage, AWFAPIRegisteredUser, EOrderType, PhoneNumberTypeInput, PhoneNumberType,
+                        ListCountMessage, E400BadRequest, E401Unauthorized)
+from app.factories import (MongoDBFactory, PostgresDBFactory, AWFAPIUserFactory, JWTAuthenticationFactory,
+                           PhoneNumberTypeFactory)
+
+from app.routes import jwt_authentication as jwt_authentication_routes
+from app.routes import awfapi_user as awfapi_user_routes
+from app.routes import phone_number_type as phone_number_type_routes
+from app import oauth2_handlers
+
+from app.tests.fixtures.fixtures_entry_lists import awfapi_nonreadonly_user, awfapi_readonly_user, phone_number_types_db
+from app.tests.fixtures.fixtures_tests import (register_test_user, obtain_access_token, insert_test_phone_number_types,
+                                               create_tables, drop_tables, drop_collection)
+
+
+mongodb_connection_string, mongodb_collection_name, mongodb_engine = MongoDBFactory.get_db_connection_details(test_suffix="_test")
+awfapi_user_provider, awfapi_user_service = AWFAPIUserFactory.get_provider_and_service(mongodb_connection_string, mongodb_collection_name, mongodb_engine)
+jwt_authentication_service = JWTAuthenticationFactory.get_service(awfapi_user_provider, awfapi_user_service)
+
+postgresdb_connection_string, postgresdb_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_test")
+phone_number_type_provider = PhoneNumberTypeFactory.get_provider(postgresdb_connection_string, postgresdb_engine)
+
+
+@pytest.fixture()
+def client():
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def fixtures_before_test(monkeypatch: MonkeyPatch, is_cache_enabled: bool = True) -> None:
+    create_tables(postgresdb_engine)
+
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_provider', awfapi_user_provider)
+    monkeypatch.setattr(awfapi_user_routes, 'awfapi_user_service', awfapi_user_service)
+    monkeypatch.setattr(jwt_authentication_routes, 'jwt_auth_service', jwt_authentication_service)
+    monkeypatch.setattr(oauth2_handlers, 'jwt_auth_service', jwt_authentication_service)
+
+    monkeypatch.setattr(phone_number_type_routes, 'phone_number_type_provider', phone_number_type_provider)
+    phone_number_type_cache_config = PhoneNumberTypeCacheConfig(is_enabled=is_cache_enabled)
+    monkeypatch.setattr(PhoneNumberTypeCacheConfig, "from_json", staticmethod(lambda: phone_number_type_cache_config))
+
+    insert_test_phone_number_types(postgresdb_engine, postgresdb_connection_string)
+
+
+def fixtures_after_test() -> None:
+    drop_collection(mongodb_engine, mongodb_collection_name)
+    drop_tables(postgresdb_engine)
+
+
+@pytest.mark.parametrize("is_cache_enabled", [False, True])
+@pytest.mark.parametrize("awfapi_registered_user, filters, order_by, order_type, offset, limit, "
+                         "expected_count, expected_phone_number_types", [
+    (awfapi_nonreadonly_user, None, None, "asc", 0, 2, 5, [phone_number_types_db[0], phone_number_types_db[1]]),
+    (awfapi_readonly_user, None, None, "asc", 4, 2, 5, [phone_number_types_db[4]]),
+    (awfapi_readonly_user, "name_phrase:hom", "name", "desc", 1, 1, 3, [phone_number_types_db[3]]),
+    (awfapi_readonly_user, "name_phrase:hom", None, "asc", 5, 2, 3, []),
+    (awfapi_readonly_user, "name_phrase:xyz", None, "asc", 0, 10, 0, [])
+])
+def test_get_phone_number_types_with_count_should_return_200_response(client, monkeypatch, is_cache_enabled: bool,
+                                                                      awfapi_registered_user: AWFAPIRegisteredUser,
+                                                                      filters: Optional[str],
+                                                                      order_by: Optional[str],
+                                                                      order_type: Optional[EOrderType],
+                                                                      offset: int, limit: int, expected_count: int,
+                                                                      expected_phone_number_types: List[PhoneNumberTypeInput]
+                                                                      ) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch, is_cache_enabled)
+        register_test_user(awfapi_user_service, awfapi_registered_user)
+        access_token = obtain_access_token(client, awfapi_registered_user)
+        params = {'filters': filters, 'order_by': order_by, 'order_type': order_type, 'offset': offset, 'limit': limit}
+
+        # Act
+        response = client.get("/get_phone_number_types_with_count", params=params,
+                              headers={'Authorization': f"Bearer {access_token}"})
+        total_count_response = client.get("/get_phone_number_types", params=dict(params, is_total_count=True),
+                                          headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        list_count_message = ListCountMessage[PhoneNumberType](**response.json())
+        assert list_count_message.entity == "Phone number type"
+        assert list_count_message.count == expected_count
+        assert list(map(lambda pnt: pnt.name, list_count_message.items)) == \
+               list(map(lambda epnt: epnt.name, expected_phone_number_types))
+
+        assert total_count_response.status_code == status.HTTP_200_OK
+        assert total_count_response.headers["X-Total-Count"] == str(expected_count)
+        assert list(map(lambda rd: PhoneNumberType(**rd).name, total_count_response.json())) == \
+               list(map(lambda epnt: epnt.name, expected_phone_number_types))
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("is_cache_enabled", [False, True])
+@pytest.mark.parametrize("filters, order_by, order_type, offset, limit, expected_message", [
+    (None, None, "asc", -1, 0,
+     ResponseMessage(title="Invalid value for SQL clause.",
+                     description=f"{E400BadRequest.INVALID_SQL_VALUE}: Value '-1' is invalid for SKIP clause.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (None, None, "asc", 0, -1,
+     ResponseMessage(title="Invalid value for SQL clause.",
+                     description=f"{E400BadRequest.INVALID_SQL_VALUE}: Value '-1' is invalid for LIMIT clause.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    ("name:hom", None, "asc", 0, 0,
+     ResponseMessage(title="Non-existing fields in filter string.",
+                     description=f"{E400BadRequest.INVALID_FIELDS_IN_FILTER_STRING}: "
+                                 f"Filter string contains fields: '['name']' some of which "
+                                 f"do not exist in phone number type filtering fields: "
+                                 f"['name_phrase'].",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    ("name_phrase", None, "asc", 0, 0,
+     ResponseMessage(title="Invalid filter string.",
+                     description=f"{E400BadRequest.INVALID_FILTER_STRING}: "
+                                 f"Invalid filter string: name_phrase.",
+                     code=status.HTTP_400_BAD_REQUEST)),
+    (None, "name_phrase", "asc", 0, 0,
+     ResponseMessage(title="Non-existing column for ordering.",
+                     description=f"{E400BadRequest.INVALID_ORDERING_COLUMN_NAME}: "
+                                 f"Column does not exist in phone number types view ('name_phrase').",
+                     code=status.HTTP_400_BAD_REQUEST))
+])
+def test_get_phone_number_types_with_count_should_return_400_response(client, monkeypatch, is_cache_enabled: bool,
+                                                                      filters: Optional[str],
+                                                                      order_by: Optional[str],
+                                                                      order_type: Optional[EOrderType],
+                                                                      offset: int, limit: int,
+                                                                      expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch, is_cache_enabled)
+        register_test_user(awfapi_user_service, awfapi_readonly_user)
+        access_token = obtain_access_token(client, awfapi_readonly_user)
+        params = {'filters': filters, 'order_by': order_by, 'order_type': order_type, 'offset': offset, 'limit': limit}
+
+        # Act
+        response = client.get("/get_phone_number_types_with_count", params=params,
+                              headers={'Authorization': f"Bearer {access_token}"})
+        total_count_response = client.get("/get_phone_number_types", params=dict(params, is_total_count=True),
+                                          headers={'Authorization': f"Bearer {access_token}"})
+
+        # Assert
+        for r in [response, total_count_response]:
+            assert r.status_code == status.HTTP_400_BAD_REQUEST
+            assert "X-Total-Count" not in r.headers
+            message = ResponseMessage(**r.json()['detail'])
+            assert message.title == expected_message.title
+            assert message.description == expected_message.description
+            assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
+
+
+@pytest.mark.parametrize("expected_message", [
+    ResponseMessage(title="JWT token not provided or wrong encoded.",
+                    description=f"{E401Unauthorized.INVALID_JWT_TOKEN}: "
+                                f"User did not provide or the JWT token is wrongly encoded.",
+                    code=status.HTTP_401_UNAUTHORIZED)
+])
+def test_get_phone_number_types_with_count_should_return_401_response(client, monkeypatch,
+                                                                      expected_message: ResponseMessage) -> None:
+    try:
+        # Arrange
+        fixtures_before_test(monkeypatch)
+
+        # Act
+        response = client.get("/get_phone_number_types_with_count")
+
+        # Assert
+        message = ResponseMessage(**response.json())
+        assert message.title == expected_message.title
+        assert message.description == expected_message.description
+        assert message.code == expected_message.code
+
+    except Exception as e:
+        fixtures_after_test()
+        raise e
+    else:
+        fixtures_after_test()
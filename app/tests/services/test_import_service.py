@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from typing import List
+
+from app.models import EExportFormat, ImportReport
+from app.services import ImportService
+
+from app.tests.fixtures.fixtures_entry_lists import person_phones
+from app.tests.fixtures.fixtures_person_provider_stub import PersonProviderStub
+from app.tests.fixtures.fixtures_phone_number_type_provider_stub import PhoneNumberTypeProviderStub
+from app.tests.fixtures.fixtures_person_phone_provider_stub import PersonPhoneProviderStub
+
+
+@pytest.mark.parametrize("chunks, import_format, expected_imported_count, expected_error_rows", [
+    ([b'{"person_type": "GC", "first_name": "John", "last_name": "Doe"}\n',
+      b'{"person_type": "EM", "first_name": "Joan", "last_name": "Doe", "email_promotion": 1}\n'],
+     EExportFormat.NDJSON, 2, []),
+    ([b'{"person_type": "GC", "first_name": "John", "last_name": "Doe"}\n{"person_type": "XX", "first_',
+      b'name": "Joan", "last_name": "Doe"}\n\n[1, 2]\n{"person_type": "SC", "last_name": "Doe"}\n'],
+     EExportFormat.NDJSON, 1, [2, 4, 5]),
+    ([b'person_type,first_name,last_name,title\nGC,John,Doe,\nEM,"Joan\n', b'Mary",Doe,Ms.\nGC,Jim\n'],
+     EExportFormat.CSV, 2, [5]),
+    ([b'person_type,first_name,last_name,demographics\nGC,John,Doe,<d/>\nGC,Jim,Doe,invalid\nGC,Joan,Doe,\n'],
+     EExportFormat.CSV, 2, [3]),
+])
+def test_import_persons_should_return_expected_report(chunks: List[bytes], import_format: EExportFormat,
+                                                      expected_imported_count: int, expected_error_rows: List[int]):
+    # Arrange
+    import_service: ImportService = ImportService(person_provider=PersonProviderStub([]))
+    # Act
+    import_report = asyncio.run(import_service.import_persons(__get_chunks(chunks), import_format))
+    # Assert
+    assert import_report.entity == "person"
+    assert import_report.imported_count == expected_imported_count
+    assert import_report.failed_count == len(expected_error_rows)
+    assert sorted(map(lambda e: e.row, import_report.errors)) == expected_error_rows
+
+
+def test_import_phone_number_types_should_return_expected_report():
+    # Arrange
+    import_service: ImportService = ImportService(phone_number_type_provider=PhoneNumberTypeProviderStub([]))
+    chunks = list([b'{"name": "Remote work"}\n{"name": null}\n{"name": "Abroad work"}'])
+    # Act
+    import_report = asyncio.run(import_service.import_phone_number_types(__get_chunks(chunks), EExportFormat.NDJSON))
+    # Assert
+    assert import_report.imported_count == 2
+    assert import_report.failed_count == 1
+    assert import_report.errors[0].row == 2
+
+
+def test_import_person_phones_should_report_skipped_person_phones():
+    # Arrange
+    import_service: ImportService = ImportService(person_phone_provider=PersonPhoneProviderStub(person_phones))
+    chunks = list([b'business_entity_id,phone_number,phone_number_type_id\n',
+                   b'1,111 111 111,1\n1,000 000 000,1\n2,222 222 222,x\n'])
+    # Act
+    import_report = asyncio.run(import_service.import_person_phones(__get_chunks(chunks), EExportFormat.CSV))
+    # Assert
+    assert import_report.imported_count == 1
+    assert import_report.failed_count == 2
+    assert list(map(lambda e: e.row, import_report.errors)) == [4, 3]
+
+
+def test_import_persons_should_limit_reported_errors():
+    # Arrange
+    import_service: ImportService = ImportService(person_provider=PersonProviderStub([]))
+    chunks = list([b"[]\n" * 1500])
+    # Act
+    import_report: ImportReport = asyncio.run(import_service.import_persons(__get_chunks(chunks),
+                                                                            EExportFormat.NDJSON))
+    # Assert
+    assert import_report.failed_count == 1500
+    assert len(import_report.errors) == 1000
+
+
+async def __get_chunks(chunks: List[bytes]):
+    for chunk in chunks:
+        yield chunk
@@ -1,7 +1,8 @@
 import pytest
-from typing import List
+from typing import Optional, List
 
-from app.models import PersonPhone
+from app import errors
+from app.models import PersonPhone, Person, EPersonType
 from app.services import PersonPhoneService
 
 from app.tests.fixtures.fixtures_entry_lists import person_phones
@@ -28,6 +29,27 @@ def test_get_persons_person_phones_should_return_valid_objects(person_id: int,
         assert rpp[0].phone_number_type_id == epp.phone_number_type_id
 
 
+@pytest.mark.parametrize("person_ids, expected_phone_numbers", [
+    ([4, 1, 6], [["123456789"], ["000 000 000", "666 666 666", "999 000 999"], []]),
+    ([5], [["338 94 95", "8880 23453"]]),
+    ([], []),
+])
+def test_get_persons_with_phones_should_return_persons_with_their_person_phones(
+        person_ids: List[int], expected_phone_numbers: List[List[str]]):
+    # Arrange
+    person_phone_service: PersonPhoneService = PersonPhoneService(PersonPhoneProviderStub(person_phones))
+    persons = list(map(lambda pi: Person(business_entity_id=pi, person_type=EPersonType.GC,
+                                         first_name="John", last_name="Doe"), person_ids))
+    # Act
+    persons_with_phones = person_phone_service.get_persons_with_phones(persons)
+    # Assert
+    assert list(map(lambda pwp: pwp.person.business_entity_id, persons_with_phones)) == person_ids
+    assert list(map(lambda pwp: list(map(lambda pp: pp[0].phone_number, pwp.person_phones)),
+                    persons_with_phones)) == expected_phone_numbers
+    for pwp in persons_with_phones:
+        assert all(map(lambda pp: pp[1].phone_number_type_id == pp[0].phone_number_type_id, pwp.person_phones))
+
+
 @pytest.mark.parametrize("phone_number_type_id, expected_person_phones", [
     (1, [person_phones[0], person_phones[1]]),
     (2, [person_phones[2]]),
@@ -46,3 +68,40 @@ def test_get_phone_number_types_person_phones_should_return_valid_objects(phone_
         assert rpp[0].business_entity_id == epp.business_entity_id
         assert rpp[0].phone_number == epp.phone_number
         assert rpp[0].phone_number_type_id == epp.phone_number_type_id
+
+
+@pytest.mark.parametrize("person_id, dependent_person_phones, expected_error", [
+    (1, [person_phones[0], person_phones[1], person_phones[2]], errors.ExistingDependentEntityError),
+    (6, [], None)
+])
+def test_has_person_person_phones_should_raise_expected_error_if_any_exist(person_id: int,
+                                                                           dependent_person_phones: List[PersonPhone],
+                                                                           expected_error: Optional[type]):
+    # Arrange
+    person_phone_service: PersonPhoneService = PersonPhoneService(PersonPhoneProviderStub(dependent_person_phones))
+    # Act
+    # Assert
+    if expected_error is not None:
+        with pytest.raises(expected_error) as e:
+            person_phone_service.has_person_person_phones(person_id)
+        assert f"Dependent {len(dependent_person_phones)} person phone entries" in str(e.value)
+    else:
+        person_phone_service.has_person_person_phones(person_id)
+
+
+@pytest.mark.parametrize("phone_number_type_id, dependent_person_phones, expected_error", [
+    (3, [person_phones[3], person_phones[4], person_phones[6]], errors.ExistingDependentEntityError),
+    (6, [], None)
+])
+def test_has_phone_number_type_person_phones_should_raise_expected_error_if_any_exist(
+        phone_number_type_id: int, dependent_person_phones: List[PersonPhone], expected_error: Optional[type]):
+    # Arrange
+    person_phone_service: PersonPhoneService = PersonPhoneService(PersonPhoneProviderStub(dependent_person_phones))
+    # Act
+    # Assert
+    if expected_error is not None:
+        with pytest.raises(expected_error) as e:
+            person_phone_service.has_phone_number_type_person_phones(phone_number_type_id)
+        assert f"Dependent {len(dependent_person_phones)} person phone entries" in str(e.value)
+    else:
+        person_phone_service.has_phone_number_type_person_phones(phone_number_type_id)
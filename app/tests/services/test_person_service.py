@@ -4,6 +4,7 @@ import datetime as dt
 from typing import Optional, List, Type
 
 from app.models import Person, EPersonType
+from app.caches import PersonNameIndex
 from app.services import PersonService
 from app import errors
 
@@ -60,3 +61,169 @@ def test_get_persons_by_phrases_should_return_valid_objects_or_raise_error(first
         # Assert
         with pytest.raises(expected_error):
             person_service.get_persons_by_phrases(first_name_phrase, last_name_phrase)
+
+
+@pytest.mark.parametrize("first_name_phrase, last_name_phrase, limit, expected_persons", [
+    ("john", None, None, [persons[0], persons[1], persons[2], persons[3], persons[4]]),
+    ("john", None, 2, [persons[0], persons[1]]),
+    (None, "smi", 0, [])
+])
+def test_get_persons_by_phrases_should_return_limited_ranked_objects(first_name_phrase: Optional[str],
+                                                                     last_name_phrase: Optional[str],
+                                                                     limit: Optional[int],
+                                                                     expected_persons: List[Person]) -> None:
+    # Arrange
+    person_service: PersonService = PersonService(PersonProviderStub(expected_persons))
+
+    # Act
+    returned_persons = person_service.get_persons_by_phrases(first_name_phrase, last_name_phrase,
+                                                             is_raised_error_if_empty=False,
+                                                             is_ranked=True, limit=limit)
+
+    # Assert
+    assert list(map(lambda p: p.business_entity_id, returned_persons)) == \
+           list(map(lambda p: p.business_entity_id, expected_persons))
+
+
+@pytest.mark.parametrize("limit, cursor, is_ranked, expected_persons, expected_next_cursor, expected_error", [
+    (None, None, False, persons, None, None),
+    (4, None, False, persons[:4], "4", None),
+    (4, "8", False, persons[8:], None, None),
+    (4, None, True, persons[:4], None, None),
+    (4, "4", True, [], None, errors.InvalidCursorError),
+    (1001, None, False, [], None, errors.InvalidSQLValueError)
+])
+def test_get_persons_page_by_phrases_should_return_bounded_page_or_raise_error(limit: Optional[int],
+                                                                               cursor: Optional[str],
+                                                                               is_ranked: bool,
+                                                                               expected_persons: List[Person],
+                                                                               expected_next_cursor: Optional[str],
+                                                                               expected_error: Optional[Type[Exception]]
+                                                                               ) -> None:
+    # Arrange
+    person_service: PersonService = PersonService(PersonProviderStub(persons))
+
+    if expected_error is None:
+        # Act
+        returned_persons, next_cursor = person_service.get_persons_page_by_phrases("john", None,
+                                                                                   is_ranked=is_ranked,
+                                                                                   limit=limit, cursor=cursor)
+
+        # Assert
+        assert returned_persons == expected_persons
+        assert next_cursor == expected_next_cursor
+    else:
+        # Act
+        # Assert
+        with pytest.raises(expected_error):
+            person_service.get_persons_page_by_phrases("john", None, is_ranked=is_ranked, limit=limit, cursor=cursor)
+
+
+def test_stream_persons_by_phrases_should_return_all_persons_in_batches() -> None:
+    # Arrange
+    person_service: PersonService = PersonService(PersonProviderStub(persons))
+
+    # Act
+    person_batches = list(person_service.stream_persons_by_phrases("john", "smi"))
+
+    # Assert
+    assert sum(person_batches, []) == persons
+
+
+@pytest.mark.parametrize("prefix, top_k, is_built, expected_person_ids, expected_error", [
+    ("john a", None, True, [103, 104, 105], None),
+    ("ada", 2, True, [103, 104], None),
+    ("", 10, True, [], errors.EmptyFieldsError),
+    ("jo", 0, True, [], errors.InvalidSQLValueError),
+    ("jo", 101, True, [], errors.InvalidSQLValueError),
+    ("jo", 10, False, [], errors.IndexNotBuiltError)
+])
+def test_get_person_names_by_prefix_should_return_indexed_names_or_raise_error(prefix: str,
+                                                                               top_k: Optional[int],
+                                                                               is_built: bool,
+                                                                               expected_person_ids: List[int],
+                                                                               expected_error: Optional[Type[Exception]]
+                                                                               ) -> None:
+    # Arrange
+    if is_built:
+        PersonNameIndex.build(map(lambda p: (p.business_entity_id, p.first_name, p.last_name), persons[:5]))
+
+    try:
+        if expected_error is None:
+            # Act
+            person_names = PersonService.get_person_names_by_prefix(prefix, top_k)
+
+            # Assert
+            assert list(map(lambda pn: pn.business_entity_id, person_names)) == expected_person_ids
+        else:
+            # Act
+            # Assert
+            with pytest.raises(expected_error):
+                PersonService.get_person_names_by_prefix(prefix, top_k)
+    finally:
+        PersonNameIndex.clear()
+
+
+@pytest.mark.parametrize("first_name_phrase, last_name_phrase, is_alternative, expected_person_ids", [
+    ("john", None, False, [105, 104, 103, 101, 102]),
+    ("ron", "smi", False, [107, 109]),
+    ("ron", "smi", True, [107, 110, 102, 109, 108])
+])
+def test_get_persons_by_phrases_should_use_person_search_engine_if_loaded(first_name_phrase: Optional[str],
+                                                                          last_name_phrase: Optional[str],
+                                                                          is_alternative: bool,
+                                                                          expected_person_ids: List[int]) -> None:
+    # Arrange
+    person_service: PersonService = PersonService(PersonProviderStub(persons))
+    person_service.load_person_search_engine()
+
+    # Act
+    returned_persons = person_service.get_persons_by_phrases(first_name_phrase, last_name_phrase,
+                                                             is_alternative=is_alternative)
+
+    # Assert
+    assert list(map(lambda p: p.business_entity_id, returned_persons)) == expected_person_ids
+
+
+def test_get_persons_page_by_phrases_should_return_current_persons_found_by_person_search_engine() -> None:
+    # Arrange
+    person_provider_stub = PersonProviderStub(list(persons))
+    person_service: PersonService = PersonService(person_provider_stub)
+    person_service.load_person_search_engine()
+    renamed_person = persons[2].copy(update={"first_name": "Jonathan"})
+    person_provider_stub.data = list(filter(lambda p: p.business_entity_id not in [103, 105], persons)) + \
+        list([renamed_person])
+
+    # Act
+    returned_persons, _ = person_service.get_persons_page_by_phrases("john", None)
+
+    # Assert
+    assert list(map(lambda p: p.business_entity_id, returned_persons)) == [104, 103, 101, 102]
+    assert returned_persons[1].first_name == "Jonathan"
+
+
+@pytest.mark.parametrize("fields, expected_fields, expected_error", [
+    ("first_name,last_name", {"business_entity_id", "first_name", "last_name"}, None),
+    ("-rowguid,-modified_date", {"business_entity_id", "person_type", "title",
+                                 "first_name", "middle_name", "last_name", "suffix",
+                                 "additional_contact_info", "demographics"}, None),
+    ("first_name,-last_name", None, errors.ColumnNotFoundError)
+])
+def test_get_persons_page_by_phrases_should_return_persons_with_projected_fields_only(
+        fields: str, expected_fields: Optional[set], expected_error: Optional[Type[Exception]]) -> None:
+    # Arrange
+    person_service: PersonService = PersonService(PersonProviderStub(persons))
+    person_service.load_person_search_engine()
+
+    if expected_error is None:
+        # Act
+        returned_persons, _ = person_service.get_persons_page_by_phrases("john", None, fields=fields)
+
+        # Assert
+        assert len(returned_persons) == 5
+        assert all(map(lambda p: set(p.dict().keys()) == expected_fields, returned_persons))
+    else:
+        # Act
+        # Assert
+        with pytest.raises(expected_error):
+            person_service.get_persons_page_by_phrases("john", None, fields=fields)
@@ -0,0 +1,28 @@
+import datetime as dt
+import pytest
+from typing import Any, List, Sequence
+
+from app.copy_loader import CopyLoader
+from app.models import EPersonType, PhoneNumberType
+
+
+@pytest.mark.parametrize("records, expected_copy_data", [
+    ([], ""),
+    ([(1, "Cell", dt.datetime(2020, 1, 1, 0, 0, 0))], "1\tCell\t2020-01-01 00:00:00\n"),
+    ([(1, None), (2, EPersonType.GC)], "1\t\\N\n2\tGC\n"),
+    ([("a\tb", "c\nd\re", "f\\g")], "a\\tb\tc\\nd\\re\tf\\\\g\n"),
+])
+def test_get_copy_data_should_return_copy_text_format(records: List[Sequence[Any]], expected_copy_data: str):
+    # Act
+    copy_data = CopyLoader.get_copy_data(records)
+    # Assert
+    assert copy_data == expected_copy_data
+
+
+def test_get_copy_sql_should_return_quoted_copy_command():
+    # Arrange
+    columns = CopyLoader.get_columns(PhoneNumberType, ["name", "modified_date"])
+    # Act
+    copy_sql = CopyLoader.get_copy_sql(PhoneNumberType.__table__.name, columns, PhoneNumberType.__table__.schema)
+    # Assert
+    assert copy_sql == 'COPY "Person"."PhoneNumberType" ("Name", "ModifiedDate") FROM STDIN'
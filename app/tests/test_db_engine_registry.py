@@ -0,0 +1,90 @@
+import asyncio
+
+from app.config import PostgresdbConnectionConfig
+from app.db_engine_registry import DbEngineRegistry
+
+
+def test_get_postgresdb_engine_should_return_the_same_engine_for_the_same_connection_string() -> None:
+    # Arrange
+    connection_string = PostgresdbConnectionConfig.get_db_connection_string(test_suffix="_test")
+
+    # Act
+    db_engine = DbEngineRegistry.get_postgresdb_engine(connection_string)
+    db_engine2 = DbEngineRegistry.get_postgresdb_engine(connection_string)
+
+    # Assert
+    assert db_engine is db_engine2
+
+    DbEngineRegistry.dispose_all()
+
+
+def test_get_postgresdb_engine_should_return_different_engines_for_different_connection_strings() -> None:
+    # Arrange
+    connection_string = PostgresdbConnectionConfig.get_db_connection_string(test_suffix="_test")
+    connection_string2 = PostgresdbConnectionConfig.get_db_connection_string(test_suffix="_test2")
+
+    # Act
+    db_engine = DbEngineRegistry.get_postgresdb_engine(connection_string)
+    db_engine2 = DbEngineRegistry.get_postgresdb_engine(connection_string2)
+
+    # Assert
+    assert db_engine is not db_engine2
+
+    DbEngineRegistry.dispose_all()
+
+
+def test_get_postgresdb_engine_should_configure_connection_pool() -> None:
+    # Arrange
+    connection_string = PostgresdbConnectionConfig.get_db_connection_string(test_suffix="_test")
+    pcc = PostgresdbConnectionConfig.from_json()
+
+    # Act
+    db_engine = DbEngineRegistry.get_postgresdb_engine(connection_string)
+
+    # Assert
+    assert db_engine.pool.size() == pcc.pool_size
+    assert db_engine.pool._max_overflow == pcc.max_overflow
+    assert db_engine.pool._recycle == pcc.pool_recycle
+    assert db_engine.pool._pre_ping == pcc.pool_pre_ping
+
+    DbEngineRegistry.dispose_all()
+
+
+def test_dispose_all_should_clear_registry() -> None:
+    # Arrange
+    connection_string = PostgresdbConnectionConfig.get_db_connection_string(test_suffix="_test")
+    DbEngineRegistry.get_postgresdb_engine(connection_string)
+
+    # Act
+    DbEngineRegistry.dispose_all()
+
+    # Assert
+    assert len(DbEngineRegistry.postgresdb_engines) == 0
+
+
+def test_get_async_postgresdb_engine_should_return_the_same_engine_for_the_same_connection_string() -> None:
+    # Arrange
+    connection_string = PostgresdbConnectionConfig.get_async_db_connection_string(test_suffix="_test")
+
+    # Act
+    db_engine = DbEngineRegistry.get_async_postgresdb_engine(connection_string)
+    db_engine2 = DbEngineRegistry.get_async_postgresdb_engine(connection_string)
+
+    # Assert
+    assert db_engine is db_engine2
+    assert db_engine.dialect.driver == "asyncpg"
+
+    asyncio.run(DbEngineRegistry.dispose_all_async())
+
+
+def test_dispose_all_async_should_clear_registry() -> None:
+    # Arrange
+    DbEngineRegistry.get_postgresdb_engine(PostgresdbConnectionConfig.get_db_connection_string(test_suffix="_test"))
+    DbEngineRegistry.get_async_postgresdb_engine(PostgresdbConnectionConfig.get_async_db_connection_string(test_suffix="_test"))
+
+    # Act
+    asyncio.run(DbEngineRegistry.dispose_all_async())
+
+    # Assert
+    assert len(DbEngineRegistry.postgresdb_engines) == 0
+    assert len(DbEngineRegistry.async_postgresdb_engines) == 0
@@ -0,0 +1,130 @@
+import datetime as dt
+import pytest
+from sqlalchemy.dialects import postgresql
+from typing import Optional
+
+from app import errors
+from app.models import EOrderType, Person, PhoneNumberType, PersonPhone
+from app.providers.person_provider import PersonDbOrder, PersonProvider
+from app.providers.person_phone_provider import PersonPhoneDbOrder
+
+
+person: Person = Person(business_entity_id=5, person_type="EM", title="Mr.", first_name="John", middle_name=None,
+                        last_name="Doe", suffix=None, email_promotion=1, rowguid="92c4279f-1207-48a3-8448-4636514eb7e2",
+                        modified_date=dt.datetime(2023, 1, 27, 9, 19, 1, 123456))
+person_phone: PersonPhone = PersonPhone(business_entity_id=5, phone_number="697-555-0142", phone_number_type_id=1,
+                                        modified_date=dt.datetime(2023, 1, 27, 9, 19, 1))
+phone_number_type: PhoneNumberType = PhoneNumberType(phone_number_type_id=1, name="Cell",
+                                                     modified_date=dt.datetime(2023, 1, 27, 9, 19, 1))
+
+
+@pytest.mark.parametrize("order_by, order_type, expected_key", [
+    (None, EOrderType.ASC, [5]),
+    ("full_name", EOrderType.ASC, ["Doe", "John", None, None, "Mr.", 5]),
+    ("rowguid", EOrderType.DESC, ["92c4279f-1207-48a3-8448-4636514eb7e2", 5]),
+    ("modified_date", EOrderType.DESC, [dt.datetime(2023, 1, 27, 9, 19, 1, 123456), 5])
+])
+def test_decode_cursor_should_return_sort_key_of_encoded_row(order_by: Optional[str], order_type: EOrderType,
+                                                             expected_key: list) -> None:
+    # Arrange
+    keyset_pagination = PersonDbOrder.get_keyset_pagination(order_by, order_type)
+
+    # Act
+    key = keyset_pagination.decode_cursor(keyset_pagination.encode_cursor(person))
+
+    # Assert
+    assert key == expected_key
+
+
+def test_decode_cursor_should_return_sort_key_of_encoded_joined_row() -> None:
+    # Arrange
+    keyset_pagination = PersonPhoneDbOrder.get_keyset_pagination("phone_number_type_name", EOrderType.ASC)
+
+    # Act
+    key = keyset_pagination.decode_cursor(keyset_pagination.encode_cursor((person_phone, person, phone_number_type)))
+
+    # Assert
+    assert key == ["Cell", 5, "697-555-0142", 1]
+
+
+@pytest.mark.parametrize("cursor_order_by, order_by, cursor", [
+    ("full_name", "full_name", "not_a_cursor"),
+    ("full_name", "full_name", "eyJmIjogInBlcnNvbjpmdWxsX25hbWU6YXNjIiwgImsiOiBbXX0"),
+    ("full_name", "modified_date", None),
+    ("person_id", None, None)
+])
+def test_decode_cursor_should_raise_expected_error(cursor_order_by: str, order_by: Optional[str],
+                                                   cursor: Optional[str]) -> None:
+    # Arrange
+    cursor = cursor or PersonDbOrder.get_keyset_pagination(cursor_order_by, EOrderType.ASC).encode_cursor(person)
+    keyset_pagination = PersonDbOrder.get_keyset_pagination(order_by, EOrderType.ASC)
+
+    # Act
+    # Assert
+    with pytest.raises(errors.InvalidCursorError):
+        keyset_pagination.decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("rows_count, limit, is_expected_cursor", [
+    (10, 10, True),
+    (9, 10, False),
+    (0, 10, False),
+    (10, None, False)
+])
+def test_get_next_cursor_should_return_cursor_only_after_full_page(rows_count: int, limit: Optional[int],
+                                                                   is_expected_cursor: bool) -> None:
+    # Arrange
+    keyset_pagination = PersonDbOrder.get_keyset_pagination("full_name", EOrderType.ASC)
+
+    # Act
+    cursor = keyset_pagination.get_next_cursor([person] * rows_count, limit)
+
+    # Assert
+    assert (cursor is not None) == is_expected_cursor
+
+
+@pytest.mark.parametrize("order_by, order_type, expected_where", [
+    (None, EOrderType.ASC, '"Person"."Person"."BusinessEntityID" > 5'),
+    ("email_promotion", EOrderType.DESC,
+     '("Person"."Person"."EmailPromotion", "Person"."Person"."BusinessEntityID") < (1, 5)'),
+    ("full_name", EOrderType.ASC,
+     '"Person"."Person"."LastName" > \'Doe\' OR "Person"."Person"."LastName" = \'Doe\' '
+     'AND "Person"."Person"."FirstName" > \'John\' OR "Person"."Person"."LastName" = \'Doe\' '
+     'AND "Person"."Person"."FirstName" = \'John\' AND "Person"."Person"."MiddleName" IS NULL '
+     'AND "Person"."Person"."Suffix" IS NULL AND ("Person"."Person"."Title" > \'Mr.\' '
+     'OR "Person"."Person"."Title" IS NULL) OR "Person"."Person"."LastName" = \'Doe\' '
+     'AND "Person"."Person"."FirstName" = \'John\' AND "Person"."Person"."MiddleName" IS NULL '
+     'AND "Person"."Person"."Suffix" IS NULL AND "Person"."Person"."Title" = \'Mr.\' '
+     'AND "Person"."Person"."BusinessEntityID" > 5')
+])
+def test_get_persons_page_statement_should_select_rows_after_cursor(order_by: Optional[str], order_type: EOrderType,
+                                                                    expected_where: str) -> None:
+    # Arrange
+    keyset_pagination = PersonDbOrder.get_keyset_pagination(order_by, order_type)
+    cursor = keyset_pagination.encode_cursor(person)
+
+    # Act
+    statement = PersonProvider.get_persons_page_statement(keyset_pagination, limit=10, cursor=cursor)
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    # Assert
+    assert f"WHERE {expected_where} ORDER BY" in sql.replace("\n", "")
+
+
+def test_get_persons_page_statement_should_compare_names_with_given_collation() -> None:
+    # Arrange
+    keyset_pagination = PersonDbOrder.get_keyset_pagination("full_name", EOrderType.ASC, "C")
+    cursor = keyset_pagination.encode_cursor(person)
+
+    # Act
+    statement = PersonProvider.get_persons_page_statement(keyset_pagination, limit=10, cursor=cursor)
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})).replace("\n", "")
+
+    # Assert
+    assert 'WHERE ("Person"."Person"."LastName" COLLATE "C") > \'Doe\' OR "Person"."Person"."LastName" = \'Doe\' ' \
+           'AND ("Person"."Person"."FirstName" COLLATE "C") > \'John\' OR ' in sql
+    assert 'ORDER BY "Person"."Person"."LastName" COLLATE "C" ASC, "Person"."Person"."FirstName" COLLATE "C" ASC, ' \
+           '"Person"."Person"."MiddleName" COLLATE "C" ASC, "Person"."Person"."Suffix" COLLATE "C" ASC, ' \
+           '"Person"."Person"."Title" COLLATE "C" ASC, "Person"."Person"."BusinessEntityID" ASC' in sql
+    with pytest.raises(errors.InvalidCursorError):
+        PersonDbOrder.get_keyset_pagination("full_name", EOrderType.ASC).decode_cursor(cursor)
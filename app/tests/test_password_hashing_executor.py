@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import pytest
+from passlib.context import CryptContext
+
+from app import errors
+from app.config import PasswordHashingConfig
+from app.password_hashing_executor import PasswordHashingExecutor, hash_password_job, verify_password_job
+
+
+pwd_context_string: str = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).to_string()
+
+
+@pytest.fixture
+def password_hashing_config(monkeypatch, request) -> PasswordHashingConfig:
+    config = PasswordHashingConfig(**request.param)
+    monkeypatch.setattr(PasswordHashingConfig, "from_json", staticmethod(lambda: config))
+    PasswordHashingExecutor.shutdown()
+    yield config
+    PasswordHashingExecutor.shutdown()
+
+
+@pytest.mark.parametrize("password_hashing_config", [
+    {"executor_type": "process", "max_workers": 1},
+    {"executor_type": "thread", "max_workers": 1},
+    {"executor_type": "inline"}
+], indirect=True)
+def test_run_should_return_job_results(password_hashing_config: PasswordHashingConfig) -> None:
+    # Arrange
+    password = "testpassword"
+
+    # Act
+    hashed_password = PasswordHashingExecutor.run(hash_password_job, pwd_context_string, password)
+    is_verified = PasswordHashingExecutor.run(verify_password_job, pwd_context_string, password, hashed_password)
+    is_verified_async = asyncio.run(PasswordHashingExecutor.run_async(verify_password_job, pwd_context_string,
+                                                                      "wrongpassword", hashed_password))
+
+    # Assert
+    assert is_verified is True
+    assert is_verified_async is False
+    assert PasswordHashingExecutor.semaphore._value == password_hashing_config.max_in_flight
+
+
+@pytest.mark.parametrize("password_hashing_config", [
+    {"executor_type": "thread", "max_workers": 1, "max_in_flight": 1, "acquire_timeout": 0.01}
+], indirect=True)
+def test_run_should_raise_expected_error_when_too_many_jobs_are_in_flight(
+        password_hashing_config: PasswordHashingConfig) -> None:
+    # Arrange
+    is_released = threading.Event()
+    blocking_job = threading.Thread(target=PasswordHashingExecutor.run, args=(is_released.wait,))
+    blocking_job.start()
+    while PasswordHashingExecutor.semaphore is None or PasswordHashingExecutor.semaphore._value > 0:
+        pass
+
+    # Act
+    # Assert
+    try:
+        with pytest.raises(errors.ServiceOverloadedError):
+            PasswordHashingExecutor.run(hash_password_job, pwd_context_string, "testpassword")
+    finally:
+        is_released.set()
+        blocking_job.join()
+
+
+@pytest.mark.parametrize("password_hashing_config", [
+    {"executor_type": "thread", "max_workers": 1, "max_in_flight": 1, "acquire_timeout": 0.01}
+], indirect=True)
+def test_run_async_should_raise_expected_error_when_too_many_jobs_are_in_flight(
+        password_hashing_config: PasswordHashingConfig) -> None:
+    # Arrange
+    is_started = threading.Event()
+    is_released = threading.Event()
+
+    async def run_jobs() -> None:
+        blocking_job = asyncio.ensure_future(
+            PasswordHashingExecutor.run_async(lambda: is_started.set() or is_released.wait()))
+        while not is_started.is_set():
+            await asyncio.sleep(0.001)
+        try:
+            with pytest.raises(errors.ServiceOverloadedError):
+                await PasswordHashingExecutor.run_async(hash_password_job, pwd_context_string, "testpassword")
+        finally:
+            is_released.set()
+            await blocking_job
+
+    # Act
+    # Assert
+    asyncio.run(run_jobs())
+
+
+@pytest.mark.parametrize("password_hashing_config", [
+    {"executor_type": "inline"}
+], indirect=True)
+def test_shutdown_should_not_break_jobs_in_flight(password_hashing_config: PasswordHashingConfig) -> None:
+    # Arrange
+    is_started = threading.Event()
+    is_released = threading.Event()
+    job_errors = list([])
+
+    def blocking_job() -> None:
+        try:
+            PasswordHashingExecutor.run(lambda: is_started.set() or is_released.wait())
+        except Exception as e:
+            job_errors.append(e)
+
+    job_thread = threading.Thread(target=blocking_job)
+    job_thread.start()
+    is_started.wait()
+
+    # Act
+    PasswordHashingExecutor.shutdown()
+    is_released.set()
+    job_thread.join()
+
+    # Assert
+    assert job_errors == []
+    assert PasswordHashingExecutor.run(hash_password_job, pwd_context_string, "testpassword") is not None
+
+
+@pytest.mark.parametrize("password_hashing_config", [
+    {"executor_type": "fiber"}
+], indirect=True)
+def test_get_executor_should_raise_expected_error_for_unsupported_executor_type(
+        password_hashing_config: PasswordHashingConfig) -> None:
+    # Act
+    # Assert
+    with pytest.raises(ValueError):
+        PasswordHashingExecutor.get_executor()
@@ -0,0 +1,120 @@
+import uuid
+import datetime as dt
+import pytest
+from typing import List, Optional, Type
+
+from app import errors
+from app.models import Person, EPersonType, EOrderType
+from app.person_search_engine import PersonSearchEngine
+from app.providers.person_provider import PersonDbOrder
+
+
+persons: List[Person] = [
+    Person(business_entity_id=1, person_type=EPersonType.EM, title="Mr.", first_name="John", last_name="Doe",
+           rowguid=uuid.UUID("92c4279f-1207-48a3-8448-4636514eb7e2"), modified_date=dt.datetime(2020, 1, 1)),
+    Person(business_entity_id=2, person_type=EPersonType.GC, first_name="Aaron", middle_name="Johnny",
+           last_name="Adams", rowguid=uuid.UUID("d54e0552-c226-4c22-af3b-762ca854cdd3"),
+           modified_date=dt.datetime(2020, 1, 1)),
+    Person(business_entity_id=3, person_type=EPersonType.IN, first_name="Sharon", last_name="Adams",
+           suffix="Jr", rowguid=uuid.UUID("08f5d3bd-82bf-49ba-baed-5616d41ccf24"),
+           modified_date=dt.datetime(2020, 1, 1)),
+    Person(business_entity_id=4, person_type=EPersonType.EM, first_name="Aaron", last_name="Adams",
+           rowguid=uuid.UUID("9cc28d7c-c5c4-4c1d-9e9f-b616f150c482"), modified_date=dt.datetime(2020, 1, 1)),
+    Person(business_entity_id=5, person_type=EPersonType.SP, first_name="Claire", last_name="Johnson",
+           rowguid=uuid.UUID("548302a3-de74-4ee2-bf22-8d1b99bb733d"), modified_date=dt.datetime(2020, 1, 1))
+]
+person_search_engine: PersonSearchEngine = PersonSearchEngine(list(map(
+    lambda p: tuple((p.business_entity_id, p.person_type,
+                     p.title, p.first_name, p.middle_name, p.last_name, p.suffix)), persons)))
+
+
+@pytest.mark.parametrize("filters, is_ordered, is_alternative, limit, expected_person_ids", [
+    ("first_name_phrase:JOHN", True, False, None, [2, 1]),
+    ("first_name_phrase:john", False, False, None, [1, 2]),
+    ("first_name_phrase:aron,last_name_phrase:ada", True, False, None, [2, 4, 3]),
+    ("first_name_phrase:jr", True, False, None, [3]),
+    ("first_name_phrase:mr.,last_name_phrase:john", True, True, None, [1, 5]),
+    ("first_name_phrase:o,last_name_phrase:a", True, False, 2, [2, 4]),
+    ("person_type:EM,first_name_phrase:aaron", True, False, None, [4]),
+    ("last_name_phrase:xyz", True, False, None, [])
+])
+def test_get_person_ids_should_return_ids_of_persons_matching_phrases_in_expected_order(
+        filters: str, is_ordered: bool, is_alternative: bool, limit: Optional[int],
+        expected_person_ids: List[int]) -> None:
+    # Arrange
+    # Act
+    found_person_ids = person_search_engine.get_person_ids(filters, is_ordered, is_alternative, limit)
+
+    # Assert
+    assert found_person_ids == expected_person_ids
+
+
+@pytest.mark.parametrize("filters, limit, expected_error", [
+    ("first_name_phrase:john", -1, errors.InvalidSQLValueError),
+    ("first_name:john", None, errors.FilterNotFoundError),
+    ("first_name_phrase", None, errors.InvalidFilterStringError)
+])
+def test_get_person_ids_should_raise_expected_error(filters: str, limit: Optional[int],
+                                                    expected_error: Type[Exception]) -> None:
+    # Arrange
+    # Act
+    # Assert
+    with pytest.raises(expected_error):
+        person_search_engine.get_person_ids(filters, limit=limit)
+
+
+@pytest.mark.parametrize("is_ordered, limit, expected_pages", [
+    (True, 2, [[2, 4], [3, 1], [5]]),
+    (True, 5, [[2, 4, 3, 1, 5], []]),
+    (False, 2, [[1, 2], [3, 4], [5]]),
+    (False, 1, [[1], [2], [3], [4], [5], []])
+])
+def test_get_person_ids_page_should_return_consecutive_pages(is_ordered: bool, limit: int,
+                                                             expected_pages: List[List[int]]) -> None:
+    # Arrange
+    pages = list([])
+    cursor = None
+
+    # Act
+    while True:
+        person_ids_page, cursor = person_search_engine.get_person_ids_page("last_name_phrase:", is_ordered,
+                                                                           limit=limit, cursor=cursor)
+        pages.append(person_ids_page)
+        if cursor is None:
+            break
+
+    # Assert
+    assert pages == expected_pages
+
+
+@pytest.mark.parametrize("last_names, limit, expected_pages", [
+    (["adams", "Adams", "Ábel", "Zed", "Öz", "de Vries", "Émile"], 2, [[2, 4], [1, 6], [3, 7], [5]]),
+    (["Ábel", "Abel", "abel", "ABEL"], 3, [[4, 2, 3], [1]])
+])
+def test_get_person_ids_page_should_order_names_by_code_points_with_cursors_of_c_collation(
+        last_names: List[str], limit: int, expected_pages: List[List[int]]) -> None:
+    # Arrange
+    mixed_case_person_search_engine = PersonSearchEngine(list(map(
+        lambda il: tuple((il[0] + 1, EPersonType.IN, None, "John", None, il[1], None)), enumerate(last_names))))
+    c_keyset_pagination = PersonDbOrder.get_keyset_pagination("full_name", EOrderType.ASC, PersonSearchEngine.collation)
+    keyset_pagination = PersonDbOrder.get_keyset_pagination("full_name", EOrderType.ASC)
+    pages = list([])
+    cursors = list([])
+    cursor = None
+
+    # Act
+    while True:
+        person_ids_page, cursor = mixed_case_person_search_engine.get_person_ids_page("first_name_phrase:john",
+                                                                                      limit=limit, cursor=cursor)
+        pages.append(person_ids_page)
+        if cursor is None:
+            break
+        cursors.append(cursor)
+
+    # Assert
+    assert pages == expected_pages
+    assert mixed_case_person_search_engine.get_person_ids("first_name_phrase:john") == sum(expected_pages, [])
+    for cursor in cursors:
+        assert c_keyset_pagination.decode_cursor(cursor)[0] in last_names
+        with pytest.raises(errors.InvalidCursorError):
+            keyset_pagination.decode_cursor(cursor)
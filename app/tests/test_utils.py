@@ -1,7 +1,12 @@
+import asyncio
+import json
+import threading
+import datetime as dt
 from typing import Union, Dict, List
 import pytest
 
-from app.models import PrimaryKeyErrorDetails, ForeignKeyErrorDetails
+from app.models import (PrimaryKeyErrorDetails, ForeignKeyErrorDetails, PersonPhone, PhoneNumberType,
+                        EExportFormat, EBatchOperation, E400BadRequest)
 from app import errors, utils
 
 
@@ -208,3 +213,277 @@ def test_get_foreign_key_violence_details_should_return_expected_details(error_m
     assert details.entity == expected_details.entity
     assert details.key_column == expected_details.key_column
     assert details.key_value == expected_details.key_value
+
+
+def test_run_nonblocking_should_await_coroutine_method_in_event_loop_thread() -> None:
+    # Arrange
+    async def method(a: int, b: int = 0) -> int:
+        return threading.get_ident()
+
+    # Act
+    result_thread, loop_thread = asyncio.run(__run_and_get_loop_thread(method, 1, b=2))
+
+    # Assert
+    assert result_thread == loop_thread
+
+
+def test_run_nonblocking_should_run_regular_method_in_threadpool() -> None:
+    # Arrange
+    def method(a: int, b: int = 0) -> int:
+        return threading.get_ident()
+
+    # Act
+    result_thread, loop_thread = asyncio.run(__run_and_get_loop_thread(method, 1, b=2))
+
+    # Assert
+    assert result_thread != loop_thread
+
+
+@pytest.mark.parametrize("models, row, expected_objects", [
+    ([PhoneNumberType], (1, "Cell", dt.datetime(2014, 1, 14)),
+     (PhoneNumberType(phone_number_type_id=1, name="Cell", modified_date=dt.datetime(2014, 1, 14)),)),
+    ([PersonPhone, PhoneNumberType], (1, "555-0100", 2, dt.datetime(2014, 1, 14), 2, "Home", dt.datetime(2014, 1, 15)),
+     (PersonPhone(business_entity_id=1, phone_number="555-0100", phone_number_type_id=2,
+                  modified_date=dt.datetime(2014, 1, 14)),
+      PhoneNumberType(phone_number_type_id=2, name="Home", modified_date=dt.datetime(2014, 1, 15))))
+])
+def test_get_models_from_row_should_return_expected_objects(models: List[type], row: tuple,
+                                                            expected_objects: tuple) -> None:
+    # Arrange
+    # Act
+    model_objects = utils.get_models_from_row(models, row)
+
+    # Assert
+    assert len(model_objects) == len(expected_objects)
+    for mo, eo in zip(model_objects, expected_objects):
+        assert type(mo) == type(eo)
+        assert mo.dict() == eo.dict()
+
+
+
+phone_number_types: List[PhoneNumberType] = [
+    PhoneNumberType(phone_number_type_id=1, name="Cell", modified_date=dt.datetime(2014, 1, 14)),
+    PhoneNumberType(phone_number_type_id=2, name="Home", modified_date=dt.datetime(2014, 1, 15))
+]
+
+
+def test_get_ndjson_stream_should_return_one_json_line_per_model() -> None:
+    # Arrange
+    batches = iter([phone_number_types, [], phone_number_types[:1]])
+
+    # Act
+    chunks = list(utils.get_ndjson_stream(batches))
+
+    # Assert
+    assert len(chunks) == 3
+    assert chunks[1] == ""
+    assert list(map(lambda line: PhoneNumberType.parse_raw(line), "".join(chunks).splitlines())) == \
+           phone_number_types + phone_number_types[:1]
+
+
+def test_get_ndjson_stream_should_return_async_stream_of_async_batches() -> None:
+    # Arrange
+    async def __get_batches():
+        yield phone_number_types
+
+    async def __collect(stream):
+        return list([chunk async for chunk in stream])
+
+    # Act
+    chunks = asyncio.run(__collect(utils.get_ndjson_stream(__get_batches())))
+
+    # Assert
+    assert chunks == [utils.get_ndjson_chunk(phone_number_types)]
+
+
+def test_get_ndjson_chunk_should_return_json_array_per_tuple_of_models() -> None:
+    # Arrange
+    person_phone = PersonPhone(business_entity_id=1, phone_number="123", phone_number_type_id=1,
+                               modified_date=dt.datetime(2014, 1, 16))
+
+    # Act
+    chunk = utils.get_ndjson_chunk([(person_phone, phone_number_types[0])])
+
+    # Assert
+    assert json.loads(chunk) == [json.loads(person_phone.json()), json.loads(phone_number_types[0].json())]
+
+
+@pytest.mark.parametrize("batches, columns, expected_lines", [
+    ([phone_number_types, []], ["phone_number_type_id", "name"],
+     ["phone_number_type_id,name", "1,Cell", "2,Home"]),
+    ([], ["phone_number_type_id", "name", "modified_date"],
+     ["phone_number_type_id,name,modified_date"]),
+    ([[(PersonPhone(business_entity_id=1, phone_number="123", phone_number_type_id=2,
+                    modified_date=dt.datetime(2014, 1, 16)), phone_number_types[1])]],
+     utils.get_csv_columns([(PersonPhone, ["business_entity_id", "phone_number"]), (PhoneNumberType, ["name"])]),
+     ["PersonPhone.business_entity_id,PersonPhone.phone_number,PhoneNumberType.name", "1,123,Home"])
+])
+def test_get_csv_stream_should_return_header_and_one_line_per_row(batches: List[list], columns: List[str],
+                                                                   expected_lines: List[str]) -> None:
+    # Arrange
+    # Act
+    chunks = list(utils.get_csv_stream(iter(batches), columns))
+
+    # Assert
+    assert len(chunks) == len(batches) + 1
+    assert "".join(chunks).splitlines() == expected_lines
+
+
+def test_get_csv_stream_should_return_async_stream_of_async_batches() -> None:
+    # Arrange
+    columns = ["phone_number_type_id", "name"]
+
+    async def __get_batches():
+        yield phone_number_types
+
+    async def __collect(stream):
+        return list([chunk async for chunk in stream])
+
+    # Act
+    chunks = asyncio.run(__collect(utils.get_csv_stream(__get_batches(), columns)))
+
+    # Assert
+    assert chunks == [utils.get_csv_chunk([], columns, is_header=True), utils.get_csv_chunk(phone_number_types, columns)]
+
+
+@pytest.mark.parametrize("chunks, expected_lines", [
+    ([b"a\nb", b"c\n", b"d"], [b"a\n", b"bc\n", b"d"]),
+    ([b"a\n\n", b"\n"], [b"a\n", b"\n", b"\n"]),
+    ([], []),
+])
+def test_get_byte_lines_should_return_lines_of_chunks(chunks: List[bytes], expected_lines: List[bytes]) -> None:
+    # Arrange
+    async def __get_chunks():
+        for chunk in chunks:
+            yield chunk
+
+    async def __collect(stream):
+        return list([line async for line in stream])
+
+    # Act
+    lines = asyncio.run(__collect(utils.get_byte_lines(__get_chunks())))
+
+    # Assert
+    assert lines == expected_lines
+
+
+@pytest.mark.parametrize("lines, import_format, expected_rows", [
+    ([b'{"a": 1, "b": "x"}\n', b'\n', b'{"a": 2}'], EExportFormat.NDJSON, [(1, dict(a=1, b="x")), (3, dict(a=2))]),
+    ([b'[1]\n', b'{"a"\n', b'\xff\n'], EExportFormat.NDJSON, [(1, None), (2, None), (3, None)]),
+    ([b'\xef\xbb\xbfa,b\n', b'1,\n', b'"x\n', b'y",2\n'], EExportFormat.CSV,
+     [(2, dict(a="1", b=None)), (3, dict(a="x\ny", b="2"))]),
+    ([b'a,b\n', b'1\n', b'\n', b'1,"2\n'], EExportFormat.CSV, [(2, None), (4, None)]),
+])
+def test_get_import_rows_should_return_expected_rows(lines: List[bytes], import_format: EExportFormat,
+                                                     expected_rows: List[tuple]) -> None:
+    # Arrange
+    async def __get_lines():
+        for line in lines:
+            yield line
+
+    async def __collect(stream):
+        return list([row async for row in stream])
+
+    # Act
+    rows = asyncio.run(__collect(utils.get_import_rows(__get_lines(), import_format)))
+
+    # Assert
+    assert list(map(lambda r: r[0], rows)) == list(map(lambda er: er[0], expected_rows))
+    for row, expected_row in zip(rows, expected_rows):
+        if expected_row[1] is None:
+            assert row[1].startswith(f"{E400BadRequest.INVALID_IMPORT_ROW}:")
+        else:
+            assert row[1] == expected_row[1]
+
+
+@pytest.mark.parametrize("lines, expected_row_number", [
+    ([b'\xffa,b\n', b'1,2\n'], 1),
+    ([b'\n', b'a,"b\n'], 2),
+])
+def test_get_import_rows_should_raise_expected_error_for_invalid_csv_header(lines: List[bytes],
+                                                                            expected_row_number: int) -> None:
+    # Arrange
+    async def __get_lines():
+        for line in lines:
+            yield line
+
+    async def __collect(stream):
+        return list([row async for row in stream])
+
+    # Act
+    # Assert
+    with pytest.raises(errors.InvalidImportFileError) as e:
+        asyncio.run(__collect(utils.get_import_rows(__get_lines(), EExportFormat.CSV)))
+    assert str(e.value).startswith(f"{E400BadRequest.INVALID_IMPORT_ROW}: Row {expected_row_number} ")
+
+
+@pytest.mark.parametrize("operations_count, expected_error", [
+    (0, None),
+    (1000, None),
+    (1001, errors.InvalidSQLValueError)
+])
+def test_check_batch_operations_count_should_raise_expected_error(operations_count: int,
+                                                                  expected_error: Union[type, None]) -> None:
+    if expected_error is not None:
+        with pytest.raises(expected_error):
+            # Act
+            # Assert
+            utils.check_batch_operations_count(operations_count)
+    else:
+        # Act
+        # Assert
+        utils.check_batch_operations_count(operations_count)
+
+
+@pytest.mark.parametrize("operation, values, expected_error", [
+    (EBatchOperation.DELETE, dict(person_id=1), None),
+    (EBatchOperation.UPDATE, dict(person_id=1, person_input=dict()), None),
+    (EBatchOperation.DELETE, dict(person_id=None), errors.EmptyFieldsError),
+    (EBatchOperation.UPDATE, dict(person_id=1, person_input=None), errors.EmptyFieldsError)
+])
+def test_check_batch_operation_values_should_raise_expected_error(operation: EBatchOperation, values: Dict[str, object],
+                                                                  expected_error: Union[type, None]) -> None:
+    if expected_error is not None:
+        with pytest.raises(expected_error):
+            # Act
+            # Assert
+            utils.check_batch_operation_values(operation, values)
+    else:
+        # Act
+        # Assert
+        utils.check_batch_operation_values(operation, values)
+
+
+@pytest.mark.parametrize("ids_count, expected_error", [
+    (1000, None),
+    (1001, errors.InvalidSQLValueError)
+])
+def test_check_ids_count_should_raise_expected_error(ids_count: int, expected_error: Union[type, None]) -> None:
+    if expected_error is not None:
+        with pytest.raises(expected_error):
+            # Act
+            # Assert
+            utils.check_ids_count(ids_count)
+    else:
+        # Act
+        # Assert
+        utils.check_ids_count(ids_count)
+
+
+@pytest.mark.parametrize("ids, objects, expected_objects", [
+    ([3, 1, 2], [dict(id=1), dict(id=2), dict(id=3)], [dict(id=3), dict(id=1), dict(id=2)]),
+    ([2, 4, 2], [dict(id=2)], [dict(id=2), None, dict(id=2)]),
+    ([(1, "a"), (1, "b")], [dict(id=(1, "b"))], [None, dict(id=(1, "b"))]),
+    ([], [], [])
+])
+def test_get_objects_in_ids_order_should_return_expected_objects(ids: List[object], objects: List[dict],
+                                                                 expected_objects: List[Union[dict, None]]) -> None:
+    # Act
+    ordered_objects = utils.get_objects_in_ids_order(ids, objects, lambda o: o["id"])
+
+    # Assert
+    assert ordered_objects == expected_objects
+
+
+async def __run_and_get_loop_thread(method, *args, **kwargs):
+    return await utils.run_nonblocking(method, *args, **kwargs), threading.get_ident()
@@ -1,8 +1,18 @@
 import re
-from typing import Dict, Tuple, Union, List
+import io
+import csv
+import json
+import inspect
+import itertools
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlmodel import SQLModel
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Tuple, Union, List, Sequence, Type
 
 from app import errors
-from app.models import PrimaryKeyErrorDetails, ForeignKeyErrorDetails, E400BadRequest
+from app.config import BatchConfig
+from app.models import PrimaryKeyErrorDetails, ForeignKeyErrorDetails, EExportFormat, EBatchOperation, E400BadRequest
 
 
 def get_filter_params(filter_string: str) -> Dict[str, str]:
@@ -223,3 +233,227 @@ def get_foreign_key_violence_details(error_message: str) -> ForeignKeyErrorDetai
     column, value = tuple(re.findall(r"\((.*?)\)", line_of_interest))
 
     return ForeignKeyErrorDetails(entity=name, key_column=column, key_value=value)
+
+
+def check_batch_operations_count(operations_count: int) -> None:
+    """ Raises error if count of batch operations exceeds the 'max_operations' of the 'batch' config section """
+    max_operations = BatchConfig.from_json().max_operations
+    if operations_count > max_operations:
+        raise errors.InvalidSQLValueError(f"{E400BadRequest.LIMIT_EXCEEDED}: "
+                                          f"Batch of {operations_count} operations exceeds "
+                                          f"the maximum of {max_operations} operations.")
+
+
+def check_ids_count(ids_count: int) -> None:
+    """ Raises error if count of ids of a multi-get exceeds the 'max_ids' of the 'batch' config section """
+    max_ids = BatchConfig.from_json().max_ids
+    if ids_count > max_ids:
+        raise errors.InvalidSQLValueError(f"{E400BadRequest.LIMIT_EXCEEDED}: "
+                                          f"List of {ids_count} ids exceeds the maximum of {max_ids} ids.")
+
+
+def get_objects_in_ids_order(ids: List[Any], objects: List[Any], get_id: Callable[[Any], Any]) -> List[Any]:
+    """ Returns objects of given ids in order of the ids, None for each id without object """
+    objects_by_id = dict(map(lambda o: (get_id(o), o), objects))
+    return list(map(lambda i: objects_by_id.get(i, None), ids))
+
+
+def check_batch_operation_values(operation: EBatchOperation, values: Dict[str, Any]) -> None:
+    """ Raises error if any of given named values required by the batch operation is not provided """
+    missing_names = list(map(lambda kv: kv[0], filter(lambda kv: kv[1] is None, values.items())))
+    if len(missing_names) > 0:
+        raise errors.EmptyFieldsError(f"{E400BadRequest.VALUES_NOT_PROVIDED}: "
+                                      f"Operation '{operation.value}' requires values: {missing_names}.")
+
+
+def get_model_columns(model: Type[SQLModel]) -> List[Any]:
+    """ Returns columns of given table model in the order of model fields """
+    return list(map(lambda f: getattr(model, f), model.__fields__.keys()))
+
+
+def get_models_from_row(models: Sequence[Type[SQLModel]], row: Sequence[Any]) -> Tuple[SQLModel, ...]:
+    """
+    Returns table model objects of given row selected (or returned) as consecutive columns of given models.
+
+    Example: row of columns of PersonPhone, Person and PhoneNumberType (returned by 'get_model_columns')
+    should return tuple of PersonPhone, Person and PhoneNumberType objects.
+    """
+    model_objects = list([])
+    offset = 0
+    for model in models:
+        fields = list(model.__fields__.keys())
+        model_objects.append(model(**dict(zip(fields, row[offset:offset + len(fields)]))))
+        offset += len(fields)
+    return tuple(model_objects)
+
+
+async def run_nonblocking(method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Returns result of provider or service method without blocking the event loop.
+
+    Coroutine methods (async providers and services) are awaited directly,
+    regular methods (sync providers and services) are run in the threadpool.
+    """
+    if inspect.iscoroutinefunction(method):
+        return await method(*args, **kwargs)
+    return await run_in_threadpool(method, *args, **kwargs)
+
+
+def get_ndjson_chunk(models: Sequence[Union[SQLModel, Tuple[SQLModel, ...]]]) -> str:
+    """ Returns NDJSON chunk of given models, one JSON line per model (JSON array per tuple of models) """
+    return "".join(map(lambda m: f"{m.json() if isinstance(m, SQLModel) else json.dumps(jsonable_encoder(m))}\n",
+                       models))
+
+
+def get_ndjson_stream(batches: Union[Iterator[Sequence[SQLModel]], AsyncIterator[Sequence[SQLModel]]]
+                      ) -> Union[Iterator[str], AsyncIterator[str]]:
+    """ Returns stream of NDJSON chunks of given model batches, async if the batches are async """
+
+    async def __get_async_ndjson_stream() -> AsyncIterator[str]:
+        async for batch in batches:
+            yield get_ndjson_chunk(batch)
+
+    if hasattr(batches, "__aiter__"):
+        return __get_async_ndjson_stream()
+    return map(get_ndjson_chunk, batches)
+
+
+def get_csv_columns(model_fields: Sequence[Tuple[Type[SQLModel], Sequence[str]]]) -> List[str]:
+    """
+    Returns CSV columns of given fields of given models.
+    Columns of rows being tuples of models are prefixed with model names.
+
+    Example model fields: [(PersonPhone, ["phone_number"]), (Person, ["first_name", "last_name"])]
+
+    Should return: ["PersonPhone.phone_number", "Person.first_name", "Person.last_name"]
+    """
+    if len(model_fields) == 1:
+        return list(model_fields[0][1])
+    return list(itertools.chain.from_iterable(map(lambda mf: map(lambda f: f"{mf[0].__name__}.{f}", mf[1]),
+                                                  model_fields)))
+
+
+def get_csv_row(row: Union[SQLModel, Tuple[SQLModel, ...]]) -> Dict[str, Any]:
+    """ Returns flat dictionary of JSON compatible values of given model (or tuple of models, prefixed) """
+    if isinstance(row, SQLModel):
+        return jsonable_encoder(row)
+    return dict(itertools.chain.from_iterable(
+        map(lambda m: map(lambda kv: (f"{type(m).__name__}.{kv[0]}", kv[1]), jsonable_encoder(m).items()),
+            filter(lambda m: m is not None, row))))
+
+
+def get_csv_chunk(rows: Sequence[Union[SQLModel, Tuple[SQLModel, ...]]], columns: List[str],
+                  is_header: bool = False) -> str:
+    """ Returns CSV chunk of given rows, values of missing columns are empty """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, columns, extrasaction="ignore")
+    if is_header:
+        writer.writeheader()
+    writer.writerows(map(get_csv_row, rows))
+    return buffer.getvalue()
+
+
+def get_csv_stream(batches: Union[Iterator[Sequence[SQLModel]], AsyncIterator[Sequence[SQLModel]]],
+                   columns: List[str]) -> Union[Iterator[str], AsyncIterator[str]]:
+    """ Returns stream of CSV chunks of given model batches (header first), async if the batches are async """
+
+    async def __get_async_csv_stream() -> AsyncIterator[str]:
+        yield get_csv_chunk(list([]), columns, is_header=True)
+        async for batch in batches:
+            yield get_csv_chunk(batch, columns)
+
+    if hasattr(batches, "__aiter__"):
+        return __get_async_csv_stream()
+    return itertools.chain([get_csv_chunk(list([]), columns, is_header=True)],
+                           map(lambda b: get_csv_chunk(b, columns), batches))
+
+
+def get_export_response(batches: Union[Iterator[Sequence[SQLModel]], AsyncIterator[Sequence[SQLModel]]],
+                        export_format: EExportFormat, columns: List[str], file_name: str) -> StreamingResponse:
+    """ Returns chunked response streaming given model batches as an NDJSON or CSV file attachment """
+    if export_format == EExportFormat.CSV:
+        stream, media_type = get_csv_stream(batches, columns), "text/csv"
+    else:
+        stream, media_type = get_ndjson_stream(batches), "application/x-ndjson"
+    content_disposition = f"attachment; filename=\"{file_name}.{export_format.value}\""
+    return StreamingResponse(stream, media_type=media_type, headers={"Content-Disposition": content_disposition})
+
+
+async def get_byte_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """ Returns stream of lines (with line endings) of given stream of byte chunks, e.g. of an uploaded file """
+    rest = b""
+    async for chunk in chunks:
+        lines = (rest + chunk).split(b"\n")
+        rest = lines.pop()
+        for line in lines:
+            yield line + b"\n"
+    if rest != b"":
+        yield rest
+
+
+async def get_import_rows(lines: AsyncIterator[bytes], import_format: EExportFormat
+                          ) -> AsyncIterator[Tuple[int, Union[Dict[str, Any], str]]]:
+    """
+    Returns stream of rows of given NDJSON or CSV file lines, each with number of its (first) line.
+    A row is dictionary of values (CSV empty values are None) or, if the row cannot be read, an error message.
+    CSV file starts with a header of value names; quoted values may contain line breaks.
+    If the header cannot be read, error is raised, as none of the following rows can be read.
+    """
+    line_number, record_line_number, record, columns = 0, 0, "", None
+    async for line in lines:
+        line_number += 1
+        try:
+            text = line.decode("utf-8-sig" if line_number == 1 else "utf-8")
+        except UnicodeDecodeError:
+            record = ""
+            if import_format == EExportFormat.CSV and columns is None:
+                raise_invalid_import_header_error(line_number, "is not valid UTF-8 text")
+            yield line_number, f"{E400BadRequest.INVALID_IMPORT_ROW}: Row {line_number} is not valid UTF-8 text."
+            continue
+
+        if import_format == EExportFormat.NDJSON:
+            if text.strip() == "":
+                continue
+            try:
+                row = json.loads(text)
+            except ValueError:
+                row = None
+            if isinstance(row, dict):
+                yield line_number, row
+            else:
+                yield line_number, f"{E400BadRequest.INVALID_IMPORT_ROW}: Row {line_number} is not a JSON object."
+            continue
+
+        if record == "":
+            record_line_number = line_number
+        record += text
+        if record.count('"') % 2 == 1:
+            continue
+        try:
+            values = next(csv.reader([record]), list([]))
+        except csv.Error:
+            values = None
+        record = ""
+        if values is not None and len(values) == 0:
+            continue
+        if columns is None:
+            if values is None:
+                raise_invalid_import_header_error(record_line_number, "is not a CSV record")
+            columns = values
+        elif values is None or len(values) != len(columns):
+            yield record_line_number, f"{E400BadRequest.INVALID_IMPORT_ROW}: " \
+                                      f"Row {record_line_number} is not a CSV record of the header columns."
+        else:
+            yield record_line_number, dict(zip(columns, map(lambda v: None if v == "" else v, values)))
+
+    if record != "":
+        if columns is None:
+            raise_invalid_import_header_error(record_line_number, "has an unterminated quoted value")
+        yield record_line_number, f"{E400BadRequest.INVALID_IMPORT_ROW}: " \
+                                  f"Row {record_line_number} has an unterminated quoted value."
+
+
+def raise_invalid_import_header_error(row_number: int, reason: str) -> None:
+    """ Raises error of imported CSV file whose header row of given number cannot be read for given reason """
+    raise errors.InvalidImportFileError(f"{E400BadRequest.INVALID_IMPORT_ROW}: Row {row_number} {reason}. "
+                                        f"It is the header of value names, so the file is not imported.")
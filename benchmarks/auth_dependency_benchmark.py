@@ -0,0 +1,174 @@
+"""
+Benchmark of the authentication dependency under concurrent requests.
+
+Compares throughput of a protected endpoint when the current user is resolved:
+    1) blocking    - by the sync user provider called directly on the event loop (former behaviour)
+    2) threadpool  - by the sync user provider run in the threadpool
+    3) async       - by the async (Motor) user provider awaited on the event loop
+    4) cached      - by the async user provider behind the authenticated-user cache
+
+By default the Mongo round trip is simulated with a fixed latency, so the benchmark needs no database.
+With '--mongo' the providers configured in 'mongodb_connection' section of config file are used.
+
+Usage:
+    python -m benchmarks.auth_dependency_benchmark --requests 1000 --concurrency 100 --latency-ms 5
+"""
+import argparse
+import asyncio
+import datetime as dt
+import time
+import httpx
+from fastapi import Depends, FastAPI
+from typing import Dict, List, Optional, Tuple
+
+from app.caches import TTLLRUCache
+from app.factories import MongoDBFactory, AWFAPIUserFactory
+from app.models import AWFAPIUser, AWFAPIUserInput
+from app.providers import IAWFAPIUserProvider
+from app.services import JWTAuthenticationService, AWFAPIUserService
+
+
+benchmark_user: AWFAPIUser = AWFAPIUser(username="benchmarkuser", full_name="Benchmark User",
+                                        email="benchmark.user@benchmark.user", is_readonly=True,
+                                        hashed_password="$2b$12$dQfVWYA0ko8tjyqglzHd4.2i9lY4x48Q08YsVSMWEIpPqXXTGRkwS",
+                                        date_created=dt.datetime(2023, 1, 1), date_modified=dt.datetime(2023, 1, 1))
+
+
+class LatencyAWFAPIUserProvider(IAWFAPIUserProvider):
+    """ Sync user provider simulating a blocking Mongo round trip """
+
+    def __init__(self, latency: float):
+        super(LatencyAWFAPIUserProvider, self).__init__()
+        self.latency = latency
+
+    def get_awfapi_user(self, username: str) -> AWFAPIUser:
+        time.sleep(self.latency)
+        return benchmark_user
+
+
+class AsyncLatencyAWFAPIUserProvider(IAWFAPIUserProvider):
+    """ Async user provider simulating a non-blocking Mongo round trip """
+
+    def __init__(self, latency: float):
+        super(AsyncLatencyAWFAPIUserProvider, self).__init__()
+        self.latency = latency
+
+    async def get_awfapi_user(self, username: str) -> AWFAPIUser:
+        await asyncio.sleep(self.latency)
+        return benchmark_user
+
+
+def get_benchmark_app(jwt_auth_service: JWTAuthenticationService,
+                      async_jwt_auth_service: JWTAuthenticationService,
+                      cached_jwt_auth_service: JWTAuthenticationService) -> FastAPI:
+    """ Returns app with one protected endpoint per authentication mode """
+    app = FastAPI()
+
+    async def get_user_blocking(token: str) -> AWFAPIUser:
+        return jwt_auth_service.get_user_from_token(token)
+
+    async def get_user_threadpool(token: str) -> AWFAPIUser:
+        return await jwt_auth_service.get_user_from_token_async(token)
+
+    async def get_user_async(token: str) -> AWFAPIUser:
+        return await async_jwt_auth_service.get_user_from_token_async(token)
+
+    async def get_user_cached(token: str) -> AWFAPIUser:
+        return await cached_jwt_auth_service.get_user_from_token_async(token)
+
+    @app.get("/blocking")
+    async def blocking(user: AWFAPIUser = Depends(get_user_blocking)) -> Dict[str, str]:
+        return {"username": user.username}
+
+    @app.get("/threadpool")
+    async def threadpool(user: AWFAPIUser = Depends(get_user_threadpool)) -> Dict[str, str]:
+        return {"username": user.username}
+
+    @app.get("/async")
+    async def async_(user: AWFAPIUser = Depends(get_user_async)) -> Dict[str, str]:
+        return {"username": user.username}
+
+    @app.get("/cached")
+    async def cached(user: AWFAPIUser = Depends(get_user_cached)) -> Dict[str, str]:
+        return {"username": user.username}
+
+    return app
+
+
+async def measure(app: FastAPI, path: str, token: str, requests: int, concurrency: int) -> float:
+    """ Returns number of requests per second served by given endpoint """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(app=app, base_url="http://benchmark") as client:
+        async def request() -> None:
+            async with semaphore:
+                response = await client.get(path, params={"token": token})
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*[request() for _ in range(requests)])
+        elapsed = time.perf_counter() - start
+
+    return requests / elapsed
+
+
+def get_services(is_mongo: bool, latency: float) -> List[JWTAuthenticationService]:
+    """ Returns sync, async and cached async provider based authentication services """
+    if not is_mongo:
+        provider = LatencyAWFAPIUserProvider(latency)
+        service = AWFAPIUserService()
+        async_provider = AsyncLatencyAWFAPIUserProvider(latency)
+    else:
+        provider, service, async_provider = get_mongo_providers_and_service()
+
+    return [JWTAuthenticationService(awfapi_user_provider=provider, awfapi_user_service=service,
+                                     awfapi_user_cache=get_disabled_cache()),
+            JWTAuthenticationService(awfapi_user_provider=provider, awfapi_user_service=service,
+                                     async_awfapi_user_provider=async_provider,
+                                     awfapi_user_cache=get_disabled_cache()),
+            JWTAuthenticationService(awfapi_user_provider=provider, awfapi_user_service=service,
+                                     async_awfapi_user_provider=async_provider,
+                                     awfapi_user_cache=TTLLRUCache(name="benchmark", max_size=1024, ttl=60.0))]
+
+
+def get_disabled_cache() -> TTLLRUCache[str, AWFAPIUser]:
+    """ Returns cache storing nothing, so every lookup reaches the user provider """
+    return TTLLRUCache(name="benchmark_disabled", max_size=0, ttl=0.0)
+
+
+def get_mongo_providers_and_service() -> Tuple[IAWFAPIUserProvider, AWFAPIUserService, IAWFAPIUserProvider]:
+    """ Returns configured MongoDB user providers and service, the benchmark user is registered """
+
+    connection_string, collection_name, db_engine = MongoDBFactory.get_db_connection_details(test_suffix="_benchmark")
+    _, _, async_db_engine = MongoDBFactory.get_async_db_connection_details(test_suffix="_benchmark")
+    provider, service = AWFAPIUserFactory.get_provider_and_service(connection_string, collection_name, db_engine)
+    async_provider = AWFAPIUserFactory.get_async_provider(connection_string, collection_name, async_db_engine)
+    db_engine.awfapi[collection_name].drop()
+    provider.insert_awfapi_user(AWFAPIUserInput(**benchmark_user.dict()))
+    return provider, service, async_provider
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Authentication dependency throughput benchmark.")
+    parser.add_argument("--requests", type=int, default=1000, help="number of requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=100, help="number of concurrent requests")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="simulated Mongo round trip latency")
+    parser.add_argument("--mongo", action="store_true", help="use the configured MongoDB instead of latency stubs")
+    parsed_args = parser.parse_args(args)
+
+    jwt_auth_services = get_services(parsed_args.mongo, parsed_args.latency_ms / 1000)
+    token = jwt_auth_services[0].create_access_token(data={"sub": benchmark_user.username})
+    app = get_benchmark_app(*jwt_auth_services)
+
+    print(f"requests: {parsed_args.requests} | concurrency: {parsed_args.concurrency} | "
+          f"{'mongo' if parsed_args.mongo else f'latency: {parsed_args.latency_ms} ms'}")
+    for path in ["/blocking", "/threadpool", "/async", "/cached"]:
+        throughput = asyncio.run(measure(app, path, token, parsed_args.requests, parsed_args.concurrency))
+        print(f"{path[1:]:>12}: {throughput:10.1f} req/s")
+
+    cache_stats = jwt_auth_services[2].awfapi_user_cache.get_stats()
+    print(f"cached mode user lookups: {cache_stats.hits} from cache, {cache_stats.misses} from provider")
+
+
+if __name__ == "__main__":
+    main()
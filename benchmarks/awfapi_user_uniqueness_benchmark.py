@@ -0,0 +1,99 @@
+"""
+Benchmark of AWFAPI user registration with a large user base.
+
+Compares latency of a registration (username and email uniqueness checks followed by the insert) when:
+    1) full scan  - uniqueness is checked on the list of all users (former behaviour)
+    2) no index   - uniqueness is checked with 'find_one' queries, the collection has no unique indexes
+    3) index      - uniqueness is checked with 'find_one' queries backed by the unique indexes
+
+The benchmark needs MongoDB configured in 'mongodb_connection' section of config file. Synthetic users are
+inserted into a separate '_benchmark' collection, which is dropped afterwards.
+
+Usage:
+    python -m benchmarks.awfapi_user_uniqueness_benchmark --users 100000 --registrations 20
+"""
+import argparse
+import datetime as dt
+import time
+from typing import Any, Dict, List, Optional
+
+from app import errors
+from app.factories import MongoDBFactory, AWFAPIUserFactory
+from app.models import AWFAPIUserInput
+from app.providers import AWFAPIUserProvider
+
+
+hashed_password: str = "$2b$12$dQfVWYA0ko8tjyqglzHd4.2i9lY4x48Q08YsVSMWEIpPqXXTGRkwS"
+
+
+def get_synthetic_user_definitions(users: int) -> List[Dict[str, Any]]:
+    """ Returns definitions of synthetic users, ready to be inserted into the collection """
+    now = dt.datetime.utcnow()
+    return list(map(lambda i: dict({"username": f"syntheticuser{i}", "full_name": f"Synthetic User {i}",
+                                    "email": f"synthetic.user{i}@synthetic.user", "is_readonly": True,
+                                    "hashed_password": hashed_password, "date_created": now, "date_modified": now}),
+                    range(users)))
+
+
+def get_new_user_input(mode: str, i: int) -> AWFAPIUserInput:
+    return AWFAPIUserInput(username=f"{mode}user{i}", full_name=f"New User {i}", email=f"{mode}.user{i}@new.user",
+                           is_readonly=True, hashed_password=hashed_password)
+
+
+def register_with_full_scan(provider: AWFAPIUserProvider, awfapi_user_input: AWFAPIUserInput) -> None:
+    """ Registers user the former way, both guards load and validate all users """
+    if awfapi_user_input.username in list(map(lambda au: au.username, provider.get_awfapi_users())):
+        raise AWFAPIUserProvider.get_username_already_exists_error(awfapi_user_input.username)
+    if awfapi_user_input.email in list(map(lambda au: au.email, provider.get_awfapi_users())):
+        raise AWFAPIUserProvider.get_email_already_exists_error(awfapi_user_input.email)
+
+    now = dt.datetime.utcnow()
+    provider.db_engine.awfapi[provider.collection_name].insert_one(dict(awfapi_user_input.dict(),
+                                                                        date_created=now, date_modified=now))
+
+
+def measure(provider: AWFAPIUserProvider, mode: str, registrations: int) -> float:
+    """ Returns mean registration latency in milliseconds, the existing user registration is expected to fail """
+    start = time.perf_counter()
+    for i in range(registrations):
+        if mode == "full_scan":
+            register_with_full_scan(provider, get_new_user_input(mode, i))
+        else:
+            provider.insert_awfapi_user(get_new_user_input(mode, i))
+    elapsed = time.perf_counter() - start
+
+    try:
+        provider.insert_awfapi_user(get_new_user_input(mode, 0))
+        raise AssertionError(f"Duplicated registration passed in mode '{mode}'.")
+    except errors.UsernameAlreadyExistsError:
+        pass
+
+    return elapsed / registrations * 1000
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="AWFAPI user registration latency benchmark.")
+    parser.add_argument("--users", type=int, default=100000, help="number of synthetic users in the collection")
+    parser.add_argument("--registrations", type=int, default=20, help="number of measured registrations per mode")
+    parsed_args = parser.parse_args(args)
+
+    connection_string, collection_name, db_engine = MongoDBFactory.get_db_connection_details(test_suffix="_benchmark")
+    provider = AWFAPIUserFactory.get_provider(connection_string, collection_name, db_engine)
+    collection = db_engine.awfapi[collection_name]
+    collection.drop()
+
+    try:
+        collection.insert_many(get_synthetic_user_definitions(parsed_args.users), ordered=False)
+        print(f"users: {collection.estimated_document_count()} | registrations: {parsed_args.registrations}")
+
+        for mode in ["full_scan", "no_index", "index"]:
+            if mode == "index":
+                provider.ensure_indexes()
+            latency = measure(provider, mode, parsed_args.registrations)
+            print(f"{mode:>12}: {latency:10.2f} ms per registration")
+    finally:
+        collection.drop()
+
+
+if __name__ == "__main__":
+    main()
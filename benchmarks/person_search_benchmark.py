@@ -0,0 +1,109 @@
+"""
+Benchmark of person phrase search with a large person table.
+
+Compares latency of a '/search_by_phrases' query when:
+    1) ilike         - persons are filtered by ILIKE phrase predicates, ordered by full name (former behaviour)
+    2) trigram index - the same query, served by trigram GIN indexes of the person search migration
+    3) ranked        - persons are searched with the trigram indexes, ranked by word similarity and limited
+
+The benchmark needs PostgreSQL configured in 'postgresdb_connection' section of config file and a separate
+'_benchmark' database, whose user may create 'pg_trgm' extension. Synthetic persons are inserted server-side
+into freshly created tables, which are dropped afterwards.
+
+Usage:
+    python -m benchmarks.person_search_benchmark --persons 1000000 --repeats 5 --limit 50
+"""
+import argparse
+import datetime as dt
+import time
+import sqlalchemy
+from sqlalchemy.dialects import postgresql
+from sqlmodel import SQLModel
+from typing import List, Optional, Tuple
+
+from app.factories import PostgresDBFactory, PersonFactory
+from app.migrations import PersonSearchMigration
+from app.models import BusinessEntity, Person, EOrderType
+from app.providers import PersonProvider
+from app.services import PersonService
+
+
+first_names: List[str] = ["John", "Mary", "Robert", "Patricia", "Michael", "Linda", "David", "Barbara",
+                          "James", "Elizabeth", "Ken", "Terri", "Roberto", "Rob", "Gail", "Jossef",
+                          "Dylan", "Diane", "Gigi", "Michael"]
+last_names: List[str] = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Miller", "Davis", "Garcia",
+                         "Sanchez", "Duffy", "Tamburello", "Walters", "Erickson", "Goldberg", "Miller",
+                         "Margheim", "Matthew", "Raheem", "Cracium", "Gilbert"]
+phrases: List[Tuple[Optional[str], Optional[str]]] = [("john", None), (None, "sanch"), ("rob", "mill"),
+                                                      (None, "3f7a")]
+
+
+def insert_synthetic_persons(db_engine: sqlalchemy.engine.Engine, persons: int) -> None:
+    """ Inserts synthetic persons with their business entities, rows are generated by the database server """
+    i = sqlalchemy.func.generate_series(1, persons).column_valued("i")
+    now = sqlalchemy.func.now()
+    business_entity_statement = sqlalchemy.insert(BusinessEntity).from_select(
+        [BusinessEntity.business_entity_id, BusinessEntity.rowguid, BusinessEntity.modified_date],
+        sqlalchemy.select(i, sqlalchemy.func.md5(sqlalchemy.cast(i, sqlalchemy.String)), now))
+    person_statement = sqlalchemy.insert(Person).from_select(
+        [Person.business_entity_id, Person.person_type, Person.name_style, Person.title, Person.first_name,
+         Person.middle_name, Person.last_name, Person.email_promotion, Person.rowguid, Person.modified_date],
+        sqlalchemy.select(i, sqlalchemy.literal("IN"), sqlalchemy.literal("0"),
+                          sqlalchemy.case((i % 10 == 0, "Mr."), else_=None),
+                          postgresql.array(first_names)[i % len(first_names) + 1],
+                          sqlalchemy.func.chr(65 + i % 26),
+                          postgresql.array(last_names)[i / len(first_names) % len(last_names) + 1] + "-" +
+                          sqlalchemy.func.left(sqlalchemy.func.md5(sqlalchemy.cast(i, sqlalchemy.String)), 6),
+                          sqlalchemy.literal(0), sqlalchemy.func.md5(sqlalchemy.cast(-i, sqlalchemy.String)), now))
+    with db_engine.begin() as db_connection:
+        db_connection.execute(business_entity_statement)
+        db_connection.execute(person_statement)
+        db_connection.execute(sqlalchemy.text(f"ANALYZE \"{Person.__table_args__['schema']}\".\"{Person.__tablename__}\""))
+
+
+def measure(provider: PersonProvider, mode: str, repeats: int, limit: int) -> Tuple[float, float]:
+    """ Returns mean search latency in milliseconds and mean number of found persons """
+    found = 0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for first_name_phrase, last_name_phrase in phrases:
+            filter_string = PersonService.get_phrases_filter_string(first_name_phrase, last_name_phrase)
+            if mode == "ranked":
+                persons = provider.search_persons(filter_string, limit)
+            else:
+                persons = provider.get_persons(filter_string, "full_name", EOrderType.ASC, None, None)
+            found += len(persons)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / (repeats * len(phrases)) * 1000, found / (repeats * len(phrases))
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Person phrase search latency benchmark.")
+    parser.add_argument("--persons", type=int, default=1000000, help="number of synthetic persons in the table")
+    parser.add_argument("--repeats", type=int, default=5, help="number of measured repeats of each phrase per mode")
+    parser.add_argument("--limit", type=int, default=50, help="limit of ranked search results")
+    parsed_args = parser.parse_args(args)
+
+    connection_string, db_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_benchmark")
+    provider = PersonFactory.get_provider(connection_string, db_engine)
+    SQLModel.metadata.drop_all(bind=db_engine)
+    SQLModel.metadata.create_all(bind=db_engine)
+
+    try:
+        start = dt.datetime.utcnow()
+        insert_synthetic_persons(db_engine, parsed_args.persons)
+        print(f"persons: {parsed_args.persons} (inserted in {dt.datetime.utcnow() - start}) | "
+              f"phrases: {len(phrases)} | repeats: {parsed_args.repeats} | limit: {parsed_args.limit}")
+
+        for mode in ["ilike", "trigram_index", "ranked"]:
+            if mode == "trigram_index":
+                PersonSearchMigration.upgrade(db_engine)
+            latency, found = measure(provider, mode, parsed_args.repeats, parsed_args.limit)
+            print(f"{mode:>14}: {latency:10.2f} ms per search | {found:10.1f} persons found")
+    finally:
+        SQLModel.metadata.drop_all(bind=db_engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark of person phrase search done by the database and by the in-memory NumPy search engine.
+
+Compares latency of 'PersonService.get_persons_by_phrases' (full name ordered, not limited) when:
+    1) sql   - persons are filtered by ILIKE phrase predicates and ordered by PostgreSQL
+    2) numpy - persons are filtered by vectorized substring scans of the person search engine arrays
+               and ordered by its precomputed full name permutation
+
+The benchmark needs PostgreSQL configured in 'postgresdb_connection' section of config file and a separate
+'_benchmark' database. Synthetic persons are inserted server-side into freshly created tables, which are
+dropped afterwards. Both modes are checked to find the same persons.
+
+Usage:
+    python -m benchmarks.person_search_engine_benchmark --persons 200000 --repeats 5
+"""
+import argparse
+import time
+from sqlmodel import SQLModel
+from typing import List, Optional, Tuple
+
+from app.factories import PostgresDBFactory, PersonFactory
+from app.person_search_engine import PersonSearchEngine
+from app.services import PersonService
+from benchmarks.person_search_benchmark import insert_synthetic_persons
+
+
+phrases: List[Tuple[Optional[str], Optional[str], bool]] = [("john", None, False), (None, "sanch", False),
+                                                            ("rob", "mill", False), ("rob", "mill", True),
+                                                            (None, "3f7a", False)]
+
+
+def measure(person_service: PersonService, repeats: int) -> Tuple[float, List[List[int]]]:
+    """ Returns mean search latency in milliseconds and sorted ids of persons found by each phrase """
+    found_person_ids = list([])
+    start = time.perf_counter()
+    for _ in range(repeats):
+        found_person_ids = list([])
+        for first_name_phrase, last_name_phrase, is_alternative in phrases:
+            persons = person_service.get_persons_by_phrases(first_name_phrase, last_name_phrase,
+                                                            is_alternative=is_alternative,
+                                                            is_raised_error_if_empty=False)
+            found_person_ids.append(sorted(map(lambda p: p.business_entity_id, persons)))
+    elapsed = time.perf_counter() - start
+
+    return elapsed / (repeats * len(phrases)) * 1000, found_person_ids
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Person phrase search latency benchmark: SQL vs NumPy engine.")
+    parser.add_argument("--persons", type=int, default=200000, help="number of synthetic persons in the table")
+    parser.add_argument("--repeats", type=int, default=5, help="number of measured repeats of each phrase per mode")
+    parsed_args = parser.parse_args(args)
+
+    connection_string, db_engine = PostgresDBFactory.get_db_connection_details(test_suffix="_benchmark")
+    person_provider = PersonFactory.get_provider(connection_string, db_engine)
+    SQLModel.metadata.drop_all(bind=db_engine)
+    SQLModel.metadata.create_all(bind=db_engine)
+
+    try:
+        insert_synthetic_persons(db_engine, parsed_args.persons)
+
+        start = time.perf_counter()
+        person_search_engine = PersonSearchEngine(person_provider.get_person_search_names())
+        print(f"persons: {person_search_engine.get_size()} | phrases: {len(phrases)} | "
+              f"repeats: {parsed_args.repeats} | engine built in {time.perf_counter() - start:.2f} s, "
+              f"arrays take {person_search_engine.get_nbytes() / 2 ** 20:.1f} MiB")
+
+        sql_latency, sql_person_ids = measure(PersonService(person_provider), parsed_args.repeats)
+        print(f"{'sql':>6}: {sql_latency:10.2f} ms per search")
+        numpy_latency, numpy_person_ids = measure(PersonService(person_provider, person_search_engine),
+                                                  parsed_args.repeats)
+        print(f"{'numpy':>6}: {numpy_latency:10.2f} ms per search")
+
+        if numpy_person_ids != sql_person_ids:
+            raise AssertionError("Search engine found other persons than the database.")
+    finally:
+        SQLModel.metadata.drop_all(bind=db_engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Bulk import of NDJSON or CSV files into the AdventureWorks PostgreSQL database (rows are loaded with COPY).
+
+Usage:
+    python import_data.py persons persons.csv
+    python import_data.py phone_number_types phone_number_types.ndjson
+    python import_data.py person_phones person_phones.txt --format csv
+"""
+import argparse
+import asyncio
+import os
+from typing import AsyncIterator, List, Optional
+
+from app import errors
+from app.factories import PostgresDBFactory
+from app.models import EExportFormat, ImportReport
+from app.providers import PersonProvider, PhoneNumberTypeProvider, PersonPhoneProvider
+from app.services import ImportService
+
+
+entities = list(["persons", "phone_number_types", "person_phones"])
+
+
+async def read_chunks(file_path: str, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            yield chunk
+
+
+def main(args: Optional[List[str]] = None) -> ImportReport:
+    parser = argparse.ArgumentParser(description="AdventureWorks bulk data import.")
+    parser.add_argument("entity", choices=entities, help="entity of the imported rows")
+    parser.add_argument("file", help="path of the imported NDJSON or CSV file")
+    parser.add_argument("--format", choices=list(map(lambda ef: ef.value, EExportFormat)), default=None,
+                        help="format of the file, by default given by the file extension")
+    parser.add_argument("--test-suffix", default="", help="suffix of the database name, e.g. '_test'")
+    parsed_args = parser.parse_args(args)
+
+    file_format = parsed_args.format or os.path.splitext(parsed_args.file)[1].lstrip(".").lower()
+    if file_format not in list(map(lambda ef: ef.value, EExportFormat)):
+        parser.error(f"format of file '{parsed_args.file}' is unknown, give it with --format")
+    import_format = EExportFormat(file_format)
+    connection_string, db_engine = PostgresDBFactory.get_db_connection_details(test_suffix=parsed_args.test_suffix)
+    import_service = ImportService(PersonProvider(connection_string, db_engine=db_engine),
+                                   PhoneNumberTypeProvider(connection_string, db_engine=db_engine),
+                                   PersonPhoneProvider(connection_string, db_engine=db_engine))
+    import_method = getattr(import_service, f"import_{parsed_args.entity}")
+
+    try:
+        import_report = asyncio.run(import_method(read_chunks(parsed_args.file), import_format))
+    except errors.InvalidImportFileError as e:
+        parser.exit(1, f"{e}\n")
+    print(import_report.json(indent=2))
+    return import_report
+
+
+if __name__ == "__main__":
+    main()
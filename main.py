@@ -2,10 +2,14 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError, StarletteHTTPException
 
-from app.config import AppMetadataConfig, CORSMiddlewareConfig
+from app.config import AppMetadataConfig, CORSMiddlewareConfig, PersonSearchConfig, PhoneNumberTypeCacheConfig
+from app.db_engine_registry import DbEngineRegistry
+from app.password_hashing_executor import PasswordHashingExecutor
 from app.routes import (main_router, jwt_auth_router, awfapi_user_router,
                         table_router, person_router, phone_number_type_router, person_phone_router)
 from app.error_handlers import custom_http_error_handler, custom_request_validation_error_handler
+from app.startup_handlers import (ensure_awfapi_user_indexes, build_person_name_index, load_person_search_engine,
+                                  load_phone_number_type_cache)
 
 
 app_metadata_config = AppMetadataConfig.from_json()
@@ -24,3 +28,12 @@ app.include_router(person_phone_router)
 
 app.add_exception_handler(StarletteHTTPException, custom_http_error_handler)
 app.add_exception_handler(RequestValidationError, custom_request_validation_error_handler)
+
+app.add_event_handler("startup", ensure_awfapi_user_indexes)
+app.add_event_handler("startup", build_person_name_index)
+if PersonSearchConfig.from_json().is_in_memory:
+    app.add_event_handler("startup", load_person_search_engine)
+if PhoneNumberTypeCacheConfig.from_json().is_enabled:
+    app.add_event_handler("startup", load_phone_number_type_cache)
+app.add_event_handler("shutdown", DbEngineRegistry.dispose_all_async)
+app.add_event_handler("shutdown", PasswordHashingExecutor.shutdown)
@@ -0,0 +1,36 @@
+"""
+Database migrations of the AdventureWorks PostgreSQL database.
+
+Usage:
+    python migrate.py person_search upgrade
+    python migrate.py person_search downgrade
+"""
+import argparse
+from typing import List, Optional
+
+from app.factories import PostgresDBFactory
+from app.migrations import PersonSearchMigration
+
+
+migrations = dict({"person_search": PersonSearchMigration})
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="AdventureWorks database migrations.")
+    parser.add_argument("migration", choices=list(migrations.keys()), help="name of the migration")
+    parser.add_argument("direction", choices=["upgrade", "downgrade"], nargs="?", default="upgrade",
+                        help="whether the migration is applied or reverted")
+    parser.add_argument("--test-suffix", default="", help="suffix of the database name, e.g. '_test'")
+    parsed_args = parser.parse_args(args)
+
+    _, db_engine = PostgresDBFactory.get_db_connection_details(test_suffix=parsed_args.test_suffix)
+    migration = migrations[parsed_args.migration]
+    if parsed_args.direction == "upgrade":
+        migration.upgrade(db_engine)
+    else:
+        migration.downgrade(db_engine)
+    print(f"Migration '{parsed_args.migration}' {parsed_args.direction} done.")
+
+
+if __name__ == "__main__":
+    main()